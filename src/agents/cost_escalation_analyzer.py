@@ -12,7 +12,7 @@ Philosophy: We document "what happened", NOT "was it justified"
 
 from typing import Dict, List, Optional
 import os
-from anthropic import Anthropic
+from src.utils.llm_client import call_llm_with_retry
 
 
 class CostEscalationAnalyzer:
@@ -23,14 +23,18 @@ class CostEscalationAnalyzer:
     """
 
     def __init__(self, anthropic_api_key: Optional[str] = None):
-        """Initialize with Anthropic API key"""
+        """Initialize with Anthropic API key
+
+        Calls go through the shared client for this key (see src.utils.llm_client),
+        so all agents draw from one connection pool and rate limit.
+        """
         if anthropic_api_key is None:
             anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 
         if not anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
-        self.client = Anthropic(api_key=anthropic_api_key)
+        self.api_key = anthropic_api_key
         self.model = "claude-sonnet-4-20250514"
 
     def analyze(
@@ -114,18 +118,14 @@ class CostEscalationAnalyzer:
 
         # Call LLM
         try:
-            response = self.client.messages.create(
+            analysis_text = call_llm_with_retry(
+                prompt=prompt,
                 model=self.model,
+                api_key=self.api_key,
                 max_tokens=2000,
-                temperature=0.3,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                temperature=0.3
             )
 
-            analysis_text = response.content[0].text
-
             # Parse LLM response
             result = self._parse_llm_response(
                 analysis_text,
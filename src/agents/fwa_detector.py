@@ -4,11 +4,34 @@ Hybrid fraud/waste/abuse detection using rules + LLM
 """
 
 import json
-from typing import Dict, List, Optional
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
 from src.models.schemas import FWADetectionResult, FWAFlag, MedicalNote
+from src.utils import telemetry
+from src.utils.fwa_rules import CostRuleTable, PreScreen
 from src.utils.llm_client import call_llm_with_retry
 
 
+logger = logging.getLogger(__name__)
+
+# Pre-screen scores (claimed amount / reference maximum) sent to the LLM: at or
+# below the lower bound the claim is clean, above the upper bound a clear outlier
+DEFAULT_LLM_BAND = (1.0, 3.0)
+
+FINDING_LABELS = {
+    "room_charges": "Room charges",
+    "surgeon_fees": "Surgeon fees",
+    "anesthetist_fees": "Anesthetist fees",
+    "ot_charges": "OT charges",
+    "icu_charges": "ICU charges",
+    "investigations": "Investigations",
+    "medicines_consumables": "Medicines/consumables/implants",
+    "other_charges": "Other charges",
+    "total": "Total cost",
+}
+
+
 # LLM Prompt template for FWA pattern detection
 PROMPT_TEMPLATE = """You are a quality assurance specialist for health insurance claims in India.
 
@@ -85,11 +108,30 @@ class FWADetector:
     - Cost inflation (rule-based: >150% typical max)
     - Duration outliers (rule-based: >typical + 2 days)
     - Pattern-based fraud (LLM: using fraud_waste_abuse_patterns from procedure JSON)
+
+    In tiered mode a rule pre-screen (src.utils.fwa_rules) compares every cost
+    component and the stay with the procedure's reference ranges first. The
+    LLM is only called for claims in the ambiguous band; clean claims and
+    clear outliers are decided by the rules alone.
     """
 
-    def __init__(self):
-        """Initialize FWA detector"""
-        pass
+    def __init__(self, tiered: Optional[bool] = None, llm_band: Optional[Tuple[float, float]] = None):
+        """
+        Initialize FWA detector
+
+        Args:
+            tiered: Skip the LLM for claims the rule pre-screen decides
+                (default: FWA_TIERED_MODE, on unless "false")
+            llm_band: (lower, upper) pre-screen scores that go to the LLM
+                (default: FWA_LLM_BAND, "1.0,3.0")
+
+        Raises:
+            ValueError: If the band is malformed
+        """
+        if tiered is None:
+            tiered = os.getenv("FWA_TIERED_MODE", "true").lower() != "false"
+        self.tiered = tiered
+        self.llm_band = llm_band or parse_llm_band(os.getenv("FWA_LLM_BAND", ""))
 
     def detect(
         self,
@@ -129,7 +171,19 @@ class FWADetector:
         duration_flags = self._check_duration_outliers(stay_duration, procedure_data)
         flags.extend(duration_flags)
 
-        # 3. LLM-based: Pattern detection
+        # 3. Tiered mode: only ambiguous claims need the LLM
+        if self.tiered:
+            screen = CostRuleTable(procedure_data).screen(costs, stay_duration, f"{diagnosis} {treatment}")
+            tier = screen.tier(self.llm_band)
+            telemetry.get_metrics().inc("iris_fwa_prescreen_total", tier=tier)
+            logger.debug("FWA pre-screen: %s (score %.2f, reasons: %s)", tier, screen.score, screen.reasons)
+            if tier == "clean":
+                return self._build_result(flags, None)
+            if tier == "outlier":
+                flags.extend(self._prescreen_flags(screen, flags))
+                return self._build_result(flags, None)
+
+        # 4. LLM-based: Pattern detection
         llm_risk_level = None
         try:
             llm_flags, llm_risk_level = self._llm_pattern_detection(
@@ -145,6 +199,46 @@ class FWADetector:
             # Graceful degradation - continue with rule-based flags only
             pass
 
+        return self._build_result(flags, llm_risk_level)
+
+    def detect_rules_only(
+        self,
+        costs: Dict,
+        procedure_data: Dict,
+        stay_duration: int
+    ) -> FWADetectionResult:
+        """
+        Detect red flags using only the rule-based checks (no LLM call)
+
+        Used when the LLM pattern detection is unavailable, e.g. when it does
+        not finish within the orchestrator's per-agent timeout. Produces the
+        same result as detect() does when the LLM call fails.
+
+        Args:
+            costs: Cost breakdown dictionary
+            procedure_data: Procedure data with typical costs
+            stay_duration: Expected length of stay
+
+        Returns:
+            FWADetectionResult based on cost and duration outliers
+        """
+        flags = []
+        flags.extend(self._check_cost_outliers(costs, procedure_data))
+        flags.extend(self._check_duration_outliers(stay_duration, procedure_data))
+
+        return self._build_result(flags, None)
+
+    def _build_result(self, flags: List[FWAFlag], llm_risk_level: Optional[str]) -> FWADetectionResult:
+        """
+        Build final FWADetectionResult from collected flags
+
+        Args:
+            flags: All flags from rule-based and LLM checks
+            llm_risk_level: Risk level assessed by the LLM, or None if unavailable
+
+        Returns:
+            FWADetectionResult with status, risk level and score impact
+        """
         # Determine overall risk level (prioritize LLM assessment if available)
         risk_level = llm_risk_level if llm_risk_level else self._determine_risk_level(flags)
 
@@ -161,6 +255,42 @@ class FWADetector:
             score_impact=score_impact
         )
 
+    def _prescreen_flags(self, screen: PreScreen, existing: List[FWAFlag]) -> List[FWAFlag]:
+        """
+        Flags for the items a clear outlier exceeds its reference ranges on
+
+        Args:
+            screen: Pre-screen of the claim
+            existing: Flags already raised by the outlier checks
+
+        Returns:
+            One FWAFlag per cost component or stay above its reference maximum
+            (the total only if the cost outlier check hasn't flagged it)
+        """
+        total_flagged = any(f.category == "cost_inflation" for f in existing)
+        flags = []
+        for finding in screen.findings:
+            item, amount, maximum = finding["item"], finding["amount"], finding["maximum"]
+            excess_percentage = int((finding["ratio"] - 1) * 100)
+            if item == "stay":
+                if any(f.category == "overtreatment" for f in existing):
+                    continue
+                flags.append(FWAFlag(
+                    category="overtreatment",
+                    detail=f"Hospital stay ({amount:.0f} days) exceeds typical maximum by {amount - maximum:.0f} days",
+                    evidence=f"Typical max: {maximum} days, Planned: {amount:.0f} days",
+                    insurer_action="Will request clinical justification for extended stay"
+                ))
+            elif item != "total" or not total_flagged:
+                label = FINDING_LABELS.get(item, item)
+                flags.append(FWAFlag(
+                    category="cost_inflation",
+                    detail=f"{label} ₹{amount:,.0f} is {excess_percentage}% above typical maximum",
+                    evidence=f"Typical max: ₹{maximum:,.0f}, Actual: ₹{amount:,.0f}",
+                    insurer_action="Will request itemized justification for cost components"
+                ))
+        return flags
+
     def _check_cost_outliers(self, costs: Dict, procedure_data: Dict) -> List[FWAFlag]:
         """
         Rule-based cost outlier detection (>150% of typical max)
@@ -283,12 +413,7 @@ class FWADetector:
             medical_note
         )
         
-        # Print prompt for debugging
-        print("\n" + "="*80)
-        print("PROMPT SENT TO AGENT-4 (FWA DETECTOR)")
-        print("="*80)
-        print(prompt)
-        print("="*80 + "\n")
+        logger.debug("Prompt sent to Agent 4 (FWA Detector):\n%s", prompt)
 
         # Call LLM
         response = call_llm_with_retry(
@@ -496,3 +621,27 @@ class FWADetector:
             return f"⚠ Medium FWA risk: {flag_summary}. Additional documentation needed."
         else:
             return f"⚠ Low FWA risk: {flag_summary}."
+
+
+def parse_llm_band(spec: str) -> Tuple[float, float]:
+    """
+    Parse the ambiguous band of pre-screen scores
+
+    Args:
+        spec: "lower,upper" (empty for DEFAULT_LLM_BAND)
+
+    Returns:
+        Tuple of (lower, upper)
+
+    Raises:
+        ValueError: If the spec is not two numbers with lower <= upper
+    """
+    if not spec.strip():
+        return DEFAULT_LLM_BAND
+    try:
+        lower, upper = (float(part) for part in spec.split(","))
+    except ValueError:
+        raise ValueError(f"Invalid FWA_LLM_BAND {spec!r}, expected lower,upper")
+    if lower > upper:
+        raise ValueError(f"Invalid FWA_LLM_BAND {spec!r}, lower bound above upper bound")
+    return lower, upper
@@ -12,7 +12,7 @@ Generates plain-language guidance for:
 
 from typing import Dict, List, Optional
 import os
-from anthropic import Anthropic
+from src.utils.llm_client import call_llm_with_retry
 
 
 class MedicalGuidanceGenerator:
@@ -23,14 +23,18 @@ class MedicalGuidanceGenerator:
     """
 
     def __init__(self, anthropic_api_key: Optional[str] = None):
-        """Initialize with Anthropic API key"""
+        """Initialize with Anthropic API key
+
+        Calls go through the shared client for this key (see src.utils.llm_client),
+        so all agents draw from one connection pool and rate limit.
+        """
         if anthropic_api_key is None:
             anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 
         if not anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
-        self.client = Anthropic(api_key=anthropic_api_key)
+        self.api_key = anthropic_api_key
         self.model = "claude-sonnet-4-20250514"
 
     def generate(
@@ -322,17 +326,13 @@ Example: "You should notice improvement in vision over the next 1-2 weeks. Most
 """
 
         try:
-            response = self.client.messages.create(
+            timeline = call_llm_with_retry(
+                prompt=prompt,
                 model=self.model,
+                api_key=self.api_key,
                 max_tokens=300,
-                temperature=0.5,  # Slightly higher for natural language
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            timeline = response.content[0].text.strip()
+                temperature=0.5  # Slightly higher for natural language
+            ).strip()
             return timeline
 
         except Exception as e:
@@ -4,11 +4,15 @@ LLM-powered assessment of medical necessity and treatment-diagnosis alignment
 """
 
 import json
+import logging
 from typing import Dict, List, Optional
 from src.models.schemas import MedicalReviewResult, MedicalConcern, MedicalNote
 from src.utils.llm_client import call_llm_with_retry
 
 
+logger = logging.getLogger(__name__)
+
+
 # Prompt template for medical review
 PROMPT_TEMPLATE = """You are a medical claim reviewer for health insurance in India.
 
@@ -111,12 +115,7 @@ class MedicalReviewer:
                 medical_note
             )
             
-            # Print prompt for debugging
-            print("\n" + "="*80)
-            print("PROMPT SENT TO AGENT-3 (MEDICAL REVIEWER)")
-            print("="*80)
-            print(prompt)
-            print("="*80 + "\n")
+            logger.debug("Prompt sent to Agent 3 (Medical Reviewer):\n%s", prompt)
 
             # Call LLM
             llm_response = self._call_llm(prompt)
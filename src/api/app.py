@@ -0,0 +1,222 @@
+"""
+Iris HTTP API
+Asynchronous job-based access to pre-authorization and discharge validation
+
+Endpoints:
+- POST /preauth: submit a medical note PDF, returns a job id immediately
+- POST /discharge: submit final bill + discharge summary PDFs, returns a job id
+- GET /jobs/{job_id}: poll job status and result
+- GET /jobs/{job_id}/events: Server-Sent Events stream of status changes and the result
+- GET /health: liveness check
+- GET /metrics: latency, token and cost metrics in the Prometheus text format
+
+Run with (the app is built by the factory, not at import time):
+    uvicorn src.api.app:create_app --factory --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from src.api.jobs import Job, JobManager
+from src.utils import telemetry
+from src.utils.data_loader import load_all_data
+from src.utils.logging_config import configure_logging
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+async def _read_pdf(upload: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read an uploaded PDF into memory
+
+    Raises:
+        HTTPException: 413 if larger than max_bytes, 400 if empty or not a PDF
+    """
+    data = await upload.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"{upload.filename} exceeds {max_bytes // (1024 * 1024)} MB")
+    if not data.startswith(b"%PDF"):
+        raise HTTPException(status_code=400, detail=f"{upload.filename or 'Upload'} is not a PDF")
+    return data
+
+
+def _job_accepted(job: Job) -> dict:
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.job_id}",
+        "events_url": f"/jobs/{job.job_id}/events"
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+def create_app(
+    job_manager: Optional[JobManager] = None,
+    max_upload_bytes: Optional[int] = None,
+    heartbeat_seconds: float = 15.0
+) -> FastAPI:
+    """
+    Build the FastAPI application
+
+    Args:
+        job_manager: Job manager to use (default: built from API_MAX_WORKERS / API_MAX_JOBS)
+        max_upload_bytes: Per-file upload limit (default: API_MAX_UPLOAD_MB, 20 MB)
+        heartbeat_seconds: Interval between SSE keep-alive comments
+
+    Returns:
+        Configured FastAPI app
+    """
+    configure_logging()
+
+    if job_manager is None:
+        job_manager = JobManager(
+            max_workers=_env_int("API_MAX_WORKERS", 4),
+            max_jobs=_env_int("API_MAX_JOBS", 1000)
+        )
+    if max_upload_bytes is None:
+        max_upload_bytes = _env_int("API_MAX_UPLOAD_MB", 20) * 1024 * 1024
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Warm the reference data (from the compiled catalog snapshot if one was built)
+        load_all_data()
+        yield
+        job_manager.shutdown(wait=False)
+
+    app = FastAPI(title="Iris Claims Co-Pilot API", lifespan=lifespan)
+    app.state.job_manager = job_manager
+
+    def get_job(job_id: str) -> Job:
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return job
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return PlainTextResponse(
+            telemetry.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    @app.post("/preauth", status_code=202)
+    async def submit_preauth(
+        medical_note: UploadFile = File(..., description="Pre-authorization medical note PDF"),
+        insurer: str = Form(...),
+        policy_type: str = Form(...),
+        procedure_id: str = Form(...),
+        policy_number: str = Form(...),
+        policy_start_date: str = Form(..., description="YYYY-MM-DD"),
+        sum_insured: int = Form(...),
+        planned_admission_date: Optional[str] = Form(None, description="YYYY-MM-DD"),
+        previous_claims_total: int = Form(0),
+        patient_age_at_policy_start: Optional[int] = Form(None),
+        save_claim: bool = Form(False, description="Save result and return a claim ID for discharge validation")
+    ):
+        pdf_bytes = await _read_pdf(medical_note, max_upload_bytes)
+
+        form_data = {
+            "insurer": insurer,
+            "policy_type": policy_type,
+            "procedure_id": procedure_id,
+            "policy_number": policy_number,
+            "policy_start_date": policy_start_date,
+            "sum_insured": sum_insured,
+            "previous_claims_total": previous_claims_total
+        }
+        if planned_admission_date:
+            form_data["planned_admission_date"] = planned_admission_date
+        if patient_age_at_policy_start is not None:
+            form_data["patient_age_at_policy_start"] = patient_age_at_policy_start
+
+        job = job_manager.submit_preauth(pdf_bytes, form_data, save_claim=save_claim)
+        return _job_accepted(job)
+
+    @app.post("/discharge", status_code=202)
+    async def submit_discharge(
+        final_bill: UploadFile = File(..., description="Final hospital bill PDF"),
+        discharge_summary: UploadFile = File(..., description="Discharge summary PDF"),
+        claim_id: Optional[str] = Form(None, description="Reference ID from a saved pre-authorization"),
+        expected_costs: Optional[str] = Form(None, description="JSON cost breakdown when no claim_id is given"),
+        expected_stay_days: int = Form(1)
+    ):
+        costs = None
+        if not claim_id:
+            if not expected_costs:
+                raise HTTPException(status_code=422, detail="Provide either claim_id or expected_costs")
+            try:
+                costs = json.loads(expected_costs)
+            except ValueError:
+                raise HTTPException(status_code=422, detail="expected_costs must be a JSON object")
+            if not isinstance(costs, dict):
+                raise HTTPException(status_code=422, detail="expected_costs must be a JSON object")
+
+        bill_bytes = await _read_pdf(final_bill, max_upload_bytes)
+        summary_bytes = await _read_pdf(discharge_summary, max_upload_bytes)
+
+        job = job_manager.submit_discharge(
+            bill_bytes,
+            summary_bytes,
+            claim_id=claim_id,
+            expected_costs=costs,
+            expected_stay_days=expected_stay_days
+        )
+        return _job_accepted(job)
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        return jsonable_encoder(get_job(job_id).to_dict())
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str):
+        job = get_job(job_id)
+
+        async def stream():
+            done = asyncio.wrap_future(job.future)
+            last_status = None
+            idle = 0.0
+            poll = min(1.0, heartbeat_seconds)
+
+            while True:
+                if job.status != last_status:
+                    last_status = job.status
+                    idle = 0.0
+                    yield _sse("status", job.to_dict(include_result=False))
+
+                if job.finished:
+                    yield _sse("result", job.to_dict())
+                    return
+
+                await asyncio.wait({done}, timeout=poll)
+                idle += poll
+                if idle >= heartbeat_seconds:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    return app
+
@@ -0,0 +1,274 @@
+"""
+Job Manager
+Runs pre-authorization and discharge validations on a worker pool
+
+Jobs are submitted with the uploaded PDFs held in memory and return a job
+immediately; callers poll the job or wait on its future for the result.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from src.services.preauth_service import PreAuthService
+from src.services.discharge_service import DischargeService
+from src.services.claim_storage import ClaimStorageService
+from src.utils import telemetry
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+class Job:
+    """A single validation job and its outcome"""
+
+    def __init__(self, job_id: str, kind: str):
+        self.job_id = job_id
+        self.kind = kind
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.telemetry: Optional[Dict] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """
+        Serialize job state
+
+        Args:
+            include_result: Include the validation result (can be large)
+
+        Returns:
+            Dict with job_id, kind, status, timestamps, error, telemetry (timings,
+            tokens and estimated cost, once finished) and optionally result
+        """
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "telemetry": self.telemetry
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    In-process job registry backed by a thread pool
+
+    Services are created once and shared by all jobs. Finished jobs are kept
+    for polling until max_jobs is exceeded, then the oldest finished jobs are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_jobs: int = 1000,
+        preauth_service: Optional[PreAuthService] = None,
+        discharge_service: Optional[DischargeService] = None,
+        claim_storage: Optional[ClaimStorageService] = None
+    ):
+        """
+        Initialize job manager
+
+        Args:
+            max_workers: Number of validations running at the same time
+            max_jobs: Maximum number of jobs retained for polling
+            preauth_service: Shared PreAuthService (created on first use if None)
+            discharge_service: Shared DischargeService (created on first use if None)
+            claim_storage: Claim storage for saving pre-auth results (created on first use if None)
+        """
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._preauth_service = preauth_service
+        self._discharge_service = discharge_service
+        self._claim_storage = claim_storage
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-job")
+
+    @property
+    def preauth_service(self) -> PreAuthService:
+        with self._lock:
+            if self._preauth_service is None:
+                self._preauth_service = PreAuthService(max_agent_workers=2 * self.max_workers)
+            return self._preauth_service
+
+    @property
+    def discharge_service(self) -> DischargeService:
+        with self._lock:
+            if self._discharge_service is None:
+                self._discharge_service = DischargeService(max_workers=2 * self.max_workers)
+            return self._discharge_service
+
+    @property
+    def claim_storage(self) -> ClaimStorageService:
+        with self._lock:
+            if self._claim_storage is None:
+                self._claim_storage = ClaimStorageService()
+            return self._claim_storage
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, kind: str, fn: Callable[[], Dict]) -> Job:
+        """
+        Queue a job on the worker pool
+
+        Args:
+            kind: Job type label ("preauth" or "discharge")
+            fn: Callable returning the job result; exceptions mark the job failed
+
+        Returns:
+            The queued Job
+        """
+        job = Job(uuid.uuid4().hex, kind)
+        job.future = self._executor.submit(self._run, job, fn)
+        # Registered before any SSE stream waits on the future, so the job is
+        # already marked when those waiters wake
+        job.future.add_done_callback(lambda future: self._on_done(job, future))
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict()
+
+        return job
+
+    def submit_preauth(self, pdf_bytes: bytes, form_data: Dict, save_claim: bool = False) -> Job:
+        """
+        Queue a pre-authorization validation
+
+        Args:
+            pdf_bytes: Medical note PDF content
+            form_data: Form fields including insurer, policy_type and procedure_id
+            save_claim: Save the result for later discharge validation
+
+        Returns:
+            The queued Job; its result has validation_result, medical_note and claim_id
+        """
+        def run() -> Dict:
+            result, medical_note = self.preauth_service.validate_preauth_from_pdf(
+                pdf_path=pdf_bytes,
+                insurer=form_data["insurer"],
+                policy_type=form_data["policy_type"],
+                procedure_id=form_data["procedure_id"],
+                form_data=form_data
+            )
+
+            claim_id = None
+            if save_claim:
+                claim_id = self.claim_storage.save_claim(result, form_data, medical_note)
+
+            return {
+                "validation_result": result.model_dump(mode="json"),
+                "medical_note": medical_note,
+                "claim_id": claim_id
+            }
+
+        return self.submit("preauth", run)
+
+    def submit_discharge(
+        self,
+        final_bill_bytes: bytes,
+        discharge_summary_bytes: bytes,
+        claim_id: Optional[str] = None,
+        expected_costs: Optional[Dict] = None,
+        expected_stay_days: int = 1
+    ) -> Job:
+        """
+        Queue a discharge validation
+
+        Args:
+            final_bill_bytes: Final hospital bill PDF content
+            discharge_summary_bytes: Discharge summary PDF content
+            claim_id: Saved pre-auth claim ID (takes precedence over expected_costs)
+            expected_costs: Manual pre-auth cost breakdown
+            expected_stay_days: Expected stay for manual mode
+
+        Returns:
+            The queued Job; its result is the discharge validation dict
+        """
+        def run() -> Dict:
+            if claim_id:
+                return self.discharge_service.validate_discharge_with_claim_id(
+                    claim_id=claim_id,
+                    final_bill_pdf_path=final_bill_bytes,
+                    discharge_summary_pdf_path=discharge_summary_bytes
+                )
+            return self.discharge_service.validate_discharge_manual(
+                expected_costs=expected_costs,
+                expected_stay_days=expected_stay_days,
+                final_bill_pdf_path=final_bill_bytes,
+                discharge_summary_pdf_path=discharge_summary_bytes
+            )
+
+        return self.submit("discharge", run)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and release the worker pool
+
+        Args:
+            wait: Let queued jobs run first; if False they are cancelled
+                (status "cancelled") and only running jobs are waited for
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        if self._preauth_service is not None:
+            self._preauth_service.shutdown()
+        if self._discharge_service is not None:
+            self._discharge_service.shutdown()
+
+    def _run(self, job: Job, fn: Callable[[], Dict]) -> None:
+        """Execute a job in a worker thread, recording its outcome"""
+        job.started_at = time.time()
+        job.status = JOB_RUNNING
+        with telemetry.trace(job.kind, job_id=job.job_id) as job_trace:
+            try:
+                job.result = fn()
+                status = JOB_COMPLETED
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {str(e)}"
+                job_trace.status = "error"
+                status = JOB_FAILED
+        job.telemetry = job_trace.summary()
+        # Status last, so readers that see a finished job also see its outcome
+        job.finished_at = time.time()
+        job.status = status
+
+    def _on_done(self, job: Job, future: Future) -> None:
+        """Mark a job cancelled if it was dropped from the queue before it ran"""
+        if future.cancelled():
+            job.error = "Cancelled: the job manager shut down before the job started"
+            job.finished_at = time.time()
+            job.status = JOB_CANCELLED
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs (caller must hold the lock)"""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.job_id for j in self._jobs.values() if j.finished][:excess]:
+            del self._jobs[job_id]
@@ -6,7 +6,6 @@ Handles discharge bill validation UI and logic
 import streamlit as st
 import sys
 from pathlib import Path
-import tempfile
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -234,15 +233,6 @@ def render():
         # Show progress
         with st.spinner("Validating discharge documents..."):
             try:
-                # Save PDFs temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_bill:
-                    tmp_bill.write(final_bill_pdf.read())
-                    bill_path = tmp_bill.name
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_discharge:
-                    tmp_discharge.write(discharge_summary_pdf.read())
-                    discharge_path = tmp_discharge.name
-
                 # Initialize service
                 service = DischargeService()
 
@@ -254,8 +244,8 @@ def render():
 
                     result = service.validate_discharge_with_claim_id(
                         claim_id=claim_id,
-                        final_bill_pdf_path=bill_path,
-                        discharge_summary_pdf_path=discharge_path
+                        final_bill_pdf_path=final_bill_pdf,
+                        discharge_summary_pdf_path=discharge_summary_pdf
                     )
                 else:
                     # Manual mode
@@ -274,17 +264,13 @@ def render():
                     result = service.validate_discharge_manual(
                         expected_costs=expected_costs,
                         expected_stay_days=expected_stay,
-                        final_bill_pdf_path=bill_path,
-                        discharge_summary_pdf_path=discharge_path
+                        final_bill_pdf_path=final_bill_pdf,
+                        discharge_summary_pdf_path=discharge_summary_pdf
                     )
 
                 # Store result
                 st.session_state.discharge_validation_result = result
 
-                # Clean up
-                Path(bill_path).unlink()
-                Path(discharge_path).unlink()
-
                 st.success("Validation completed successfully!")
 
             except Exception as e:
@@ -7,7 +7,6 @@ import streamlit as st
 import sys
 from pathlib import Path
 from datetime import datetime
-import tempfile
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -235,17 +234,12 @@ def render():
         # Show progress
         with st.spinner("Processing your documentation..."):
             try:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    tmp_file.write(uploaded_file.read())
-                    tmp_file_path = tmp_file.name
-
                 # Initialize service
                 service = PreAuthService(enable_llm_fallback=False)
 
                 # Run validation - returns (result, medical_note)
                 result, medical_note = service.validate_preauth_from_pdf(
-                    pdf_path=tmp_file_path,
+                    pdf_path=uploaded_file,  # Read in memory, never written to disk
                     insurer=form_data['insurer'],
                     policy_type=form_data['policy_type'],
                     procedure_id=form_data['procedure_id'],
@@ -257,9 +251,6 @@ def render():
                 st.session_state.preauth_form_data = form_data
                 st.session_state.preauth_medical_note = medical_note
 
-                # Clean up
-                Path(tmp_file_path).unlink()
-
                 st.success("Validation completed successfully!")
 
             except Exception as e:
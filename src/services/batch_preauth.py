@@ -0,0 +1,398 @@
+"""
+Batch Pre-Authorization Service
+Validates many pre-authorization PDFs from a manifest and streams results to JSONL
+
+Pipeline per manifest row:
+1. PDF extraction in a process pool (CPU-bound text parsing)
+2. Agent validation with bounded async concurrency (LLM-bound)
+3. Result appended to the output JSONL as soon as it finishes
+
+Usage:
+    python -m src.services.batch_preauth manifest.csv --output results.jsonl
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from src.models.schemas import MedicalNote
+from src.services.pdf_extractor import PDFExtractor
+from src.services.preauth_service import PreAuthService
+from src.utils.data_loader import load_policy_data, load_procedure_data
+from src.utils.logging_config import configure_logging
+
+
+# Manifest columns that identify the request; every other column is form data
+REQUIRED_COLUMNS = ["pdf_path", "insurer", "policy_type", "procedure_id"]
+
+# Form fields that must be numeric (CSV values arrive as strings)
+INTEGER_FORM_FIELDS = ["sum_insured", "previous_claims_total", "patient_age_at_policy_start"]
+
+
+def _extract_medical_note(pdf_path: str, enable_llm_fallback: bool) -> Dict:
+    """
+    Extract a medical note in a worker process
+
+    Module-level so it can be pickled for ProcessPoolExecutor. Returns a plain
+    dict because Pydantic models are rebuilt in the parent process.
+    """
+    extractor = PDFExtractor(enable_llm_fallback=enable_llm_fallback)
+    return extractor.extract_from_pdf(pdf_path).model_dump()
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """
+    Load batch manifest from CSV or JSONL
+
+    Each row needs pdf_path, insurer, policy_type and procedure_id. An optional
+    record_id identifies the row in the output (defaults to pdf_path). All other
+    columns, or a nested "form_data" object in JSONL, become form data
+    (policy_number, policy_start_date, sum_insured, ...). Relative PDF paths are
+    resolved against the manifest's directory.
+
+    A row whose form data can't be used (a non-numeric sum_insured, ...) is kept
+    with an "error" message, so the engine records it as failed without
+    aborting the rest of the batch.
+
+    Args:
+        manifest_path: Path to .csv or .jsonl manifest
+
+    Returns:
+        List of items with record_id, pdf_path, insurer, policy_type, procedure_id,
+        form_data and, for unusable rows, error
+
+    Raises:
+        FileNotFoundError: If manifest doesn't exist
+        ValueError: If a row is missing required columns or record_ids are duplicated
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            rows = [dict(row) for row in csv.DictReader(f)]
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    items = []
+    seen_ids: Set[str] = set()
+
+    for line_number, row in enumerate(rows, 1):
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            raise ValueError(f"Manifest row {line_number} missing required columns: {', '.join(missing)}")
+
+        pdf_path = Path(row["pdf_path"])
+        if not pdf_path.is_absolute():
+            pdf_path = path.parent / pdf_path
+
+        form_data = dict(row.pop("form_data", None) or {})
+        for key, value in row.items():
+            if key not in REQUIRED_COLUMNS and key != "record_id" and value not in (None, ""):
+                form_data[key] = value
+
+        error = None
+        for key in INTEGER_FORM_FIELDS:
+            if isinstance(form_data.get(key), str):
+                try:
+                    form_data[key] = int(float(form_data[key]))
+                except (ValueError, OverflowError) as e:
+                    error = (
+                        f"{type(e).__name__}: Manifest row {line_number}: "
+                        f"{key} is not a usable number: {form_data[key]!r}"
+                    )
+                    break
+
+        record_id = str(row.get("record_id") or row["pdf_path"])
+        if record_id in seen_ids:
+            raise ValueError(f"Duplicate record_id in manifest: {record_id}")
+        seen_ids.add(record_id)
+
+        item = {
+            "record_id": record_id,
+            "pdf_path": str(pdf_path),
+            "insurer": row["insurer"],
+            "policy_type": row["policy_type"],
+            "procedure_id": row["procedure_id"],
+            "form_data": form_data
+        }
+        if error:
+            item["error"] = error
+        items.append(item)
+
+    return items
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """
+    Read record_ids that already completed successfully from an output JSONL
+
+    Used to resume an interrupted batch; failed records are retried.
+
+    Args:
+        output_path: Path to results JSONL
+
+    Returns:
+        Set of completed record_ids
+    """
+    path = Path(output_path)
+    if not path.exists():
+        return set()
+
+    completed = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Partially written last line from an interrupted run
+                continue
+            if record.get("status") == "ok":
+                completed.add(record.get("record_id"))
+
+    return completed
+
+
+class BatchPreAuthEngine:
+    """
+    Batch pre-authorization validation engine
+
+    Extracts PDFs in a process pool, runs agent validation with bounded async
+    concurrency, and appends one JSON line per record to the output file as
+    each record finishes.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        extract_workers: Optional[int] = None,
+        agent_timeout: Optional[float] = None,
+        enable_llm_fallback: bool = False,
+        include_medical_note: bool = False
+    ):
+        """
+        Initialize batch engine
+
+        Args:
+            concurrency: Maximum number of records validated at the same time
+            extract_workers: Processes for PDF extraction (default: CPU count).
+                0 extracts in threads instead of processes.
+            agent_timeout: Per-agent timeout in seconds passed to PreAuthService
+            enable_llm_fallback: Enable LLM fallback for PDF extraction
+            include_medical_note: Include the extracted medical note in each output record
+        """
+        self.concurrency = max(1, concurrency)
+        self.extract_workers = (os.cpu_count() or 1) if extract_workers is None else extract_workers
+        self.enable_llm_fallback = enable_llm_fallback
+        self.include_medical_note = include_medical_note
+
+        self.service = PreAuthService(
+            enable_llm_fallback=enable_llm_fallback,
+            agent_timeout=agent_timeout,
+            max_agent_workers=2 * self.concurrency
+        )
+
+    def run(self, manifest_path: str, output_path: str, resume: bool = True) -> Dict:
+        """
+        Run a batch synchronously
+
+        Args:
+            manifest_path: Path to CSV/JSONL manifest
+            output_path: Path to results JSONL (appended to)
+            resume: Skip records already completed in output_path
+
+        Returns:
+            Throughput summary dict (see run_async)
+        """
+        return asyncio.run(self.run_async(manifest_path, output_path, resume=resume))
+
+    async def run_async(self, manifest_path: str, output_path: str, resume: bool = True) -> Dict:
+        """
+        Run a batch on the current event loop
+
+        Args:
+            manifest_path: Path to CSV/JSONL manifest
+            output_path: Path to results JSONL (appended to)
+            resume: Skip records already completed in output_path
+
+        Returns:
+            Summary dict with total, skipped, succeeded, failed, elapsed_seconds,
+            records_per_minute and latency percentiles
+        """
+        items = load_manifest(manifest_path)
+        completed = load_completed_ids(output_path) if resume else set()
+        pending = [item for item in items if item["record_id"] not in completed]
+
+        started_at = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        write_lock = asyncio.Lock()
+        latencies: List[float] = []
+        counts = {"succeeded": 0, "failed": 0}
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        if self.extract_workers > 0:
+            extract_pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+        else:
+            extract_pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch-extract")
+        validate_pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch-validate")
+
+        try:
+            with open(output_path, "a", encoding="utf-8") as out:
+
+                async def process(item: Dict):
+                    async with semaphore:
+                        record = await self._process_item(item, extract_pool, validate_pool)
+
+                    async with write_lock:
+                        out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                        out.flush()
+                        latencies.append(record["timings"]["total_seconds"])
+                        counts["succeeded" if record["status"] == "ok" else "failed"] += 1
+
+                await asyncio.gather(*(process(item) for item in pending))
+        finally:
+            extract_pool.shutdown(wait=True)
+            validate_pool.shutdown(wait=True)
+
+        elapsed = time.monotonic() - started_at
+        processed = counts["succeeded"] + counts["failed"]
+
+        return {
+            "total": len(items),
+            "skipped": len(items) - len(pending),
+            "succeeded": counts["succeeded"],
+            "failed": counts["failed"],
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_minute": round(processed / elapsed * 60, 2) if elapsed > 0 and processed else 0.0,
+            "latency_p50_seconds": _percentile(latencies, 50),
+            "latency_p95_seconds": _percentile(latencies, 95)
+        }
+
+    async def _process_item(self, item: Dict, extract_pool, validate_pool) -> Dict:
+        """
+        Extract and validate one manifest record
+
+        Returns:
+            Output record; failures are captured as status "error" rather than raised
+        """
+        loop = asyncio.get_running_loop()
+        record = {
+            "record_id": item["record_id"],
+            "pdf_path": item["pdf_path"],
+            "status": "ok",
+            "timings": {}
+        }
+        started_at = time.monotonic()
+
+        if item.get("error"):
+            # Bad manifest row: fail this record only
+            record["status"] = "error"
+            record["error"] = item["error"]
+            record["timings"]["total_seconds"] = 0.0
+            return record
+
+        try:
+            note_dict = await loop.run_in_executor(
+                extract_pool, _extract_medical_note, item["pdf_path"], self.enable_llm_fallback
+            )
+            extracted_at = time.monotonic()
+            record["timings"]["extract_seconds"] = round(extracted_at - started_at, 3)
+
+            medical_note = MedicalNote(**note_dict)
+            result = await loop.run_in_executor(validate_pool, self._validate, item, medical_note)
+            record["timings"]["validate_seconds"] = round(time.monotonic() - extracted_at, 3)
+
+            record["result"] = result.model_dump(mode="json")
+            if self.include_medical_note:
+                record["medical_note"] = note_dict
+
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+
+        record["timings"]["total_seconds"] = round(time.monotonic() - started_at, 3)
+        return record
+
+    def _validate(self, item: Dict, medical_note: MedicalNote):
+        """Run the agent pipeline for one record (called in a worker thread)"""
+        policy_data = load_policy_data(item["insurer"], item["policy_type"])
+        procedure_data = load_procedure_data(item["procedure_id"])
+
+        form_data = {
+            **item["form_data"],
+            "insurer": item["insurer"],
+            "policy_type": item["policy_type"],
+            "procedure_id": item["procedure_id"],
+            "hospital_name": medical_note.hospital_details.name
+        }
+
+        return self.service.validate_preauth(
+            medical_note=medical_note,
+            policy_data=policy_data,
+            procedure_data=procedure_data,
+            form_data=form_data
+        )
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of values (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Validate a batch of pre-authorization PDFs listed in a CSV/JSONL manifest"
+    )
+    parser.add_argument("manifest", help="CSV or JSONL manifest (pdf_path, insurer, policy_type, procedure_id, form fields)")
+    parser.add_argument("-o", "--output", required=True, help="Results JSONL (appended; used for resume)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Records validated concurrently (default: 8)")
+    parser.add_argument("-w", "--extract-workers", type=int, default=None,
+                        help="PDF extraction processes (default: CPU count, 0 = threads)")
+    parser.add_argument("--agent-timeout", type=float, default=None, help="Per-agent timeout in seconds")
+    parser.add_argument("--llm-fallback", action="store_true", help="Enable LLM fallback for PDF extraction")
+    parser.add_argument("--include-medical-note", action="store_true", help="Include extracted medical note in output")
+    parser.add_argument("--no-resume", action="store_true", help="Re-run records already completed in the output file")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    engine = BatchPreAuthEngine(
+        concurrency=args.concurrency,
+        extract_workers=args.extract_workers,
+        agent_timeout=args.agent_timeout,
+        enable_llm_fallback=args.llm_fallback,
+        include_medical_note=args.include_medical_note
+    )
+    summary = engine.run(args.manifest, args.output, resume=not args.no_resume)
+
+    print("=" * 60)
+    print("BATCH PRE-AUTHORIZATION SUMMARY")
+    print("=" * 60)
+    print(f"Records in manifest:  {summary['total']}")
+    print(f"Skipped (resumed):    {summary['skipped']}")
+    print(f"Succeeded:            {summary['succeeded']}")
+    print(f"Failed:               {summary['failed']}")
+    print(f"Elapsed:              {summary['elapsed_seconds']:.1f}s")
+    print(f"Throughput:           {summary['records_per_minute']:.1f} records/min")
+    print(f"Latency p50 / p95:    {summary['latency_p50_seconds']:.2f}s / {summary['latency_p95_seconds']:.2f}s")
+    print("=" * 60)
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+"""
+Pipeline Benchmark
+Drives the tests/test_data/case-*.pdf corpus through PreAuthService and
+DischargeService against the local mock LLM server, without network access
+
+Per pipeline the report has p50/p95 latency of every stage (the telemetry
+spans: PDF extraction, each agent, aggregation) and end to end, throughput,
+LLM calls and tokens, and the peak memory allocated per stage.
+
+Two passes:
+1. Latency: every case, iterations times, with the requested concurrency
+2. Memory: every case once, sequentially, with tracemalloc running (tracing
+   slows Python down, so its timings are not used)
+
+Usage:
+    python -m src.services.benchmark --iterations 5 --concurrency 4 --latency 0.8 --jitter 0.3
+    python -m src.services.benchmark --json bench.json
+"""
+
+import argparse
+import json
+import re
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from src.services.batch_preauth import _percentile
+from src.services.discharge_service import DischargeService
+from src.services.pdf_extractor import PDFExtractor
+from src.services.preauth_service import PreAuthService
+from src.utils import telemetry
+from src.utils.mock_llm_server import MockLLMServer, Recordings, mock_llm_environment
+from src.utils.pdf_text_cache import get_pdf_text_cache
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+TEST_DATA_DIR = PROJECT_ROOT / "tests" / "test_data"
+DEFAULT_RECORDINGS = TEST_DATA_DIR / "llm_recordings.json"
+
+PIPELINES = ("preauth", "discharge")
+
+# Policy and form data for the pre-auth notes in the corpus (see tests/test_data_json/test_case_*.json)
+CASE_FORMS = {
+    "case-1": ("Star Health", "Comprehensive", "appendectomy",
+               {"policy_start_date": "2024-09-01", "sum_insured": 500000}),
+    "case-2": ("Star Health", "Comprehensive", "cataract_surgery",
+               {"policy_start_date": "2021-06-01", "sum_insured": 1000000}),
+    "case-3": ("HDFC ERGO", "Optima Secure", "gallbladder_removal",
+               {"policy_start_date": "2022-01-01", "sum_insured": 1000000}),
+    "case-4": ("Star Health", "Family Health Optima", "total_knee_replacement",
+               {"policy_start_date": "2024-08-01", "sum_insured": 500000}),
+    "case-5": ("Star Health", "Comprehensive", "total_knee_replacement",
+               {"policy_start_date": "2021-01-01", "sum_insured": 1000000}),
+    "case-6": ("Bajaj Allianz", "Health Care", "total_knee_replacement",
+               {"policy_start_date": "2024-11-01", "sum_insured": 500000}),
+}
+
+CASE_PDF_PATTERN = re.compile(r"^(case-\d+)\.pdf$")
+
+
+@dataclass
+class BenchmarkCase:
+    """One corpus case: a pre-auth note, with a final bill and discharge summary if present"""
+    case_id: str
+    note_pdf: Path
+    insurer: str
+    policy_type: str
+    procedure_id: str
+    form_data: Dict
+    final_bill_pdf: Optional[Path] = None
+    discharge_summary_pdf: Optional[Path] = None
+    # Filled in from the pre-auth note before timing starts
+    expected_costs: Dict = field(default_factory=dict)
+    expected_stay_days: int = 1
+
+
+def discover_cases(data_dir: Path = TEST_DATA_DIR) -> List[BenchmarkCase]:
+    """
+    Find the benchmark corpus
+
+    Args:
+        data_dir: Directory with case-N.pdf, case-N_finalbill.pdf and case-N_dischargesummary.pdf
+
+    Returns:
+        Cases with known policy data, ordered by case number
+    """
+    cases = []
+    for pdf in sorted(Path(data_dir).glob("case-*.pdf"), key=lambda p: p.name):
+        match = CASE_PDF_PATTERN.match(pdf.name)
+        if not match or match.group(1) not in CASE_FORMS:
+            continue
+        case_id = match.group(1)
+        insurer, policy_type, procedure_id, form = CASE_FORMS[case_id]
+        bill = pdf.with_name(f"{case_id}_finalbill.pdf")
+        summary = pdf.with_name(f"{case_id}_dischargesummary.pdf")
+
+        cases.append(BenchmarkCase(
+            case_id=case_id,
+            note_pdf=pdf,
+            insurer=insurer,
+            policy_type=policy_type,
+            procedure_id=procedure_id,
+            form_data={
+                "policy_number": f"BENCH-{case_id.upper()}",
+                "previous_claims_total": 0,
+                "planned_admission_date": "2025-10-10",
+                **form
+            },
+            final_bill_pdf=bill if bill.exists() else None,
+            discharge_summary_pdf=summary if summary.exists() else None
+        ))
+    return sorted(cases, key=lambda c: int(c.case_id.split("-")[1]))
+
+
+def summarize(values: List[float]) -> Dict:
+    """Count, mean, p50, p95 and max of a list of values"""
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 6),
+        "p50": round(_percentile(values, 50), 6),
+        "p95": round(_percentile(values, 95), 6),
+        "max": round(max(values), 6)
+    }
+
+
+class PipelineBenchmark:
+    """
+    Runs the corpus through both pipelines and aggregates telemetry
+
+    Must be used inside mock_llm_environment (see run_benchmark), because the
+    services create their LLM clients on construction.
+    """
+
+    def __init__(self, cases: List[BenchmarkCase], concurrency: int = 1):
+        """
+        Args:
+            cases: Corpus to run
+            concurrency: Validations in flight at the same time during the latency pass
+        """
+        self.cases = cases
+        self.concurrency = max(1, concurrency)
+        self.preauth_service = PreAuthService(max_agent_workers=2 * self.concurrency)
+        self.discharge_service = DischargeService(max_workers=2 * self.concurrency)
+
+    def prepare(self) -> None:
+        """Derive each case's expected costs and stay from its pre-auth note (untimed)"""
+        extractor = PDFExtractor()
+        for case in self.cases:
+            note = extractor.extract_from_pdf(str(case.note_pdf))
+            case.expected_costs = note.cost_breakdown.model_dump()
+            case.expected_stay_days = note.hospitalization_details.expected_length_of_stay
+
+    def cases_for(self, pipeline: str) -> List[BenchmarkCase]:
+        if pipeline == "discharge":
+            return [c for c in self.cases if c.final_bill_pdf and c.discharge_summary_pdf]
+        return list(self.cases)
+
+    def run_case(self, pipeline: str, case: BenchmarkCase, preauth_service=None, discharge_service=None) -> Dict:
+        """
+        Validate one case inside a telemetry trace
+
+        Returns:
+            Trace summary dict (status "error" and an "error" field if the validation raised)
+        """
+        preauth_service = preauth_service or self.preauth_service
+        discharge_service = discharge_service or self.discharge_service
+
+        error = None
+        with telemetry.trace(pipeline, case=case.case_id) as case_trace:
+            try:
+                if pipeline == "preauth":
+                    preauth_service.validate_preauth_from_pdf(
+                        pdf_path=str(case.note_pdf),
+                        insurer=case.insurer,
+                        policy_type=case.policy_type,
+                        procedure_id=case.procedure_id,
+                        form_data=case.form_data
+                    )
+                else:
+                    discharge_service.validate_discharge_manual(
+                        expected_costs=case.expected_costs,
+                        expected_stay_days=case.expected_stay_days,
+                        final_bill_pdf_path=str(case.final_bill_pdf),
+                        discharge_summary_pdf_path=str(case.discharge_summary_pdf)
+                    )
+            except Exception as e:
+                case_trace.status = "error"
+                error = f"{type(e).__name__}: {e}"
+
+        summary = case_trace.summary()
+        if error:
+            summary["error"] = error
+        return summary
+
+    def latency_pass(self, pipeline: str, iterations: int) -> Dict:
+        """
+        Time every case iterations times
+
+        Returns:
+            Dict with runs, errors, wall time, throughput, per-stage and end-to-end
+            latency summaries and LLM usage totals
+        """
+        jobs = [case for _ in range(iterations) for case in self.cases_for(pipeline)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bench") as executor:
+            traces = list(executor.map(lambda case: self.run_case(pipeline, case), jobs))
+        wall = time.perf_counter() - started
+
+        stages: Dict[str, List[float]] = {}
+        for case_trace in traces:
+            for span_record in case_trace["spans"]:
+                stages.setdefault(span_record["name"], []).append(span_record["duration_seconds"])
+
+        errors = [t["error"] for t in traces if t.get("error")]
+        return {
+            "runs": len(traces),
+            "errors": len(errors),
+            "error_samples": errors[:3],
+            "wall_seconds": round(wall, 3),
+            "throughput_per_minute": round(len(traces) / wall * 60, 2) if wall > 0 else 0.0,
+            "latency_seconds": {
+                "end_to_end": summarize([t["duration_seconds"] for t in traces]),
+                "stages": {name: summarize(values) for name, values in sorted(stages.items())}
+            },
+            "llm": {
+                "requests": sum(t["llm_requests"] for t in traces),
+                "coalesced": sum(t["llm_coalesced"] for t in traces),
+                "input_tokens": sum(t["input_tokens"] for t in traces),
+                "output_tokens": sum(t["output_tokens"] for t in traces),
+                "estimated_cost_usd": round(sum(t["cost_usd"] for t in traces), 6)
+            }
+        }
+
+    def memory_pass(self, pipeline: str) -> Dict:
+        """
+        Peak memory allocated per stage, from one sequential run of every case
+
+        Returns:
+            Dict of stage name to the largest peak (bytes) over all cases
+        """
+        preauth_service = PreAuthService(concurrent_agents=False)
+        discharge_service = DischargeService(concurrent=False)
+        peaks: Dict[str, int] = {}
+
+        tracemalloc.start()
+        try:
+            for case in self.cases_for(pipeline):
+                case_trace = self.run_case(pipeline, case, preauth_service, discharge_service)
+                for span_record in case_trace["spans"]:
+                    name = span_record["name"]
+                    peaks[name] = max(peaks.get(name, 0), span_record.get("memory_peak_bytes", 0))
+        finally:
+            tracemalloc.stop()
+            preauth_service.shutdown()
+            discharge_service.shutdown()
+
+        return dict(sorted(peaks.items()))
+
+    def shutdown(self) -> None:
+        self.preauth_service.shutdown()
+        self.discharge_service.shutdown()
+
+
+@contextmanager
+def _pdf_text_cache_disabled(disabled: bool) -> Iterator[None]:
+    """Temporarily bypass the PDF text cache so every run extracts afresh"""
+    cache = get_pdf_text_cache()
+    previous = cache.enabled
+    if disabled:
+        cache.enabled = False
+    try:
+        yield
+    finally:
+        cache.enabled = previous
+
+
+def run_benchmark(
+    data_dir: Path = TEST_DATA_DIR,
+    pipelines: tuple = PIPELINES,
+    iterations: int = 3,
+    concurrency: int = 1,
+    recordings_path: Path = DEFAULT_RECORDINGS,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: Optional[int] = 0,
+    measure_memory: bool = True,
+    pdf_cache: bool = False
+) -> Dict:
+    """
+    Benchmark the pipelines offline
+
+    Args:
+        data_dir: Corpus directory (see discover_cases)
+        pipelines: "preauth" and/or "discharge"
+        iterations: Runs of every case in the latency pass
+        concurrency: Validations in flight at the same time
+        recordings_path: Mock LLM recordings file
+        latency: Mean synthetic LLM latency in seconds
+        jitter: Uniform LLM latency variation in seconds
+        error_rate: Fraction of LLM requests failed with HTTP 529 (retried by the client)
+        seed: Random seed for latency and error injection
+        measure_memory: Run the tracemalloc memory pass
+        pdf_cache: Keep the PDF text cache on (default: off, so extraction is measured)
+
+    Returns:
+        Report dict with config, per-pipeline results and mock LLM server stats
+    """
+    cases = discover_cases(data_dir)
+    if not cases:
+        raise ValueError(f"No benchmark cases found in {data_dir}")
+
+    report = {
+        "config": {
+            "cases": [c.case_id for c in cases],
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "llm_latency": latency,
+            "llm_jitter": jitter,
+            "llm_error_rate": error_rate,
+            "pdf_cache": pdf_cache
+        },
+        "pipelines": {}
+    }
+
+    server = MockLLMServer(
+        recordings=Recordings.load(recordings_path),
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        seed=seed
+    )
+    with server, mock_llm_environment(server), _pdf_text_cache_disabled(not pdf_cache):
+        bench = PipelineBenchmark(cases, concurrency=concurrency)
+        try:
+            bench.prepare()
+            for pipeline in pipelines:
+                result = bench.latency_pass(pipeline, iterations)
+                if measure_memory:
+                    result["memory_peak_bytes"] = bench.memory_pass(pipeline)
+                report["pipelines"][pipeline] = result
+        finally:
+            bench.shutdown()
+        report["mock_llm"] = server.stats()
+
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Render a benchmark report as a text table"""
+    lines = []
+    config = report["config"]
+    lines.append("=" * 78)
+    lines.append(
+        f"PIPELINE BENCHMARK  cases={len(config['cases'])} iterations={config['iterations']} "
+        f"concurrency={config['concurrency']} llm_latency={config['llm_latency']}s"
+    )
+    lines.append("=" * 78)
+
+    for pipeline, result in report["pipelines"].items():
+        lines.append(
+            f"\n[{pipeline.upper()}] runs={result['runs']} errors={result['errors']} "
+            f"throughput={result['throughput_per_minute']:.1f}/min wall={result['wall_seconds']:.2f}s"
+        )
+        lines.append(f"  {'stage':<34} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'peak MB':>9}")
+        latency = result["latency_seconds"]
+        memory = result.get("memory_peak_bytes", {})
+        rows = list(latency["stages"].items()) + [("end_to_end", latency["end_to_end"])]
+        for name, stats in rows:
+            peak = f"{memory[name] / (1024 * 1024):9.2f}" if name in memory else f"{'-':>9}"
+            lines.append(
+                f"  {name:<34} {stats['p50'] * 1000:9.1f} {stats['p95'] * 1000:9.1f} {stats['max'] * 1000:9.1f} {peak}"
+            )
+        llm = result["llm"]
+        lines.append(
+            f"  LLM: {llm['requests']} calls ({llm['coalesced']} coalesced), "
+            f"{llm['input_tokens']} input / {llm['output_tokens']} output tokens"
+        )
+        for sample in result["error_samples"]:
+            lines.append(f"  error: {sample}")
+
+    lines.append(f"\nMock LLM server: {report['mock_llm']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Offline benchmark of the pre-auth and discharge pipelines")
+    parser.add_argument("--pipeline", choices=PIPELINES, action="append",
+                        help="Pipeline to run (repeatable; default: both)")
+    parser.add_argument("-n", "--iterations", type=int, default=3, help="Runs of every case (default: 3)")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="Validations in flight (default: 1)")
+    parser.add_argument("--data-dir", default=str(TEST_DATA_DIR), help="Corpus directory")
+    parser.add_argument("--recordings", default=str(DEFAULT_RECORDINGS), help="Mock LLM recordings file")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean synthetic LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="LLM latency variation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of LLM requests failed with 529")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc memory pass")
+    parser.add_argument("--pdf-cache", action="store_true", help="Keep the PDF text cache enabled")
+    parser.add_argument("--json", help="Also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        data_dir=Path(args.data_dir),
+        pipelines=tuple(args.pipeline or PIPELINES),
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        recordings_path=Path(args.recordings),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        measure_memory=not args.no_memory,
+        pdf_cache=args.pdf_cache
+    )
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = sum(result["errors"] for result in report["pipelines"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
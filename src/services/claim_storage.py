@@ -1,16 +1,355 @@
 """
 Claim Storage Service
 Saves pre-authorization validation results for later discharge validation
+
+Claims are kept in a pluggable backend:
+
+- JSONFileClaimBackend: one pretty-printed JSON file per claim (default, human-readable)
+- SQLiteClaimBackend: a single SQLite database in WAL mode with indexes on
+  claim_id, timestamp, policy_number and procedure_id, for paginated and
+  filtered lookups over large numbers of claims
+
+Existing JSON claims can be imported into SQLite with:
+
+    python -m src.services.claim_storage migrate --db data/claims.db
 """
 
+import argparse
 import json
 import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import random
 
 
+CLAIM_STORAGE_BACKENDS = ("json", "sqlite")
+
+# Filters accepted by list_claims / count_claims, mapped to the claim record field
+CLAIM_FILTERS = {
+    "policy_number": ("policy_info", "policy_number"),
+    "procedure_id": ("procedure_info", "procedure_id"),
+    "insurer": ("policy_info", "insurer"),
+    "readiness_status": ("readiness_status",),
+}
+
+
+def _project_root() -> Path:
+    return Path(__file__).parent.parent.parent
+
+
+def _record_field(record: Dict, path: tuple):
+    """Read a nested field from a claim record (None if any level is missing)"""
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _check_filters(filters: Dict) -> Dict:
+    """Drop unset filters and reject unknown ones"""
+    unknown = set(filters) - set(CLAIM_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown claim filter(s): {', '.join(sorted(unknown))}. Use {', '.join(CLAIM_FILTERS)}")
+    return {name: value for name, value in filters.items() if value is not None}
+
+
+class ClaimStorageBackend(ABC):
+    """
+    Storage backend for claim records
+
+    Records are the dicts built by ClaimStorageService.save_claim and always
+    carry "claim_id" and "timestamp" (ISO format, so it sorts chronologically).
+    """
+
+    @abstractmethod
+    def add(self, record: Dict) -> bool:
+        """
+        Store a new claim record
+
+        Returns:
+            True if stored, False if a claim with the same claim_id already exists
+        """
+
+    @abstractmethod
+    def get(self, claim_id: str) -> Optional[Dict]:
+        """Load a claim record by ID (None if not found)"""
+
+    @abstractmethod
+    def exists(self, claim_id: str) -> bool:
+        """Check whether a claim ID is taken"""
+
+    @abstractmethod
+    def list_claims(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        **filters
+    ) -> List[Dict]:
+        """List claim records, most recent first (see ClaimStorageService.list_claims)"""
+
+    @abstractmethod
+    def count_claims(self, date_from: Optional[str] = None, date_to: Optional[str] = None, **filters) -> int:
+        """Count claim records matching the filters"""
+
+    @abstractmethod
+    def list_claim_ids(self) -> List[str]:
+        """All claim IDs, most recent first"""
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class JSONFileClaimBackend(ClaimStorageBackend):
+    """
+    One JSON file per claim: storage_dir/<claim_id>.json
+
+    Listing and filtering read every file, so this backend suits small
+    deployments; use SQLiteClaimBackend for large claim volumes.
+    """
+
+    def __init__(self, storage_dir: str):
+        """
+        Initialize JSON file backend
+
+        Args:
+            storage_dir: Directory to store claim JSON files
+        """
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+
+    def add(self, record: Dict) -> bool:
+        file_path = self.storage_dir / f"{record['claim_id']}.json"
+        try:
+            # Exclusive create, so two writers can never overwrite the same claim
+            with open(file_path, 'x', encoding='utf-8') as f:
+                json.dump(record, f, indent=2, ensure_ascii=False)
+        except FileExistsError:
+            return False
+        return True
+
+    def get(self, claim_id: str) -> Optional[Dict]:
+        file_path = self.storage_dir / f"{claim_id}.json"
+
+        if not file_path.exists():
+            return None
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def exists(self, claim_id: str) -> bool:
+        return (self.storage_dir / f"{claim_id}.json").exists()
+
+    def list_claims(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        **filters
+    ) -> List[Dict]:
+        records = self._matching(date_from, date_to, _check_filters(filters))
+        records.sort(key=lambda r: (r.get("timestamp") or "", r["claim_id"]), reverse=True)
+        end = offset + limit if limit is not None else None
+        return records[offset:end]
+
+    def count_claims(self, date_from: Optional[str] = None, date_to: Optional[str] = None, **filters) -> int:
+        return len(self._matching(date_from, date_to, _check_filters(filters)))
+
+    def list_claim_ids(self) -> List[str]:
+        claim_files = self.storage_dir.glob("CR-*.json")
+        claim_ids = [f.stem for f in claim_files]
+        return sorted(claim_ids, reverse=True)  # Most recent first
+
+    def iter_records(self):
+        """Yield (path, record) for every claim file; unreadable files yield (path, None)"""
+        for file_path in sorted(self.storage_dir.glob("CR-*.json")):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                record = None
+            yield file_path, record
+
+    def _matching(self, date_from: Optional[str], date_to: Optional[str], filters: Dict) -> List[Dict]:
+        records = []
+        for _, record in self.iter_records():
+            if not isinstance(record, dict) or "claim_id" not in record:
+                continue
+            timestamp = record.get("timestamp") or ""
+            if date_from is not None and timestamp < date_from:
+                continue
+            if date_to is not None and timestamp >= date_to:
+                continue
+            if all(_record_field(record, CLAIM_FILTERS[name]) == value for name, value in filters.items()):
+                records.append(record)
+        return records
+
+
+class SQLiteClaimBackend(ClaimStorageBackend):
+    """
+    SQLite claim store
+
+    The full record is kept as JSON alongside indexed columns used for lookups.
+    The database runs in WAL mode so readers (e.g. the Streamlit app) are not
+    blocked by a writer in another process. One connection is shared by all
+    threads of the process and serialized with a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS claims (
+            claim_id TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            policy_number TEXT,
+            procedure_id TEXT,
+            insurer TEXT,
+            readiness_status TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_claims_timestamp ON claims (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_claims_policy_number ON claims (policy_number, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_claims_procedure_id ON claims (procedure_id, timestamp);
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        """
+        Initialize SQLite backend
+
+        Args:
+            db_path: Database file (created with its parent directory if missing)
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def add(self, record: Dict) -> bool:
+        return self.add_many([record]) == 1
+
+    def add_many(self, records: List[Dict]) -> int:
+        """
+        Store several claim records in one transaction
+
+        Returns:
+            Number of records stored (records whose claim_id exists are skipped)
+        """
+        rows = [
+            (
+                record["claim_id"],
+                record.get("timestamp") or "",
+                _record_field(record, CLAIM_FILTERS["policy_number"]),
+                _record_field(record, CLAIM_FILTERS["procedure_id"]),
+                _record_field(record, CLAIM_FILTERS["insurer"]),
+                _record_field(record, CLAIM_FILTERS["readiness_status"]),
+                json.dumps(record, ensure_ascii=False),
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO claims "
+                "(claim_id, timestamp, policy_number, procedure_id, insurer, readiness_status, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def get(self, claim_id: str) -> Optional[Dict]:
+        row = self._fetchone("SELECT record FROM claims WHERE claim_id = ?", (claim_id,))
+        return json.loads(row[0]) if row else None
+
+    def exists(self, claim_id: str) -> bool:
+        return self._fetchone("SELECT 1 FROM claims WHERE claim_id = ?", (claim_id,)) is not None
+
+    def list_claims(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        **filters
+    ) -> List[Dict]:
+        where, params = self._where(date_from, date_to, _check_filters(filters))
+        # LIMIT -1 means no limit in SQLite
+        query = f"SELECT record FROM claims{where} ORDER BY timestamp DESC, claim_id DESC LIMIT ? OFFSET ?"
+        rows = self._fetchall(query, params + [limit if limit is not None else -1, offset])
+        return [json.loads(row[0]) for row in rows]
+
+    def count_claims(self, date_from: Optional[str] = None, date_to: Optional[str] = None, **filters) -> int:
+        where, params = self._where(date_from, date_to, _check_filters(filters))
+        return self._fetchone(f"SELECT COUNT(*) FROM claims{where}", params)[0]
+
+    def list_claim_ids(self) -> List[str]:
+        return [row[0] for row in self._fetchall("SELECT claim_id FROM claims ORDER BY claim_id DESC", [])]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _where(date_from: Optional[str], date_to: Optional[str], filters: Dict) -> tuple:
+        """Build the WHERE clause; column names come from CLAIM_FILTERS, values are bound"""
+        clauses = [f"{name} = ?" for name in filters]
+        params = list(filters.values())
+        if date_from is not None:
+            clauses.append("timestamp >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("timestamp < ?")
+            params.append(date_to)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _fetchone(self, query: str, params) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def _fetchall(self, query: str, params) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+
+def create_claim_backend(backend: Optional[str] = None) -> ClaimStorageBackend:
+    """
+    Create the configured claim storage backend
+    Configured from environment variables:
+
+    - CLAIM_STORAGE_BACKEND: "json" or "sqlite" (default: json)
+    - CLAIM_STORAGE_DIR: JSON backend directory (default: data/stored_claims)
+    - CLAIM_STORAGE_DB: SQLite database file (default: data/claims.db)
+
+    Args:
+        backend: Backend name, overriding CLAIM_STORAGE_BACKEND
+
+    Returns:
+        ClaimStorageBackend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = (backend or os.getenv("CLAIM_STORAGE_BACKEND", "json")).strip().lower()
+
+    if name == "json":
+        return JSONFileClaimBackend(os.getenv("CLAIM_STORAGE_DIR", str(_project_root() / "data" / "stored_claims")))
+    if name == "sqlite":
+        return SQLiteClaimBackend(os.getenv("CLAIM_STORAGE_DB", str(_project_root() / "data" / "claims.db")))
+
+    raise ValueError(f"Unknown claim storage backend: {name}. Use one of {', '.join(CLAIM_STORAGE_BACKENDS)}")
+
+
 class ClaimStorageService:
     """
     Service to save and retrieve pre-authorization claims
@@ -19,20 +358,19 @@ class ClaimStorageService:
     to compare actual costs against pre-auth estimates
     """
 
-    def __init__(self, storage_dir: str = None):
+    def __init__(self, storage_dir: str = None, backend: Optional[ClaimStorageBackend] = None):
         """
         Initialize claim storage service
 
         Args:
-            storage_dir: Directory to store claim JSON files
+            storage_dir: Directory to store claim JSON files (uses the JSON backend)
+            backend: Storage backend; if neither is given, the backend is chosen
+                from the environment (see create_claim_backend)
         """
-        if storage_dir is None:
-            # Default to data/stored_claims/ in project root
-            project_root = Path(__file__).parent.parent.parent
-            storage_dir = project_root / "data" / "stored_claims"
+        if backend is None:
+            backend = JSONFileClaimBackend(storage_dir) if storage_dir is not None else create_claim_backend()
 
-        self.storage_dir = Path(storage_dir)
-        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
 
     def generate_claim_id(self) -> str:
         """
@@ -51,8 +389,8 @@ class ClaimStorageService:
         random_num = random.randint(10000, 99999)
         claim_id = f"CR-{date_str}-{random_num}"
 
-        # Ensure uniqueness - regenerate if file exists
-        while (self.storage_dir / f"{claim_id}.json").exists():
+        # Ensure uniqueness - regenerate if the ID is taken
+        while self.backend.exists(claim_id):
             random_num = random.randint(10000, 99999)
             claim_id = f"CR-{date_str}-{random_num}"
 
@@ -161,10 +499,10 @@ class ClaimStorageService:
             },
         }
 
-        # Save to JSON file
-        file_path = self.storage_dir / f"{claim_id}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(claim_record, f, indent=2, ensure_ascii=False)
+        # Another writer may have taken the ID since it was generated; pick a new one
+        while not self.backend.add(claim_record):
+            claim_id = self.generate_claim_id()
+            claim_record["claim_id"] = claim_id
 
         return claim_id
 
@@ -181,13 +519,7 @@ class ClaimStorageService:
         Example:
             claim = storage.load_claim("CR-20251005-12345")
         """
-        file_path = self.storage_dir / f"{claim_id}.json"
-
-        if not file_path.exists():
-            return None
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self.backend.get(claim_id)
 
     def list_all_claims(self) -> list:
         """
@@ -200,6 +532,138 @@ class ClaimStorageService:
             claims = storage.list_all_claims()
             # Returns: ["CR-20251005-12345", "CR-20251006-67890"]
         """
-        claim_files = self.storage_dir.glob("CR-*.json")
-        claim_ids = [f.stem for f in claim_files]
-        return sorted(claim_ids, reverse=True)  # Most recent first
+        return self.backend.list_claim_ids()
+
+    def list_claims(
+        self,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        policy_number: Optional[str] = None,
+        procedure_id: Optional[str] = None,
+        insurer: Optional[str] = None,
+        readiness_status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        List saved claim records, most recent first
+
+        Args:
+            limit: Page size (None for all matching claims)
+            offset: Number of matching claims to skip
+            policy_number: Only claims for this policy number
+            procedure_id: Only claims for this procedure
+            insurer: Only claims for this insurer
+            readiness_status: Only claims with this status
+            date_from: Only claims saved at or after this ISO date/time
+            date_to: Only claims saved before this ISO date/time
+
+        Returns:
+            List of claim record dicts
+
+        Example:
+            page = storage.list_claims(limit=20, offset=40, procedure_id="cataract_surgery")
+        """
+        return self.backend.list_claims(
+            limit=limit,
+            offset=offset,
+            date_from=date_from,
+            date_to=date_to,
+            policy_number=policy_number,
+            procedure_id=procedure_id,
+            insurer=insurer,
+            readiness_status=readiness_status
+        )
+
+    def count_claims(
+        self,
+        policy_number: Optional[str] = None,
+        procedure_id: Optional[str] = None,
+        insurer: Optional[str] = None,
+        readiness_status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> int:
+        """
+        Count saved claims matching the same filters as list_claims
+
+        Returns:
+            Number of matching claims (for pagination)
+        """
+        return self.backend.count_claims(
+            date_from=date_from,
+            date_to=date_to,
+            policy_number=policy_number,
+            procedure_id=procedure_id,
+            insurer=insurer,
+            readiness_status=readiness_status
+        )
+
+
+def migrate_json_claims(source_dir: str, target: SQLiteClaimBackend, batch_size: int = 500) -> Dict:
+    """
+    Import JSON claim files into an SQLite backend
+
+    Safe to re-run: claims already in the database are skipped.
+
+    Args:
+        source_dir: Directory of CR-*.json claim files
+        target: Destination backend
+        batch_size: Records inserted per transaction
+
+    Returns:
+        Dict with imported, skipped (already present) and failed (unreadable file names) counts/list
+    """
+    imported = 0
+    skipped = 0
+    failed = []
+    batch = []
+
+    def flush():
+        nonlocal imported, skipped
+        stored = target.add_many(batch)
+        imported += stored
+        skipped += len(batch) - stored
+        batch.clear()
+
+    for file_path, record in JSONFileClaimBackend(source_dir).iter_records():
+        if not isinstance(record, dict) or not record.get("claim_id"):
+            failed.append(file_path.name)
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return {"imported": imported, "skipped": skipped, "failed": failed}
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command-line entry point: python -m src.services.claim_storage migrate"""
+    parser = argparse.ArgumentParser(description="Claim storage maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Import JSON claim files into SQLite")
+    migrate.add_argument("--source", default=str(_project_root() / "data" / "stored_claims"),
+                         help="Directory of CR-*.json claim files")
+    migrate.add_argument("--db", default=os.getenv("CLAIM_STORAGE_DB", str(_project_root() / "data" / "claims.db")),
+                         help="SQLite database file")
+    args = parser.parse_args(argv)
+
+    target = SQLiteClaimBackend(args.db)
+    try:
+        summary = migrate_json_claims(args.source, target)
+        total = target.count_claims()
+    finally:
+        target.close()
+
+    print(f"Imported {summary['imported']} claims, skipped {summary['skipped']} already present, "
+          f"{len(summary['failed'])} unreadable; {total} claims in {args.db}")
+    for name in summary["failed"]:
+        print(f"  unreadable: {name}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
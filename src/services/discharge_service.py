@@ -10,20 +10,28 @@ Components:
 - Aggregator
 """
 
+import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.utils.discharge_pdf_extractor import extract_final_bill, extract_discharge_summary
+from src.utils.pdf_document import PDFSource
 from src.agents.bill_reconciliation import BillReconciliationAgent
 from src.agents.cost_escalation_analyzer import CostEscalationAnalyzer
 from src.agents.medical_guidance_generator import MedicalGuidanceGenerator
 from src.services.discharge_aggregator import DischargeAggregator
 from src.services.claim_storage import ClaimStorageService
+from src.utils import telemetry
+
+
+logger = logging.getLogger(__name__)
 
 
 class DischargeService:
@@ -36,29 +44,53 @@ class DischargeService:
     3. Run 3 agents
     4. Aggregate results
     5. Return complete validation result
+
+    The two PDF extractions are independent and each may block on an LLM
+    call, as are Agents 6 and 8 once Bill Reconciliation has run. By default
+    each pair runs concurrently on a small thread pool, so a validation waits
+    for two rounds of LLM calls instead of four.
     """
 
-    def __init__(self, anthropic_api_key: Optional[str] = None):
-        """Initialize service with all agents"""
+    def __init__(
+        self,
+        anthropic_api_key: Optional[str] = None,
+        concurrent: bool = True,
+        max_workers: int = 4
+    ):
+        """Initialize service with all agents
+
+        Args:
+            anthropic_api_key: Optional API key for the LLM agents
+            concurrent: Run the PDF extractions, then Agents 6 and 8, concurrently (default: True).
+                Set to False to run every step strictly in sequence.
+            max_workers: Size of the thread pool. Each validation uses two workers,
+                so raise this when one service is shared by many concurrent validations.
+        """
         self.bill_recon_agent = BillReconciliationAgent()
         self.cost_esc_agent = CostEscalationAnalyzer(anthropic_api_key)
         self.med_guide_agent = MedicalGuidanceGenerator(anthropic_api_key)
         self.aggregator = DischargeAggregator()
         self.claim_storage = ClaimStorageService()
 
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
     def validate_discharge_with_claim_id(
         self,
         claim_id: str,
-        final_bill_pdf_path: str,
-        discharge_summary_pdf_path: str
+        final_bill_pdf_path: PDFSource,
+        discharge_summary_pdf_path: PDFSource
     ) -> Dict:
         """
         Validate discharge using saved claim ID
 
         Args:
             claim_id: Claim reference ID from pre-auth (e.g., "CR-20251005-12345")
-            final_bill_pdf_path: Path to final hospital bill PDF
-            discharge_summary_pdf_path: Path to discharge summary PDF
+            final_bill_pdf_path: Path to final hospital bill PDF, or its content
+                (bytes, BytesIO, memoryview or an uploaded file)
+            discharge_summary_pdf_path: Path to discharge summary PDF, or its content
 
         Returns:
             DischargeValidationResult as dict
@@ -75,8 +107,7 @@ class DischargeService:
         expected_stay_days = claim_data.get('procedure_info', {}).get('expected_stay_days', 1)
 
         # Extract PDFs
-        final_bill = extract_final_bill(final_bill_pdf_path, use_llm_fallback=True)
-        discharge_summary = extract_discharge_summary(discharge_summary_pdf_path, use_llm=True)
+        final_bill, discharge_summary = self._extract_documents(final_bill_pdf_path, discharge_summary_pdf_path)
 
         # Run validation
         return self._run_validation(
@@ -90,8 +121,8 @@ class DischargeService:
         self,
         expected_costs: Dict,
         expected_stay_days: int,
-        final_bill_pdf_path: str,
-        discharge_summary_pdf_path: str
+        final_bill_pdf_path: PDFSource,
+        discharge_summary_pdf_path: PDFSource
     ) -> Dict:
         """
         Validate discharge with manual pre-auth input
@@ -105,16 +136,16 @@ class DischargeService:
                     "total_estimated_cost": 52000
                 }
             expected_stay_days: Expected hospital stay
-            final_bill_pdf_path: Path to final bill PDF
-            discharge_summary_pdf_path: Path to discharge summary PDF
+            final_bill_pdf_path: Path to final bill PDF, or its content
+                (bytes, BytesIO, memoryview or an uploaded file)
+            discharge_summary_pdf_path: Path to discharge summary PDF, or its content
 
         Returns:
             DischargeValidationResult as dict
         """
 
         # Extract PDFs
-        final_bill = extract_final_bill(final_bill_pdf_path, use_llm_fallback=True)
-        discharge_summary = extract_discharge_summary(discharge_summary_pdf_path, use_llm=True)
+        final_bill, discharge_summary = self._extract_documents(final_bill_pdf_path, discharge_summary_pdf_path)
 
         # Run validation
         return self._run_validation(
@@ -141,38 +172,36 @@ class DischargeService:
         actual_stay_days = discharge_summary.get('days_stayed', final_bill.get('total_days', 0))
 
         # Agent 5: Bill Reconciliation
-        print("Running Agent 5: Bill Reconciliation...")
-        bill_recon_result = self.bill_recon_agent.reconcile(
-            expected_costs=expected_costs,
-            actual_bill=final_bill,
-            expected_stay_days=expected_stay_days,
-            actual_stay_days=actual_stay_days
-        )
-
-        # Agent 6: Cost Escalation Analyzer
-        print("Running Agent 6: Cost Escalation Analyzer...")
-        cost_esc_result = self.cost_esc_agent.analyze(
-            line_item_variances=bill_recon_result['line_item_comparison'],
-            discharge_summary=discharge_summary,
-            stay_variance=bill_recon_result['stay_variance']
-        )
-
-        # Agent 8: Medical Guidance Generator
-        print("Running Agent 8: Medical Guidance Generator...")
-        med_guide_result = self.med_guide_agent.generate(
-            discharge_summary=discharge_summary,
-            procedure_type="general"
-        )
+        logger.debug("Running Agent 5: Bill Reconciliation")
+        with telemetry.span("agent.bill_reconciliation"):
+            bill_recon_result = self.bill_recon_agent.reconcile(
+                expected_costs=expected_costs,
+                actual_bill=final_bill,
+                expected_stay_days=expected_stay_days,
+                actual_stay_days=actual_stay_days
+            )
+
+        # Agents 6 and 8 only read the reconciliation result and discharge summary
+        if self.concurrent:
+            executor = self._get_executor()
+            cost_esc_future = executor.submit(telemetry.wrap(self._run_cost_escalation), bill_recon_result, discharge_summary)
+            med_guide_future = executor.submit(telemetry.wrap(self._run_medical_guidance), discharge_summary)
+            cost_esc_result = cost_esc_future.result()
+            med_guide_result = med_guide_future.result()
+        else:
+            cost_esc_result = self._run_cost_escalation(bill_recon_result, discharge_summary)
+            med_guide_result = self._run_medical_guidance(discharge_summary)
 
         # Aggregate results
-        print("Aggregating results...")
-        aggregated_result = self.aggregator.aggregate(
-            bill_reconciliation_result=bill_recon_result,
-            cost_escalation_result=cost_esc_result,
-            medical_guidance_result=med_guide_result,
-            has_discharge_summary=True,
-            has_final_bill=True
-        )
+        logger.debug("Aggregating results")
+        with telemetry.span("aggregation"):
+            aggregated_result = self.aggregator.aggregate(
+                bill_reconciliation_result=bill_recon_result,
+                cost_escalation_result=cost_esc_result,
+                medical_guidance_result=med_guide_result,
+                has_discharge_summary=True,
+                has_final_bill=True
+            )
 
         # Convert to dict for easy serialization
         return {
@@ -194,6 +223,71 @@ class DischargeService:
             "final_bill": final_bill
         }
 
+    def _extract_documents(
+        self,
+        final_bill_pdf_path: PDFSource,
+        discharge_summary_pdf_path: PDFSource
+    ) -> Tuple[Dict, Dict]:
+        """
+        Extract the final bill and discharge summary
+
+        Returns:
+            Tuple of (final_bill, discharge_summary)
+        """
+        if not self.concurrent:
+            return self._extract_final_bill(final_bill_pdf_path), self._extract_discharge_summary(discharge_summary_pdf_path)
+
+        executor = self._get_executor()
+        bill_future = executor.submit(telemetry.wrap(self._extract_final_bill), final_bill_pdf_path)
+        summary_future = executor.submit(telemetry.wrap(self._extract_discharge_summary), discharge_summary_pdf_path)
+        return bill_future.result(), summary_future.result()
+
+    def _extract_final_bill(self, pdf_path: PDFSource) -> Dict:
+        """Extract the final bill (rule-based with LLM fallback)"""
+        with telemetry.span("pdf_extraction.final_bill"):
+            return extract_final_bill(pdf_path, use_llm_fallback=True)
+
+    def _extract_discharge_summary(self, pdf_path: PDFSource) -> Dict:
+        """Extract the discharge summary (LLM)"""
+        with telemetry.span("pdf_extraction.discharge_summary"):
+            return extract_discharge_summary(pdf_path, use_llm=True)
+
+    def _run_cost_escalation(self, bill_recon_result: Dict, discharge_summary: Dict) -> Dict:
+        """Agent 6: Cost Escalation Analyzer"""
+        logger.debug("Running Agent 6: Cost Escalation Analyzer")
+        with telemetry.span("agent.cost_escalation"):
+            return self.cost_esc_agent.analyze(
+                line_item_variances=bill_recon_result['line_item_comparison'],
+                discharge_summary=discharge_summary,
+                stay_variance=bill_recon_result['stay_variance']
+            )
+
+    def _run_medical_guidance(self, discharge_summary: Dict) -> Dict:
+        """Agent 8: Medical Guidance Generator"""
+        logger.debug("Running Agent 8: Medical Guidance Generator")
+        with telemetry.span("agent.medical_guidance"):
+            return self.med_guide_agent.generate(
+                discharge_summary=discharge_summary,
+                procedure_type="general"
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for concurrent steps"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="discharge-worker"
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Release the thread pool (a new one is created on next use)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
 
 # Test function
 def test_discharge_service():
@@ -4,25 +4,317 @@ Extracts medical note data from pre-authorization PDF documents using rule-based
 with optional LLM fallback
 """
 
+import logging
 import re
 import json
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import PyPDF2
 from src.models.schemas import MedicalNote, PatientInfo, DiagnosisInfo, ClinicalHistory
 from src.models.schemas import ProposedTreatment, MedicalJustification, HospitalizationDetails
 from src.models.schemas import CostBreakdown, DoctorDetails, HospitalDetails
+from src.utils import telemetry
 from src.utils.llm_client import call_llm_with_retry
+from src.utils.pdf_document import DocumentParser, PDFDocument, PDFSource, ingest
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# PRECOMPILED PATTERNS
+# ============================================================================
+
+# Numbered section headings of the PRE-AUTHORIZATION REQUEST template, e.g.
+# "11. ESTIMATED COST BREAKDOWN (in ₹)". Titles are upper-case and at least two
+# words, which separates them from numbered list items such as
+# "1. Visual Acuity Testing (15/09/2025): Right 6/36"
+SECTION_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(\d{1,2})\.[ \t]*([A-Z][A-Z/&,\-]*(?:[ \t]+[A-Z/&,\-]+)+)[ \t]*(?:\([^)\n]*\))?[ \t]*$',
+    re.MULTILINE
+)
+
+# Section key -> title pattern, matched against the heading title with spaces
+# removed (PDF text often splits words, e.g. "HOSPITALIZA TION"). First match wins.
+# Headings with unrecognised titles are treated as part of the preceding section.
+SECTION_TITLES = [
+    ('patient', re.compile(r'PATIENTDETAILS')),
+    ('doctor_declaration', re.compile(r'DECLARATIONBYTREATINGDOCTOR')),
+    ('patient_declaration', re.compile(r'DECLARATIONBYPATIENT')),
+    ('doctor', re.compile(r'TREATINGDOCTOR')),
+    ('illness', re.compile(r'ILLNESS|DISEASE')),
+    ('clinical_findings', re.compile(r'CLINICALFINDINGS')),
+    ('medical_history', re.compile(r'MEDICALHISTORY')),
+    ('investigations', re.compile(r'INVESTIGATION')),
+    ('surgical', re.compile(r'SURGICAL')),
+    ('hospitalization', re.compile(r'HOSPITALI[SZ]ATION')),
+    ('accident', re.compile(r'ACCIDENT')),
+    ('maternity', re.compile(r'MATERNITY')),
+    ('cost', re.compile(r'ESTIMATEDCOST')),
+]
+
+MULTIPLE_SPACES = re.compile(r' +')
+WHITESPACE = re.compile(r'\s+')
+NON_DIGITS = re.compile(r'[^\d]')
+
+# Amount following a cost line label: ₹, Rs. or no symbol, or ■ (black square from encoding issues)
+_AMOUNT = r'[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)'
+
+
+def _compile_all(patterns: List[str], flags: int = re.IGNORECASE) -> List[re.Pattern]:
+    return [re.compile(pattern, flags) for pattern in patterns]
+
+
+def _search_first(patterns: List[re.Pattern], text: str) -> Optional[re.Match]:
+    """Return the first match of the first pattern that matches text"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+def _parse_amount(match: Optional[re.Match]) -> float:
+    """Convert a matched amount such as "1,25,000" to float (0.0 if no match)"""
+    return float(match.group(1).replace(',', '')) if match else 0.0
+
+
+# Section 1: Patient details
+PATIENT_NAME_PATTERNS = _compile_all([
+    r'Patient\s+Name\s*:\s*([A-Za-z\s\.]+?)(?=\s*Gender|\s*Age|\n)',
+    r'Patient Name:\s*([A-Za-z\s\.]+?)(?=Gender|Age)',
+])
+AGE_PATTERNS = _compile_all([
+    r'Age\s*:\s*(\d+)\s*(?:Years?|years?)',
+    r'Age[:\s]+(\d+)',
+])
+GENDER_PATTERNS = _compile_all([
+    r'Gender\s*:\s*(?:☐)?\s*(Male|Female|Third\s+Gender|Other)',
+    r'Gender\s*:\s*([A-Za-z\s]+?)(?=\s+Age|\n)',
+])
+CONTACT_PATTERNS = _compile_all([
+    r'Contact\s+Number\s*:\s*([\d\s\-\+]+)',
+    r'(?:Phone|Mobile)[:\s]+([\d\s\-\+]+)',
+])
+PATIENT_ID_PATTERNS = _compile_all([
+    r'TPA\s+Card\s+ID\s*:\s*([\w\d\/\-]+)',
+    r'Patient\s+ID[:\s]+([\w\d\/\-]+)',
+])
+
+# Section 2 / 12: Treating doctor and declaration
+DECLARATION_DOCTOR_NAME_PATTERN = re.compile(r'Doctor\'s\s+Name\s*:\s*([A-Za-z\s\.]+?)(?=\s*Doctor\'s\s+Signature|\n|$)', re.IGNORECASE)
+DOCTOR_NAME_PATTERN = re.compile(r'Doctor\s+Name\s*:\s*Dr\.?\s*([A-Za-z\s\.]+?)(?=\s*Contact|\n)', re.IGNORECASE)
+QUALIFICATION_PATTERN = re.compile(r'Qualification\s*:\s*([A-Z\s,\.\(\)]+?)(?=\s*Registration|\n)', re.IGNORECASE)
+REGISTRATION_PATTERN = re.compile(r'Registration\s+Number[^:]*:\s*([\w\/\d]+)', re.IGNORECASE)
+
+# Section 3: Illness / disease details
+DIAGNOSIS_PATTERNS = _compile_all([
+    r'Provisional\s+Diagnosis\s*:\s*([^\n]+?)(?=\s*ICD|\n|$)',
+    r'Primary\s+Diagnosis\s*:\s*([^\n]+?)(?=\s*ICD|\n|$)',
+])
+ICD_PATTERNS = _compile_all([
+    r'ICD[- ]?10\s+Code\s*:\s*([A-Z]\d+\.?\d*)',
+    r'ICD[:\s]+([A-Z]\d+\.?\d*)',
+])
+DIAGNOSIS_DATE_PATTERNS = _compile_all([
+    r'Date\s+of\s+First\s+Consultation\s*:\s*([\d\/\-]+)',
+    r'Diagnosis\s+Date[:\s]+([\d\/\-]+)',
+])
+COMPLAINT_PATTERNS = _compile_all([
+    r'Nature\s+of\s+Illness[^:]*:\s*\n?\s*(.{30,1000}?)(?=\s*\n\s*Duration\s+of\s+Present|Date\s+of\s+First|Past\s+History|Relevant)',
+    r'Presenting\s+Complaint[:\s]+(.{30,1000}?)(?=\s*\n\s*Duration|$)',
+    r'Chief\s+Complaints?[:\s]+(.{30,1000}?)(?=\s*\n\s*Duration|$)',
+], re.IGNORECASE | re.DOTALL)
+DURATION_PATTERNS = _compile_all([
+    r'Duration\s+of\s+Present\s+Ailment\s*:\s*(\d+)\s*(?:Days?|days?)',
+    r'Duration\s+of\s+Symptoms[:\s]+(\d+\s*(?:days?|months?|years?))',
+])
+
+# Section 4 / 5: Clinical findings and past medical history
+RELEVANT_FINDINGS_PATTERN = re.compile(r'Relevant\s+Critical\s+Findings[^:]*:\s*(.{30,800}?)(?=Past\s+History|\n\d+\.|$)', re.IGNORECASE | re.DOTALL)
+PAST_HISTORY_PATTERN = re.compile(r'Past\s+History[^:]*:\s*(.{20,300}?)(?=\n\d+\.|PAST\s+MEDICAL|$)', re.IGNORECASE | re.DOTALL)
+COMORBIDITY_PATTERNS = [
+    ("Diabetes", re.compile(r'Diabetes.*Since:', re.IGNORECASE)),
+    ("Hypertension", re.compile(r'Hypertension.*Since:', re.IGNORECASE)),
+    ("Heart Disease", re.compile(r'Heart\s+Disease.*Since:', re.IGNORECASE)),
+]
+
+# Section 6: Investigations
+INVESTIGATION_LIST_PATTERN = re.compile(
+    r'Investigations?/Diagnos?\s*tic\s+Tests?\s+Done[:\s]+([\s\S]+?)(?:Medical Management|Proposed Line of Treatment|7\.\s+SURGICAL|8\.\s+ACCIDENT)',
+    re.IGNORECASE
+)
+TEST_ITEM_PATTERN = re.compile(r'(\d+)\.\s+([A-Za-z][^:]+?):\s*([^\n]+)', re.IGNORECASE)
+TEST_DATE_PATTERN = re.compile(r'\(([\/\d\-]+)\)')
+
+# Section 7: Surgical details
+PROCEDURE_PATTERNS = _compile_all([
+    r'Name\s+of\s+Surgery/Procedure\s*:\s*(.{10,250}?)(?=\s*ICD|Route|Other|Anesthesia|\n\d+\.|\s*$)',
+    r'Procedure\s+Name[:\s]+(.{10,250}?)(?=\s*ICD|$)',
+], re.IGNORECASE | re.DOTALL)
+ANESTHESIA_PATTERNS = _compile_all([
+    r'under\s+(peribulbar|general|spinal|local|regional)\s+anesthesia',
+    r'Anesthesia[^:]*:\s*(?:☐)?\s*(General|Spinal|Local|Regional|Peribulbar)',
+])
+PROCEDURE_CODE_PATTERNS = _compile_all([
+    r'ICD[- ]?10\s+PCS\s+Code\s*:\s*([\w\d]+)',
+    r'Procedure\s+Code[:\s]+([\w\d]+)',
+])
+SURGICAL_APPROACH_PATTERN = re.compile(
+    r'Other\s+Treatment\s+Details[^:]*:\s*(.+?)(?=\n\d+\.\s+[A-Z]{3,}|ACCIDENT DETAILS|MATERNITY DETAILS|HOSPITALIZATION DETAILS|$)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Section 10: Hospitalization details
+HOSPITALIZATION_TYPE_PATTERN = re.compile(r'Is\s+this\s+an\s+Emergency/Planned\s+Hospitalization\s*:\s*(Emergency|Planned)', re.IGNORECASE)
+ADMISSION_PATTERNS = _compile_all([
+    r'Date\s+of\s+Admission\s*:\s*([\d\/\-]+)',
+    r'Planned\s+Admission\s+Date[:\s]+([\d\/\-]+)',
+])
+STAY_PATTERNS = _compile_all([
+    r'Expected\s+Number\s+of\s+Days/Stay\s+in\s+Hospital\s*:\s*(\d+)\s*Days?',
+    r'Expected\s+(?:Length\s+of\s+)?Stay[:\s]+(\d+)',
+])
+ICU_DAYS_PATTERN = re.compile(r'Days\s+in\s+ICU[^:]*:\s*(\d+)', re.IGNORECASE)
+
+# Section 11: Estimated cost breakdown
+ROOM_RENT_PATTERNS = _compile_all([
+    r'Room\s+Rent' + _AMOUNT,
+    r'Per\s+Day\s+Room\s+Rent' + _AMOUNT,
+])
+PROFESSIONAL_FEES_PATTERN = re.compile(r'Professional\s+Fees' + _AMOUNT, re.IGNORECASE)
+SURGEON_FEES_PATTERN = re.compile(r'Surgeon\s+Fees?' + _AMOUNT, re.IGNORECASE)
+ANESTHETIST_FEES_PATTERN = re.compile(r'Anesthetist\s+Fees?' + _AMOUNT, re.IGNORECASE)
+OT_CHARGES_PATTERN = re.compile(r'OT\s+Charges' + _AMOUNT, re.IGNORECASE)
+ICU_CHARGES_PATTERN = re.compile(r'ICU\s+Charges' + _AMOUNT, re.IGNORECASE)
+INVESTIGATION_COST_PATTERNS = _compile_all([
+    r'Expected\s+Cost\s+of\s+Inves[^\n]{0,20}(?:Diagnos|Diagnostic)' + _AMOUNT,
+    r'Investigation' + _AMOUNT,
+])
+COMBINED_MEDICINES_PATTERN = re.compile(r'Medicines\s*\+\s*Consumables\s*\+\s*(?:Cost\s+of\s+)?Implants' + _AMOUNT, re.IGNORECASE)
+MEDICINES_PATTERNS = _compile_all([
+    r'Medicines\s*\+\s*Consumables' + _AMOUNT,
+    r'Medicines' + _AMOUNT,
+])
+IMPLANTS_PATTERN = re.compile(r'(?:Cost\s+of\s+)?Implants' + _AMOUNT, re.IGNORECASE)
+OTHER_EXPENSES_PATTERN = re.compile(r'Other\s+Hospital\s+Expenses' + _AMOUNT, re.IGNORECASE)
+TOTAL_COST_PATTERNS = _compile_all([
+    r'SUM[- ]TOTAL\s+EXPECTED\s+COST' + _AMOUNT,
+    r'TOTAL' + _AMOUNT,
+])
+
+# Letterhead and address (no dedicated template section)
+HOSPITAL_NAME_PATTERNS = _compile_all([
+    r'^([A-Z][A-Za-z\s&\.]+(?:Hospital|Clinic|Medical Center|Healthcare))',
+    r'([A-Z][A-Za-z\s&\.]+(?:Hospital|Clinic|Medical Center|Healthcare))\s*\n',
+], re.MULTILINE)
+ADDRESS_PATTERNS = _compile_all([
+    r'Hospital\s+Address\s*:\s*(.{10,200}?)(?:\n\n|Registration|$)',
+    r'Address\s*:\s*(.{10,200}?)(?:\n\n|Registration|Contact|$)',
+])
+
+
+# ============================================================================
+# FIELD-LEVEL LLM FALLBACK
+# ============================================================================
+
+# Fields whose extraction confidence is tracked. Dotted path -> (template
+# sections the field is read from, value type or allowed values, description
+# for the LLM). "header" is the letterhead area before the first section.
+FIELD_SPECS = {
+    'patient_info.name': (('patient',), str, "Patient's full name"),
+    'patient_info.age': (('patient',), int, "Patient's age in years"),
+    'patient_info.gender': (('patient',), ("Male", "Female", "Other"), "Patient's gender"),
+    'patient_info.contact_number': (('patient',), str, "Patient's contact number"),
+    'patient_info.patient_id': (('patient',), str, "TPA card ID or patient ID"),
+    'diagnosis.primary_diagnosis': (('illness',), str, "Provisional or primary diagnosis"),
+    'diagnosis.icd_10_code': (('illness',), str, "ICD-10 code of the diagnosis"),
+    'diagnosis.diagnosis_date': (('illness',), str, "Date of first consultation or diagnosis"),
+    'clinical_history.chief_complaints': (('illness',), str, "Nature of illness / presenting complaints"),
+    'clinical_history.duration_of_symptoms': (('illness',), str, "Duration of symptoms, e.g. \"30 days\""),
+    'proposed_treatment.procedure_name': (('surgical',), str, "Name of the surgery or procedure"),
+    'proposed_treatment.anesthesia_type': (('surgical',), ("General", "Spinal", "Local", "Regional"),
+                                           "Type of anesthesia"),
+    'medical_justification.why_hospitalization_required': (('clinical_findings',), str,
+                                                           "Clinical findings that require hospitalization"),
+    'medical_justification.why_treatment_necessary': (('illness',), str, "Why the treatment is necessary"),
+    'hospitalization_details.hospitalization_type': (('hospitalization',), ("Emergency", "Planned"),
+                                                     "Emergency or planned hospitalization"),
+    'hospitalization_details.planned_admission_date': (('hospitalization',), str, "Date of admission"),
+    'hospitalization_details.expected_length_of_stay': (('hospitalization',), int,
+                                                        "Expected stay in hospital in days"),
+    'cost_breakdown.total_estimated_cost': (('cost',), float, "Total expected cost of hospitalization in rupees"),
+    'doctor_details.name': (('doctor_declaration', 'doctor'), str, "Treating doctor's name"),
+    'hospital_details.name': (('header',), str, "Hospital name from the letterhead"),
+}
+
+# Fields the rules otherwise fill with a placeholder ("Unknown Patient", age 0, ...):
+# any of them below the threshold triggers the fallback even when the average is fine
+REQUIRED_FIELDS = (
+    'patient_info.name', 'patient_info.age', 'patient_info.gender',
+    'diagnosis.primary_diagnosis', 'diagnosis.icd_10_code', 'clinical_history.chief_complaints',
+    'proposed_treatment.procedure_name', 'hospitalization_details.planned_admission_date',
+    'hospitalization_details.expected_length_of_stay', 'cost_breakdown.total_estimated_cost',
+    'doctor_details.name', 'hospital_details.name',
+)
+
+CONFIDENCE_THRESHOLD = 0.7
+
+# Model asked for the low-confidence fields
+LLM_FALLBACK_MODEL = "claude-sonnet-4-5-20250929"
+
+# Letterhead area searched for the hospital name
+HEADER_LENGTH = 500
+
+FIELD_FALLBACK_PROMPT = """Extract the following fields from this excerpt of a pre-authorization medical note and return as JSON.
+
+FIELDS:
+{fields}
+
+EXCERPT:
+{excerpt}
+
+Return a JSON object with exactly these field names as keys. Use null for any field that is not stated in the excerpt; do not guess.
+
+Return ONLY valid JSON."""
+
+FIRST_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _coerce_field(value, value_type):
+    """
+    Convert an LLM answer to the field's type
+
+    Returns:
+        The converted value, or None if the answer is missing or unusable
+    """
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    if not text or text.lower() in ("null", "none", "n/a", "not specified"):
+        return None
 
+    if isinstance(value_type, tuple):
+        return next((option for option in value_type if option.lower() == text.lower()), None)
+    if value_type in (int, float):
+        number = FIRST_NUMBER.search(text.replace(',', ''))
+        if not number:
+            return None
+        return value_type(float(number.group(0)))
+    return text
 
-class PDFExtractor:
+
+
+class PDFExtractor(DocumentParser):
     """
     Extracts structured medical note data from PDF documents using rule-based parsing
 
     Primary method: Regex pattern matching (fast, free, deterministic)
-    Fallback: LLM parsing (disabled by default, enable for production)
+    Fallback: LLM extraction of the low-confidence fields only (disabled by
+    default, enable for production)
     """
 
+    # The patterns and encoding fixes are written against PyPDF2's output
+    backends = ("pypdf2",)
+
     def __init__(self, enable_llm_fallback: bool = False):
         """
         Initialize PDF extractor
@@ -32,12 +324,13 @@ class PDFExtractor:
         """
         self.enable_llm_fallback = enable_llm_fallback
 
-    def extract_from_pdf(self, pdf_path: str) -> MedicalNote:
+    def extract_from_pdf(self, pdf_path: PDFSource) -> MedicalNote:
         """
         Extract medical note from PDF file
 
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or its content (bytes, BytesIO,
+                memoryview or an uploaded file), which is never written to disk
 
         Returns:
             MedicalNote object with extracted data
@@ -51,51 +344,24 @@ class PDFExtractor:
             >>> medical_note = extractor.extract_from_pdf("test_case_1.pdf")
             >>> print(medical_note.patient_info.name)
         """
-        # 1. Validate file exists
-        pdf_file = Path(pdf_path)
-        if not pdf_file.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        # 1. Open the file, extract its text and parse it using rule-based
+        #    approach, with LLM fallback for low-confidence fields
+        medical_data = ingest(pdf_path, self).data
 
-        # 2. Extract text from PDF
-        pdf_text = self._extract_text_from_pdf(pdf_file)
-
-        if not pdf_text.strip():
-            raise ValueError("PDF appears to be empty or contains no extractable text")
-
-        # 3. Parse using rule-based approach
-        medical_data, confidence = self._parse_with_rules(pdf_text)
-
-        # 4. Fallback to LLM if enabled and confidence is low
-        if self.enable_llm_fallback and confidence < 0.7:
-            print(f"⚠️  Rule-based parsing confidence: {confidence:.0%}. Falling back to LLM...")
-            medical_data = self._parse_with_llm(pdf_text)
-
-        # 5. Validate and return MedicalNote
+        # 2. Validate and return MedicalNote
         try:
             medical_note = MedicalNote(**medical_data)
             return medical_note
         except Exception as e:
             raise ValueError(f"Failed to create MedicalNote from extracted data: {str(e)}\nExtracted data: {json.dumps(medical_data, indent=2)}")
 
-    def _extract_text_from_pdf(self, pdf_file: Path) -> str:
-        """Extract raw text from PDF using PyPDF2"""
-        try:
-            text_content = []
-
-            with open(pdf_file, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+    def _extract_text_from_pdf(self, pdf_file: PDFSource) -> str:
+        """Extract raw text from PDF using PyPDF2 (cached by content hash)"""
+        return PDFDocument.open(pdf_file).read(self.backends, self.separator)[1]
 
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        text_content.append(text)
-
-            full_text = "\n".join(text_content)
-            return full_text
-
-        except Exception as e:
-            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+    def parse(self, text: str) -> Dict:
+        """DocumentParser hook: the extracted data dictionary of a note's text"""
+        return self._parse(text)
 
     def _fix_pdf_encoding_issues(self, text: str) -> str:
         """
@@ -132,240 +398,264 @@ class PDFExtractor:
         
         return text
     
+    def _split_sections(self, text: str) -> Dict[str, str]:
+        """
+        Split template text into its numbered sections in a single pass
+
+        Headings such as "11. ESTIMATED COST BREAKDOWN (in ₹)" are located with one
+        precompiled pattern. Only recognised template titles with increasing section
+        numbers count, so numbered list items inside a section are not mistaken
+        for headings.
+
+        Args:
+            text: Cleaned PDF text
+
+        Returns:
+            Dict of section key (see SECTION_TITLES) -> section body text.
+            Sections that are not present (e.g. free-form notes) are omitted.
+        """
+        headings = []
+        last_number = 0
+        for heading in SECTION_HEADING_PATTERN.finditer(text):
+            number = int(heading.group(1))
+            if number <= last_number:
+                continue
+            title = heading.group(2).replace(' ', '')
+            key = next((key for key, title_pattern in SECTION_TITLES if title_pattern.search(title)), None)
+            if key:
+                headings.append((key, heading))
+                last_number = number
+
+        sections = {}
+        for i, (key, heading) in enumerate(headings):
+            end = headings[i + 1][1].start() if i + 1 < len(headings) else len(text)
+            sections.setdefault(key, text[heading.end():end])
+
+        return sections
+
+    def _parse(self, pdf_text: str) -> Dict:
+        """
+        Parse with the rules, then fill low-confidence fields with the LLM if enabled
+
+        The fallback runs when the average field confidence is below
+        CONFIDENCE_THRESHOLD or any required field is. Only those fields are
+        asked for, and the rule-based values of all other fields are kept.
+
+        Args:
+            pdf_text: Raw text from PDF
+
+        Returns:
+            Extracted data dictionary
+        """
+        data, field_confidence, sections, text = self._parse_fields(pdf_text)
+        if not self.enable_llm_fallback:
+            return data
+
+        confidence = self._aggregate_confidence(field_confidence)
+        low = [field for field in FIELD_SPECS if field_confidence.get(field, 0.0) < CONFIDENCE_THRESHOLD]
+        if confidence >= CONFIDENCE_THRESHOLD and not any(field in REQUIRED_FIELDS for field in low):
+            return data
+
+        logger.info(
+            "Rule-based parsing confidence %.0f%%, asking LLM for %d fields: %s",
+            confidence * 100, len(low), ", ".join(low)
+        )
+        return self._fill_with_llm(data, low, sections, text)
+
     def _parse_with_rules(self, pdf_text: str) -> Tuple[Dict, float]:
         """
         Parse PDF text using rule-based regex patterns
+
+        Args:
+            pdf_text: Raw text from PDF
+
+        Returns:
+            Tuple of (extracted_data_dict, confidence_score), where the
+            confidence is the average over FIELD_SPECS
+        """
+        data, field_confidence, _, _ = self._parse_fields(pdf_text)
+        return data, self._aggregate_confidence(field_confidence)
+
+    @staticmethod
+    def _aggregate_confidence(field_confidence: Dict[str, float]) -> float:
+        return sum(field_confidence.get(field, 0.0) for field in FIELD_SPECS) / len(FIELD_SPECS)
+
+    def _parse_fields(self, pdf_text: str) -> Tuple[Dict, Dict[str, float], Dict[str, str], str]:
+        """
+        Parse PDF text using rule-based regex patterns
         Updated to handle new PRE-AUTHORIZATION REQUEST template format
 
+        The text is split into numbered template sections once and each field is
+        searched only within its own section. Text without section headings is
+        searched as a whole.
+
         Args:
             pdf_text: Raw text from PDF
 
         Returns:
-            Tuple of (extracted_data_dict, confidence_score)
+            Tuple of (extracted_data_dict, field confidence by FIELD_SPECS path,
+            sections by key as from _split_sections, cleaned text the sections
+            were split from). Fields left at a placeholder have no confidence entry.
         """
         # Initialize data structure
         data = {}
-        fields_found = 0
-        total_fields = 0
+        # Tracked field (see FIELD_SPECS) -> confidence; fields absent here were not found
+        field_confidence = {}
 
         # Clean text - preserve some structure for better extraction
         text = pdf_text.replace('\r', ' ')
         # Normalize excessive whitespace but keep some line structure
-        text = re.sub(r' +', ' ', text)
-        
+        text = MULTIPLE_SPACES.sub(' ', text)
+
         # Fix common PDF encoding issues (ligatures and special characters)
         text = self._fix_pdf_encoding_issues(text)
 
+        sections = self._split_sections(text)
+        patient_text = sections.get('patient', text)
+        doctor_text = sections.get('doctor', text)
+        illness_text = sections.get('illness', text)
+        findings_text = sections.get('clinical_findings', text)
+        history_text = sections.get('medical_history', text)
+        investigations_text = sections.get('investigations', text)
+        surgical_text = sections.get('surgical', text)
+        hospitalization_text = sections.get('hospitalization', text)
+        cost_text = sections.get('cost', text)
+        declaration_text = sections.get('doctor_declaration', text)
+
         # === PATIENT INFO (Part A / Section 1) ===
-        total_fields += 5
         patient_info = {}
 
         # Patient Name - updated for new template format
-        name_patterns = [
-            r'Patient\s+Name\s*:\s*([A-Za-z\s\.]+?)(?=\s*Gender|\s*Age|\n)',
-            r'Patient Name:\s*([A-Za-z\s\.]+?)(?=Gender|Age)',
-        ]
-        for pattern in name_patterns:
-            name_match = re.search(pattern, text, re.IGNORECASE)
-            if name_match:
-                patient_info['name'] = name_match.group(1).strip()
-                fields_found += 1
-                break
-        if 'name' not in patient_info:
+        name_match = _search_first(PATIENT_NAME_PATTERNS, patient_text)
+        if name_match:
+            patient_info['name'] = name_match.group(1).strip()
+            field_confidence['patient_info.name'] = 1.0
+        else:
             patient_info['name'] = "Unknown Patient"
 
         # Age - handle "68 Years" format
-        age_patterns = [
-            r'Age\s*:\s*(\d+)\s*(?:Years?|years?)',
-            r'Age[:\s]+(\d+)',
-        ]
-        for pattern in age_patterns:
-            age_match = re.search(pattern, text, re.IGNORECASE)
-            if age_match:
-                patient_info['age'] = int(age_match.group(1))
-                fields_found += 1
-                break
-        if 'age' not in patient_info:
+        age_match = _search_first(AGE_PATTERNS, patient_text)
+        if age_match:
+            patient_info['age'] = int(age_match.group(1))
+            field_confidence['patient_info.age'] = 1.0
+        else:
             patient_info['age'] = 0
 
         # Gender - handle checkbox symbols
-        gender_patterns = [
-            r'Gender\s*:\s*(?:☐)?\s*(Male|Female|Third\s+Gender|Other)',
-            r'Gender\s*:\s*([A-Za-z\s]+?)(?=\s+Age|\n)',
-        ]
-        for pattern in gender_patterns:
-            gender_match = re.search(pattern, text, re.IGNORECASE)
-            if gender_match:
-                gender = gender_match.group(1).strip().title()
-                if "Third" in gender:
-                    gender = "Other"
-                patient_info['gender'] = gender
-                fields_found += 1
-                break
-        if 'gender' not in patient_info:
+        gender_match = _search_first(GENDER_PATTERNS, patient_text)
+        if gender_match:
+            gender = gender_match.group(1).strip().title()
+            if "Third" in gender:
+                gender = "Other"
+            patient_info['gender'] = gender
+            field_confidence['patient_info.gender'] = 1.0
+        else:
             patient_info['gender'] = "Male"
 
         # Contact Number
-        contact_patterns = [
-            r'Contact\s+Number\s*:\s*([\d\s\-\+]+)',
-            r'(?:Phone|Mobile)[:\s]+([\d\s\-\+]+)',
-        ]
-        for pattern in contact_patterns:
-            contact_match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in CONTACT_PATTERNS:
+            contact_match = pattern.search(patient_text)
             if contact_match:
-                contact_num = re.sub(r'[^\d]', '', contact_match.group(1))
+                contact_num = NON_DIGITS.sub('', contact_match.group(1))
                 if len(contact_num) >= 10:
                     patient_info['contact_number'] = contact_num[:10]
-                    fields_found += 1
+                    field_confidence['patient_info.contact_number'] = 1.0
                     break
 
         # Patient ID / TPA Card ID
-        patient_id_patterns = [
-            r'TPA\s+Card\s+ID\s*:\s*([\w\d\/\-]+)',
-            r'Patient\s+ID[:\s]+([\w\d\/\-]+)',
-        ]
-        for pattern in patient_id_patterns:
-            patient_id_match = re.search(pattern, text, re.IGNORECASE)
-            if patient_id_match:
-                patient_info['patient_id'] = patient_id_match.group(1).strip()
-                fields_found += 1
-                break
+        patient_id_match = _search_first(PATIENT_ID_PATTERNS, patient_text)
+        if patient_id_match:
+            patient_info['patient_id'] = patient_id_match.group(1).strip()
+            field_confidence['patient_info.patient_id'] = 1.0
 
         data['patient_info'] = patient_info
 
         # === DIAGNOSIS (Part B / Section 3) ===
-        total_fields += 3
         diagnosis = {}
 
         # Primary Diagnosis - new template
-        diag_patterns = [
-            r'Provisional\s+Diagnosis\s*:\s*([^\n]+?)(?=\s*ICD|\n|$)',
-            r'Primary\s+Diagnosis\s*:\s*([^\n]+?)(?=\s*ICD|\n|$)',
-        ]
-        for pattern in diag_patterns:
-            diag_match = re.search(pattern, text, re.IGNORECASE)
-            if diag_match:
-                diagnosis['primary_diagnosis'] = diag_match.group(1).strip()[:200]
-                fields_found += 1
-                break
-        if 'primary_diagnosis' not in diagnosis:
+        diag_match = _search_first(DIAGNOSIS_PATTERNS, illness_text)
+        if diag_match:
+            diagnosis['primary_diagnosis'] = diag_match.group(1).strip()[:200]
+            field_confidence['diagnosis.primary_diagnosis'] = 1.0
+        else:
             diagnosis['primary_diagnosis'] = "Not specified"
 
         # ICD-10 Code
-        icd_patterns = [
-            r'ICD[- ]?10\s+Code\s*:\s*([A-Z]\d+\.?\d*)',
-            r'ICD[:\s]+([A-Z]\d+\.?\d*)',
-        ]
-        for pattern in icd_patterns:
-            icd_match = re.search(pattern, text, re.IGNORECASE)
-            if icd_match:
-                diagnosis['icd_10_code'] = icd_match.group(1).strip()
-                fields_found += 1
-                break
-        if 'icd_10_code' not in diagnosis:
+        icd_match = _search_first(ICD_PATTERNS, illness_text)
+        if icd_match:
+            diagnosis['icd_10_code'] = icd_match.group(1).strip()
+            field_confidence['diagnosis.icd_10_code'] = 1.0
+        else:
             diagnosis['icd_10_code'] = "A00.0"
 
         # Date of First Consultation
-        diag_date_patterns = [
-            r'Date\s+of\s+First\s+Consultation\s*:\s*([\d\/\-]+)',
-            r'Diagnosis\s+Date[:\s]+([\d\/\-]+)',
-        ]
-        for pattern in diag_date_patterns:
-            diag_date_match = re.search(pattern, text, re.IGNORECASE)
-            if diag_date_match:
-                diagnosis['diagnosis_date'] = diag_date_match.group(1).strip()
-                fields_found += 1
-                break
+        diag_date_match = _search_first(DIAGNOSIS_DATE_PATTERNS, illness_text)
+        if diag_date_match:
+            diagnosis['diagnosis_date'] = diag_date_match.group(1).strip()
+            field_confidence['diagnosis.diagnosis_date'] = 1.0
 
         diagnosis['secondary_diagnoses'] = []
         data['diagnosis'] = diagnosis
 
         # === CLINICAL HISTORY (Section 3 & 4) ===
-        total_fields += 2
         clinical = {}
 
         # Chief Complaints - "Nature of Illness/Disease with Presenting Complaint"
-        complaint_patterns = [
-            r'Nature\s+of\s+Illness[^:]*:\s*\n?\s*(.{30,1000}?)(?=\s*\n\s*Duration\s+of\s+Present|Date\s+of\s+First|Past\s+History|Relevant)',
-            r'Presenting\s+Complaint[:\s]+(.{30,1000}?)(?=\s*\n\s*Duration|$)',
-            r'Chief\s+Complaints?[:\s]+(.{30,1000}?)(?=\s*\n\s*Duration|$)',
-        ]
-        for pattern in complaint_patterns:
-            complaint_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if complaint_match:
-                complaints = complaint_match.group(1).strip()
-                complaints = re.sub(r'\s+', ' ', complaints)  # Clean whitespace
-                clinical['chief_complaints'] = complaints[:1000]  # Increased limit
-                fields_found += 1
-                break
-        if 'chief_complaints' not in clinical:
+        complaint_match = _search_first(COMPLAINT_PATTERNS, illness_text)
+        if complaint_match:
+            complaints = complaint_match.group(1).strip()
+            complaints = WHITESPACE.sub(' ', complaints)  # Clean whitespace
+            clinical['chief_complaints'] = complaints[:1000]  # Increased limit
+            field_confidence['clinical_history.chief_complaints'] = 1.0
+        else:
             clinical['chief_complaints'] = "Not documented"
 
         # Duration of Present Ailment
-        duration_patterns = [
-            r'Duration\s+of\s+Present\s+Ailment\s*:\s*(\d+)\s*(?:Days?|days?)',
-            r'Duration\s+of\s+Symptoms[:\s]+(\d+\s*(?:days?|months?|years?))',
-        ]
-        for pattern in duration_patterns:
-            duration_match = re.search(pattern, text, re.IGNORECASE)
-            if duration_match:
-                duration_val = duration_match.group(1).strip()
-                if duration_val.isdigit():
-                    clinical['duration_of_symptoms'] = duration_val + " days"
-                else:
-                    clinical['duration_of_symptoms'] = duration_val
-                fields_found += 1
-                break
+        duration_match = _search_first(DURATION_PATTERNS, illness_text)
+        if duration_match:
+            duration_val = duration_match.group(1).strip()
+            if duration_val.isdigit():
+                clinical['duration_of_symptoms'] = duration_val + " days"
+            else:
+                clinical['duration_of_symptoms'] = duration_val
+            field_confidence['clinical_history.duration_of_symptoms'] = 1.0
 
         # Past History
-        past_history_match = re.search(r'Past\s+History[^:]*:\s*(.{20,300}?)(?=\n\d+\.|PAST\s+MEDICAL|$)', text, re.IGNORECASE | re.DOTALL)
+        past_history_match = PAST_HISTORY_PATTERN.search(findings_text)
         if past_history_match:
-            clinical['relevant_medical_history'] = re.sub(r'\s+', ' ', past_history_match.group(1).strip())
+            clinical['relevant_medical_history'] = WHITESPACE.sub(' ', past_history_match.group(1).strip())
 
         # Comorbidities - Section 5
-        comorbidities = []
-        if re.search(r'Diabetes.*Since:', text, re.IGNORECASE):
-            comorbidities.append("Diabetes")
-        if re.search(r'Hypertension.*Since:', text, re.IGNORECASE):
-            comorbidities.append("Hypertension")
-        if re.search(r'Heart\s+Disease.*Since:', text, re.IGNORECASE):
-            comorbidities.append("Heart Disease")
+        comorbidities = [name for name, pattern in COMORBIDITY_PATTERNS if pattern.search(history_text)]
         clinical['comorbidities'] = comorbidities if comorbidities else None
 
         data['clinical_history'] = clinical
 
         # === DIAGNOSTIC TESTS (Section 6) ===
         tests = []
-        
-        # First, try to find the investigations section
-        # Look for the investigations section and capture until "Medical Management" or next section
+
+        # First, narrow to the investigations list within Section 6, up to "Medical Management"
         # Handle "Diagnos tic" (with space from encoding fix) as well as "Diagnostic"
-        investigation_section_match = re.search(
-            r'Investigations?/Diagnos?\s*tic\s+Tests?\s+Done[:\s]+([\s\S]+?)(?:Medical Management|Proposed Line of Treatment|7\.\s+SURGICAL|8\.\s+ACCIDENT)',
-            text,
-            re.IGNORECASE
-        )
-        
-        search_text = investigation_section_match.group(1).strip() if investigation_section_match else text
-        
+        investigation_list_match = INVESTIGATION_LIST_PATTERN.search(investigations_text)
+        search_text = investigation_list_match.group(1).strip() if investigation_list_match else investigations_text
+
         # Look for numbered investigations with optional date
         # Pattern: "1. Test name (date): findings" or "1. Test name: findings"
         # Use [^:]+ to capture everything until the colon (includes dates, ampersands, etc.)
-        test_pattern = r'(\d+)\.\s+([A-Za-z][^:]+?):\s*([^\n]+)'
-        
-        test_matches = re.findall(test_pattern, search_text, re.IGNORECASE)
+        test_matches = TEST_ITEM_PATTERN.findall(search_text)
         for match in test_matches[:10]:  # Limit to 10 tests
-            test_name = re.sub(r'\s+', ' ', match[1].strip())  # Clean whitespace
-            findings = re.sub(r'\s+', ' ', match[2].strip()) if match[2] else None
-            
+            test_name = WHITESPACE.sub(' ', match[1].strip())  # Clean whitespace
+            findings = WHITESPACE.sub(' ', match[2].strip()) if match[2] else None
+
             # Extract date if present in test name (e.g., "Test Name (15/09/2025)")
-            date_match = re.search(r'\(([\/\d\-]+)\)', test_name)
+            date_match = TEST_DATE_PATTERN.search(test_name)
             if date_match:
                 date_performed = date_match.group(1)
                 test_name = test_name.replace(date_match.group(0), '').strip()
             else:
                 date_performed = None
-            
+
             # Filter out section headers and invalid entries
             if test_name and len(test_name) > 2:
                 # Skip if it looks like a section header
@@ -374,130 +664,98 @@ class PDFExtractor:
                 # Skip very short "names" (likely parsing errors)
                 if len(test_name) < 5:
                     continue
-                    
+
                 tests.append({
                     "test_name": test_name[:150],
                     "date_performed": date_performed,
                     "key_findings": findings[:500] if findings and len(findings) > 3 else None
                 })
-        
+
         data['diagnostic_tests'] = tests if tests else []
 
         # === PROPOSED TREATMENT (Section 7) ===
-        total_fields += 2
         treatment = {}
 
         # Name of Surgery/Procedure
-        proc_patterns = [
-            r'Name\s+of\s+Surgery/Procedure\s*:\s*(.{10,250}?)(?=\s*ICD|Route|Other|Anesthesia|\n\d+\.|\s*$)',
-            r'Procedure\s+Name[:\s]+(.{10,250}?)(?=\s*ICD|$)',
-        ]
-        for pattern in proc_patterns:
-            proc_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if proc_match:
-                procedure = proc_match.group(1).strip()
-                procedure = re.sub(r'\s+', ' ', procedure)  # Clean whitespace
-                treatment['procedure_name'] = procedure[:250]
-                fields_found += 1
-                break
-        if 'procedure_name' not in treatment:
+        proc_match = _search_first(PROCEDURE_PATTERNS, surgical_text)
+        if proc_match:
+            procedure = proc_match.group(1).strip()
+            procedure = WHITESPACE.sub(' ', procedure)  # Clean whitespace
+            treatment['procedure_name'] = procedure[:250]
+            field_confidence['proposed_treatment.procedure_name'] = 1.0
+        else:
             treatment['procedure_name'] = "Not specified"
 
         # Anesthesia Type - may be in "Other Treatment Details"
-        anes_patterns = [
-            r'under\s+(peribulbar|general|spinal|local|regional)\s+anesthesia',
-            r'Anesthesia[^:]*:\s*(?:☐)?\s*(General|Spinal|Local|Regional|Peribulbar)',
-        ]
-        for pattern in anes_patterns:
-            anes_match = re.search(pattern, text, re.IGNORECASE)
-            if anes_match:
-                anesthesia = anes_match.group(1).strip().title()
-                # Map Peribulbar to Local
-                if anesthesia == "Peribulbar":
-                    anesthesia = "Local"
-                treatment['anesthesia_type'] = anesthesia
-                fields_found += 1
-                break
+        anes_match = _search_first(ANESTHESIA_PATTERNS, surgical_text)
+        if anes_match:
+            anesthesia = anes_match.group(1).strip().title()
+            # Map Peribulbar to Local
+            if anesthesia == "Peribulbar":
+                anesthesia = "Local"
+            treatment['anesthesia_type'] = anesthesia
+            field_confidence['proposed_treatment.anesthesia_type'] = 1.0
 
         # Procedure Code
-        proc_code_patterns = [
-            r'ICD[- ]?10\s+PCS\s+Code\s*:\s*([\w\d]+)',
-            r'Procedure\s+Code[:\s]+([\w\d]+)',
-        ]
-        for pattern in proc_code_patterns:
-            proc_code_match = re.search(pattern, text, re.IGNORECASE)
-            if proc_code_match:
-                treatment['procedure_code'] = proc_code_match.group(1).strip()
-                break
+        proc_code_match = _search_first(PROCEDURE_CODE_PATTERNS, surgical_text)
+        if proc_code_match:
+            treatment['procedure_code'] = proc_code_match.group(1).strip()
 
         # Surgical approach from "Other Treatment Details"
         # Capture until the next section or end, without arbitrary character limits
-        surgical_approach_match = re.search(r'Other\s+Treatment\s+Details[^:]*:\s*(.+?)(?=\n\d+\.\s+[A-Z]{3,}|ACCIDENT DETAILS|MATERNITY DETAILS|HOSPITALIZATION DETAILS|$)', text, re.IGNORECASE | re.DOTALL)
+        surgical_approach_match = SURGICAL_APPROACH_PATTERN.search(surgical_text)
         if surgical_approach_match:
-            treatment['surgical_approach'] = re.sub(r'\s+', ' ', surgical_approach_match.group(1).strip())
+            treatment['surgical_approach'] = WHITESPACE.sub(' ', surgical_approach_match.group(1).strip())
 
         data['proposed_treatment'] = treatment
 
         # === MEDICAL JUSTIFICATION ===
         # For this template, infer from clinical findings and treatment details
-        total_fields += 2
         justification = {}
 
         # Use relevant clinical findings as justification
-        relevant_findings_match = re.search(r'Relevant\s+Critical\s+Findings[^:]*:\s*(.{30,800}?)(?=Past\s+History|\n\d+\.|$)', text, re.IGNORECASE | re.DOTALL)
+        relevant_findings_match = RELEVANT_FINDINGS_PATTERN.search(findings_text)
         if relevant_findings_match:
-            findings = re.sub(r'\s+', ' ', relevant_findings_match.group(1).strip())
+            findings = WHITESPACE.sub(' ', relevant_findings_match.group(1).strip())
             justification['why_hospitalization_required'] = "Surgical intervention requiring controlled environment and post-operative monitoring. " + findings[:500]
-            justification['why_treatment_necessary'] = clinical.get('chief_complaints', 'Medical treatment required')[:1000]  # Increased limit
-            fields_found += 2
+            field_confidence['medical_justification.why_hospitalization_required'] = 1.0
         else:
             justification['why_hospitalization_required'] = "Surgical intervention required"
-            justification['why_treatment_necessary'] = clinical.get('chief_complaints', 'Medical treatment required')[:1000]  # Increased limit
-            fields_found += 1
+        justification['why_treatment_necessary'] = clinical.get('chief_complaints', 'Medical treatment required')[:1000]  # Increased limit
+        # Inferred from the presenting complaint, so only as good as that
+        if 'clinical_history.chief_complaints' in field_confidence:
+            field_confidence['medical_justification.why_treatment_necessary'] = 1.0
 
         data['medical_justification'] = justification
 
         # === HOSPITALIZATION DETAILS (Section 10) ===
-        total_fields += 3  # Increased to include hospitalization type
         hosp_details = {}
 
         # Hospitalization Type (Emergency or Planned)
-        hosp_type_match = re.search(r'Is\s+this\s+an\s+Emergency/Planned\s+Hospitalization\s*:\s*(Emergency|Planned)', text, re.IGNORECASE)
+        hosp_type_match = HOSPITALIZATION_TYPE_PATTERN.search(hospitalization_text)
         if hosp_type_match:
             hosp_type = hosp_type_match.group(1).strip().title()
             hosp_details['hospitalization_type'] = hosp_type
-            fields_found += 1
+            field_confidence['hospitalization_details.hospitalization_type'] = 1.0
 
         # Date of Admission
-        admission_patterns = [
-            r'Date\s+of\s+Admission\s*:\s*([\d\/\-]+)',
-            r'Planned\s+Admission\s+Date[:\s]+([\d\/\-]+)',
-        ]
-        for pattern in admission_patterns:
-            admission_match = re.search(pattern, text, re.IGNORECASE)
-            if admission_match:
-                hosp_details['planned_admission_date'] = admission_match.group(1).strip()
-                fields_found += 1
-                break
-        if 'planned_admission_date' not in hosp_details:
+        admission_match = _search_first(ADMISSION_PATTERNS, hospitalization_text)
+        if admission_match:
+            hosp_details['planned_admission_date'] = admission_match.group(1).strip()
+            field_confidence['hospitalization_details.planned_admission_date'] = 1.0
+        else:
             hosp_details['planned_admission_date'] = "01/01/2025"
 
         # Expected Number of Days/Stay
-        stay_patterns = [
-            r'Expected\s+Number\s+of\s+Days/Stay\s+in\s+Hospital\s*:\s*(\d+)\s*Days?',
-            r'Expected\s+(?:Length\s+of\s+)?Stay[:\s]+(\d+)',
-        ]
-        for pattern in stay_patterns:
-            stay_match = re.search(pattern, text, re.IGNORECASE)
-            if stay_match:
-                hosp_details['expected_length_of_stay'] = int(stay_match.group(1))
-                fields_found += 1
-                break
-        if 'expected_length_of_stay' not in hosp_details:
+        stay_match = _search_first(STAY_PATTERNS, hospitalization_text)
+        if stay_match:
+            hosp_details['expected_length_of_stay'] = int(stay_match.group(1))
+            field_confidence['hospitalization_details.expected_length_of_stay'] = 1.0
+        else:
             hosp_details['expected_length_of_stay'] = 1
 
         # Days in ICU
-        icu_days_match = re.search(r'Days\s+in\s+ICU[^:]*:\s*(\d+)', text, re.IGNORECASE)
+        icu_days_match = ICU_DAYS_PATTERN.search(hospitalization_text)
         if icu_days_match:
             icu_days = int(icu_days_match.group(1))
             hosp_details['icu_required'] = icu_days > 0
@@ -508,110 +766,60 @@ class PDFExtractor:
         data['hospitalization_details'] = hosp_details
 
         # === COST BREAKDOWN (Section 11) ===
-        total_fields += 2
+        # Searched only within Section 11 to avoid matching numbers from earlier sections
         costs = {}
 
-        # First, extract just the cost breakdown section to avoid matching numbers from earlier sections
-        # Section 11 starts with "ESTIMATED COST" and ends before Section 12 "DECLARATION"
-        cost_section_match = re.search(r'11\.\s*ESTIMATED\s+COST.*?(?=12\.|DECLARATION|$)', text, re.DOTALL | re.IGNORECASE)
-        cost_text = cost_section_match.group(0) if cost_section_match else text
-
         # Extract individual cost components from new template format
         # "Room Rent + Nursing & Service Charges + Patient's Diet"
-        # Support both ₹ and Rs. symbols, or no symbol, or ■ (black square from encoding issues)
-        room_patterns = [
-            r'Room\s+Rent[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-            r'Per\s+Day\s+Room\s+Rent[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-        ]
-        for pattern in room_patterns:
-            room_match = re.search(pattern, cost_text, re.IGNORECASE)
-            if room_match:
-                costs['room_charges'] = float(re.sub(r'[,]', '', room_match.group(1)))
-                break
-        if 'room_charges' not in costs:
-            costs['room_charges'] = 0.0
+        # Amounts support ₹, Rs. or no symbol, or ■ (black square from encoding issues)
+        room_match = _search_first(ROOM_RENT_PATTERNS, cost_text)
+        costs['room_charges'] = _parse_amount(room_match)
 
         # "Professional Fees (Surgeon + Anesthetist + Consultation Charges)"
-        prof_fee_match = re.search(r'Professional\s+Fees[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
+        prof_fee_match = PROFESSIONAL_FEES_PATTERN.search(cost_text)
         if prof_fee_match:
             # Split professional fees (assuming 70/30 split for surgeon/anesthetist)
-            total_prof = float(re.sub(r'[,]', '', prof_fee_match.group(1)))
+            total_prof = _parse_amount(prof_fee_match)
             costs['surgeon_fees'] = total_prof * 0.7
             costs['anesthetist_fees'] = total_prof * 0.3
         else:
             # Try individual matches
-            surgeon_match = re.search(r'Surgeon\s+Fees?[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-            costs['surgeon_fees'] = float(re.sub(r'[,]', '', surgeon_match.group(1))) if surgeon_match else 0.0
-
-            anes_fee_match = re.search(r'Anesthetist\s+Fees?[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-            costs['anesthetist_fees'] = float(re.sub(r'[,]', '', anes_fee_match.group(1))) if anes_fee_match else 0.0
+            costs['surgeon_fees'] = _parse_amount(SURGEON_FEES_PATTERN.search(cost_text))
+            costs['anesthetist_fees'] = _parse_amount(ANESTHETIST_FEES_PATTERN.search(cost_text))
 
         # OT Charges
-        ot_match = re.search(r'OT\s+Charges[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-        costs['ot_charges'] = float(re.sub(r'[,]', '', ot_match.group(1))) if ot_match else 0.0
+        costs['ot_charges'] = _parse_amount(OT_CHARGES_PATTERN.search(cost_text))
 
         # ICU Charges
-        icu_match = re.search(r'ICU\s+Charges[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-        costs['icu_charges'] = float(re.sub(r'[,]', '', icu_match.group(1))) if icu_match else 0.0
+        costs['icu_charges'] = _parse_amount(ICU_CHARGES_PATTERN.search(cost_text))
 
         # "Expected Cost of Investigation + Diagnostic"
         # Note: Some PDFs may have OCR artifacts like "Inves Ɵga Ɵon" instead of "Investigation"
-        invest_patterns = [
-            r'Expected\s+Cost\s+of\s+Inves[^\n]{0,20}(?:Diagnos|Diagnostic)[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-            r'Investigation[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-        ]
-        for pattern in invest_patterns:
-            invest_match = re.search(pattern, cost_text, re.IGNORECASE)
-            if invest_match:
-                costs['investigations'] = float(re.sub(r'[,]', '', invest_match.group(1)))
-                break
-        if 'investigations' not in costs:
-            costs['investigations'] = 0.0
+        costs['investigations'] = _parse_amount(_search_first(INVESTIGATION_COST_PATTERNS, cost_text))
 
         # "Medicines + Consumables + Cost of Implants"
         # Check if it's a combined line (medicines + consumables + implants together)
-        combined_med_pattern = r'Medicines\s*\+\s*Consumables\s*\+\s*(?:Cost\s+of\s+)?Implants[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)'
-        combined_match = re.search(combined_med_pattern, cost_text, re.IGNORECASE)
+        combined_match = COMBINED_MEDICINES_PATTERN.search(cost_text)
 
         if combined_match:
             # Combined line - put everything in medicines_consumables, implants = 0
-            costs['medicines_consumables'] = float(re.sub(r'[,]', '', combined_match.group(1)))
+            costs['medicines_consumables'] = _parse_amount(combined_match)
             costs['implants'] = 0.0
         else:
             # Separate lines - extract individually
-            med_patterns = [
-                r'Medicines\s*\+\s*Consumables[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-                r'Medicines[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-            ]
-            for pattern in med_patterns:
-                med_match = re.search(pattern, cost_text, re.IGNORECASE)
-                if med_match:
-                    costs['medicines_consumables'] = float(re.sub(r'[,]', '', med_match.group(1)))
-                    break
-            if 'medicines_consumables' not in costs:
-                costs['medicines_consumables'] = 0.0
+            costs['medicines_consumables'] = _parse_amount(_search_first(MEDICINES_PATTERNS, cost_text))
 
             # Implants (separate if specified)
-            implant_match = re.search(r'(?:Cost\s+of\s+)?Implants[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-            costs['implants'] = float(re.sub(r'[,]', '', implant_match.group(1))) if implant_match else 0.0
+            costs['implants'] = _parse_amount(IMPLANTS_PATTERN.search(cost_text))
 
         # Other Hospital Expenses
-        other_match = re.search(r'Other\s+Hospital\s+Expenses[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)', cost_text, re.IGNORECASE)
-        costs['other_charges'] = float(re.sub(r'[,]', '', other_match.group(1))) if other_match else 0.0
+        costs['other_charges'] = _parse_amount(OTHER_EXPENSES_PATTERN.search(cost_text))
 
         # Total Cost - "SUM-TOTAL EXPECTED COST OF HOSPITALIZATION"
-        total_patterns = [
-            r'SUM[- ]TOTAL\s+EXPECTED\s+COST[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-            r'TOTAL[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+)',
-        ]
-        for pattern in total_patterns:
-            total_match = re.search(pattern, cost_text, re.IGNORECASE)
-            if total_match:
-                costs['total_estimated_cost'] = float(re.sub(r'[,]', '', total_match.group(1)))
-                fields_found += 1
-                break
-        
-        if 'total_estimated_cost' not in costs:
+        total_match = _search_first(TOTAL_COST_PATTERNS, cost_text)
+        if total_match:
+            costs['total_estimated_cost'] = _parse_amount(total_match)
+        else:
             # Calculate from components
             costs['total_estimated_cost'] = sum([
                 costs.get('room_charges', 0),
@@ -626,88 +834,61 @@ class PDFExtractor:
             ])
 
         if costs['total_estimated_cost'] > 0:
-            fields_found += 1
+            # A stated total is certain; one summed from the components may miss lines
+            field_confidence['cost_breakdown.total_estimated_cost'] = 1.0 if total_match else 0.5
 
         data['cost_breakdown'] = costs
 
         # === DOCTOR DETAILS (Section 2 / Declaration 12) ===
-        total_fields += 1
         doctor = {}
 
-        # Doctor Name from "Doctor's Name" in declaration or treating doctor section
-        doc_patterns = [
-            r'Doctor\'s\s+Name\s*:\s*([A-Za-z\s\.]+?)(?=\s*Doctor\'s\s+Signature|\n|$)',
-            r'Doctor\s+Name\s*:\s*Dr\.?\s*([A-Za-z\s\.]+?)(?=\s*Contact|\n)',
-        ]
-        for pattern in doc_patterns:
-            doc_match = re.search(pattern, text, re.IGNORECASE)
-            if doc_match:
-                name = doc_match.group(1).strip()
-                # Add Dr. prefix if not present
-                if not name.startswith('Dr'):
-                    name = 'Dr. ' + name
-                doctor['name'] = name
-                fields_found += 1
-                break
-        if 'name' not in doctor:
+        # Doctor Name from "Doctor's Name" in declaration, else treating doctor section
+        doc_match = DECLARATION_DOCTOR_NAME_PATTERN.search(declaration_text) or DOCTOR_NAME_PATTERN.search(doctor_text)
+        if doc_match:
+            name = doc_match.group(1).strip()
+            # Add Dr. prefix if not present
+            if not name.startswith('Dr'):
+                name = 'Dr. ' + name
+            doctor['name'] = name
+            field_confidence['doctor_details.name'] = 1.0
+        else:
             doctor['name'] = "Dr. Unknown"
 
         # Qualification
-        qual_patterns = [
-            r'Qualification\s*:\s*([A-Z\s,\.\(\)]+?)(?=\s*Registration|\n)',
-        ]
-        for pattern in qual_patterns:
-            qual_match = re.search(pattern, text, re.IGNORECASE)
-            if qual_match:
-                doctor['qualification'] = qual_match.group(1).strip()[:100]
-                break
+        qual_match = QUALIFICATION_PATTERN.search(doctor_text)
+        if qual_match:
+            doctor['qualification'] = qual_match.group(1).strip()[:100]
 
         # Registration Number
-        reg_patterns = [
-            r'Registration\s+Number[^:]*:\s*([\w\/\d]+)',
-        ]
-        for pattern in reg_patterns:
-            reg_match = re.search(pattern, text, re.IGNORECASE)
-            if reg_match:
-                doctor['registration_number'] = reg_match.group(1).strip()
-                break
+        reg_match = REGISTRATION_PATTERN.search(doctor_text)
+        if reg_match:
+            doctor['registration_number'] = reg_match.group(1).strip()
 
         data['doctor_details'] = doctor
 
         # === HOSPITAL DETAILS ===
-        total_fields += 1
         hospital = {}
 
         # Hospital Name - try to extract from letterhead/header (first few lines)
         # Look for hospital name in first 500 characters (letterhead area)
-        header_text = text[:500]
-        
-        # Try to find hospital name patterns in header
-        hosp_patterns = [
-            r'^([A-Z][A-Za-z\s&\.]+(?:Hospital|Clinic|Medical Center|Healthcare))',
-            r'([A-Z][A-Za-z\s&\.]+(?:Hospital|Clinic|Medical Center|Healthcare))\s*\n',
-        ]
-        
-        for pattern in hosp_patterns:
-            hosp_match = re.search(pattern, header_text, re.MULTILINE)
+        header_text = text[:HEADER_LENGTH]
+
+        for pattern in HOSPITAL_NAME_PATTERNS:
+            hosp_match = pattern.search(header_text)
             if hosp_match:
                 hosp_name = hosp_match.group(1).strip()
                 # Avoid matching "Emergency/Planned Hospitalization"
                 if "Emergency" not in hosp_name and "Planned" not in hosp_name and len(hosp_name) > 5:
                     hospital['name'] = hosp_name
-                    fields_found += 1
+                    field_confidence['hospital_details.name'] = 1.0
                     break
-        
+
         if 'name' not in hospital:
             hospital['name'] = "Hospital name not specified in document"
 
-        # Hospital Address - look for address field if exists
-        addr_patterns = [
-            r'Hospital\s+Address\s*:\s*(.{10,200}?)(?:\n\n|Registration|$)',
-            r'Address\s*:\s*(.{10,200}?)(?:\n\n|Registration|Contact|$)',
-        ]
-        for pattern in addr_patterns:
-            addr_match = re.search(pattern, text, re.IGNORECASE)
+        # Hospital Address - look for address field if exists (no dedicated template section)
+        for pattern in ADDRESS_PATTERNS:
+            addr_match = pattern.search(text)
             if addr_match:
                 address = addr_match.group(1).strip()
                 # Avoid matching hospitalization type
@@ -717,24 +898,83 @@ class PDFExtractor:
 
         data['hospital_details'] = hospital
 
-        # Calculate confidence
-        confidence = fields_found / total_fields if total_fields > 0 else 0.0
+        return data, field_confidence, sections, text
 
-        return data, confidence
-
-    def _parse_with_llm(self, pdf_text: str) -> Dict:
+    def _fill_with_llm(self, data: Dict, fields: List[str], sections: Dict[str, str], text: str) -> Dict:
         """
-        Fallback: Parse using LLM (only if enabled and rule-based fails)
+        Fallback: ask the LLM for the given fields only and merge them into data
+
+        The prompt carries only the text of the sections those fields are read
+        from, not the full document; fields whose sections the note lacks are
+        not asked for. Notes without template sections are sent whole. Fields
+        the LLM can't answer keep their rule-based value.
 
         Args:
-            pdf_text: Raw text from PDF
+            data: Rule-based extraction (updated in place)
+            fields: FIELD_SPECS paths to extract
+            sections: Sections from _split_sections
+            text: Cleaned text the sections were split from (see _parse_fields)
 
         Returns:
-            Dictionary with structured medical data
+            data with the LLM's values merged in
         """
-        # LLM parsing implementation (same as before)
-        # This will only be called if enable_llm_fallback=True and confidence < 0.7
-        raise NotImplementedError("LLM fallback is disabled. Enable with enable_llm_fallback=True")
+        if sections:
+            # A field whose sections the note doesn't have can't be read from an excerpt
+            fields = [
+                field for field in fields
+                if any(key == 'header' or key in sections for key in FIELD_SPECS[field][0])
+            ]
+            if not fields:
+                return data
+            section_keys = []
+            for field in fields:
+                for key in FIELD_SPECS[field][0]:
+                    if key not in section_keys and (key == 'header' or key in sections):
+                        section_keys.append(key)
+            # The letterhead ends where the first section starts
+            first_heading = SECTION_HEADING_PATTERN.search(text)
+            header = text[:min(HEADER_LENGTH, first_heading.start() if first_heading else HEADER_LENGTH)]
+            excerpt = "\n".join(header if key == 'header' else sections[key] for key in section_keys)
+        else:
+            # Free-form note: no sections to narrow the text down to
+            excerpt = text
+
+        field_lines = []
+        for field in fields:
+            _, value_type, description = FIELD_SPECS[field]
+            if isinstance(value_type, tuple):
+                description += f" (one of: {', '.join(value_type)})"
+            elif value_type is not str:
+                description += " (number)"
+            field_lines.append(f"- {field}: {description}")
+        prompt = FIELD_FALLBACK_PROMPT.format(fields="\n".join(field_lines), excerpt=excerpt.strip())
+
+        try:
+            with telemetry.span("pdf_extraction.field_fallback"):
+                response = call_llm_with_retry(
+                    prompt=prompt,
+                    model=LLM_FALLBACK_MODEL,
+                    max_tokens=1000,
+                    temperature=0.2
+                )
+            answer = json.loads(response[response.find('{'):response.rfind('}') + 1])
+            if not isinstance(answer, dict):
+                raise ValueError("response is not a JSON object")
+        except Exception as e:
+            logger.warning("LLM field extraction failed, keeping rule-based values: %s", e)
+            return data
+
+        filled = []
+        for field in fields:
+            value = _coerce_field(answer.get(field), FIELD_SPECS[field][1])
+            if value is None:
+                continue
+            group, name = field.split('.', 1)
+            data.setdefault(group, {})[name] = value
+            filled.append(field)
+
+        logger.info("LLM filled %d of %d low-confidence fields", len(filled), len(fields))
+        return data
 
     def extract_from_text(self, text_content: str) -> MedicalNote:
         """
@@ -746,10 +986,7 @@ class PDFExtractor:
         Returns:
             MedicalNote object
         """
-        medical_data, confidence = self._parse_with_rules(text_content)
-
-        if self.enable_llm_fallback and confidence < 0.7:
-            medical_data = self._parse_with_llm(text_content)
+        medical_data = self._parse(text_content)
 
         try:
             medical_note = MedicalNote(**medical_data)
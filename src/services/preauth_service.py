@@ -3,13 +3,20 @@ PreAuth Service (Orchestrator)
 Main orchestration layer that runs all 4 agents and aggregates results
 """
 
-from typing import Dict
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
 from src.models.schemas import (
     PreAuthRequest,
     ValidationResult,
     MedicalNote,
     ProcedureData,
-    PolicyData
+    PolicyData,
+    MedicalReviewResult,
+    MedicalConcern,
+    FWADetectionResult
 )
 from src.agents.completeness_checker import CompletenessChecker
 from src.agents.policy_validator import PolicyValidator
@@ -17,7 +24,13 @@ from src.agents.medical_reviewer import MedicalReviewer
 from src.agents.fwa_detector import FWADetector
 from src.services.aggregator import Aggregator
 from src.services.pdf_extractor import PDFExtractor
+from src.utils import telemetry
 from src.utils.data_loader import load_policy_data, load_procedure_data
+from src.utils.logging_config import lazy_json
+from src.utils.pdf_document import PDFSource
+
+
+logger = logging.getLogger(__name__)
 
 
 class PreAuthService:
@@ -31,13 +44,33 @@ class PreAuthService:
     4. FWA Detector - detects fraud/waste/abuse (hybrid)
 
     Then aggregates results into final validation decision.
+
+    Agents 3 and 4 each block on an LLM call and do not depend on each other,
+    so by default they run concurrently on a small thread pool while agents
+    1 and 2 run in the calling thread. End-to-end latency is then close to the
+    slower of the two LLM calls instead of their sum.
+
+    Each agent, the PDF extraction and the aggregation run in a telemetry span
+    (see src.utils.telemetry), so their latency and LLM spend are measured.
     """
 
-    def __init__(self, enable_llm_fallback: bool = False):
+    def __init__(
+        self,
+        enable_llm_fallback: bool = False,
+        concurrent_agents: bool = True,
+        agent_timeout: Optional[float] = None,
+        max_agent_workers: int = 4
+    ):
         """Initialize all agents, aggregator, and PDF extractor
 
         Args:
             enable_llm_fallback: Enable LLM fallback for PDF extraction if rule-based fails
+            concurrent_agents: Run Medical Reviewer and FWA Detector concurrently (default: True).
+                Set to False to run all agents strictly in sequence.
+            agent_timeout: Maximum seconds to wait for each LLM agent in concurrent mode.
+                On timeout the agent's graceful-degradation result is used. None waits indefinitely.
+            max_agent_workers: Size of the agent thread pool. Each validation uses two workers,
+                so raise this when one service is shared by many concurrent validations.
         """
         self.completeness_checker = CompletenessChecker()
         self.policy_validator = PolicyValidator()
@@ -46,6 +79,12 @@ class PreAuthService:
         self.aggregator = Aggregator()
         self.pdf_extractor = PDFExtractor(enable_llm_fallback=enable_llm_fallback)
 
+        self.concurrent_agents = concurrent_agents
+        self.agent_timeout = agent_timeout
+        self.max_agent_workers = max_agent_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
     def validate_preauth(
         self,
         medical_note: MedicalNote,
@@ -71,52 +110,165 @@ class PreAuthService:
             >>> print(result.final_score)  # 85
             >>> print(result.approval_likelihood)  # "high"
         """
+        # Convert procedure_data to dict for LLM prompt construction
+        procedure_dict = procedure_data if isinstance(procedure_data, dict) else procedure_data.model_dump()
+
+        if not self.concurrent_agents:
+            completeness_result, policy_result = self._run_rule_agents(
+                medical_note, policy_data, form_data
+            )
+            medical_result = self._run_medical_review(medical_note, procedure_dict)
+            fwa_result = self._run_fwa_detection(medical_note, procedure_dict)
+        else:
+            # Agents 3 & 4 (LLM-bound) are started first so they are in flight
+            # while the rule-based agents run in this thread
+            executor = self._get_executor()
+            started_at = time.monotonic()
+            medical_future = executor.submit(telemetry.wrap(self._run_medical_review), medical_note, procedure_dict)
+            fwa_future = executor.submit(telemetry.wrap(self._run_fwa_detection), medical_note, procedure_dict)
+
+            completeness_result, policy_result = self._run_rule_agents(
+                medical_note, policy_data, form_data
+            )
+
+            medical_result = self._wait_for_agent(
+                medical_future,
+                started_at,
+                on_timeout=self._medical_timeout_result
+            )
+            fwa_result = self._wait_for_agent(
+                fwa_future,
+                started_at,
+                on_timeout=lambda: self.fwa_detector.detect_rules_only(
+                    costs=medical_note.cost_breakdown.model_dump(),
+                    procedure_data=procedure_dict,
+                    stay_duration=medical_note.hospitalization_details.expected_length_of_stay
+                )
+            )
+
+        # Aggregate all results
+        with telemetry.span("aggregation"):
+            final_result = self.aggregator.aggregate(
+                completeness=completeness_result,
+                policy=policy_result,
+                medical=medical_result,
+                fwa=fwa_result
+            )
+
+        return final_result
+
+    def _run_rule_agents(
+        self,
+        medical_note: MedicalNote,
+        policy_data: PolicyData,
+        form_data: Dict
+    ) -> tuple:
+        """
+        Run the rule-based agents (1 and 2)
+
+        Returns:
+            Tuple of (CompletenessResult, PolicyValidationResult)
+        """
         # Agent 1: Completeness Checker
-        completeness_result = self.completeness_checker.validate(
-            form_data=form_data,
-            medical_note=medical_note
-        )
+        with telemetry.span("agent.completeness"):
+            completeness_result = self.completeness_checker.validate(
+                form_data=form_data,
+                medical_note=medical_note
+            )
 
         # Agent 2: Policy Validator
         # Pass policy_data as-is (PolicyData object), validator will use it for utilities
-        policy_result = self.policy_validator.validate(
-            policy_data=policy_data,
-            procedure_id=form_data['procedure_id'],
-            form_data=form_data,
-            medical_note=medical_note
-        )
+        with telemetry.span("agent.policy_validation"):
+            policy_result = self.policy_validator.validate(
+                policy_data=policy_data,
+                procedure_id=form_data['procedure_id'],
+                form_data=form_data,
+                medical_note=medical_note
+            )
 
-        # Agent 3: Medical Reviewer
-        # Convert procedure_data to dict for LLM prompt construction
-        procedure_dict = procedure_data if isinstance(procedure_data, dict) else procedure_data.model_dump()
-        medical_result = self.medical_reviewer.review(
-            diagnosis=medical_note.diagnosis.primary_diagnosis,
-            treatment=medical_note.proposed_treatment.procedure_name,
-            justification=self._build_justification_text(medical_note),
-            procedure_data=procedure_dict,
-            medical_note=medical_note
-        )
+        return completeness_result, policy_result
 
-        # Agent 4: FWA Detector
-        # Convert procedure_data to dict for LLM prompt construction
-        fwa_result = self.fwa_detector.detect(
-            diagnosis=medical_note.diagnosis.primary_diagnosis,
-            treatment=medical_note.proposed_treatment.procedure_name,
-            costs=medical_note.cost_breakdown.model_dump(),
-            procedure_data=procedure_dict,
-            stay_duration=medical_note.hospitalization_details.expected_length_of_stay,
-            medical_note=medical_note
-        )
+    def _run_medical_review(self, medical_note: MedicalNote, procedure_dict: Dict) -> MedicalReviewResult:
+        """Agent 3: Medical Reviewer"""
+        with telemetry.span("agent.medical_review"):
+            return self.medical_reviewer.review(
+                diagnosis=medical_note.diagnosis.primary_diagnosis,
+                treatment=medical_note.proposed_treatment.procedure_name,
+                justification=self._build_justification_text(medical_note),
+                procedure_data=procedure_dict,
+                medical_note=medical_note
+            )
 
-        # Aggregate all results
-        final_result = self.aggregator.aggregate(
-            completeness=completeness_result,
-            policy=policy_result,
-            medical=medical_result,
-            fwa=fwa_result
+    def _run_fwa_detection(self, medical_note: MedicalNote, procedure_dict: Dict) -> FWADetectionResult:
+        """Agent 4: FWA Detector"""
+        with telemetry.span("agent.fwa_detection"):
+            return self.fwa_detector.detect(
+                diagnosis=medical_note.diagnosis.primary_diagnosis,
+                treatment=medical_note.proposed_treatment.procedure_name,
+                costs=medical_note.cost_breakdown.model_dump(),
+                procedure_data=procedure_dict,
+                stay_duration=medical_note.hospitalization_details.expected_length_of_stay,
+                medical_note=medical_note
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for concurrent agent execution"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_agent_workers,
+                    thread_name_prefix="preauth-agent"
+                )
+            return self._executor
+
+    def _wait_for_agent(self, future: Future, started_at: float, on_timeout):
+        """
+        Wait for a concurrently running agent, honouring the per-agent timeout
+
+        The timeout is measured from when the agents were submitted, so both
+        agents share the same deadline.
+
+        Args:
+            future: Future of the running agent
+            started_at: time.monotonic() when the agent was submitted
+            on_timeout: Callable producing the fallback result on timeout
+
+        Returns:
+            Agent result, or the fallback result if the agent timed out
+        """
+        if self.agent_timeout is None:
+            return future.result()
+
+        remaining = max(0.0, self.agent_timeout - (time.monotonic() - started_at))
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # The worker thread cannot be interrupted; let it finish in the
+            # background and discard its result
+            future.cancel()
+            return on_timeout()
+
+    def _medical_timeout_result(self) -> MedicalReviewResult:
+        """Graceful-degradation result used when the Medical Reviewer times out"""
+        return MedicalReviewResult(
+            status="warning",
+            concerns=[
+                MedicalConcern(
+                    type="insufficient_justification",
+                    description=f"Unable to perform LLM review: timed out after {self.agent_timeout:g}s",
+                    suggestion="Manual review recommended"
+                )
+            ],
+            score_impact=-5,
+            doctor_feedback_required=True
         )
 
-        return final_result
+    def shutdown(self):
+        """Release the agent thread pool (safe to call more than once)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
 
     def _build_justification_text(self, medical_note: MedicalNote) -> str:
         """
@@ -139,7 +291,7 @@ Expected Outcomes: {mj.expected_outcomes or 'Not specified'}
 
     def validate_preauth_from_pdf(
         self,
-        pdf_path: str,
+        pdf_path: PDFSource,
         insurer: str,
         policy_type: str,
         procedure_id: str,
@@ -149,7 +301,8 @@ Expected Outcomes: {mj.expected_outcomes or 'Not specified'}
         Complete end-to-end pre-authorization validation from PDF
 
         Args:
-            pdf_path: Path to medical note PDF file
+            pdf_path: Path to medical note PDF file, or its content (bytes,
+                BytesIO, memoryview or an uploaded file)
             insurer: Insurance company name (e.g., "Star Health")
             policy_type: Policy type (e.g., "Comprehensive")
             procedure_id: Procedure identifier (e.g., "cataract_surgery")
@@ -177,14 +330,10 @@ Expected Outcomes: {mj.expected_outcomes or 'Not specified'}
             >>> print(result.final_score)
         """
         # Step 1: Extract medical note from PDF
-        medical_note = self.pdf_extractor.extract_from_pdf(pdf_path)
-        
-        # Print extracted data for debugging
-        print("\n" + "="*80)
-        print("DATA EXTRACTED FROM PDF")
-        print("="*80)
-        print(medical_note.model_dump_json(indent=2))
-        print("="*80 + "\n")
+        with telemetry.span("pdf_extraction"):
+            medical_note = self.pdf_extractor.extract_from_pdf(pdf_path)
+
+        logger.debug("Data extracted from PDF:\n%s", lazy_json(medical_note))
 
         # Step 2: Load policy and procedure data
         policy_data = load_policy_data(insurer, policy_type)
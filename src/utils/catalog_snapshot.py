@@ -0,0 +1,223 @@
+"""
+Catalog snapshot
+Compiles the reference data (procedure registry, medical_data/*.json and
+policy_data/*.json) into one versioned file of already-validated models
+
+A new worker that finds a snapshot seeds the data catalog from it instead of
+decoding and validating every JSON file on its first requests. Entries stay
+tied to their source files: each records the file's SHA-256, and the data
+catalog only uses a seeded value while the file on disk still has that content,
+so an outdated snapshot degrades to reading the JSON, never to stale data.
+
+File layout:
+
+    MAGIC (8 bytes) | format version (uint16) | SHA-256 of payload (32 bytes) | payload (pickle)
+
+The payload is also bound to the model definitions (src/models/schemas.py) and
+the Pydantic version; a snapshot built against other models is ignored.
+Snapshots are build artifacts of this codebase and are trusted like code
+(pickle), so only load snapshots you built.
+
+Build with:
+
+    python -m src.utils.catalog_snapshot build
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pydantic
+
+
+MAGIC = b"CRCATSNP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">8sH32s")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SCHEMAS_PATH = PROJECT_ROOT / "src" / "models" / "schemas.py"
+DEFAULT_SNAPSHOT_PATH = PROJECT_ROOT / "data" / "catalog_snapshot.bin"
+
+
+class SnapshotError(Exception):
+    """Snapshot is missing, corrupt or built for different code"""
+
+
+def schema_fingerprint() -> str:
+    """
+    Fingerprint of the model definitions the snapshot's objects were built with
+
+    Returns:
+        Hex SHA-256 over schemas.py and the Pydantic version
+    """
+    digest = hashlib.sha256(SCHEMAS_PATH.read_bytes())
+    digest.update(pydantic.VERSION.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_snapshot(path: Union[str, Path], entries: List[Dict]) -> Dict:
+    """
+    Write catalog entries to a snapshot file
+
+    Args:
+        path: Output file
+        entries: DataCatalog.export() entries; paths under the project root are
+            stored relative to it so the snapshot survives relocation
+
+    Returns:
+        Dict with path, entries and bytes written
+    """
+    stored = []
+    for entry in entries:
+        entry_path = Path(entry["path"])
+        try:
+            entry_path = entry_path.resolve().relative_to(PROJECT_ROOT.resolve())
+        except ValueError:
+            pass
+        stored.append({**entry, "path": entry_path.as_posix()})
+
+    payload = pickle.dumps(
+        {
+            "schema_fingerprint": schema_fingerprint(),
+            "created_at": time.time(),
+            "entries": stored
+        },
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+    data = _HEADER.pack(MAGIC, FORMAT_VERSION, hashlib.sha256(payload).digest()) + payload
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write atomically so workers starting meanwhile never read a partial file
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    return {"path": str(path), "entries": len(stored), "bytes": len(data)}
+
+
+def read_snapshot(path: Union[str, Path]) -> Dict:
+    """
+    Read and verify a snapshot
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Payload dict with schema_fingerprint, created_at and entries (paths made absolute)
+
+    Raises:
+        SnapshotError: If the file is missing, truncated, corrupt, of another
+            format version or built against different models
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+
+    magic, version, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a catalog snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Snapshot format {version} is not supported (expected {FORMAT_VERSION})")
+
+    payload = memoryview(data)[_HEADER.size:]
+    if hashlib.sha256(payload).digest() != checksum:
+        raise SnapshotError(f"Snapshot {path} failed its integrity check")
+
+    try:
+        snapshot = pickle.loads(payload)
+    except Exception as e:
+        raise SnapshotError(f"Snapshot {path} could not be decoded: {e}") from e
+
+    if snapshot.get("schema_fingerprint") != schema_fingerprint():
+        raise SnapshotError(f"Snapshot {path} was built for different data models; rebuild it")
+
+    for entry in snapshot["entries"]:
+        entry["path"] = str(PROJECT_ROOT / entry["path"])
+    return snapshot
+
+
+def get_snapshot_path() -> Optional[Path]:
+    """
+    Snapshot location from the environment
+
+    - CATALOG_SNAPSHOT_ENABLED: "false" / "0" to never use a snapshot (default: enabled)
+    - CATALOG_SNAPSHOT_PATH: Snapshot file (default: data/catalog_snapshot.bin)
+
+    Returns:
+        Path, or None if snapshots are disabled
+    """
+    enabled = os.getenv("CATALOG_SNAPSHOT_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+    if not enabled:
+        return None
+    return Path(os.getenv("CATALOG_SNAPSHOT_PATH", str(DEFAULT_SNAPSHOT_PATH)))
+
+
+def build_snapshot(path: Optional[Union[str, Path]] = None) -> Dict:
+    """
+    Parse the whole reference catalog from JSON and write it as a snapshot
+
+    Args:
+        path: Output file (default: get_snapshot_path() or data/catalog_snapshot.bin)
+
+    Returns:
+        Dict with path, entries and bytes written
+    """
+    from src.utils.data_catalog import DataCatalog
+    from src.utils.data_loader import load_all_data
+
+    # A private catalog, so the snapshot reflects the files on disk now
+    catalog = DataCatalog(max_entries=1_000_000, check_interval=0)
+    load_all_data(catalog)
+    return write_snapshot(path or get_snapshot_path() or DEFAULT_SNAPSHOT_PATH, catalog.export())
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command-line entry point: python -m src.utils.catalog_snapshot build|verify"""
+    parser = argparse.ArgumentParser(description="Compiled reference data snapshot")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--path", help="Snapshot file (default: CATALOG_SNAPSHOT_PATH or data/catalog_snapshot.bin)")
+    args = parser.parse_args(argv)
+
+    path = Path(args.path) if args.path else (get_snapshot_path() or DEFAULT_SNAPSHOT_PATH)
+
+    if args.command == "build":
+        result = build_snapshot(path)
+        print(f"Wrote {result['entries']} entries ({result['bytes']} bytes) to {result['path']}")
+        return 0
+
+    try:
+        snapshot = read_snapshot(path)
+    except SnapshotError as e:
+        print(f"Invalid: {e}")
+        return 1
+
+    stale = []
+    for entry in snapshot["entries"]:
+        try:
+            current = hashlib.sha256(Path(entry["path"]).read_bytes()).hexdigest()
+        except OSError:
+            current = None
+        if current != entry["sha256"]:
+            stale.append(entry["path"])
+
+    print(f"Valid snapshot with {len(snapshot['entries'])} entries, {len(stale)} out of date")
+    for stale_path in stale:
+        print(f"  changed since build: {stale_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""
+Data catalog
+In-process cache of parsed policy, procedure and registry JSON files with
+change detection, so edits to policy_data/ or medical_data/ are picked up
+without restarting the process
+
+Each cached file remembers its mtime, size and SHA-256. At most once per
+check_interval a lookup re-stats the file; if mtime or size changed the file is
+re-read, and it is re-parsed only if its content hash changed (a touch or an
+identical copy keeps the parsed object).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+class _CatalogEntry:
+    __slots__ = ("value", "mtime_ns", "size", "sha256", "checked_at")
+
+    def __init__(self, value: Any, mtime_ns: int, size: int, sha256: str, checked_at: float):
+        self.value = value
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.checked_at = checked_at
+
+
+class DataCatalog:
+    """
+    LRU cache of parsed JSON data files, invalidated by file changes
+
+    Sized to hold the whole catalog (all policies and procedures) by default,
+    so a long-running worker never re-parses files that have not changed.
+    """
+
+    def __init__(self, max_entries: int = 1024, check_interval: float = 2.0):
+        """
+        Initialize data catalog
+
+        Args:
+            max_entries: Parsed files kept in memory (least recently used are dropped)
+            check_interval: Seconds between change checks of a file; 0 checks on every lookup
+        """
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+        self._entries: "OrderedDict[str, _CatalogEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def load(self, path: Union[str, Path], parse: Callable[[Any], Any]) -> Any:
+        """
+        Get the parsed content of a JSON file, reading it only when new or changed
+
+        Args:
+            path: JSON file path
+            parse: Builds the cached value from the decoded JSON (e.g. a Pydantic model)
+
+        Returns:
+            The parsed value (the same object until the file content changes)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist (any cached value is dropped)
+        """
+        key = str(path)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.checked_at < self.check_interval:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+            try:
+                st = os.stat(key)
+            except FileNotFoundError:
+                self._entries.pop(key, None)
+                raise
+
+            if entry is not None and (st.st_mtime_ns, st.st_size) == (entry.mtime_ns, entry.size):
+                entry.checked_at = now
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+            with open(key, "rb") as f:
+                raw = f.read()
+            sha256 = hashlib.sha256(raw).hexdigest()
+
+            if entry is not None and sha256 == entry.sha256:
+                # Touched or rewritten with identical content: keep the parsed value
+                value = entry.value
+                self.hits += 1
+            else:
+                value = parse(json.loads(raw.decode("utf-8")))
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.reloads += 1
+
+            self._entries[key] = _CatalogEntry(value, st.st_mtime_ns, st.st_size, sha256, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            return value
+
+    def seed(self, path: Union[str, Path], value: Any, sha256: str, mtime_ns: int = 0, size: int = -1) -> bool:
+        """
+        Pre-populate a parsed value (e.g. from a compiled snapshot)
+
+        The value is trusted only while the file still matches: the first lookup
+        re-stats the file, and if mtime/size differ it is hashed and the value
+        is kept only if the content hash equals sha256.
+
+        Args:
+            path: JSON file path the value was parsed from
+            value: Parsed value
+            sha256: Hex SHA-256 of the file content the value was parsed from
+            mtime_ns: File mtime when parsed (0 if unknown)
+            size: File size when parsed (-1 if unknown)
+
+        Returns:
+            True if seeded, False if the file was already cached
+        """
+        key = str(path)
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._entries[key] = _CatalogEntry(value, mtime_ns, size, sha256, float("-inf"))
+            self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def export(self) -> List[Dict]:
+        """
+        List cached entries
+
+        Returns:
+            List of dicts with path, value, sha256, mtime_ns and size
+        """
+        with self._lock:
+            return [
+                {"path": key, "value": e.value, "sha256": e.sha256, "mtime_ns": e.mtime_ns, "size": e.size}
+                for key, e in self._entries.items()
+            ]
+
+    def reload(self, path: Optional[Union[str, Path]] = None) -> int:
+        """
+        Drop cached data so the next lookup reads from disk
+
+        Args:
+            path: Only drop this file (default: everything)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            if path is not None:
+                return 1 if self._entries.pop(str(path), None) is not None else 0
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+    def stats(self) -> Dict:
+        """
+        Get catalog counters
+
+        Returns:
+            Dict with entries, max_entries, hits, misses and reloads (content changes picked up)
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads
+            }
+
+
+_data_catalog: Optional[DataCatalog] = None
+_init_lock = threading.Lock()
+
+
+def get_data_catalog() -> DataCatalog:
+    """
+    Get or create the shared data catalog
+    Configured from environment variables:
+
+    - DATA_CATALOG_MAX_ENTRIES: Parsed files kept in memory (default: 1024)
+    - DATA_CATALOG_CHECK_SECONDS: Seconds between file change checks (default: 2)
+
+    Returns:
+        DataCatalog instance
+    """
+    global _data_catalog
+
+    with _init_lock:
+        if _data_catalog is None:
+            _data_catalog = DataCatalog(
+                max_entries=int(os.getenv("DATA_CATALOG_MAX_ENTRIES", "1024")),
+                check_interval=float(os.getenv("DATA_CATALOG_CHECK_SECONDS", "2"))
+            )
+
+    return _data_catalog
@@ -1,43 +1,260 @@
 """
 Data loading utilities for ClaimReady
 Handles loading and caching of policy, procedure, and registry data
+
+Parsed files are held in the shared DataCatalog (see src/utils/data_catalog.py):
+edits to data/, medical_data/ or policy_data/ are picked up by running
+processes, and reload_data() drops everything explicitly. On first use the
+catalog is seeded from the compiled snapshot, if one has been built (see
+src/utils/catalog_snapshot.py), so workers skip JSON parsing on cold start.
 """
 
 import json
 import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from functools import lru_cache
 
 from src.models.schemas import ProcedureData, PolicyData, ProcedureRegistryEntry
+from src.utils.catalog_snapshot import SnapshotError, get_snapshot_path, read_snapshot
+from src.utils.data_catalog import DataCatalog, get_data_catalog
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.procedure_matcher import ProcedureMatch, ProcedureMatcher
 
 
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+REGISTRY_PATH = PROJECT_ROOT / "data" / "procedure_registry.json"
+
+
+# ============================================================================
+# CATALOG AND SNAPSHOT
+# ============================================================================
+
+_snapshot_info: Dict = {"loaded": False, "path": None, "entries": 0, "error": None}
+_snapshot_lock = threading.Lock()
+_snapshot_checked = False
+
+
+def _get_catalog() -> DataCatalog:
+    """Shared data catalog, seeded from the compiled snapshot on first use"""
+    global _snapshot_checked
+
+    catalog = get_data_catalog()
+    if not _snapshot_checked:
+        with _snapshot_lock:
+            if not _snapshot_checked:
+                _seed_from_snapshot(catalog)
+                _snapshot_checked = True
+    return catalog
+
+
+def _seed_from_snapshot(catalog: DataCatalog) -> None:
+    """Seed the catalog from the snapshot; any problem falls back to reading JSON"""
+    path = get_snapshot_path()
+    _snapshot_info["path"] = str(path) if path else None
+    if path is None or not path.exists():
+        return
+
+    try:
+        snapshot = read_snapshot(path)
+    except SnapshotError as e:
+        _snapshot_info["error"] = str(e)
+        return
+
+    for entry in snapshot["entries"]:
+        catalog.seed(entry["path"], entry["value"], entry["sha256"], entry["mtime_ns"], entry["size"])
+    _snapshot_info.update(loaded=True, entries=len(snapshot["entries"]), error=None)
+
+
+def get_snapshot_info() -> Dict:
+    """
+    Describe the catalog snapshot used by this process
+
+    Returns:
+        Dict with loaded flag, path, number of entries seeded and error (why it was not used)
+    """
+    _get_catalog()
+    return dict(_snapshot_info)
+
+
+def _parse_registry(data: Dict) -> List[ProcedureRegistryEntry]:
+    return [ProcedureRegistryEntry(**entry) for entry in data["procedures"]]
+
+
+def _parse_policy(data: Dict) -> PolicyData:
+    return PolicyData(**data)
+
+
+def _procedure_parser(procedure_id: str):
+    def parse(data: Dict) -> ProcedureData:
+        # Add procedure_id to the data
+        data["procedure_id"] = procedure_id
+        return ProcedureData(**data)
+    return parse
+
+
+def load_all_data(catalog: Optional[DataCatalog] = None) -> int:
+    """
+    Load the registry, every procedure's medical data and every policy
+    Use at worker startup so the first request doesn't pay for loading
+
+    Args:
+        catalog: Catalog to load into (default: the shared, snapshot-seeded catalog)
+
+    Returns:
+        Number of files loaded
+    """
+    catalog = catalog or _get_catalog()
+    registry = catalog.load(REGISTRY_PATH, _parse_registry)
+    loaded = 1
+
+    for entry in registry:
+        medical_data_path = PROJECT_ROOT / "medical_data" / entry.medical_data_file
+        if medical_data_path.exists():
+            catalog.load(medical_data_path, _procedure_parser(entry.procedure_id))
+            loaded += 1
+
+    for policy_path in sorted((PROJECT_ROOT / "policy_data").glob("*.json")):
+        catalog.load(policy_path, _parse_policy)
+        loaded += 1
+
+    return loaded
 
 
 # ============================================================================
 # PROCEDURE REGISTRY
 # ============================================================================
 
-@lru_cache(maxsize=1)
 def load_procedure_registry() -> List[ProcedureRegistryEntry]:
     """
     Load procedure registry from data/procedure_registry.json
-    Cached to avoid repeated file reads
+    Cached to avoid repeated file reads; reloaded when the file changes
 
     Returns:
         List of ProcedureRegistryEntry objects
     """
-    registry_path = PROJECT_ROOT / "data" / "procedure_registry.json"
+    try:
+        return _get_catalog().load(REGISTRY_PATH, _parse_registry)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Procedure registry not found at {REGISTRY_PATH}") from None
 
-    if not registry_path.exists():
-        raise FileNotFoundError(f"Procedure registry not found at {registry_path}")
 
-    with open(registry_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+# Lookup structures derived from the registry, rebuilt when the registry is reloaded
+_registry_derived: Dict[str, tuple] = {}
+_registry_derived_lock = threading.Lock()
+
+
+def _derived_from_registry(name: str, build):
+    """Build (once per loaded registry) a structure over the registry entries"""
+    registry = load_procedure_registry()
+    with _registry_derived_lock:
+        cached = _registry_derived.get(name)
+        if cached is None or cached[0] is not registry:
+            cached = (registry, build(registry))
+            _registry_derived[name] = cached
+        return cached[1]
 
-    return [ProcedureRegistryEntry(**entry) for entry in data["procedures"]]
+
+def _normalize_name(name: str) -> str:
+    """Case-insensitive, whitespace-insensitive key for display names and synonyms"""
+    return " ".join(name.split()).casefold()
+
+
+def _normalize_icd_code(code: str) -> str:
+    """
+    Normalize an ICD-10 code for lookup: upper case, dot and surrounding text removed
+
+    "h25.9" -> "H259", "I25 series" -> "I25"
+    """
+    parts = code.split()
+    return parts[0].replace(".", "").upper() if parts else ""
+
+
+class ProcedureIndex:
+    """
+    Dictionary indexes over the procedure registry
+
+    Built once from the registry entries; every lookup is a dict access
+    (ICD-10 lookups try at most a handful of code prefixes), so lookup cost
+    does not grow with the number of procedures.
+
+    Where two procedures share a key, the one listed first in the registry
+    wins, as with the previous linear scans.
+    """
+
+    # Shortest code prefix used for ICD-10 matching (the 3-character category, e.g. "H25")
+    MIN_ICD_PREFIX = 3
+
+    def __init__(self, entries: List[ProcedureRegistryEntry]):
+        """
+        Build the indexes
+
+        Args:
+            entries: Registry entries in registry order
+        """
+        self.entries = list(entries)
+        self.by_id: Dict[str, ProcedureRegistryEntry] = {}
+        self.by_display_name: Dict[str, ProcedureRegistryEntry] = {}
+        self.by_synonym: Dict[str, ProcedureRegistryEntry] = {}
+        self.by_icd_code: Dict[str, ProcedureRegistryEntry] = {}
+        # Display names and synonyms in scan order: an entry's display name,
+        # then its synonyms, then the next entry
+        self._by_name: Dict[str, ProcedureRegistryEntry] = {}
+
+        for entry in self.entries:
+            self.by_id.setdefault(entry.procedure_id, entry)
+
+            display_key = _normalize_name(entry.user_display_name)
+            self.by_display_name.setdefault(display_key, entry)
+            self._by_name.setdefault(display_key, entry)
+
+            for synonym in entry.common_synonyms:
+                synonym_key = _normalize_name(synonym)
+                self.by_synonym.setdefault(synonym_key, entry)
+                self._by_name.setdefault(synonym_key, entry)
+
+            for code in entry.icd_10_codes:
+                code_key = _normalize_icd_code(code)
+                if code_key:
+                    self.by_icd_code.setdefault(code_key, entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, procedure_id: str) -> Optional[ProcedureRegistryEntry]:
+        """Look up a procedure by procedure_id"""
+        return self.by_id.get(procedure_id)
+
+    def match_name(self, user_input: str) -> Optional[ProcedureRegistryEntry]:
+        """Look up a procedure by display name or synonym (case-insensitive)"""
+        return self._by_name.get(_normalize_name(user_input))
+
+    def match_icd_code(self, icd_code: str) -> Optional[ProcedureRegistryEntry]:
+        """
+        Look up a procedure by ICD-10 code, falling back to shorter prefixes
+
+        "H25.9" matches a registry code "H25.9" exactly, and "H25.91" falls back
+        to "H25.9" and then to the category "H25".
+        """
+        code_key = _normalize_icd_code(icd_code)
+        for end in range(len(code_key), self.MIN_ICD_PREFIX - 1, -1):
+            entry = self.by_icd_code.get(code_key[:end])
+            if entry is not None:
+                return entry
+        return None
+
+
+def get_procedure_index() -> ProcedureIndex:
+    """
+    Get the procedure index built from the cached registry
+
+    Returns:
+        ProcedureIndex over load_procedure_registry()
+    """
+    return _derived_from_registry("index", ProcedureIndex)
 
 
 def get_procedure_by_id(procedure_id: str) -> Optional[ProcedureRegistryEntry]:
@@ -50,50 +267,78 @@ def get_procedure_by_id(procedure_id: str) -> Optional[ProcedureRegistryEntry]:
     Returns:
         ProcedureRegistryEntry or None if not found
     """
-    registry = load_procedure_registry()
+    return get_procedure_index().get(procedure_id)
 
-    for entry in registry:
-        if entry.procedure_id == procedure_id:
-            return entry
 
-    return None
+def get_procedure_matcher() -> ProcedureMatcher:
+    """
+    Get the fuzzy procedure matcher built from the cached registry
 
+    Returns:
+        ProcedureMatcher over load_procedure_registry()
+    """
+    return _derived_from_registry("matcher", ProcedureMatcher)
 
-def get_procedure_by_synonym(user_input: str) -> Optional[ProcedureRegistryEntry]:
+
+def get_procedure_by_synonym(user_input: str, fuzzy_min_score: Optional[float] = None) -> Optional[ProcedureRegistryEntry]:
     """
     Match procedure by user input using common_synonyms
     Case-insensitive matching
 
     Args:
         user_input: User's procedure name input
+        fuzzy_min_score: If set and there is no exact match, return the best
+            fuzzy match scoring at least this much (see find_procedure_candidates)
 
     Returns:
         ProcedureRegistryEntry or None if no match found
     """
-    registry = load_procedure_registry()
-    user_input_lower = user_input.lower()
+    entry = get_procedure_index().match_name(user_input)
+    if entry is None and fuzzy_min_score is not None:
+        candidates = find_procedure_candidates(user_input, limit=1, min_score=fuzzy_min_score)
+        entry = candidates[0].entry if candidates else None
+    return entry
 
-    for entry in registry:
-        # Check exact match with display name
-        if entry.user_display_name.lower() == user_input_lower:
-            return entry
 
-        # Check synonyms
-        for synonym in entry.common_synonyms:
-            if synonym.lower() == user_input_lower:
-                return entry
+def find_procedure_candidates(text: str, limit: int = 5, min_score: float = 0.3) -> List[ProcedureMatch]:
+    """
+    Rank procedures by fuzzy similarity of their display names and synonyms
 
-    return None
+    Tolerates spelling variants, abbreviations and extra words, e.g.
+    "phaco emulsification" -> cataract_surgery, "lap chole" -> gallbladder_removal
+
+    Args:
+        text: Procedure name or phrase from a form or medical note
+        limit: Maximum number of candidates
+        min_score: Minimum similarity score (0.0 - 1.0)
+
+    Returns:
+        ProcedureMatch candidates (procedure_id, matched_name, score), best first
+    """
+    return get_procedure_matcher().match(text, limit=limit, min_score=min_score)
+
+
+def get_procedure_by_icd_code(icd_code: str) -> Optional[ProcedureRegistryEntry]:
+    """
+    Match procedure by ICD-10 code, including codes more specific than the registry lists
+
+    Args:
+        icd_code: ICD-10 code from the medical note (e.g., "H25.9")
+
+    Returns:
+        ProcedureRegistryEntry (e.g., cataract_surgery) or None if no match found
+    """
+    return get_procedure_index().match_icd_code(icd_code)
 
 
 # ============================================================================
 # MEDICAL PROCEDURE DATA
 # ============================================================================
 
-@lru_cache(maxsize=20)
 def load_procedure_data(procedure_id: str) -> ProcedureData:
     """
     Load detailed medical procedure data from medical_data/*.json
+    Cached; reloaded when the file changes
 
     Args:
         procedure_id: Procedure identifier (e.g., "cataract_surgery")
@@ -112,16 +357,10 @@ def load_procedure_data(procedure_id: str) -> ProcedureData:
 
     medical_data_path = PROJECT_ROOT / "medical_data" / registry_entry.medical_data_file
 
-    if not medical_data_path.exists():
-        raise FileNotFoundError(f"Medical data file not found: {medical_data_path}")
-
-    with open(medical_data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Add procedure_id to the data
-    data["procedure_id"] = procedure_id
-
-    return ProcedureData(**data)
+    try:
+        return _get_catalog().load(medical_data_path, _procedure_parser(procedure_id))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Medical data file not found: {medical_data_path}") from None
 
 
 # ============================================================================
@@ -173,10 +412,10 @@ def _normalize_policy_filename(insurer: str, policy_type: str) -> str:
     return f"{insurer_prefix}_{policy_suffix}.json"
 
 
-@lru_cache(maxsize=10)
 def load_policy_data(insurer: str, policy_type: str) -> PolicyData:
     """
     Load policy data from policy_data/*.json
+    Cached; reloaded when the file changes
 
     Args:
         insurer: Insurance company name
@@ -191,19 +430,30 @@ def load_policy_data(insurer: str, policy_type: str) -> PolicyData:
     filename = _normalize_policy_filename(insurer, policy_type)
     policy_path = PROJECT_ROOT / "policy_data" / filename
 
-    if not policy_path.exists():
+    try:
+        return _get_catalog().load(policy_path, _parse_policy)
+    except FileNotFoundError:
         # Try to find similar filenames
         policy_dir = PROJECT_ROOT / "policy_data"
         available = [f.name for f in policy_dir.glob("*.json")] if policy_dir.exists() else []
         raise FileNotFoundError(
             f"Policy file not found: {filename}\n"
             f"Available policies: {', '.join(available)}"
-        )
+        ) from None
 
-    with open(policy_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    return PolicyData(**data)
+def reload_data() -> int:
+    """
+    Drop all cached policy, procedure and registry data
+    The next lookup reads from disk; use after replacing data files in bulk
+    (single-file edits are detected automatically)
+
+    Returns:
+        Number of cached files dropped
+    """
+    with _registry_derived_lock:
+        _registry_derived.clear()
+    return _get_catalog().reload()
 
 
 def get_waiting_period_for_procedure(
@@ -246,14 +496,82 @@ def get_waiting_period_for_procedure(
     return None
 
 
-def check_procedure_excluded(
+# Keywords that exclude a procedure on their own when they appear in a policy exclusion
+GENERIC_EXCLUSION_KEYWORDS = frozenset(["cosmetic", "experimental", "unproven"])
+
+
+@dataclass(frozen=True)
+class ExclusionClauseMatch:
+    """An exclusion keyword found in a policy exclusion clause"""
+    clause_index: int  # Position of the clause in policy_data.exclusions
+    clause: str
+    keyword: str
+    start: int  # Offsets of the keyword within the clause
+    end: int
+
+
+@dataclass
+class ExclusionCheck:
+    """Outcome of matching a procedure's exclusion keywords against a policy"""
+    excluded: bool
+    # Every keyword occurrence in the policy's exclusion clauses
+    clause_matches: List[ExclusionClauseMatch] = field(default_factory=list)
+    # Every keyword occurrence in the diagnosis text: (keyword, start, end)
+    diagnosis_matches: List[Tuple[str, int, int]] = field(default_factory=list)
+    # Clause matches that make the procedure excluded
+    triggering_matches: List[ExclusionClauseMatch] = field(default_factory=list)
+
+
+@lru_cache(maxsize=64)
+def _get_exclusion_keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Compiled matcher for one procedure's exclusion keywords"""
+    return KeywordMatcher(keywords)
+
+
+@lru_cache(maxsize=256)
+def _match_exclusion_clauses(keywords: Tuple[str, ...], exclusions: Tuple[str, ...]) -> Tuple[ExclusionClauseMatch, ...]:
+    """
+    Locate keywords in a policy's exclusion clauses, computed once per (policy, procedure)
+
+    The clauses are joined and scanned in one pass; a newline separator keeps
+    matches from spanning two clauses (keywords never contain newlines).
+    """
+    clause_starts = []
+    offset = 0
+    for clause in exclusions:
+        clause_starts.append(offset)
+        offset += len(clause) + 1
+
+    matches = []
+    clause_index = 0
+    for start, end, keyword in _get_exclusion_keyword_matcher(keywords).find_all("\n".join(exclusions)):
+        # Matches arrive in text order, so the owning clause only moves forward
+        while clause_index + 1 < len(exclusions) and clause_starts[clause_index + 1] <= start:
+            clause_index += 1
+        clause_start = clause_starts[clause_index]
+        matches.append(ExclusionClauseMatch(
+            clause_index=clause_index,
+            clause=exclusions[clause_index],
+            keyword=keyword,
+            start=start - clause_start,
+            end=end - clause_start
+        ))
+    return tuple(matches)
+
+
+def find_procedure_exclusions(
     policy_data: PolicyData,
     procedure_id: str,
     diagnosis: str = ""
-) -> bool:
+) -> ExclusionCheck:
     """
-    Check if procedure is excluded by policy
-    Uses exclusion keywords from procedure registry
+    Match a procedure's exclusion keywords against policy exclusions and diagnosis
+
+    A procedure is excluded when one of its registry exclusion keywords appears
+    in a policy exclusion clause and either also appears in the diagnosis or is
+    generic (see GENERIC_EXCLUSION_KEYWORDS). Keywords are compiled into an
+    Aho-Corasick automaton and the clause scan is cached per (policy, procedure),
+    so repeated checks only scan the diagnosis.
 
     Args:
         policy_data: Loaded policy data
@@ -261,33 +579,52 @@ def check_procedure_excluded(
         diagnosis: Optional diagnosis text for context
 
     Returns:
-        True if procedure is excluded, False otherwise
+        ExclusionCheck with the decision and every clause/diagnosis match with positions
     """
     registry_entry = get_procedure_by_id(procedure_id)
-    if not registry_entry:
-        return False
+    if not registry_entry or not registry_entry.policy_exclusion_keywords:
+        return ExclusionCheck(excluded=False)
 
-    exclusion_keywords = registry_entry.policy_exclusion_keywords or []
+    keywords = tuple(registry_entry.policy_exclusion_keywords)
+    clause_matches = list(_match_exclusion_clauses(keywords, tuple(policy_data.exclusions)))
+    if not clause_matches:
+        return ExclusionCheck(excluded=False)
 
-    # Check if any exclusion keyword appears in policy exclusions
-    diagnosis_lower = diagnosis.lower()
+    diagnosis_matches = _get_exclusion_keyword_matcher(keywords).find_all(diagnosis) if diagnosis else []
+    diagnosis_keywords = {keyword.lower() for _, _, keyword in diagnosis_matches}
 
-    for exclusion in policy_data.exclusions:
-        exclusion_lower = exclusion.lower()
+    triggering = [
+        match for match in clause_matches
+        if match.keyword.lower() in diagnosis_keywords or match.keyword.lower() in GENERIC_EXCLUSION_KEYWORDS
+    ]
 
-        for keyword in exclusion_keywords:
-            keyword_lower = keyword.lower()
+    return ExclusionCheck(
+        excluded=bool(triggering),
+        clause_matches=clause_matches,
+        diagnosis_matches=[(keyword, start, end) for start, end, keyword in diagnosis_matches],
+        triggering_matches=triggering
+    )
 
-            # Check if keyword in policy exclusion OR in diagnosis
-            if keyword_lower in exclusion_lower:
-                # If keyword found in exclusions, check diagnosis context
-                if diagnosis_lower and keyword_lower in diagnosis_lower:
-                    return True
-                # If keyword is generic (like "cosmetic"), consider excluded
-                elif keyword_lower in ["cosmetic", "experimental", "unproven"]:
-                    return True
 
-    return False
+def check_procedure_excluded(
+    policy_data: PolicyData,
+    procedure_id: str,
+    diagnosis: str = ""
+) -> bool:
+    """
+    Check if procedure is excluded by policy
+    Uses exclusion keywords from procedure registry
+
+    Args:
+        policy_data: Loaded policy data
+        procedure_id: Procedure identifier
+        diagnosis: Optional diagnosis text for context
+
+    Returns:
+        True if procedure is excluded, False otherwise
+        (see find_procedure_exclusions for the matched clauses)
+    """
+    return find_procedure_exclusions(policy_data, procedure_id, diagnosis).excluded
 
 
 def get_room_rent_limit(policy_data: PolicyData, sum_insured: int) -> Optional[float]:
@@ -1,20 +1,205 @@
 """
 Discharge PDF Extractor
 Extracts data from final hospital bills and discharge summaries
+
+Final bills are parsed page by page as pages are extracted (BillParseState),
+and reading stops once the required fields and the grand total are found:
+itemized lines come before the totals, and the pages after them (payment
+breakdown, notes, appendices) are never extracted.
 """
 
+import bisect
+import logging
 import re
-import pdfplumber
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 from src.utils.llm_client import call_llm_with_retry
+from src.utils.pdf_document import DocumentParser, PageParser, PDFDocument, PDFSource, ingest
+
+
+logger = logging.getLogger(__name__)
+
+AMOUNT = r'(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)'
+
+# Bill fields: dotted path in the bill structure -> (pattern, value type).
+# The first match in the bill wins.
+BILL_FIELDS = {
+    "bill_number": (re.compile(r'Bill\s+No[:\s]+([A-Z0-9/]+)', re.IGNORECASE), str),
+    "bill_date": (re.compile(r'Bill.*?Date[:\s]+(\d{2}/\d{2}/\d{4})', re.IGNORECASE), str),
+    "patient_name": (re.compile(r'Patient\s+Name[:\s]+(.+?)(?:\n|Age)', re.IGNORECASE), str),
+    "authorization_number": (re.compile(r'Authorization\s+Number[:\s]+([A-Z0-9-]+)', re.IGNORECASE), str),
+    "authorized_amount": (re.compile(r'Authorized\s+Amount[:\s]+(?:₹|Rs\.?|■)?\s*([\d,]+)', re.IGNORECASE), float),
+    "admission_date": (re.compile(r'(?:Date\s+of\s+)?Admission[:\s]+(\d{2}/\d{2}/\d{4})', re.IGNORECASE), str),
+    "discharge_date": (re.compile(r'(?:Date\s+of\s+)?Discharge[:\s]+(\d{2}/\d{2}/\d{4})', re.IGNORECASE), str),
+    "total_days": (re.compile(r'Total\s+Days[:\s]+(\d+)', re.IGNORECASE), int),
+    # Itemized line items: the amount at the end of the line
+    "itemized_costs.room_charges": (
+        re.compile(r'Room\s+Rent[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.nursing_charges": (
+        re.compile(r'Nursing\s+Charges[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.surgeon_fees": (
+        re.compile(r'Surgeon[\'\']?s?\s+Fee[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.anesthetist_fees": (
+        re.compile(r'Anesthe[st]ist[\'\']?s?\s+Fee[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.ot_charges": (
+        re.compile(r'OT\s+Charges[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.medicines": (
+        re.compile(r'Medicines[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.implants": (
+        re.compile(r'Implant[^\n]*?' + AMOUNT + r'\s*$', re.MULTILINE | re.IGNORECASE), float),
+    "itemized_costs.investigations": (
+        re.compile(r'(?:Pre-operative\s+)?[Ii]nvestigations?[^\n]*?' + AMOUNT + r'\s*$',
+                   re.MULTILINE | re.IGNORECASE), float),
+    # Totals
+    "total_bill_amount": (re.compile(r'(?:TOTAL\s+BILL\s+AMOUNT|GROSS\s+BILL)[^\n]*?' + AMOUNT, re.IGNORECASE), float),
+    "gst_amount": (re.compile(r'GST[^\n]*?' + AMOUNT, re.IGNORECASE), float),
+    "net_payable_amount": (re.compile(r'NET\s+PAYABLE[^\n]*?' + AMOUNT, re.IGNORECASE), float),
+    # Payment details
+    "patient_paid": (re.compile(
+        r'(?:Amount\s+Paid\s+by\s+Patient|Patient\s+Responsibility)[^\n]*?' + AMOUNT, re.IGNORECASE), float),
+    "insurance_claimed": (re.compile(
+        r'(?:Amount\s+Claimed\s+from\s+TPA|TPA\s+Authorized)[^\n]*?' + AMOUNT, re.IGNORECASE), float),
+}
+
+# Reading stops once these are found: the header, the grand total (NET PAYABLE
+# comes after the last itemized line) and the TPA claim in the payment details
+# that follow it. Other fields on the pages read so far are still filled in.
+BILL_REQUIRED_FIELDS = (
+    "bill_number", "bill_date", "admission_date", "discharge_date", "total_days",
+    "total_bill_amount", "net_payable_amount", "insurance_claimed"
+)
+
+# A match still open where the complete lines end began on one of the last
+# lines before it (a label, whitespace, then the value), so later pages are
+# searched from a line start at least this many characters back
+BILL_MATCH_LOOKBACK = 200
+
+
+def _bill_value(raw: str, value_type: type):
+    if value_type is float:
+        return float(raw.replace(',', ''))
+    if value_type is int:
+        return int(raw)
+    return raw.strip()
+
+
+class BillParseState:
+    """
+    Bill fields matched so far in a stream of pages
+
+    Text is matched once its lines are complete; the last, unfinished line of
+    a page is joined with the next page (pages are concatenated, as in the
+    joined text). Fields keep their first match, so the result is the same as
+    matching the whole bill, for every field found on the pages read.
+
+    Example:
+        >>> state = BillParseState()
+        >>> for page_text in document.iter_pages("pypdf2"):
+        ...     if state.feed(page_text):
+        ...         break
+        >>> bill = state.finish()
+    """
+
+    def __init__(self, required: Tuple[str, ...] = BILL_REQUIRED_FIELDS):
+        """
+        Args:
+            required: Fields after which no more pages are needed
+        """
+        self.result = _get_empty_bill_structure()
+        self.required = required
+        # Field path -> 1-based page number it was found on
+        self.field_pages: Dict[str, int] = {}
+        self.pages_read = 0
+
+        self._pending = list(BILL_FIELDS)
+        # Unsearched text (and the lookback before it), starting at a line start
+        self._buffer = ""
+        # Offset of _buffer in the text of all pages read, and where each page starts
+        self._offset = 0
+        self._page_starts: List[int] = []
+
+    @property
+    def complete(self) -> bool:
+        """Whether every required field has been found"""
+        return all(path in self.field_pages for path in self.required)
+
+    @property
+    def pages_used(self) -> List[int]:
+        """1-based numbers of the pages fields were found on"""
+        return sorted(set(self.field_pages.values()))
+
+    def feed(self, page_text: str) -> bool:
+        """
+        Match the complete lines of the next page
+
+        Returns:
+            True once every required field has been found
+        """
+        self._page_starts.append(self._offset + len(self._buffer))
+        self.pages_read += 1
+        self._buffer += page_text
+        self._search(self._buffer.rfind("\n") + 1)
+        return self.complete
+
+    def finish(self) -> Dict:
+        """Match the last line and return the bill structure"""
+        self._search(len(self._buffer))
+        return self.result
+
+    def _search(self, end: int) -> None:
+        for path in list(self._pending):
+            pattern, value_type = BILL_FIELDS[path]
+            match = pattern.search(self._buffer, 0, end)
+            if not match:
+                continue
+            section, _, field = path.rpartition(".")
+            target = self.result[section] if section else self.result
+            target[field] = _bill_value(match.group(1), value_type)
+            self.field_pages[path] = bisect.bisect_right(self._page_starts, self._offset + match.start())
+            self._pending.remove(path)
+
+        keep = self._buffer.rfind("\n", 0, max(0, end - BILL_MATCH_LOOKBACK)) + 1
+        self._buffer = self._buffer[keep:]
+        self._offset += keep
+
+
+class FinalBillParser(PageParser):
+    """Regex parser for final hospital bills, reading pages until the totals are found"""
+
+    separator = ""
+
+    def parse_pages(self, pages: Iterable[str]) -> Tuple[Dict, List[int]]:
+        state = BillParseState()
+        for page_text in pages:
+            if state.feed(page_text):
+                break
+        return state.finish(), state.pages_used
+
+
+class DischargeSummaryParser(DocumentParser):
+    """Regex parser for discharge summaries (the LLM path only needs the text)"""
+
+    separator = ""
+
+    def parse(self, text: str) -> Dict:
+        return _extract_discharge_with_regex(text)
+
+
+FINAL_BILL_PARSER = FinalBillParser()
+DISCHARGE_SUMMARY_PARSER = DischargeSummaryParser()
+
 
+def _read_pdf_text(source: PDFSource, parser: DocumentParser) -> str:
+    """Page text of a PDF concatenated, from the parser's first working backend"""
+    return PDFDocument.open(source).read(parser.backends, parser.separator)[1]
 
-def extract_final_bill(pdf_path: str, use_llm_fallback: bool = True) -> Dict:
+
+def extract_final_bill(pdf_path: PDFSource, use_llm_fallback: bool = True) -> Dict:
     """
     Extract data from final hospital bill PDF
 
     Args:
-        pdf_path: Path to final bill PDF
+        pdf_path: Path to final bill PDF, its content (bytes, BytesIO,
+            memoryview, uploaded file) or an opened PDFDocument
         use_llm_fallback: Whether to use LLM if regex extraction fails
 
     Returns:
@@ -49,153 +234,42 @@ def extract_final_bill(pdf_path: str, use_llm_fallback: bool = True) -> Dict:
             "insurance_claimed": 52000.0
         }
     """
-    # Try text extraction first
+    # Open the document once; the LLM fallback reuses its extracted text
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+        document = PDFDocument.open(pdf_path)
+    except OSError as e:
+        logger.warning("Could not read bill PDF: %s", e)
+        return _get_empty_bill_structure()
 
-        # Try regex extraction
-        result = _extract_bill_with_regex(text)
+    # Try regex extraction first
+    try:
+        bill = ingest(document, FINAL_BILL_PARSER)
+        result = bill.data
+        logger.debug("Parsed bill %s from pages %s", document.name, bill.pages)
 
         # Validate extraction
         if result.get("total_bill_amount", 0) > 0:
             return result
 
     except Exception as e:
-        print(f"Error in pdfplumber extraction: {e}")
+        logger.warning("Regex bill extraction failed: %s", e)
 
     # Fallback to LLM
     if use_llm_fallback:
         try:
-            return _extract_bill_with_llm(pdf_path)
+            return _extract_bill_with_llm(document)
         except Exception as e:
-            print(f"Error in LLM extraction: {e}")
+            logger.warning("LLM bill extraction failed: %s", e)
 
     # Return empty structure if all fails
     return _get_empty_bill_structure()
 
 
-def _extract_bill_with_regex(text: str) -> Dict:
-    """Extract bill data using regex patterns"""
-
-    result = _get_empty_bill_structure()
-
-    # Bill number and date
-    bill_num_match = re.search(r'Bill\s+No[:\s]+([A-Z0-9/]+)', text, re.IGNORECASE)
-    if bill_num_match:
-        result["bill_number"] = bill_num_match.group(1).strip()
-
-    bill_date_match = re.search(r'Bill.*?Date[:\s]+(\d{2}/\d{2}/\d{4})', text, re.IGNORECASE)
-    if bill_date_match:
-        result["bill_date"] = bill_date_match.group(1).strip()
-
-    # Patient name
-    patient_match = re.search(r'Patient\s+Name[:\s]+(.+?)(?:\n|Age)', text, re.IGNORECASE)
-    if patient_match:
-        result["patient_name"] = patient_match.group(1).strip()
-
-    # Authorization number and amount
-    auth_num_match = re.search(r'Authorization\s+Number[:\s]+([A-Z0-9-]+)', text, re.IGNORECASE)
-    if auth_num_match:
-        result["authorization_number"] = auth_num_match.group(1).strip()
-
-    auth_amt_match = re.search(r'Authorized\s+Amount[:\s]+(?:₹|Rs\.?|■)?\s*([\d,]+)', text, re.IGNORECASE)
-    if auth_amt_match:
-        result["authorized_amount"] = float(auth_amt_match.group(1).replace(',', ''))
-
-    # Admission and discharge dates
-    admission_match = re.search(r'(?:Date\s+of\s+)?Admission[:\s]+(\d{2}/\d{2}/\d{4})', text, re.IGNORECASE)
-    if admission_match:
-        result["admission_date"] = admission_match.group(1).strip()
-
-    discharge_match = re.search(r'(?:Date\s+of\s+)?Discharge[:\s]+(\d{2}/\d{2}/\d{4})', text, re.IGNORECASE)
-    if discharge_match:
-        result["discharge_date"] = discharge_match.group(1).strip()
-
-    # Total days
-    days_match = re.search(r'Total\s+Days[:\s]+(\d+)', text, re.IGNORECASE)
-    if days_match:
-        result["total_days"] = int(days_match.group(1))
-
-    # Extract itemized costs - look for specific line items
-    # Room charges
-    room_match = re.search(r'Room\s+Rent[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if room_match:
-        result["itemized_costs"]["room_charges"] = float(room_match.group(1).replace(',', ''))
-
-    # Nursing charges
-    nursing_match = re.search(r'Nursing\s+Charges[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if nursing_match:
-        result["itemized_costs"]["nursing_charges"] = float(nursing_match.group(1).replace(',', ''))
-
-    # Surgeon fees
-    surgeon_match = re.search(r'Surgeon[\'\']?s?\s+Fee[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if surgeon_match:
-        result["itemized_costs"]["surgeon_fees"] = float(surgeon_match.group(1).replace(',', ''))
-
-    # Anesthetist fees
-    anesth_match = re.search(r'Anesthe[st]ist[\'\']?s?\s+Fee[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if anesth_match:
-        result["itemized_costs"]["anesthetist_fees"] = float(anesth_match.group(1).replace(',', ''))
-
-    # OT charges
-    ot_match = re.search(r'OT\s+Charges[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if ot_match:
-        result["itemized_costs"]["ot_charges"] = float(ot_match.group(1).replace(',', ''))
-
-    # Medicines (look for total medicine amount)
-    med_match = re.search(r'Medicines[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if med_match:
-        result["itemized_costs"]["medicines"] = float(med_match.group(1).replace(',', ''))
-
-    # Implants
-    implant_match = re.search(r'Implant[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if implant_match:
-        result["itemized_costs"]["implants"] = float(implant_match.group(1).replace(',', ''))
-
-    # Investigations
-    invest_match = re.search(r'(?:Pre-operative\s+)?[Ii]nvestigations?[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)\s*$', text, re.MULTILINE | re.IGNORECASE)
-    if invest_match:
-        result["itemized_costs"]["investigations"] = float(invest_match.group(1).replace(',', ''))
-
-    # Total bill amount (before GST)
-    total_match = re.search(r'(?:TOTAL\s+BILL\s+AMOUNT|GROSS\s+BILL)[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    if total_match:
-        result["total_bill_amount"] = float(total_match.group(1).replace(',', ''))
-
-    # GST
-    gst_match = re.search(r'GST[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    if gst_match:
-        result["gst_amount"] = float(gst_match.group(1).replace(',', ''))
-
-    # Net payable
-    net_match = re.search(r'NET\s+PAYABLE[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    if net_match:
-        result["net_payable_amount"] = float(net_match.group(1).replace(',', ''))
-
-    # Patient paid amount
-    patient_paid_match = re.search(r'(?:Amount\s+Paid\s+by\s+Patient|Patient\s+Responsibility)[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    if patient_paid_match:
-        result["patient_paid"] = float(patient_paid_match.group(1).replace(',', ''))
-
-    # Insurance claimed
-    ins_match = re.search(r'(?:Amount\s+Claimed\s+from\s+TPA|TPA\s+Authorized)[^\n]*?(?:₹|Rs\.?|■)?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    if ins_match:
-        result["insurance_claimed"] = float(ins_match.group(1).replace(',', ''))
-
-    return result
-
-
-def _extract_bill_with_llm(pdf_path: str) -> Dict:
+def _extract_bill_with_llm(pdf_path: PDFSource) -> Dict:
     """Extract bill data using LLM"""
 
     # Read PDF text
-    with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() or ""
+    text = _read_pdf_text(pdf_path, FINAL_BILL_PARSER)
 
     prompt = f"""Extract information from this final hospital bill and return as JSON.
 
@@ -250,12 +324,13 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
     return json.loads(json_str)
 
 
-def extract_discharge_summary(pdf_path: str, use_llm: bool = True) -> Dict:
+def extract_discharge_summary(pdf_path: PDFSource, use_llm: bool = True) -> Dict:
     """
     Extract data from discharge summary PDF
 
     Args:
-        pdf_path: Path to discharge summary PDF
+        pdf_path: Path to discharge summary PDF, its content (bytes, BytesIO,
+            memoryview, uploaded file) or an opened PDFDocument
         use_llm: Whether to use LLM for extraction (recommended for discharge summaries)
 
     Returns:
@@ -282,22 +357,14 @@ def extract_discharge_summary(pdf_path: str, use_llm: bool = True) -> Dict:
         return _extract_discharge_with_llm(pdf_path)
     else:
         # Basic text extraction fallback
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-
-        return _extract_discharge_with_regex(text)
+        return ingest(pdf_path, DISCHARGE_SUMMARY_PARSER).data
 
 
-def _extract_discharge_with_llm(pdf_path: str) -> Dict:
+def _extract_discharge_with_llm(pdf_path: PDFSource) -> Dict:
     """Extract discharge summary using LLM - most reliable for complex documents"""
 
     # Read PDF text
-    with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() or ""
+    text = _read_pdf_text(pdf_path, DISCHARGE_SUMMARY_PARSER)
 
     # Limit text to avoid token limits - prioritize key sections
     # Extract section 6 (post-op course), 7 (complications), 9-12
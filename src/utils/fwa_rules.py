@@ -0,0 +1,261 @@
+"""
+FWA rule engine
+Deterministic pre-screen of a claim's costs and stay against the procedure's
+reference ranges in medical_data/*.json
+
+Every cost component of the claim (surgeon fees, OT charges, ...) is compared
+with its per-item range from cost_analysis.india_tier1_cities.detailed_breakdown,
+the total with the overall range, and the stay with the typical hospitalization.
+The reference data is compiled once into parallel arrays (one slot per cost
+component), so screening a claim is a single pass over the components.
+
+The result is a score, the largest ratio of a claimed amount to its reference
+maximum (1.0 = at the top of the range), which FWADetector uses to decide
+whether a claim is clean, ambiguous (needs the LLM) or a clear outlier.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+# Cost component -> (cost breakdown fields claimed under it, substrings of the
+# detailed_breakdown keys priced under it). First match wins, so the more
+# specific entries come first. Implants are priced together with consumables,
+# as hospitals itemize lenses and stents under either.
+COMPONENT_KEYWORDS = (
+    ("icu_charges", ("icu_charges",), ("icu",)),
+    ("room_charges", ("room_charges",), ("ward_stay", "hospital_stay", "room")),
+    ("surgeon_fees", ("surgeon_fees",), ("surgeon", "cardiologist")),
+    ("anesthetist_fees", ("anesthetist_fees",), ("anesthe", "anaesthe")),
+    ("ot_charges", ("ot_charges",), ("ot_", "cath_lab")),
+    ("investigations", ("investigations",), ("investigation", "diagnostic")),
+    ("medicines_consumables", ("medicines_consumables", "implants"),
+     ("consumable", "medication", "medicine", "implant", "iol", "stent")),
+    ("other_charges", ("other_charges",), ("rehabilitation",)),
+)
+
+COMPONENTS = tuple(component for component, _, _ in COMPONENT_KEYWORDS)
+
+# Upgrades and multi-site procedures that justify costs the ranges don't price;
+# whether they are documented is for the LLM to judge
+UPGRADE_TERMS = ("premium", "toric", "multifocal", "trifocal", "bilateral", "robotic")
+
+# Itemized costs may differ from the stated total by this fraction before the claim is ambiguous
+TOTAL_MISMATCH_TOLERANCE = 0.10
+
+
+class PreScreen:
+    """Outcome of screening one claim"""
+
+    __slots__ = ("score", "ratios", "findings", "reasons")
+
+    def __init__(self, score: float, ratios: Dict[str, float], findings: List[Dict], reasons: List[str]):
+        """
+        Args:
+            score: Largest amount / reference maximum over components, total and stay
+            ratios: Ratio per checked item (cost components, "total", "stay")
+            findings: Items above their reference maximum, as
+                {"item", "amount", "maximum", "ratio"} (stay amounts in days)
+            reasons: Claim features the ranges can't judge (upgrades, totals
+                that don't match the itemized costs, amounts claimed under
+                components the procedure has no range for)
+        """
+        self.score = score
+        self.ratios = ratios
+        self.findings = findings
+        self.reasons = reasons
+
+    def tier(self, band: Tuple[float, float]) -> str:
+        """
+        Classify the claim against the ambiguous band
+
+        Args:
+            band: (lower, upper) score bounds of the ambiguous band
+
+        Returns:
+            "clean" (score <= lower and nothing the ranges can't judge),
+            "outlier" (score > upper) or "ambiguous"
+        """
+        lower, upper = band
+        if self.score > upper:
+            return "outlier"
+        if self.score <= lower and not self.reasons:
+            return "clean"
+        return "ambiguous"
+
+
+class CostRuleTable:
+    """Reference ranges of one procedure, compiled for screening claims"""
+
+    def __init__(self, procedure_data: Dict):
+        """
+        Compile the reference ranges
+
+        Args:
+            procedure_data: Procedure data dict (ProcedureData.model_dump())
+        """
+        tier1 = procedure_data.get('cost_analysis', {}).get('india_tier1_cities', {})
+
+        # Parallel arrays, one slot per COMPONENTS entry; None where the data has no range
+        self.maximums: List[Optional[float]] = [None] * len(COMPONENTS)
+        # Per-day share of the maximum, scaled by the stay
+        self.daily_maximums: List[float] = [0.0] * len(COMPONENTS)
+
+        for key, value in tier1.get('detailed_breakdown', {}).items():
+            slot = _component_slot(key)
+            price_range = _price_range(value)
+            if slot is None or price_range is None:
+                continue
+            high = price_range[1]
+            # Several items can price one component (IOL + medications): their maximums add up
+            if "per_day" in key:
+                self.daily_maximums[slot] += high
+                self.maximums[slot] = self.maximums[slot] or 0
+            else:
+                self.maximums[slot] = (self.maximums[slot] or 0) + high
+
+        ceilings = [
+            tier1.get('overall_range', {}).get('maximum'),
+            tier1.get('cost_outlier_thresholds', {}).get('concerning_if_above')
+        ]
+        ceilings = [c for c in ceilings if isinstance(c, (int, float)) and c > 0]
+        self.total_maximum: Optional[float] = min(ceilings) if ceilings else None
+
+        self.stay_maximum_days: Optional[int] = _typical_stay_maximum(procedure_data.get('hospitalization', {}))
+
+    def screen(self, costs: Dict, stay_duration: int, claim_text: str = "") -> PreScreen:
+        """
+        Screen a claim against the reference ranges
+
+        Args:
+            costs: Cost breakdown dictionary
+            stay_duration: Expected length of stay in days
+            claim_text: Diagnosis and treatment text, checked for upgrades
+
+        Returns:
+            PreScreen with score, per-item ratios, findings and reasons
+        """
+        stay_days = max(stay_duration or 0, 1)
+        amounts = [
+            float(sum(costs.get(field) or 0 for field in fields))
+            for _, fields, _ in COMPONENT_KEYWORDS
+        ]
+        maximums = [
+            None if maximum is None else maximum + daily * stay_days
+            for maximum, daily in zip(self.maximums, self.daily_maximums)
+        ]
+
+        ratios = {
+            component: amount / maximum
+            for component, amount, maximum in zip(COMPONENTS, amounts, maximums)
+            if maximum and amount
+        }
+        findings = [
+            {"item": component, "amount": amount, "maximum": maximum, "ratio": ratios[component]}
+            for component, amount, maximum in zip(COMPONENTS, amounts, maximums)
+            if ratios.get(component, 0) > 1.0
+        ]
+
+        total = float(costs.get('total_estimated_cost') or 0)
+        if self.total_maximum and total:
+            ratios["total"] = total / self.total_maximum
+            if ratios["total"] > 1.0:
+                findings.append({"item": "total", "amount": total, "maximum": self.total_maximum,
+                                 "ratio": ratios["total"]})
+
+        if self.stay_maximum_days:
+            ratios["stay"] = stay_days / self.stay_maximum_days
+            if ratios["stay"] > 1.0:
+                findings.append({"item": "stay", "amount": stay_days, "maximum": self.stay_maximum_days,
+                                 "ratio": ratios["stay"]})
+
+        reasons = []
+        # Charges the procedure isn't priced for (ICU or room charges on a
+        # day-care cataract) can be unbundling; the ranges can't clear them
+        unpriced = [
+            f"{component} ₹{amount:,.0f}"
+            for component, amount, maximum in zip(COMPONENTS, amounts, maximums)
+            if maximum is None and amount
+        ]
+        if unpriced:
+            reasons.append(f"No reference range for {', '.join(unpriced)}")
+        itemized = sum(amounts)
+        if total and itemized and abs(total - itemized) > TOTAL_MISMATCH_TOLERANCE * total:
+            reasons.append(f"Itemized costs ₹{itemized:,.0f} do not add up to the total ₹{total:,.0f}")
+        text = claim_text.lower()
+        upgrades = [term for term in UPGRADE_TERMS if term in text]
+        if upgrades:
+            reasons.append(f"Claim mentions {', '.join(upgrades)}")
+
+        return PreScreen(
+            score=max(ratios.values(), default=0.0),
+            ratios=ratios,
+            findings=findings,
+            reasons=reasons
+        )
+
+
+def _component_slot(key: str) -> Optional[int]:
+    """Index in COMPONENTS of the component a detailed_breakdown key prices"""
+    key = key.lower()
+    for slot, (_, _, keywords) in enumerate(COMPONENT_KEYWORDS):
+        if any(keyword in key for keyword in keywords):
+            return slot
+    return None
+
+
+def _price_range(value) -> Optional[Tuple[float, float]]:
+    """
+    Read a (minimum, maximum) price from a detailed_breakdown entry
+
+    Entries are [min, max], {"range": [min, max], ...}, {"nppa_capped_price": cap}
+    or alternatives such as {"delhi": [min, max], "mumbai": [min, max]}, which
+    give the widest range. Nested options (premium IOLs) are not priced here.
+    """
+    if _is_pair(value):
+        return float(value[0]), float(value[1])
+    if not isinstance(value, dict):
+        return None
+    if _is_pair(value.get('range')):
+        return float(value['range'][0]), float(value['range'][1])
+    if isinstance(value.get('nppa_capped_price'), (int, float)):
+        return 0.0, float(value['nppa_capped_price'])
+
+    alternatives = [v for v in value.values() if _is_pair(v)]
+    if not alternatives:
+        return None
+    return float(min(a[0] for a in alternatives)), float(max(a[1] for a in alternatives))
+
+
+def _is_pair(value) -> bool:
+    return (
+        isinstance(value, (list, tuple)) and len(value) == 2
+        and all(isinstance(v, (int, float)) for v in value)
+    )
+
+
+def _typical_stay_maximum(hospitalization: Dict) -> Optional[int]:
+    """
+    Typical maximum stay in whole days (at least 1: a day-care admission is normal)
+
+    Reads hospitalization.typical_duration, whose unit is "days", "hours" or
+    "hours_to_days"; with alternatives by surgical approach, the longest applies.
+    """
+    typical = hospitalization.get('typical_duration', {})
+    if not isinstance(typical, dict):
+        return None
+
+    maximum = typical.get('maximum')
+    if not isinstance(maximum, (int, float)):
+        by_approach = typical.get('by_approach', {})
+        maximums = [
+            approach.get('maximum') for approach in by_approach.values()
+            if isinstance(approach, dict) and isinstance(approach.get('maximum'), (int, float))
+        ]
+        if not maximums:
+            return None
+        maximum = max(maximums)
+
+    if str(typical.get('unit', 'days')).startswith('hours'):
+        maximum = maximum / 24
+    return max(1, math.ceil(maximum))
@@ -0,0 +1,103 @@
+"""
+Multi-keyword matcher
+Aho-Corasick automaton for finding many keywords in text in a single pass
+
+Used for policy exclusion checks, where every registry exclusion keyword has to
+be located in every exclusion clause of a policy. The automaton is compiled
+once per keyword set; scanning is linear in the text length plus the number of
+matches, regardless of how many keywords there are.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive Aho-Corasick keyword matcher
+
+    Matches are plain substrings (no word boundaries), like "keyword in text".
+    Positions refer to the lower-cased text, which has the same offsets as the
+    original for the text found in policies and notes.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the automaton
+
+        Args:
+            keywords: Keywords to search for (empty and duplicate keywords are ignored)
+        """
+        self.keywords: List[str] = []
+        # Trie as parallel lists indexed by state; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        seen = set()
+        for keyword in keywords:
+            pattern = keyword.lower()
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern, len(self.keywords))
+            self.keywords.append(keyword)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find every (possibly overlapping) keyword occurrence
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (start, end, keyword) in order of end position, where
+            text[start:end] matches keyword case-insensitively
+        """
+        matches = []
+        if not self.keywords:
+            return matches
+
+        goto, fail, output = self._goto, self._fail, self._output
+        lengths = [len(k) for k in self.keywords]
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_index in output[state]:
+                end = position + 1
+                matches.append((end - lengths[keyword_index], end, self.keywords[keyword_index]))
+        return matches
+
+    def _add(self, pattern: str, keyword_index: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword_index)
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first: each state falls back to its longest proper suffix in the trie"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Keywords ending at the fallback state also end here
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
@@ -0,0 +1,243 @@
+"""
+LLM response cache
+Content-addressed on-disk cache for Claude responses, keyed by a hash of
+(model, max_tokens, temperature, prompt)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of LLM responses
+
+    Each response is stored as one small JSON file named after the SHA-256 of
+    the request parameters, sharded into sub-directories by the first two hex
+    characters. Identical requests (e.g. a hospital re-uploading the same
+    pre-auth PDF) are served from disk instead of calling the API again.
+
+    Eviction:
+    - TTL: entries older than ttl_seconds are treated as misses and removed
+    - Size: when max_entries or max_bytes is exceeded, the oldest entries are
+      removed until the cache is back under 90% of the limit
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        max_bytes: int = 200 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            cache_dir: Directory to store cached responses
+            ttl_seconds: Time-to-live for an entry in seconds (0 disables expiry)
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses on disk
+            enabled: If False, get() always misses and set() is a no-op
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # Approximate (entry count, total bytes); computed lazily on first write
+        self._entry_count: Optional[int] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(prompt: str, model: str, max_tokens: int, temperature: float) -> str:
+        """
+        Build the content-addressed cache key for a request
+
+        Args:
+            prompt: The prompt text
+            model: Claude model name
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "max_tokens": int(max_tokens),
+                "temperature": float(temperature),
+                "prompt": prompt
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._record_miss()
+            return None
+
+        if self._is_expired(entry.get("created_at", 0)):
+            self._remove(path)
+            self._record_miss()
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry.get("response")
+
+    def set(self, key: str, response: str, model: Optional[str] = None) -> None:
+        """
+        Store a response in the cache
+
+        Args:
+            key: Cache key from make_key()
+            response: Response text to cache
+            model: Model name (stored for inspection only)
+        """
+        if not self.enabled:
+            return
+
+        path = self._path_for(key)
+        entry = {
+            "key": key,
+            "model": model,
+            "created_at": time.time(),
+            "response": response
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+            # Write atomically so concurrent readers never see a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best-effort; never fail the LLM call because of it
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._entry_count is None:
+                self._scan()
+            elif not existed:
+                self._entry_count += 1
+                self._total_bytes += len(data)
+
+            if self._entry_count > self.max_entries or self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            for path in self.cache_dir.glob("*/*.json"):
+                self._remove(path)
+            self._entry_count = 0
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dict with enabled flag, hits, misses, writes, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0
+            }
+
+    def _path_for(self, key: str) -> Path:
+        """Sharded file path for a cache key"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _is_expired(self, created_at: float) -> bool:
+        """Check whether an entry created at created_at has outlived the TTL"""
+        if not self.ttl_seconds:
+            return False
+        return (time.time() - created_at) > self.ttl_seconds
+
+    def _record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _scan(self) -> list:
+        """
+        Recount entries on disk (caller must hold the lock)
+
+        Returns:
+            List of (mtime, size, path) tuples for all entries
+        """
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        self._entry_count = len(entries)
+        self._total_bytes = sum(size for _, size, _ in entries)
+        return entries
+
+    def _evict(self) -> None:
+        """Remove expired entries, then oldest entries until under 90% of limits (caller must hold the lock)"""
+        entries = sorted(self._scan())
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+
+        for mtime, size, path in entries:
+            over_limit = self._entry_count > target_entries or self._total_bytes > target_bytes
+            if not over_limit and not self._is_expired(mtime):
+                break
+            self._remove(path)
+            self._entry_count -= 1
+            self._total_bytes -= size
+            self.evictions += 1
@@ -1,25 +1,64 @@
 """
 LLM client wrapper for Anthropic Claude API
-Handles API initialization, error handling, and retries
+Handles API initialization, error handling, retries, response caching,
+coalescing of identical in-flight requests, rate limiting, the shared async
+client pool and usage telemetry
 """
 
+import asyncio
+import email.utils
 import os
-from typing import Optional
-from anthropic import Anthropic
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, APIConnectionError, APIStatusError
 from dotenv import load_dotenv
 
+from src.utils import telemetry
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.single_flight import SingleFlight
+
 # Load environment variables
 load_dotenv()
 
 
-# Global client instance
-_llm_client: Optional[Anthropic] = None
+# Global client instances, one per API key
+_llm_clients: Dict[str, Anthropic] = {}
+
+# Global response cache instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+# Global coalescing group for identical in-flight requests
+_single_flight: Optional[SingleFlight] = None
+
+# Global rate limiter and concurrency gate (shared by threads and every event loop)
+_rate_limiter: Optional["LLMRateLimiter"] = None
+_concurrency_limiter: Optional["ConcurrencyLimiter"] = None
+
+# Async client pools per event loop (httpx connections are bound to a loop), by API key
+_async_pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+_init_lock = threading.Lock()
+
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
 
-def get_llm_client() -> Anthropic:
+
+def get_llm_client(api_key: Optional[str] = None) -> Anthropic:
     """
     Get or create Anthropic client instance
-    Singleton pattern to reuse client
+    One client is reused per API key
+
+    Args:
+        api_key: Optional API key (defaults to ANTHROPIC_API_KEY)
 
     Returns:
         Anthropic client instance
@@ -27,20 +66,222 @@ def get_llm_client() -> Anthropic:
     Raises:
         ValueError: If ANTHROPIC_API_KEY not set in environment
     """
-    global _llm_client
+    api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
 
-    if _llm_client is None:
-        api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "ANTHROPIC_API_KEY not found in environment variables. "
+            "Please set it in .env file or environment."
+        )
 
-        if not api_key:
-            raise ValueError(
-                "ANTHROPIC_API_KEY not found in environment variables. "
-                "Please set it in .env file or environment."
-            )
+    client = _llm_clients.get(api_key)
+    if client is None:
+        with _init_lock:
+            client = _llm_clients.get(api_key)
+            if client is None:
+                # Retries are handled by RetryPolicy, not by the SDK
+                client = Anthropic(api_key=api_key, max_retries=0)
+                _llm_clients[api_key] = client
+
+    return client
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get or create the shared LLM response cache
+    Configured from environment variables:
+
+    - LLM_CACHE_ENABLED: "false" / "0" to bypass the cache (default: enabled)
+    - LLM_CACHE_DIR: Cache directory (default: data/llm_cache)
+    - LLM_CACHE_TTL_HOURS: Entry time-to-live in hours (default: 168)
+    - LLM_CACHE_MAX_ENTRIES: Maximum number of entries (default: 10000)
+    - LLM_CACHE_MAX_MB: Maximum size on disk in MB (default: 200)
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _llm_cache
+
+    if _llm_cache is None:
+        project_root = Path(__file__).parent.parent.parent
+        enabled = os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+
+        _llm_cache = LLMResponseCache(
+            cache_dir=os.getenv("LLM_CACHE_DIR", str(project_root / "data" / "llm_cache")),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600,
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024),
+            enabled=enabled
+        )
+
+    return _llm_cache
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Get or create the shared group that coalesces identical in-flight requests
+
+    Concurrent calls with the same (model, max_tokens, temperature, prompt),
+    from threads or asyncio tasks, share one API request. Disabled with
+    LLM_COALESCE_ENABLED=false.
+
+    Returns:
+        SingleFlight instance, or None if coalescing is disabled
+    """
+    global _single_flight
+
+    if os.getenv("LLM_COALESCE_ENABLED", "true").strip().lower() in ("0", "false", "no", "off"):
+        return None
+
+    if _single_flight is None:
+        with _init_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+
+    return _single_flight
+
+
+# ============================================================================
+# RETRY POLICY
+# ============================================================================
+
+# HTTP status codes worth retrying: timeouts, conflicts, rate limits, server errors and 529 "overloaded"
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class RetryPolicy:
+    """
+    Retry policy for Claude API calls
+
+    - Only transient errors are retried (connection errors, timeouts, 408/409/429/5xx/529);
+      request errors such as 400/401/403/404 fail immediately
+    - Delay between attempts is exponential backoff with full jitter
+    - A server retry-after hint overrides the backoff when it is longer
+    - Every call has a total deadline budget shared by all attempts; a retry is
+      not attempted if its delay would overrun the budget
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 30.0, deadline: float = 120.0):
+        """
+        Args:
+            base_delay: Backoff delay before the first retry, in seconds
+            max_delay: Upper bound for a single backoff delay, in seconds
+            deadline: Total time budget for one call including retries, in seconds
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check whether an error is transient and worth retrying"""
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        # APITimeoutError is a subclass of APIConnectionError
+        return isinstance(error, (APIConnectionError, TimeoutError, ConnectionError))
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """
+        Read the server's retry-after hint from an API error
+
+        Returns:
+            Seconds to wait, or None if the response carries no usable hint
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return max(0.0, float(retry_after_ms) / 1000.0)
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        # HTTP-date form
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry number (0-based)"""
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def next_delay(self, error: Exception, attempt: int, max_attempts: int, started_at: float) -> Optional[float]:
+        """
+        Decide whether and when to retry after a failed attempt
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: 0-based index of the attempt that failed
+            max_attempts: Total attempts allowed
+            started_at: time.monotonic() when the call started
 
-        _llm_client = Anthropic(api_key=api_key)
+        Returns:
+            Seconds to sleep before the next attempt, or None to give up
+        """
+        if attempt >= max_attempts - 1 or not self.is_retryable(error):
+            return None
 
-    return _llm_client
+        delay = self.backoff(attempt)
+        hint = self.retry_after(error)
+        if hint is not None:
+            delay = max(delay, hint)
+
+        if self.remaining(started_at) <= delay:
+            return None
+        return delay
+
+    def remaining(self, started_at: float) -> float:
+        """Seconds left in the deadline budget of a call started at started_at"""
+        return self.deadline - (time.monotonic() - started_at)
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Build the retry policy from environment settings:
+    LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY and LLM_CALL_DEADLINE_SECONDS
+
+    Returns:
+        RetryPolicy instance
+    """
+    return RetryPolicy(
+        base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0")),
+        max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "30.0")),
+        deadline=float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "120"))
+    )
+
+
+def _usage_tokens(message) -> tuple:
+    """
+    Read token usage from an API response
+
+    Returns:
+        Tuple of (input_tokens, output_tokens); 0 for counts the response does not carry
+    """
+    usage = getattr(message, "usage", None)
+    input_tokens = getattr(usage, "input_tokens", 0)
+    output_tokens = getattr(usage, "output_tokens", 0)
+    return (
+        input_tokens if isinstance(input_tokens, int) else 0,
+        output_tokens if isinstance(output_tokens, int) else 0
+    )
+
+
+def _raise_llm_failure(attempts: int, error: Exception):
+    """Raise the standard error for a failed LLM call"""
+    raise Exception(f"LLM call failed after {attempts} attempts: {str(error)}") from error
 
 
 def call_llm_with_retry(
@@ -48,51 +289,526 @@ def call_llm_with_retry(
     model: str = "claude-sonnet-4-20250514",
     max_tokens: int = 2000,
     temperature: float = 0.3,
-    max_retries: int = 2
+    max_retries: int = 2,
+    use_cache: bool = True,
+    retry_policy: Optional[RetryPolicy] = None,
+    api_key: Optional[str] = None
 ) -> str:
     """
     Call Claude API with automatic retry on failure
 
+    Responses are cached on disk keyed by (model, max_tokens, temperature, prompt),
+    so byte-identical requests are answered without an API call. Identical
+    requests made while one is in flight wait for it and share its response.
+
     Args:
         prompt: The prompt text
         model: Claude model to use
         max_tokens: Maximum tokens in response
         temperature: Temperature for response generation (0.0-1.0)
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of attempts, at least 1 (transient errors only are retried)
+        use_cache: Read from and write to the response cache (default: True)
+        retry_policy: Retry policy (default: built from environment, see get_retry_policy)
+        api_key: Optional API key (defaults to ANTHROPIC_API_KEY)
 
     Returns:
         Response text from Claude
 
     Raises:
-        Exception: If all retries fail
+        Exception: If the error is not retryable, all attempts fail, or the deadline is exhausted
     """
-    client = get_llm_client()
+    cache = get_llm_cache() if use_cache else None
+    request_key = LLMResponseCache.make_key(prompt, model, max_tokens, temperature)
+    cache_key = None
+
+    if cache is not None and cache.enabled:
+        cache_key = request_key
+        lookup_started = time.perf_counter()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            telemetry.record_llm_call(model, latency=time.perf_counter() - lookup_started, cache_hit=True)
+            return cached
+
+    def send() -> str:
+        response_text = _send_request(prompt, model, max_tokens, temperature, max_retries, retry_policy, api_key)
+        if cache_key is not None:
+            cache.set(cache_key, response_text, model=model)
+        return response_text
+
+    group = get_single_flight()
+    if group is None:
+        return send()
+
+    timer = time.perf_counter()
+    response_text, shared = group.do(request_key, send)
+    if shared:
+        telemetry.record_llm_call(model, latency=time.perf_counter() - timer, coalesced=True)
+    return response_text
 
-    last_error = None
 
-    for attempt in range(max_retries):
+def _send_request(
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    max_retries: int,
+    retry_policy: Optional[RetryPolicy],
+    api_key: Optional[str] = None
+) -> str:
+    """Send one request to the API with retries (see call_llm_with_retry)"""
+    client = get_llm_client(api_key)
+    limiter = get_rate_limiter()
+    gate = get_concurrency_limiter()
+    policy = retry_policy or get_retry_policy()
+    started_at = time.monotonic()
+    timer = time.perf_counter()
+    # At least one attempt, whatever max_retries says
+    attempts = max(1, max_retries)
+
+    for attempt in range(attempts):
         try:
-            message = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            # Rate-limit waits happen before taking a slot, so they don't hold one
+            limiter.acquire(estimate_tokens(prompt))
+            with gate:
+                message = client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=max(1.0, policy.remaining(started_at))
+                )
 
-            return message.content[0].text
+            response_text = message.content[0].text
+            input_tokens, output_tokens = _usage_tokens(message)
+            telemetry.record_llm_call(
+                model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency=time.perf_counter() - timer
+            )
+            return response_text
 
         except Exception as e:
-            last_error = e
+            delay = policy.next_delay(e, attempt, attempts, started_at)
+            if delay is None:
+                telemetry.record_llm_error(model)
+                _raise_llm_failure(attempt + 1, e)
+            time.sleep(delay)
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate
+
+    reserve() deducts immediately and may drive the balance negative; the
+    returned wait time is how long the caller must sleep before its
+    reservation is covered. Callers are therefore served in reservation
+    order without polling.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Args:
+            per_minute: Bucket capacity and refill rate per minute
+        """
+        self.capacity = float(per_minute)
+        self.rate_per_second = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserve tokens from the bucket
+
+        Args:
+            amount: Tokens to take (clamped to the bucket capacity)
+
+        Returns:
+            Seconds to wait before the reservation is available
+        """
+        amount = min(float(amount), self.capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= amount
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+
+class LLMRateLimiter:
+    """
+    Process-wide limiter for requests/min and (estimated input) tokens/min
+
+    Shared by the sync and async call paths so every agent draws from the
+    same budget. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Args:
+            requests_per_minute: Maximum API requests per minute (0 = unlimited)
+            tokens_per_minute: Maximum estimated prompt tokens per minute (0 = unlimited)
+        """
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """
+        Reserve one request and estimated_tokens tokens
 
-            # If this was the last attempt, raise the error
-            if attempt == max_retries - 1:
-                break
+        Returns:
+            Seconds to wait before sending the request
+        """
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.reserve(estimated_tokens))
+        return wait
 
-            # Otherwise, continue to next attempt
-            continue
+    def acquire(self, estimated_tokens: int) -> None:
+        """Block the calling thread until the request may be sent"""
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
 
-    # If we got here, all retries failed
-    raise Exception(f"LLM call failed after {max_retries} attempts: {str(last_error)}")
+    async def acquire_async(self, estimated_tokens: int) -> None:
+        """Suspend the calling task until the request may be sent"""
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    """
+    Get or create the shared rate limiter
+    Configured from LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE (0 = unlimited)
+
+    Returns:
+        LLMRateLimiter instance
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        with _init_lock:
+            if _rate_limiter is None:
+                _rate_limiter = LLMRateLimiter(
+                    requests_per_minute=_env_int("LLM_REQUESTS_PER_MINUTE", 0),
+                    tokens_per_minute=_env_int("LLM_TOKENS_PER_MINUTE", 0)
+                )
+
+    return _rate_limiter
+
+
+def get_max_concurrency() -> int:
+    """Maximum number of in-flight LLM requests per process (LLM_MAX_CONCURRENCY)"""
+    return max(1, _env_int("LLM_MAX_CONCURRENCY", 16))
+
+
+class ConcurrencyLimiter:
+    """
+    Process-wide cap on in-flight API requests
+
+    One counter shared by the sync path (threads) and the async path (tasks on
+    any event loop), so mixed traffic, such as batch workers next to the API
+    service, never exceeds the limit together. Freed slots are handed to
+    waiters in arrival order. Use as a context manager, sync or async.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: Maximum number of requests in flight at once
+        """
+        self.limit = max(1, limit)
+        self._in_flight = 0
+        # Callbacks that wake a waiter; a woken waiter owns the freed slot
+        self._waiters: Deque[Callable[[], None]] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block the calling thread until a slot is free"""
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            granted = threading.Event()
+            self._waiters.append(granted.set)
+        granted.wait()
+
+    async def acquire_async(self) -> None:
+        """Suspend the calling task until a slot is free"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            granted = loop.create_future()
+
+            def wake() -> None:
+                loop.call_soon_threadsafe(_set_future_result, granted)
+
+            self._waiters.append(wake)
+
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(wake)
+                    handed_over = False
+                except ValueError:
+                    handed_over = True
+            if handed_over:
+                # The slot was handed to this task as it was cancelled; pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the longest waiting caller if any"""
+        with self._lock:
+            while self._waiters:
+                wake = self._waiters.popleft()
+                try:
+                    wake()
+                    return
+                except RuntimeError:
+                    # The waiter's event loop has closed
+                    continue
+            self._in_flight -= 1
+
+    def in_flight(self) -> int:
+        """Number of slots currently taken"""
+        with self._lock:
+            return self._in_flight
+
+    def __enter__(self) -> "ConcurrencyLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _set_future_result(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """
+    Get or create the process-wide concurrency gate
+    Sized by LLM_MAX_CONCURRENCY
+
+    Returns:
+        ConcurrencyLimiter instance
+    """
+    global _concurrency_limiter
+
+    if _concurrency_limiter is None:
+        with _init_lock:
+            if _concurrency_limiter is None:
+                _concurrency_limiter = ConcurrencyLimiter(get_max_concurrency())
+
+    return _concurrency_limiter
+
+
+# ============================================================================
+# ASYNC CLIENT
+# ============================================================================
+
+class _AsyncLLMPool:
+    """Async client with a bounded connection pool"""
+
+    def __init__(self, api_key: str, max_concurrency: int):
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0)
+            )
+        )
+
+
+def _get_async_pool(api_key: Optional[str] = None) -> _AsyncLLMPool:
+    """Get or create the async pool for the running event loop and API key"""
+    api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "ANTHROPIC_API_KEY not found in environment variables. "
+            "Please set it in .env file or environment."
+        )
+
+    loop = asyncio.get_running_loop()
+    pools = _async_pools.setdefault(loop, {})
+    pool = pools.get(api_key)
+
+    if pool is None:
+        pool = _AsyncLLMPool(api_key, get_max_concurrency())
+        pools[api_key] = pool
+
+    return pool
+
+
+def get_async_llm_client(api_key: Optional[str] = None) -> AsyncAnthropic:
+    """
+    Get or create the shared AsyncAnthropic client for the running event loop
+
+    All agents running on the same loop with the same key share one HTTP
+    connection pool (sized by LLM_MAX_CONCURRENCY).
+
+    Args:
+        api_key: Optional API key (defaults to ANTHROPIC_API_KEY)
+
+    Returns:
+        AsyncAnthropic client instance
+
+    Raises:
+        ValueError: If ANTHROPIC_API_KEY not set in environment
+        RuntimeError: If called outside a running event loop
+    """
+    return _get_async_pool(api_key).client
+
+
+async def close_async_llm_client() -> None:
+    """Close the async client pools for the running event loop, if any"""
+    loop = asyncio.get_running_loop()
+    pools = _async_pools.pop(loop, None) or {}
+    for pool in pools.values():
+        await pool.client.close()
+
+
+async def call_llm_async(
+    prompt: str,
+    model: str = "claude-sonnet-4-20250514",
+    max_tokens: int = 2000,
+    temperature: float = 0.3,
+    max_retries: int = 2,
+    use_cache: bool = True,
+    retry_policy: Optional[RetryPolicy] = None,
+    api_key: Optional[str] = None
+) -> str:
+    """
+    Async variant of call_llm_with_retry
+
+    Uses the shared async client, waits on the process-wide concurrency gate
+    and rate limiter, and shares the response cache and the coalescing of
+    identical in-flight requests with the sync path.
+
+    Args:
+        prompt: The prompt text
+        model: Claude model to use
+        max_tokens: Maximum tokens in response
+        temperature: Temperature for response generation (0.0-1.0)
+        max_retries: Maximum number of attempts, at least 1 (transient errors only are retried)
+        use_cache: Read from and write to the response cache (default: True)
+        retry_policy: Retry policy (default: built from environment, see get_retry_policy)
+        api_key: Optional API key (defaults to ANTHROPIC_API_KEY)
+
+    Returns:
+        Response text from Claude
+
+    Raises:
+        Exception: If the error is not retryable, all attempts fail, or the deadline is exhausted
+    """
+    cache = get_llm_cache() if use_cache else None
+    request_key = LLMResponseCache.make_key(prompt, model, max_tokens, temperature)
+    cache_key = None
+
+    if cache is not None and cache.enabled:
+        cache_key = request_key
+        lookup_started = time.perf_counter()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            telemetry.record_llm_call(model, latency=time.perf_counter() - lookup_started, cache_hit=True)
+            return cached
+
+    async def send() -> str:
+        response_text = await _send_request_async(
+            prompt, model, max_tokens, temperature, max_retries, retry_policy, api_key
+        )
+        if cache_key is not None:
+            cache.set(cache_key, response_text, model=model)
+        return response_text
+
+    group = get_single_flight()
+    if group is None:
+        return await send()
+
+    timer = time.perf_counter()
+    response_text, shared = await group.do_async(request_key, send)
+    if shared:
+        telemetry.record_llm_call(model, latency=time.perf_counter() - timer, coalesced=True)
+    return response_text
+
+
+async def _send_request_async(
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    max_retries: int,
+    retry_policy: Optional[RetryPolicy],
+    api_key: Optional[str] = None
+) -> str:
+    """Send one request to the API with retries (see call_llm_async)"""
+    pool = _get_async_pool(api_key)
+    limiter = get_rate_limiter()
+    gate = get_concurrency_limiter()
+    policy = retry_policy or get_retry_policy()
+    started_at = time.monotonic()
+    timer = time.perf_counter()
+    # At least one attempt, whatever max_retries says
+    attempts = max(1, max_retries)
+
+    for attempt in range(attempts):
+        try:
+            await limiter.acquire_async(estimate_tokens(prompt))
+            async with gate:
+                message = await pool.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=max(1.0, policy.remaining(started_at))
+                )
+
+            response_text = message.content[0].text
+            input_tokens, output_tokens = _usage_tokens(message)
+            telemetry.record_llm_call(
+                model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency=time.perf_counter() - timer
+            )
+            return response_text
+
+        except Exception as e:
+            delay = policy.next_delay(e, attempt, attempts, started_at)
+            if delay is None:
+                telemetry.record_llm_error(model)
+                _raise_llm_failure(attempt + 1, e)
+            await asyncio.sleep(delay)
 
 
 def estimate_tokens(text: str) -> int:
@@ -0,0 +1,159 @@
+"""
+Logging configuration
+Structured, lazily formatted logging with per-module levels
+
+Modules log through the standard library: logger = logging.getLogger(__name__).
+Messages use %-style arguments, so nothing is formatted unless the record is
+emitted, and the level check (Logger.isEnabledFor) is a cached dict lookup.
+Expensive values such as prompts or extracted notes are passed as
+Lazy(...) / lazy_json(...) so they are only rendered when debug is on.
+
+Configured from environment variables:
+
+- LOG_LEVEL: Level of the application loggers ("src" and "iris") (default: INFO)
+- LOG_LEVELS: Per-module overrides, e.g. "src.agents=DEBUG,iris.telemetry=WARNING,httpx=WARNING"
+- LOG_FORMAT: "text" (default) or "json" (one JSON object per line)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+# Loggers LOG_LEVEL applies to: this package's modules (src.*) and named channels (iris.*)
+APP_LOGGERS = ("src", "iris")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_handler: Optional[logging.Handler] = None
+_configure_lock = threading.Lock()
+
+
+class Lazy:
+    """
+    Defer building a log argument until the record is formatted
+
+    Example:
+        >>> logger.debug("Prompt: %s", Lazy(lambda: build_prompt(note)))
+    """
+
+    __slots__ = ("_render",)
+
+    def __init__(self, render: Callable[[], Any]):
+        self._render = render
+
+    def __str__(self) -> str:
+        return str(self._render())
+
+
+def lazy_json(value: Any, indent: Optional[int] = 2) -> Lazy:
+    """
+    Defer JSON serialization of a Pydantic model or plain value for logging
+
+    Args:
+        value: Pydantic model (model_dump_json is used) or JSON-serializable value
+        indent: JSON indentation
+
+    Returns:
+        Lazy wrapper rendering the JSON text
+    """
+    if hasattr(value, "model_dump_json"):
+        return Lazy(lambda: value.model_dump_json(indent=indent))
+    return Lazy(lambda: json.dumps(value, indent=indent, default=str))
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including extra={...} fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                         + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse per-module levels
+
+    Args:
+        spec: Comma-separated "logger=LEVEL" pairs
+
+    Returns:
+        Dict of logger name to numeric level
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown level
+    """
+    levels = {}
+    for pair in spec.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        name, sep, level = pair.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid LOG_LEVELS entry {pair!r}, expected logger=LEVEL")
+        levels[name.strip()] = _level_number(level)
+    return levels
+
+
+def _level_number(level: str) -> int:
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level {level!r}")
+    return value
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    module_levels: Optional[str] = None
+) -> None:
+    """
+    Configure application logging (safe to call more than once)
+
+    Sets the level of the application loggers and any per-module overrides,
+    and installs one stderr handler on the root logger unless the host
+    (uvicorn, Streamlit, pytest) already configured one. Third-party loggers
+    keep their own levels unless named in module_levels.
+
+    Args:
+        level: Level for the application loggers (default: LOG_LEVEL or INFO)
+        fmt: "text" or "json" (default: LOG_FORMAT or text)
+        module_levels: "logger=LEVEL,..." overrides (default: LOG_LEVELS)
+    """
+    global _handler
+
+    level_number = _level_number(level or os.getenv("LOG_LEVEL") or "INFO")
+    overrides = parse_module_levels(module_levels if module_levels is not None else os.getenv("LOG_LEVELS", ""))
+    fmt = (fmt or os.getenv("LOG_FORMAT") or "text").strip().lower()
+
+    with _configure_lock:
+        for name in APP_LOGGERS:
+            logging.getLogger(name).setLevel(level_number)
+        for name, override in overrides.items():
+            logging.getLogger(name).setLevel(override)
+
+        root = logging.getLogger()
+        if _handler is None and root.handlers:
+            return
+        if _handler is None:
+            _handler = logging.StreamHandler(sys.stderr)
+            root.addHandler(_handler)
+        _handler.setFormatter(JSONFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
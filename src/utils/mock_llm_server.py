@@ -0,0 +1,446 @@
+"""
+Mock LLM server
+Local stand-in for the Anthropic Messages API (POST /v1/messages) for
+benchmarks and offline runs
+
+Responses are replayed from a recordings file:
+
+    {
+        "responses": {"<sha256 of prompt>": "response text", ...},
+        "rules": [{"contains": ["text in prompt", ...], "response": "response text"}, ...],
+        "default": "response text"
+    }
+
+A prompt is answered from "responses" by the SHA-256 of its text; prompts that
+were never recorded fall back to the first rule whose snippets all occur in the
+prompt, then to "default". Every reply carries usage figures estimated from the
+text length, so token and cost telemetry work as with the real API.
+
+Synthetic latency (mean plus uniform jitter) and an error rate (HTTP 529
+"overloaded" with a retry-after hint by default) can be configured to exercise
+timeouts and retries. With upstream set, unrecorded prompts are forwarded to the
+real API and the responses are added to the recordings, so a live run can
+record a replay file once.
+
+Run standalone with:
+
+    python -m src.utils.mock_llm_server --recordings tests/test_data/llm_recordings.json --port 8089
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=mock python -m src.services.batch_preauth ...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import httpx
+
+
+DEFAULT_UPSTREAM = "https://api.anthropic.com"
+
+
+def prompt_key(prompt: str) -> str:
+    """Recording key of a prompt: hex SHA-256 of its UTF-8 text"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class Recordings:
+    """Recorded responses by prompt hash, with snippet rules for unrecorded prompts"""
+
+    def __init__(
+        self,
+        responses: Optional[Dict[str, str]] = None,
+        rules: Optional[List[Dict]] = None,
+        default: Optional[str] = None
+    ):
+        """
+        Args:
+            responses: Response text by prompt_key()
+            rules: Ordered {"contains": [snippets], "response": text} fallbacks
+            default: Response for prompts matched by nothing (None: reply 404)
+        """
+        self.responses = dict(responses or {})
+        self.rules = list(rules or [])
+        self.default = default
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Recordings":
+        """
+        Load recordings from a JSON file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If a rule has no snippets or response
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        rules = data.get("rules", [])
+        for rule in rules:
+            if isinstance(rule.get("contains"), str):
+                rule["contains"] = [rule["contains"]]
+            if not rule.get("contains") or "response" not in rule:
+                raise ValueError(f"Recording rule needs 'contains' and 'response': {rule}")
+
+        return cls(responses=data.get("responses"), rules=rules, default=data.get("default"))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write recordings to a JSON file (atomically)"""
+        with self._lock:
+            data = {"responses": dict(sorted(self.responses.items())), "rules": self.rules, "default": self.default}
+
+        path = Path(path)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    def lookup(self, prompt: str) -> Optional[tuple]:
+        """
+        Find the response for a prompt
+
+        Returns:
+            Tuple of (response text, source) where source is "recorded", "rule"
+            or "default"; None if nothing matches
+        """
+        with self._lock:
+            recorded = self.responses.get(prompt_key(prompt))
+        if recorded is not None:
+            return recorded, "recorded"
+
+        for rule in self.rules:
+            if all(snippet in prompt for snippet in rule["contains"]):
+                return rule["response"], "rule"
+
+        if self.default is not None:
+            return self.default, "default"
+        return None
+
+    def record(self, prompt: str, response: str) -> None:
+        """Store a response for a prompt"""
+        with self._lock:
+            self.responses[prompt_key(prompt)] = response
+
+
+class MockLLMServer:
+    """
+    HTTP server implementing POST /v1/messages from recordings
+
+    Usable as a context manager; the server runs on a background thread.
+    """
+
+    def __init__(
+        self,
+        recordings: Optional[Recordings] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 529,
+        retry_after: float = 0.0,
+        seed: Optional[int] = None,
+        upstream: Optional[str] = None,
+        upstream_api_key: Optional[str] = None
+    ):
+        """
+        Initialize mock server
+
+        Args:
+            recordings: Responses to replay (default: empty, so only upstream answers)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Mean synthetic response delay in seconds
+            jitter: Delay varies uniformly within latency ± jitter
+            error_rate: Fraction of requests answered with error_status (0.0-1.0)
+            error_status: HTTP status of injected errors (529 overloaded, 429, 500, ...)
+            retry_after: retry-after hint in seconds sent with injected errors
+            seed: Random seed for reproducible latency and error injection
+            upstream: Forward unrecorded prompts to this API base URL and record the replies
+            upstream_api_key: API key for upstream (default: ANTHROPIC_API_KEY)
+        """
+        self.recordings = recordings or Recordings()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.upstream = upstream
+        self.upstream_api_key = upstream_api_key or os.getenv("ANTHROPIC_API_KEY")
+
+        self.counts = {"requests": 0, "recorded": 0, "rule": 0, "default": 0, "upstream": 0,
+                       "unmatched": 0, "errors_injected": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ANTHROPIC_BASE_URL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        """Serve requests on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port"""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict:
+        """
+        Get request counters
+
+        Returns:
+            Dict with requests, responses by source (recorded, rule, default,
+            upstream), unmatched prompts and injected errors
+        """
+        with self._lock:
+            return dict(self.counts)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _plan(self) -> tuple:
+        """Draw the delay and whether to inject an error for one request"""
+        with self._lock:
+            delay = 0.0
+            if self.latency or self.jitter:
+                delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, fail
+
+    def handle_messages(self, body: Dict) -> tuple:
+        """
+        Answer one Messages API request
+
+        Args:
+            body: Decoded request JSON
+
+        Returns:
+            Tuple of (HTTP status, response JSON, extra headers)
+        """
+        self._count("requests")
+        delay, fail = self._plan()
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            self._count("errors_injected")
+            headers = {"retry-after": f"{self.retry_after:g}"} if self.retry_after else {}
+            error_type = "overloaded_error" if self.error_status == 529 else "api_error"
+            return self.error_status, _error_body(error_type, "Injected error from mock LLM server"), headers
+
+        prompt = _prompt_text(body)
+        found = self.recordings.lookup(prompt)
+        # With an upstream, only exact recordings are replayed; everything else is recorded
+        if found is not None and (found[1] == "recorded" or not self.upstream):
+            text, source = found
+            self._count(source)
+            return 200, _message_body(body.get("model", "mock"), prompt, text), {}
+
+        if self.upstream:
+            status, reply = self._forward(body)
+            if status == 200:
+                self._count("upstream")
+                self.recordings.record(prompt, "".join(
+                    block.get("text", "") for block in reply.get("content", []) if block.get("type") == "text"
+                ))
+            return status, reply, {}
+
+        self._count("unmatched")
+        return 404, _error_body("not_found_error", f"No recording for prompt {prompt_key(prompt)}"), {}
+
+    def _forward(self, body: Dict) -> tuple:
+        """Send a request to the upstream API"""
+        response = httpx.post(
+            f"{self.upstream.rstrip('/')}/v1/messages",
+            json=body,
+            headers={
+                "x-api-key": self.upstream_api_key or "",
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            },
+            timeout=600.0
+        )
+        return response.status_code, response.json()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if self.path.split("?", 1)[0].rstrip("/") != "/v1/messages":
+                    self._reply(404, _error_body("not_found_error", f"Unknown path {self.path}"), {})
+                    return
+                try:
+                    length = int(self.headers.get("content-length", "0"))
+                    body = json.loads(self.rfile.read(length).decode("utf-8"))
+                except ValueError:
+                    self._reply(400, _error_body("invalid_request_error", "Body must be JSON"), {})
+                    return
+                self._reply(*server.handle_messages(body))
+
+            def _reply(self, status: int, payload: Dict, headers: Dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.send_header("request-id", f"req_mock_{uuid.uuid4().hex[:24]}")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _prompt_text(body: Dict) -> str:
+    """Text of the request's user messages (string or text-block content)"""
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if block.get("type") == "text")
+    return "\n".join(parts)
+
+
+def _message_body(model: str, prompt: str, text: str) -> Dict:
+    # Same ~4 characters per token estimate as llm_client.estimate_tokens
+    return {
+        "id": f"msg_mock_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": max(1, len(prompt) // 4), "output_tokens": max(1, len(text) // 4)}
+    }
+
+
+def _error_body(error_type: str, message: str) -> Dict:
+    return {"type": "error", "error": {"type": error_type, "message": message}}
+
+
+@contextmanager
+def mock_llm_environment(server: MockLLMServer, disable_cache: bool = True) -> Iterator[MockLLMServer]:
+    """
+    Point the shared LLM clients at a mock server for the duration of the block
+
+    Sets ANTHROPIC_BASE_URL / ANTHROPIC_API_KEY, optionally disables the
+    response cache so every call reaches the server, and drops the cached
+    client singletons so they are rebuilt against the mock. Everything is
+    restored on exit.
+
+    Args:
+        server: Running MockLLMServer
+        disable_cache: Bypass the LLM response cache (default: True)
+    """
+    from src.utils import llm_client
+
+    overrides = {"ANTHROPIC_BASE_URL": server.url, "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY") or "mock-key"}
+    if disable_cache:
+        overrides["LLM_CACHE_ENABLED"] = "false"
+
+    saved_env = {name: os.environ.get(name) for name in overrides}
+    saved_clients = (dict(llm_client._llm_clients), llm_client._llm_cache)
+    os.environ.update(overrides)
+    llm_client._llm_clients.clear()
+    llm_client._llm_cache = None
+    try:
+        yield server
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        llm_client._llm_clients.clear()
+        llm_client._llm_clients.update(saved_clients[0])
+        llm_client._llm_cache = saved_clients[1]
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command-line entry point: serve recordings until interrupted"""
+    parser = argparse.ArgumentParser(description="Local mock of the Anthropic Messages API")
+    parser.add_argument("--recordings", help="Recordings JSON file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform delay variation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with --error-status")
+    parser.add_argument("--error-status", type=int, default=529)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record-upstream", nargs="?", const=DEFAULT_UPSTREAM, default=None,
+                        help="Forward unrecorded prompts to the real API and save replies to --recordings")
+    args = parser.parse_args(argv)
+
+    if args.record_upstream and not args.recordings:
+        parser.error("--record-upstream needs --recordings to save to")
+
+    recordings = Recordings.load(args.recordings) if args.recordings and Path(args.recordings).exists() else Recordings()
+    server = MockLLMServer(
+        recordings=recordings,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        upstream=args.record_upstream
+    )
+
+    print(f"Mock LLM server on {server.url} (set ANTHROPIC_BASE_URL to this)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        if args.record_upstream:
+            recordings.save(args.recordings)
+            print(f"Saved {len(recordings.responses)} recorded responses to {args.recordings}")
+        print(f"Served: {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
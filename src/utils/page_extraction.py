@@ -0,0 +1,226 @@
+"""
+Page extraction
+Page-by-page PDF text extraction, serial or spread over a process pool
+
+Pages are yielded in page order as soon as they are extracted, so callers can
+start work on the first pages of a long document (itemized pharmacy lines of a
+CABG or TKR bill run to dozens of pages) before the last ones are read.
+
+Documents with at least min_pages pages are split into page ranges that worker
+processes extract from the same in-memory bytes; the ranges are reassembled in
+order, each page yielded once it and every page before it are done. Text
+extraction is pure-Python CPU work, so threads would not run it in parallel.
+Shorter documents, or hosts with a single CPU, are extracted serially in
+process: for a few pages, starting the tasks costs more than it saves.
+"""
+
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_pages_pypdf2(pdf_bytes: bytes, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    for index in range(start, len(reader.pages) if stop is None else stop):
+        yield reader.pages[index].extract_text() or ""
+
+
+def _iter_pages_pdfplumber(pdf_bytes: bytes, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+            # Parsed layout objects are not needed once the text is out
+            page.flush_cache()
+
+
+PAGE_ITERATORS: Dict[str, Callable[..., Iterator[str]]] = {
+    "pypdf2": _iter_pages_pypdf2,
+    "pdfplumber": _iter_pages_pdfplumber
+}
+
+
+def count_pages(pdf_bytes: bytes) -> int:
+    """Number of pages (0 if the PDF can't be parsed)"""
+    import PyPDF2
+
+    try:
+        return len(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)).pages)
+    except Exception:
+        return 0
+
+
+def _extract_page_range(pdf_bytes: bytes, backend: str, start: int, stop: int) -> List[str]:
+    """Worker process task: text of pages [start, stop)"""
+    return list(PAGE_ITERATORS[backend](pdf_bytes, start, stop))
+
+
+class PageExtractor:
+    """
+    Streams page text, using a process pool for long documents
+
+    Example:
+        >>> extractor = get_page_extractor()
+        >>> for page_text in extractor.iter_pages(pdf_bytes, "pypdf2"):
+        ...     parse(page_text)
+    """
+
+    def __init__(self, workers: int = 1, min_pages: int = 24, chunks_per_worker: int = 2):
+        """
+        Args:
+            workers: Worker processes (below 2 extracts serially)
+            min_pages: Page count from which documents are extracted in parallel
+            chunks_per_worker: Page ranges per worker; smaller ranges reach the
+                caller sooner, larger ones parse the PDF fewer times
+        """
+        self.workers = workers
+        self.min_pages = min_pages
+        self.chunks_per_worker = max(1, chunks_per_worker)
+
+        self.documents = 0
+        self.parallel_documents = 0
+        self.pages = 0
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers >= 2 and self.min_pages > 0
+
+    def iter_pages(self, pdf_bytes: bytes, backend: str) -> Iterator[str]:
+        """
+        Text of each page, in page order, as it becomes available
+
+        Closing the iterator early cancels the page ranges not yet started.
+
+        Args:
+            pdf_bytes: PDF file content
+            backend: "pypdf2" or "pdfplumber"
+
+        Raises:
+            ValueError: If backend is unknown
+            Exception: Whatever the backend raises for an unreadable PDF
+        """
+        if backend not in PAGE_ITERATORS:
+            raise ValueError(f"Unknown PDF backend: {backend}. Use one of {', '.join(PAGE_ITERATORS)}")
+
+        page_count = count_pages(pdf_bytes) if self.parallel else 0
+        parallel = self.parallel and page_count >= self.min_pages
+        with self._lock:
+            self.documents += 1
+            self.parallel_documents += int(parallel)
+
+        if parallel:
+            pages = self._iter_parallel(pdf_bytes, backend, page_count)
+        else:
+            pages = PAGE_ITERATORS[backend](pdf_bytes)
+
+        try:
+            for text in pages:
+                with self._lock:
+                    self.pages += 1
+                yield text
+        finally:
+            if parallel:
+                # Cancels the page ranges not started yet
+                pages.close()
+
+    def stats(self) -> Dict:
+        """
+        Get extraction counters
+
+        Returns:
+            Dict with workers, min_pages, documents, parallel_documents and pages
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "min_pages": self.min_pages,
+                "documents": self.documents,
+                "parallel_documents": self.parallel_documents,
+                "pages": self.pages
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (they are started again on demand)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs worker threads can copy held locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _iter_parallel(self, pdf_bytes: bytes, backend: str, page_count: int) -> Iterator[str]:
+        """Extract page ranges in worker processes and yield them back in order"""
+        chunk = math.ceil(page_count / (self.workers * self.chunks_per_worker))
+        futures: List[Future] = []
+        done = 0
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_extract_page_range, pdf_bytes, backend, start, min(start + chunk, page_count))
+                for start in range(0, page_count, chunk)
+            ]
+            for future in futures:
+                for text in future.result():
+                    done += 1
+                    yield text
+        except Exception as e:
+            # A broken pool (killed worker, no fork/spawn support): finish in process.
+            # A PDF the backend can't read fails the same way again here.
+            logger.warning("Parallel page extraction failed after %d of %d pages, continuing serially: %s",
+                           done, page_count, e)
+            yield from PAGE_ITERATORS[backend](pdf_bytes, done, page_count)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+_page_extractor: Optional[PageExtractor] = None
+_init_lock = threading.Lock()
+
+
+def get_page_extractor() -> PageExtractor:
+    """
+    Get or create the shared page extractor
+    Configured from environment variables:
+
+    - PDF_PARALLEL_WORKERS: Worker processes (default: CPU count, at most 4;
+      below 2 disables parallel extraction)
+    - PDF_PARALLEL_MIN_PAGES: Page count from which a document is extracted
+      in parallel (default: 24; 0 disables parallel extraction)
+
+    Returns:
+        PageExtractor instance
+    """
+    global _page_extractor
+
+    with _init_lock:
+        if _page_extractor is None:
+            default_workers = min(4, os.cpu_count() or 1)
+            _page_extractor = PageExtractor(
+                workers=int(os.getenv("PDF_PARALLEL_WORKERS") or default_workers),
+                min_pages=int(os.getenv("PDF_PARALLEL_MIN_PAGES", "24"))
+            )
+
+    return _page_extractor
@@ -0,0 +1,291 @@
+"""
+PDF ingestion
+One pipeline for every PDF the app reads: pre-auth medical notes, final
+hospital bills and discharge summaries
+
+A PDFDocument reads the file once (or takes in-memory content such as an
+upload, so nothing is written to disk) and extracts page text lazily, per backend,
+through the shared PDF text cache; the text is kept on the document, so a
+regex pass and an LLM fallback on the same document share one extraction.
+Pages are extracted by the shared PageExtractor, which streams them in order
+and uses worker processes for long documents (see page_extraction.py).
+
+Template-specific parsers (PDFExtractor for pre-auth notes, FinalBillParser
+and DischargeSummaryParser for discharge documents) subclass DocumentParser
+and are run with ingest(). Each parser lists the backends it can read, fastest
+first; ingest() uses the first one that yields text for the document. PyPDF2
+is about 2.5x faster than pdfplumber on the test corpus, so pdfplumber is only
+used for documents PyPDF2 can't read.
+
+Parsers that subclass PageParser (FinalBillParser) are fed pages as they are
+extracted instead of the joined text, and stop reading once they have what
+they need; pages after that are never extracted.
+
+Usage:
+    >>> document = PDFDocument.open("case-1_finalbill.pdf")
+    >>> result = ingest(document, FinalBillParser())
+    >>> result.backend, result.data["total_bill_amount"]
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.utils.page_extraction import get_page_extractor
+from src.utils.pdf_text_cache import PDF_BACKENDS, PDFTextCache, get_pdf_text_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Anything PDFDocument.open() accepts: a path, the content (bytes, bytearray,
+# memoryview), a binary file object (BytesIO, Streamlit UploadedFile) or a document
+PDFSource = Union[str, Path, bytes, bytearray, memoryview, BinaryIO, "PDFDocument"]
+
+
+class PDFDocument:
+    """A PDF read into memory once, with page text extracted on first use"""
+
+    def __init__(self, pdf_bytes: bytes, name: str = "document.pdf"):
+        """
+        Args:
+            pdf_bytes: PDF file content
+            name: File name, for log messages
+        """
+        self.pdf_bytes = pdf_bytes
+        self.name = name
+        self._key: Optional[str] = None
+        self._pages: Dict[str, List[str]] = {}
+
+    @classmethod
+    def open(cls, source: PDFSource) -> "PDFDocument":
+        """
+        Open a PDF from a path, in-memory content or a binary file object
+        (documents are passed through)
+
+        bytes are used as they are and BytesIO content is taken with
+        getvalue(), leaving the stream position alone. bytearray and
+        memoryview content is copied once (the backends would copy it into
+        their own stream anyway). Other file objects are read from the start.
+
+        Raises:
+            FileNotFoundError: If the path doesn't exist
+        """
+        if isinstance(source, PDFDocument):
+            return source
+        if isinstance(source, bytes):
+            return cls(source)
+        if isinstance(source, (bytearray, memoryview)):
+            return cls(bytes(source))
+        if isinstance(source, io.BytesIO):
+            return cls(source.getvalue(), name=getattr(source, "name", "document.pdf"))
+        if hasattr(source, "read"):
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return cls(source.read(), name=getattr(source, "name", "document.pdf"))
+
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"PDF file not found: {source}")
+        return cls(path.read_bytes(), name=path.name)
+
+    @property
+    def key(self) -> str:
+        """Content hash, computed once (the text cache key)"""
+        if self._key is None:
+            self._key = PDFTextCache.make_key(self.pdf_bytes)
+        return self._key
+
+    def pages(self, backend: str) -> List[str]:
+        """
+        Text of each page as extracted by backend
+
+        Raises:
+            ValueError: If backend is unknown
+            Exception: Whatever the backend raises for an unreadable PDF
+        """
+        pages = self._pages.get(backend)
+        if pages is None:
+            pages = list(self.iter_pages(backend))
+        return pages
+
+    def iter_pages(self, backend: str) -> Iterator[str]:
+        """
+        Text of each page in page order, as soon as it is extracted
+
+        Pages already extracted come from the document or the text cache.
+        Otherwise they are streamed from the shared page extractor, and once
+        every page has been read they are kept on the document and cached;
+        stopping early keeps nothing.
+
+        Raises:
+            ValueError: If backend is unknown
+            Exception: Whatever the backend raises for an unreadable PDF
+        """
+        cache = get_pdf_text_cache()
+        pages = self._pages.get(backend)
+        if pages is None:
+            pages = cache.lookup(backend, self.key)
+        if pages is not None:
+            self._pages[backend] = pages
+            yield from pages
+            return
+
+        extracted = []
+        stream = get_page_extractor().iter_pages(self.pdf_bytes, backend)
+        try:
+            for text in stream:
+                extracted.append(text)
+                yield text
+        finally:
+            stream.close()
+        self._pages[backend] = extracted
+        cache.store(backend, self.key, extracted)
+
+    def read(self, backends: Tuple[str, ...] = PDF_BACKENDS, separator: str = "\n") -> Tuple[str, str]:
+        """
+        Text of the document from the first backend that yields any
+
+        Args:
+            backends: Backends to try, in order
+            separator: Joins the non-empty pages
+
+        Returns:
+            Tuple of (backend, text)
+
+        Raises:
+            ValueError: If no backend could read the document, or it has no text
+        """
+        error = None
+        for backend in backends:
+            try:
+                pages = self.pages(backend)
+            except Exception as e:
+                logger.warning("%s could not read %s: %s", backend, self.name, e)
+                error = e
+                continue
+
+            text = separator.join(page for page in pages if page)
+            if text.strip():
+                return backend, text
+            logger.info("%s found no text in %s", backend, self.name)
+
+        if error is not None:
+            raise ValueError(f"Failed to extract text from PDF: {error}")
+        raise ValueError("PDF appears to be empty or contains no extractable text")
+
+
+class DocumentParser:
+    """
+    Template-specific parser run by ingest()
+
+    Subclasses set the backends their patterns work with (fastest first) and
+    how pages are joined, and implement parse().
+    """
+
+    backends: Tuple[str, ...] = ("pypdf2", "pdfplumber")
+    separator: str = "\n"
+
+    def parse(self, text: str) -> Dict:
+        """Parse the document text into a data dictionary"""
+        raise NotImplementedError
+
+
+class PageParser(DocumentParser):
+    """
+    DocumentParser fed page by page, as pages are extracted
+
+    Subclasses implement parse_pages() and stop iterating once they have what
+    they need; ingest() then stops extracting. parse() runs parse_pages() over
+    a whole text as a single page.
+    """
+
+    def parse_pages(self, pages: Iterable[str]) -> Tuple[Any, List[int]]:
+        """
+        Parse page texts in page order, reading no more pages than needed
+
+        Returns:
+            Tuple of (parsed data, 1-based numbers of the pages the data came from)
+        """
+        raise NotImplementedError
+
+    def parse(self, text: str) -> Any:
+        return self.parse_pages([text])[0]
+
+
+@dataclass
+class IngestResult:
+    """A parsed document"""
+    document: PDFDocument
+    backend: str
+    text: str
+    data: Any
+    # Pages the data came from (PageParser only; text then covers only the pages read)
+    pages: Optional[List[int]] = None
+
+
+class _ExtractionError(Exception):
+    """A backend failed while a PageParser was reading its pages"""
+
+
+def ingest(source: PDFSource, parser: DocumentParser) -> IngestResult:
+    """
+    Open a document, read its text with the parser's fastest working backend and parse it
+
+    Args:
+        source: PDF path, content, binary file object or an opened document
+        parser: Template parser
+
+    Returns:
+        IngestResult with the document, backend used, text and parsed data
+
+    Raises:
+        FileNotFoundError: If the path doesn't exist
+        ValueError: If the document has no extractable text
+    """
+    document = PDFDocument.open(source)
+    if isinstance(parser, PageParser):
+        return _ingest_pages(document, parser)
+
+    backend, text = document.read(parser.backends, parser.separator)
+    return IngestResult(document=document, backend=backend, text=text, data=parser.parse(text))
+
+
+def _ingest_pages(document: PDFDocument, parser: PageParser) -> IngestResult:
+    """ingest() for page parsers: stream pages to the parser, with the same backend fallback as read()"""
+    error = None
+    for backend in parser.backends:
+        read: List[str] = []
+        pages = document.iter_pages(backend)
+
+        def extracted() -> Iterator[str]:
+            # Backend errors are told apart from parser errors, which propagate
+            while True:
+                try:
+                    text = next(pages)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    raise _ExtractionError(e) from e
+                read.append(text)
+                yield text
+
+        try:
+            data, used = parser.parse_pages(extracted())
+        except _ExtractionError as e:
+            logger.warning("%s could not read %s: %s", backend, document.name, e.__cause__)
+            error = e.__cause__
+            continue
+        finally:
+            # Stops extraction (and cancels parallel page ranges) if the parser stopped early
+            pages.close()
+
+        if any(text.strip() for text in read):
+            text = parser.separator.join(page for page in read if page)
+            return IngestResult(document=document, backend=backend, text=text, data=data, pages=used)
+        logger.info("%s found no text in %s", backend, document.name)
+
+    if error is not None:
+        raise ValueError(f"Failed to extract text from PDF: {error}")
+    raise ValueError("PDF appears to be empty or contains no extractable text")
@@ -5,7 +5,6 @@ Uses pdfplumber for basic extraction, falls back to Claude API for intelligent p
 
 import re
 from typing import Dict, Optional
-import pdfplumber
 
 from src.models.schemas import (
     MedicalNote, PatientInfo, DiagnosisInfo, ClinicalHistory,
@@ -13,29 +12,21 @@ from src.models.schemas import (
     HospitalizationDetails, CostBreakdown, DoctorDetails, HospitalDetails
 )
 from src.utils.llm_client import get_llm_client
+from src.utils.pdf_document import PDFDocument
 
 
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """
-    Extract raw text from PDF using pdfplumber
+    Extract raw text from PDF using pdfplumber (cached by content hash)
 
     Args:
         pdf_bytes: PDF file as bytes
 
     Returns:
-        Extracted text as string
+        Extracted text as string ("" if the PDF has no text)
     """
-    import io
-
-    text_parts = []
-
-    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-
-    return "\n".join(text_parts)
+    pages = PDFDocument(pdf_bytes).pages("pdfplumber")
+    return "\n".join(page for page in pages if page)
 
 
 def extract_medical_note_with_llm(pdf_text: str) -> Dict:
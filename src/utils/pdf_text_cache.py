@@ -0,0 +1,270 @@
+"""
+PDF text cache
+Content-addressed cache of extracted PDF page text, keyed by SHA-256 of the PDF bytes
+
+Text extraction with PyPDF2/pdfplumber is the most CPU-expensive non-LLM step.
+The same document is often extracted several times (re-validation after a form
+change, regex then LLM fallback on the same bill), so extracted pages are kept
+in an in-memory LRU in front of an on-disk store.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Bump when extraction output changes so stale on-disk entries are ignored
+EXTRACTION_VERSION = 1
+
+PDF_BACKENDS = ("pypdf2", "pdfplumber")
+
+
+class PDFTextCache:
+    """
+    Two-level cache of extracted PDF page text
+
+    - Memory: LRU of the most recently used documents (per process)
+    - Disk: one JSON file per (backend, document) under
+      cache_dir/<backend>-v<EXTRACTION_VERSION>/<sha[:2]>/<sha>.json, shared
+      across processes. When max_bytes is exceeded the oldest files are removed
+      until the store is back under 90% of the limit.
+
+    Entries never go stale: the key is the hash of the PDF content itself.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        memory_entries: int = 128,
+        max_bytes: int = 500 * 1024 * 1024,
+        enabled: bool = True,
+        persist: bool = True
+    ):
+        """
+        Initialize PDF text cache
+
+        Args:
+            cache_dir: Directory for the on-disk store
+            memory_entries: Documents kept in the in-memory LRU (0 disables it)
+            max_bytes: Maximum total size of the on-disk store
+            enabled: If False, lookups always miss and nothing is stored
+            persist: If False, only the in-memory LRU is used
+        """
+        self.cache_dir = Path(cache_dir)
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.persist = persist
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Approximate bytes on disk; computed lazily on first write
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes) -> str:
+        """
+        Build the content-addressed key for a PDF
+
+        Args:
+            pdf_bytes: PDF file content
+
+        Returns:
+            Hex SHA-256 digest of the content
+        """
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def lookup(self, backend: str, key: str) -> Optional[List[str]]:
+        """
+        Get a document's cached pages without extracting
+
+        Callers (PDFDocument) extract on a miss, page by page, and store() the
+        result. Hits are counted here, misses by store().
+
+        Args:
+            backend: Backend the text was extracted with
+            key: make_key() of the PDF content
+
+        Returns:
+            List of page texts, or None if not cached (or the cache is disabled)
+        """
+        if not self.enabled:
+            return None
+
+        memory_key = (backend, key)
+        with self._lock:
+            pages = self._memory.get(memory_key)
+            if pages is not None:
+                self._memory.move_to_end(memory_key)
+                self.memory_hits += 1
+                return list(pages)
+
+        pages = self._read_disk(backend, key)
+        if pages is None:
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(memory_key, pages)
+        return list(pages)
+
+    def store(self, backend: str, key: str, pages: List[str]) -> None:
+        """
+        Cache the pages of a document extracted after a lookup() miss
+
+        Args:
+            backend: Backend the text was extracted with
+            key: make_key() of the PDF content
+            pages: Text of every page
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.misses += 1
+        self._write_disk(backend, key, pages)
+        self._remember((backend, key), list(pages))
+
+    def clear(self) -> None:
+        """Remove all cached text from memory and disk"""
+        with self._lock:
+            self._memory.clear()
+            for path in self.cache_dir.glob("*/*/*.json"):
+                self._remove(path)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dict with enabled flag, memory_hits, disk_hits, misses, memory_entries and hit_rate
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "hit_rate": ((self.memory_hits + self.disk_hits) / lookups) if lookups else 0.0
+            }
+
+    def _path_for(self, backend: str, key: str) -> Path:
+        """Sharded file path for a document's pages"""
+        return self.cache_dir / f"{backend}-v{EXTRACTION_VERSION}" / key[:2] / f"{key}.json"
+
+    def _remember(self, memory_key: tuple, pages: List[str]) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[memory_key] = pages
+            self._memory.move_to_end(memory_key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, backend: str, key: str) -> Optional[List[str]]:
+        if not self.persist:
+            return None
+        try:
+            with open(self._path_for(backend, key), "r", encoding="utf-8") as f:
+                pages = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return pages if isinstance(pages, list) else None
+
+    def _write_disk(self, backend: str, key: str, pages: List[str]) -> None:
+        if not self.persist:
+            return
+
+        path = self._path_for(backend, key)
+        data = json.dumps(pages, ensure_ascii=False).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically so concurrent readers never see a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best-effort; never fail extraction because of it
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _scan(self) -> list:
+        """List (mtime, size, path) for all files on disk (caller must hold the lock)"""
+        entries = []
+        for path in self.cache_dir.glob("*/*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove oldest files until under 90% of max_bytes (caller must hold the lock)"""
+        entries = sorted(self._scan())
+        self._total_bytes = sum(size for _, size, _ in entries)
+        target_bytes = int(self.max_bytes * 0.9)
+
+        for _, size, path in entries:
+            if self._total_bytes <= target_bytes:
+                break
+            self._remove(path)
+            self._total_bytes -= size
+
+
+_pdf_text_cache: Optional[PDFTextCache] = None
+_init_lock = threading.Lock()
+
+
+def get_pdf_text_cache() -> PDFTextCache:
+    """
+    Get or create the shared PDF text cache
+    Configured from environment variables:
+
+    - PDF_TEXT_CACHE_ENABLED: "false" / "0" to always extract afresh (default: enabled)
+    - PDF_TEXT_CACHE_DIR: On-disk store directory (default: data/pdf_text_cache)
+    - PDF_TEXT_CACHE_MEMORY_ENTRIES: Documents kept in memory (default: 128)
+    - PDF_TEXT_CACHE_MAX_MB: Maximum size on disk in MB (default: 500)
+
+    Returns:
+        PDFTextCache instance
+    """
+    global _pdf_text_cache
+
+    with _init_lock:
+        if _pdf_text_cache is None:
+            project_root = Path(__file__).parent.parent.parent
+            enabled = os.getenv("PDF_TEXT_CACHE_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+
+            _pdf_text_cache = PDFTextCache(
+                cache_dir=os.getenv("PDF_TEXT_CACHE_DIR", str(project_root / "data" / "pdf_text_cache")),
+                memory_entries=int(os.getenv("PDF_TEXT_CACHE_MEMORY_ENTRIES", "128")),
+                max_bytes=int(float(os.getenv("PDF_TEXT_CACHE_MAX_MB", "500")) * 1024 * 1024),
+                enabled=enabled
+            )
+
+    return _pdf_text_cache
+
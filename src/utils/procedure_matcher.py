@@ -0,0 +1,163 @@
+"""
+Fuzzy procedure matching
+Ranks registry procedures against free text such as "phaco emulsification" or "lap chole"
+
+Every display name and synonym is broken into word trigrams once, and an
+inverted index maps each trigram to the names containing it. Candidates are
+gathered from the posting lists of the query's selective trigrams only, then
+scored exactly, so matching cost depends on the query rather than on the size
+of the registry.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from src.models.schemas import ProcedureRegistryEntry
+
+
+NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+# A name fully contained in the query ("phaco" in "phaco emulsification") scores
+# this much, so an exact match always ranks above a containment match
+CONTAINMENT_WEIGHT = 0.9
+
+# Trigrams found in more names than this are too common to gather candidates
+# from ("  s", "ery" in "surgery"); they still count when scoring. The rarest
+# MIN_PROBE_TRIGRAMS of a query are always probed.
+COMMON_TRIGRAM_POSTINGS = 64
+MIN_PROBE_TRIGRAMS = 3
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, punctuation to spaces, whitespace collapsed"""
+    return " ".join(NON_ALPHANUMERIC.sub(" ", text.casefold()).split())
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    Word trigrams of normalized text, padded so word starts and ends count
+
+    "lap chole" -> {"  l", " la", "lap", "ap ", "  c", " ch", "cho", "hol", "ole", "le "}
+    """
+    grams = set()
+    for word in normalize_text(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class ProcedureMatch:
+    """A ranked fuzzy match candidate"""
+    procedure_id: str
+    display_name: str
+    matched_name: str  # The display name or synonym that scored best
+    score: float  # 0.0 - 1.0, 1.0 for an exact (normalized) match
+    entry: ProcedureRegistryEntry
+
+
+class ProcedureMatcher:
+    """
+    Trigram inverted index over registry display names and synonyms
+
+    Scoring per name is max(Dice coefficient, CONTAINMENT_WEIGHT * share of the
+    name's trigrams found in the query); a procedure scores as its best name.
+    Only names sharing a selective trigram with the query are scored; with the
+    small MVP registry every trigram is selective and matching is exhaustive.
+    """
+
+    def __init__(self, entries: List[ProcedureRegistryEntry]):
+        """
+        Build the index
+
+        Args:
+            entries: Registry entries in registry order
+        """
+        # Parallel lists, one slot per distinct (procedure, normalized name)
+        self._names: List[str] = []
+        self._entries: List[ProcedureRegistryEntry] = []
+        self._grams: List[frozenset] = []
+        self._exact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        seen = set()
+        for entry in entries:
+            for name in [entry.user_display_name, *entry.common_synonyms]:
+                normalized = normalize_text(name)
+                grams = trigrams(normalized)
+                if not grams or (entry.procedure_id, normalized) in seen:
+                    continue
+                seen.add((entry.procedure_id, normalized))
+
+                slot = len(self._names)
+                self._names.append(name)
+                self._entries.append(entry)
+                self._grams.append(grams)
+                self._exact.setdefault(normalized, slot)
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(slot)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(self, text: str, limit: int = 5, min_score: float = 0.3) -> List[ProcedureMatch]:
+        """
+        Rank procedures against free text
+
+        Args:
+            text: Procedure name or phrase from a form or medical note
+            limit: Maximum number of candidates
+            min_score: Drop candidates scoring below this
+
+        Returns:
+            Up to limit ProcedureMatch objects, best first (one per procedure)
+        """
+        query_grams = trigrams(text)
+        if not query_grams or limit <= 0:
+            return []
+
+        # Probe the selective trigrams' posting lists for candidates
+        by_rarity = sorted(
+            (len(self._postings[gram]), gram) for gram in query_grams if gram in self._postings
+        )
+        candidates = set()
+        for rank, (postings_count, gram) in enumerate(by_rarity):
+            if rank >= MIN_PROBE_TRIGRAMS and postings_count > COMMON_TRIGRAM_POSTINGS:
+                break
+            candidates.update(self._postings[gram])
+
+        query_size = len(query_grams)
+        best: Dict[str, Tuple[float, int]] = {}
+        for slot in candidates:
+            name_grams = self._grams[slot]
+            shared = len(query_grams & name_grams)
+            score = max(
+                2.0 * shared / (query_size + len(name_grams)),
+                CONTAINMENT_WEIGHT * shared / len(name_grams)
+            )
+            procedure_id = self._entries[slot].procedure_id
+            current = best.get(procedure_id)
+            if current is None or score > current[0]:
+                best[procedure_id] = (score, slot)
+
+        # Exact normalized match scores 1.0 (Dice is 1.0 there, but guard float error)
+        exact_slot = self._exact.get(normalize_text(text))
+        if exact_slot is not None:
+            best[self._entries[exact_slot].procedure_id] = (1.0, exact_slot)
+
+        ranked = heapq.nlargest(
+            limit,
+            ((score, -slot) for score, slot in best.values() if score >= min_score)
+        )
+        return [
+            ProcedureMatch(
+                procedure_id=self._entries[-neg_slot].procedure_id,
+                display_name=self._entries[-neg_slot].user_display_name,
+                matched_name=self._names[-neg_slot],
+                score=round(score, 4),
+                entry=self._entries[-neg_slot]
+            )
+            for score, neg_slot in ranked
+        ]
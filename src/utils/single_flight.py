@@ -0,0 +1,194 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight call
+
+Used by the LLM client so that identical prompts sent at the same time (a
+hospital double-submitting a claim, two reviewers opening the same claim)
+reach the API once. The first caller for a key (the leader) runs the call;
+callers arriving while it is in flight wait for it and receive the same
+result or exception. Once the call finishes the key is released, so later
+callers start a new call (repeat requests are the response cache's job).
+
+Threads and asyncio tasks can coalesce with each other: thread followers
+block on an event, task followers await a future resolved on their own loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class _Flight:
+    """One in-flight call and the callers waiting for it"""
+
+    __slots__ = ("done", "result", "error", "abandoned", "_waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # The leader stopped without an outcome (cancelled or interrupted); followers retry
+        self.abandoned = False
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def add_waiter(self, loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+        """Future on loop resolved when the flight finishes (called with the group lock held)"""
+        future = loop.create_future()
+        self._waiters.append((loop, future))
+        return future
+
+    def finish(self) -> None:
+        """Wake every follower (called with the group lock held, after the outcome is set)"""
+        self.done.set()
+        for loop, future in self._waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The follower's loop has been closed
+                pass
+        self._waiters = []
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """
+    Thread-safe and asyncio-aware call deduplication by key
+
+    Example:
+        >>> group = SingleFlight()
+        >>> text, shared = group.do(request_key, lambda: send_request(prompt))
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the in-flight call with the same key
+
+        Args:
+            key: Deduplication key
+            fn: Call to run if no call with this key is in flight
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        while True:
+            flight, leader, _ = self._join(key)
+            if leader:
+                return self._lead(key, flight, fn), False
+
+            flight.done.wait()
+            if not flight.abandoned:
+                return self._outcome(flight), True
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Async variant of do(): await fn(), or the in-flight call with the same key
+
+        Args:
+            key: Deduplication key
+            fn: Coroutine function to await if no call with this key is in flight
+
+        Returns:
+            Tuple of (result, shared) as for do()
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            flight, leader, waiter = self._join(key, loop)
+            if leader:
+                return await self._lead_async(key, flight, fn), False
+
+            await waiter
+            if not flight.abandoned:
+                return self._outcome(flight), True
+
+    def stats(self) -> Dict:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dict with in_flight keys, leaders (calls made) and coalesced (calls saved)
+        """
+        with self._lock:
+            return {"in_flight": len(self._flights), "leaders": self.leaders, "coalesced": self.coalesced}
+
+    def _join(
+        self,
+        key: str,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Tuple[_Flight, bool, Optional[asyncio.Future]]:
+        """
+        Find the flight for key or start one
+
+        Returns:
+            Tuple of (flight, leader, waiter) where waiter is the future an
+            async follower awaits (None for leaders and thread followers)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.leaders += 1
+                return flight, True, None
+
+            self.coalesced += 1
+            return flight, False, flight.add_waiter(loop) if loop is not None else None
+
+    def _lead(self, key: str, flight: _Flight, fn: Callable[[], Any]) -> Any:
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            raise
+        except BaseException:
+            self._finish(key, flight, abandoned=True)
+            raise
+        self._finish(key, flight, result=result)
+        return result
+
+    async def _lead_async(self, key: str, flight: _Flight, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            raise
+        except BaseException:
+            # Cancelled: followers did not ask to be cancelled, so they retry
+            self._finish(key, flight, abandoned=True)
+            raise
+        self._finish(key, flight, result=result)
+        return result
+
+    def _finish(self, key: str, flight: _Flight, result: Any = None,
+                error: Optional[BaseException] = None, abandoned: bool = False) -> None:
+        """Record the outcome, release the key and wake the followers"""
+        with self._lock:
+            flight.result = result
+            flight.error = error
+            flight.abandoned = abandoned
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.finish()
+
+    @staticmethod
+    def _outcome(flight: _Flight) -> Any:
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
@@ -0,0 +1,471 @@
+"""
+Telemetry
+Latency, token and cost instrumentation for the validation pipelines
+
+A trace covers one validation (a pre-auth or discharge job). Inside it, spans
+time the individual steps: PDF extraction, each agent and aggregation. LLM calls
+report their token usage, latency and cache hits to the innermost open span, so
+spend is attributed to the agent that made the call.
+
+State is carried in context variables, so spans opened in a worker thread see
+their trace as long as the work is submitted through wrap().
+
+Two exports:
+- Metrics: process-wide counters and histograms in the Prometheus text format
+  (render_prometheus(), served at GET /metrics by the API)
+- Trace logs: one JSON line per finished trace on the "iris.telemetry" logger,
+  optionally also appended to TELEMETRY_LOG_FILE
+"""
+
+import contextvars
+import json
+import logging
+import math
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger("iris.telemetry")
+
+# USD per million (input, output) tokens, matched on the model family in the model id
+MODEL_PRICES_PER_MTOK = {
+    "opus": (15.0, 75.0),
+    "sonnet": (3.0, 15.0),
+    "haiku": (0.8, 4.0),
+}
+
+# Histogram buckets (upper bounds)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+COST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+METRIC_HELP = {
+    "iris_span_duration_seconds": ("histogram", "Duration of pipeline steps (PDF extraction, agents, aggregation)"),
+    "iris_trace_duration_seconds": ("histogram", "End-to-end duration of a validation"),
+    "iris_trace_cost_usd": ("histogram", "Estimated LLM cost of a validation"),
+    "iris_llm_request_duration_seconds": ("histogram", "LLM call latency including retries"),
+    "iris_llm_requests_total": ("counter", "LLM calls by model, agent and cache result (hit, miss, coalesced)"),
+    "iris_llm_errors_total": ("counter", "LLM calls that failed after all retries"),
+    "iris_llm_tokens_total": ("counter", "Tokens reported by the API"),
+    "iris_llm_cost_usd_total": ("counter", "Estimated LLM spend"),
+    "iris_fwa_prescreen_total": ("counter", "FWA rule pre-screen outcomes (clean and outlier skip the LLM)"),
+}
+
+NO_SPAN = "none"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms
+
+    Metrics are identified by name and a label set; histograms keep cumulative
+    bucket counts, a sum and a count, as in the Prometheus data model.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Add value to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels) -> None:
+        """Record one observation in a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            bounds = self._buckets.setdefault(name, buckets)
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # [bucket counts..., sum, count]
+                state = series[key] = [0] * len(bounds) + [0.0, 0]
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def counter_value(self, name: str, **labels) -> float:
+        """Current value of a counter series (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram_count(self, name: str, **labels) -> int:
+        """Number of observations in a histogram series"""
+        with self._lock:
+            state = self._histograms.get(name, {}).get(_label_key(labels))
+            return state[-1] if state else 0
+
+    def reset(self) -> None:
+        """Drop all series"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._buckets.clear()
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format (version 0.0.4)
+
+        Returns:
+            Metrics text, ending with a newline
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._histograms)):
+                kind, help_text = METRIC_HELP.get(
+                    name, ("histogram" if name in self._histograms else "counter", name)
+                )
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+                bounds = self._buckets.get(name, ())
+                for key, state in sorted(self._histograms.get(name, {}).items()):
+                    for bound, count in zip(bounds, state):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(state[-2])}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Spans and LLM usage recorded for one validation"""
+
+    def __init__(self, name: str, attributes: Optional[Dict] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.spans: List[Dict] = []
+        # Per-agent LLM usage: requests, cache_hits, coalesced, input/output tokens, cost, latency
+        self.llm: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, record: Dict) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def add_llm_call(self, agent: str, input_tokens: int, output_tokens: int, cost: float,
+                     latency: float, cache_hit: bool, coalesced: bool = False) -> None:
+        with self._lock:
+            usage = self.llm.setdefault(agent, {
+                "requests": 0, "cache_hits": 0, "coalesced": 0, "input_tokens": 0,
+                "output_tokens": 0, "cost_usd": 0.0, "latency_seconds": 0.0
+            })
+            usage["requests"] += 1
+            usage["cache_hits"] += int(cache_hit)
+            usage["coalesced"] += int(coalesced)
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+            usage["cost_usd"] += cost
+            usage["latency_seconds"] += latency
+
+    @property
+    def cost_usd(self) -> float:
+        with self._lock:
+            return sum(u["cost_usd"] for u in self.llm.values())
+
+    def summary(self) -> Dict:
+        """
+        Serializable view of the trace
+
+        Returns:
+            Dict with trace_id, name, status, timings, spans, per-agent LLM usage and totals
+        """
+        with self._lock:
+            llm = {agent: dict(usage) for agent, usage in self.llm.items()}
+            spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_seconds": self.duration,
+            "attributes": self.attributes,
+            "spans": spans,
+            "llm": llm,
+            "llm_requests": sum(u["requests"] for u in llm.values()),
+            "llm_cache_hits": sum(u["cache_hits"] for u in llm.values()),
+            "llm_coalesced": sum(u["coalesced"] for u in llm.values()),
+            "input_tokens": sum(u["input_tokens"] for u in llm.values()),
+            "output_tokens": sum(u["output_tokens"] for u in llm.values()),
+            "cost_usd": round(sum(u["cost_usd"] for u in llm.values()), 6)
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("iris_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("iris_span", default=None)
+
+_metrics: Optional[MetricsRegistry] = None
+_trace_file_handler: Optional[logging.Handler] = None
+_init_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get or create the process-wide metrics registry
+
+    Returns:
+        MetricsRegistry instance
+    """
+    global _metrics
+
+    with _init_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+
+    return _metrics
+
+
+def render_prometheus() -> str:
+    """Process metrics in the Prometheus text format"""
+    return get_metrics().render()
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace open in this context, if any"""
+    return _current_trace.get()
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """
+    Estimate the USD cost of an LLM call
+
+    Prices come from LLM_PRICE_INPUT_PER_MTOK / LLM_PRICE_OUTPUT_PER_MTOK when
+    set, otherwise from MODEL_PRICES_PER_MTOK by model family (unknown models cost 0).
+
+    Args:
+        model: Model id (e.g. "claude-sonnet-4-20250514")
+        input_tokens: Prompt tokens
+        output_tokens: Completion tokens
+
+    Returns:
+        Estimated cost in USD
+    """
+    input_price, output_price = 0.0, 0.0
+    model_lower = model.lower()
+    for family, prices in MODEL_PRICES_PER_MTOK.items():
+        if family in model_lower:
+            input_price, output_price = prices
+            break
+
+    input_price = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK") or input_price)
+    output_price = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK") or output_price)
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def record_llm_call(model: str, input_tokens: int = 0, output_tokens: int = 0,
+                    latency: float = 0.0, cache_hit: bool = False, coalesced: bool = False) -> None:
+    """
+    Record a completed LLM call against the innermost open span
+
+    Args:
+        model: Model id
+        input_tokens: Prompt tokens from the API usage (0 for cache hits)
+        output_tokens: Completion tokens from the API usage (0 for cache hits)
+        latency: Seconds spent in the call, including retries
+        cache_hit: Answered from the response cache without an API call
+        coalesced: Shared the response of an identical in-flight call (no API call)
+    """
+    agent = _current_span.get() or NO_SPAN
+    cost = 0.0 if cache_hit or coalesced else estimate_cost(model, input_tokens, output_tokens)
+    cache = "hit" if cache_hit else ("coalesced" if coalesced else "miss")
+
+    metrics = get_metrics()
+    metrics.inc("iris_llm_requests_total", model=model, agent=agent, cache=cache)
+    metrics.observe("iris_llm_request_duration_seconds", latency, model=model, cache=cache)
+    if input_tokens:
+        metrics.inc("iris_llm_tokens_total", input_tokens, model=model, agent=agent, direction="input")
+    if output_tokens:
+        metrics.inc("iris_llm_tokens_total", output_tokens, model=model, agent=agent, direction="output")
+    if cost:
+        metrics.inc("iris_llm_cost_usd_total", cost, model=model, agent=agent)
+
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_llm_call(agent, input_tokens, output_tokens, cost, latency, cache_hit, coalesced)
+
+
+def record_llm_error(model: str) -> None:
+    """Record an LLM call that failed after all retries"""
+    get_metrics().inc("iris_llm_errors_total", model=model, agent=_current_span.get() or NO_SPAN)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """
+    Time a pipeline step
+
+    The duration is always added to iris_span_duration_seconds; inside a trace
+    the span is also recorded on the trace. LLM calls made within the block are
+    attributed to this span's name.
+
+    While tracemalloc is tracing, the span record also gets memory_peak_bytes:
+    the peak traced memory above the level at span start. The peak counter is
+    process-wide, so the figure is only exact for spans that do not overlap
+    with other spans (sequential runs).
+
+    Args:
+        name: Step name (e.g. "agent.medical_review", "pdf_extraction")
+        **attributes: Extra fields stored on the trace's span record
+    """
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    memory_start = None
+    if tracemalloc.is_tracing():
+        memory_start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    started_at = time.time()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _current_span.reset(token)
+        get_metrics().observe("iris_span_duration_seconds", duration, span=name)
+        if trace is not None:
+            record = {
+                "name": name,
+                "parent": parent,
+                "start_offset_seconds": round(started_at - trace.started_at, 6),
+                "duration_seconds": round(duration, 6),
+                "status": status
+            }
+            if memory_start is not None:
+                record["memory_peak_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - memory_start)
+            if attributes:
+                record["attributes"] = attributes
+            trace.add_span(record)
+
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Trace]:
+    """
+    Open a trace for one validation
+
+    On exit the trace duration and estimated cost are added to the metrics and
+    the trace summary is logged as one JSON line.
+
+    Args:
+        name: Trace name (e.g. "preauth", "discharge")
+        **attributes: Extra fields included in the trace log (e.g. job_id)
+
+    Yields:
+        The Trace, whose summary() can be attached to results
+    """
+    current = Trace(name, attributes)
+    trace_token = _current_trace.set(current)
+    span_token = _current_span.set(None)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        current.status = "error"
+        raise
+    finally:
+        current.duration = round(time.perf_counter() - started, 6)
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+        metrics = get_metrics()
+        metrics.observe("iris_trace_duration_seconds", current.duration, trace=name, status=current.status)
+        metrics.observe("iris_trace_cost_usd", current.cost_usd, buckets=COST_BUCKETS, trace=name)
+        _log_trace(current)
+
+
+def wrap(fn: Callable) -> Callable:
+    """
+    Bind fn to a copy of the current context
+
+    Executor threads do not inherit context variables; submit wrap(fn) instead
+    of fn so spans opened in the worker belong to the caller's trace.
+
+    Args:
+        fn: Callable to run later, possibly in another thread
+
+    Returns:
+        Callable with the same signature (call it once)
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+
+    return run
+
+
+def _log_trace(finished: Trace) -> None:
+    """Emit a finished trace as one JSON log line"""
+    if not logger.isEnabledFor(logging.INFO) and _get_trace_file_handler() is None:
+        return
+
+    line = json.dumps({"event": "trace", **finished.summary()}, default=str)
+    logger.info(line)
+
+    handler = _get_trace_file_handler()
+    if handler is not None:
+        handler.handle(logging.makeLogRecord({"name": logger.name, "levelno": logging.INFO, "msg": line}))
+
+
+def _get_trace_file_handler() -> Optional[logging.Handler]:
+    """JSON lines file for trace logs, from TELEMETRY_LOG_FILE (unset: logger only)"""
+    global _trace_file_handler
+
+    path = os.getenv("TELEMETRY_LOG_FILE")
+    if not path:
+        return None
+
+    with _init_lock:
+        if _trace_file_handler is None or getattr(_trace_file_handler, "baseFilename", None) != os.path.abspath(path):
+            if _trace_file_handler is not None:
+                _trace_file_handler.close()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            _trace_file_handler = logging.FileHandler(path, encoding="utf-8")
+            _trace_file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    return _trace_file_handler
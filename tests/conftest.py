@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+# Keep the on-disk PDF text cache out of the working tree during test runs
+if "PDF_TEXT_CACHE_DIR" not in os.environ:
+    _cache_dir = tempfile.mkdtemp(prefix="iris-pdf-text-cache-")
+    os.environ["PDF_TEXT_CACHE_DIR"] = _cache_dir
+    atexit.register(shutil.rmtree, _cache_dir, True)
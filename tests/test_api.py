@@ -0,0 +1,208 @@
+"""
+Unit tests for the HTTP API
+Tests job submission, polling and SSE streaming without calling the real API
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from src.api.app import create_app
+from src.api.jobs import JobManager, JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_RUNNING
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+PREAUTH_FORM = {
+    "insurer": "Star Health",
+    "policy_type": "Comprehensive",
+    "procedure_id": "cataract_surgery",
+    "policy_number": "SH12345678",
+    "policy_start_date": "2023-01-01",
+    "sum_insured": "500000",
+    "planned_admission_date": "2025-05-10",
+    "patient_age_at_policy_start": "63"
+}
+
+
+def _wait_for(client: TestClient, job_id: str, timeout: float = 10.0) -> dict:
+    """Poll a job until it finishes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/jobs/{job_id}").json()
+        if body["status"] in (JOB_COMPLETED, JOB_FAILED):
+            return body
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+class TestPreAuthAPI:
+    """Test suite for pre-authorization job submission"""
+
+    def setup_method(self):
+        """Setup app with a real PreAuthService and mocked claim storage"""
+        self.storage = MagicMock()
+        self.storage.save_claim.return_value = "CR-20250101-12345"
+        self.manager = JobManager(max_workers=2, claim_storage=self.storage)
+        self.client = TestClient(create_app(job_manager=self.manager))
+        self.pdf_bytes = (TEST_DATA_DIR / "case-2.pdf").read_bytes()
+
+    def teardown_method(self):
+        self.manager.shutdown()
+
+    @patch('src.agents.medical_reviewer.call_llm_with_retry')
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_submit_returns_job_and_result_is_polled(self, fwa_mock, medical_mock):
+        """POST /preauth returns 202 with a job id; polling yields the validation result"""
+        medical_mock.return_value = '{"assessment": "strong", "concerns": []}'
+        fwa_mock.return_value = '{"risk_level": "low", "flags": []}'
+
+        response = self.client.post(
+            "/preauth",
+            data={**PREAUTH_FORM, "save_claim": "true"},
+            files={"medical_note": ("note.pdf", self.pdf_bytes, "application/pdf")}
+        )
+
+        assert response.status_code == 202
+        job = _wait_for(self.client, response.json()["job_id"])
+
+        assert job["status"] == JOB_COMPLETED, job["error"]
+        assert job["result"]["claim_id"] == "CR-20250101-12345"
+        assert 0 <= job["result"]["validation_result"]["final_score"] <= 100
+        assert job["result"]["medical_note"]["diagnosis"]["icd_10_code"] == "H25.9"
+
+        form_data = self.storage.save_claim.call_args[0][1]
+        assert form_data["sum_insured"] == 500000
+
+    def test_rejects_non_pdf_upload(self):
+        """Uploads that are not PDFs are rejected before a job is created"""
+        response = self.client.post(
+            "/preauth",
+            data=PREAUTH_FORM,
+            files={"medical_note": ("note.txt", b"hello", "text/plain")}
+        )
+
+        assert response.status_code == 400
+
+    def test_unknown_job_is_404(self):
+        """Polling an unknown job id returns 404"""
+        assert self.client.get("/jobs/does-not-exist").status_code == 404
+
+
+class TestDischargeAPI:
+    """Test suite for discharge job submission and SSE streaming"""
+
+    def setup_method(self):
+        """Setup app with a mocked DischargeService"""
+        self.release = threading.Event()
+        self.discharge_service = MagicMock()
+
+        def validate_manual(**kwargs):
+            self.release.wait(5)
+            assert kwargs["final_bill_pdf_path"].startswith(b"%PDF")
+            return {"overall_status": "pass", "expected_total": kwargs["expected_costs"]["total_estimated_cost"]}
+
+        self.discharge_service.validate_discharge_manual.side_effect = validate_manual
+        self.manager = JobManager(max_workers=2, discharge_service=self.discharge_service)
+        self.client = TestClient(create_app(job_manager=self.manager, heartbeat_seconds=0.05))
+        self.files = {
+            "final_bill": ("bill.pdf", b"%PDF-1.4 bill", "application/pdf"),
+            "discharge_summary": ("summary.pdf", b"%PDF-1.4 summary", "application/pdf")
+        }
+
+    def teardown_method(self):
+        self.release.set()
+        self.manager.shutdown()
+
+    def test_requires_claim_id_or_expected_costs(self):
+        """Manual mode needs an expected cost breakdown"""
+        response = self.client.post("/discharge", files=self.files)
+
+        assert response.status_code == 422
+
+    def test_events_stream_status_then_result(self):
+        """The SSE stream reports status changes, keep-alives and finally the result"""
+        response = self.client.post(
+            "/discharge",
+            data={"expected_costs": json.dumps({"total_estimated_cost": 52000}), "expected_stay_days": "1"},
+            files=self.files
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        threading.Timer(0.3, self.release.set).start()
+        with self.client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            body = stream.read().decode()
+
+        assert ": keep-alive" in body
+        events = [
+            (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+            for block in body.strip().split("\n\n") if block.startswith("event:")
+        ]
+        assert events[-1][0] == "result"
+        assert events[-1][1]["status"] == JOB_COMPLETED
+        assert events[-1][1]["result"]["expected_total"] == 52000
+        assert [e[1]["status"] for e in events if e[0] == "status"][-1] == JOB_COMPLETED
+
+        # The uploads are passed on in memory, without temp files
+        kwargs = self.discharge_service.validate_discharge_manual.call_args.kwargs
+        assert kwargs["final_bill_pdf_path"] == b"%PDF-1.4 bill"
+        assert kwargs["discharge_summary_pdf_path"] == b"%PDF-1.4 summary"
+
+
+class TestJobManager:
+    """Test suite for job retention"""
+
+    def test_oldest_finished_jobs_are_evicted(self):
+        """Only max_jobs jobs are retained"""
+        manager = JobManager(max_workers=1, max_jobs=2)
+        try:
+            jobs = [manager.submit("test", lambda: {"ok": True}) for _ in range(3)]
+            for job in jobs:
+                job.future.result(timeout=5)
+            manager.submit("test", lambda: {"ok": True}).future.result(timeout=5)
+
+            assert manager.get(jobs[0].job_id) is None
+            assert manager.get(jobs[2].job_id) is not None
+        finally:
+            manager.shutdown()
+
+    def test_exceptions_mark_job_failed(self):
+        """Errors are captured on the job instead of propagating"""
+        manager = JobManager(max_workers=1)
+        try:
+            def boom():
+                raise ValueError("bad bill")
+
+            job = manager.submit("test", boom)
+            job.future.result(timeout=5)
+
+            assert job.status == JOB_FAILED
+            assert job.error == "ValueError: bad bill"
+        finally:
+            manager.shutdown()
+
+    def test_shutdown_without_wait_cancels_queued_jobs(self):
+        """Jobs dropped from the queue end as cancelled instead of staying queued"""
+        manager = JobManager(max_workers=1)
+        release = threading.Event()
+        running = manager.submit("test", lambda: release.wait(5) and {"ok": True})
+        queued = manager.submit("test", lambda: {"ok": True})
+        while running.status != JOB_RUNNING:
+            time.sleep(0.01)
+
+        manager.shutdown(wait=False)
+        release.set()
+
+        assert queued.status == JOB_CANCELLED
+        assert queued.finished
+        assert queued.error.startswith("Cancelled")
+        running.future.result(timeout=5)
+        assert running.status == JOB_COMPLETED
@@ -0,0 +1,191 @@
+"""
+Unit tests for the batch pre-authorization engine
+Tests manifest parsing, resume and JSONL streaming without calling the real API
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from unittest.mock import patch
+from src.services.batch_preauth import (
+    BatchPreAuthEngine, load_completed_ids, load_manifest, _percentile
+)
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+MANIFEST_HEADER = (
+    "record_id,pdf_path,insurer,policy_type,procedure_id,policy_number,"
+    "policy_start_date,sum_insured,previous_claims_total,planned_admission_date,"
+    "patient_age_at_policy_start\n"
+)
+
+
+def _cataract_row(record_id: str, pdf_path: str) -> str:
+    """Manifest row for the cataract case (Star Health Comprehensive, policy >24 months old)"""
+    return (
+        f"{record_id},{pdf_path},Star Health,Comprehensive,cataract_surgery,SH12345678,"
+        "2023-01-01,500000,0,2025-05-10,63\n"
+    )
+
+
+class TestLoadManifest:
+    """Test suite for manifest parsing"""
+
+    def test_csv_manifest_builds_form_data(self, tmp_path):
+        """Non-identifying columns become form data with numeric fields coerced"""
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(MANIFEST_HEADER + _cataract_row("r1", "case-2.pdf"))
+
+        items = load_manifest(str(manifest))
+
+        assert len(items) == 1
+        item = items[0]
+        assert item["record_id"] == "r1"
+        assert item["pdf_path"] == str(tmp_path / "case-2.pdf")
+        assert item["procedure_id"] == "cataract_surgery"
+        assert item["form_data"]["sum_insured"] == 500000
+        assert item["form_data"]["policy_number"] == "SH12345678"
+        assert "insurer" not in item["form_data"]
+
+    def test_jsonl_manifest_with_nested_form_data(self, tmp_path):
+        """JSONL rows may carry form data nested; record_id defaults to pdf_path"""
+        manifest = tmp_path / "manifest.jsonl"
+        row = {
+            "pdf_path": "/abs/case-1.pdf",
+            "insurer": "Star Health",
+            "policy_type": "Comprehensive",
+            "procedure_id": "appendectomy",
+            "form_data": {"policy_number": "SH1", "sum_insured": "300000"}
+        }
+        manifest.write_text(json.dumps(row) + "\n\n")
+
+        items = load_manifest(str(manifest))
+
+        assert items[0]["record_id"] == "/abs/case-1.pdf"
+        assert items[0]["form_data"] == {"policy_number": "SH1", "sum_insured": 300000}
+
+    def test_missing_required_column_raises(self, tmp_path):
+        """Rows without a procedure_id are rejected"""
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text(json.dumps({"pdf_path": "a.pdf", "insurer": "X", "policy_type": "Y"}) + "\n")
+
+        with pytest.raises(ValueError, match="procedure_id"):
+            load_manifest(str(manifest))
+
+    def test_bad_numeric_cell_marks_only_that_row(self, tmp_path):
+        """A non-numeric sum_insured is kept as a per-record error, not raised"""
+        manifest = tmp_path / "manifest.csv"
+        bad_row = _cataract_row("bad", "b.pdf").replace(",500000,", ",five lakh,")
+        manifest.write_text(MANIFEST_HEADER + _cataract_row("r1", "a.pdf") + bad_row)
+
+        items = load_manifest(str(manifest))
+
+        assert "error" not in items[0]
+        assert items[1]["record_id"] == "bad"
+        assert "sum_insured" in items[1]["error"]
+
+    def test_infinite_numeric_cell_marks_only_that_row(self, tmp_path):
+        """An "inf" sum_insured overflows int() and is kept as a per-record error"""
+        manifest = tmp_path / "manifest.jsonl"
+        row = {
+            "pdf_path": "a.pdf",
+            "insurer": "Star Health",
+            "policy_type": "Comprehensive",
+            "procedure_id": "cataract_surgery",
+            "sum_insured": "inf"
+        }
+        manifest.write_text(json.dumps(row) + "\n")
+
+        items = load_manifest(str(manifest))
+
+        assert items[0]["error"].startswith("OverflowError:")
+        assert "sum_insured" in items[0]["error"]
+
+    def test_duplicate_record_id_raises(self, tmp_path):
+        """record_ids must be unique so resume is unambiguous"""
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(MANIFEST_HEADER + _cataract_row("r1", "a.pdf") + _cataract_row("r1", "b.pdf"))
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            load_manifest(str(manifest))
+
+
+class TestBatchPreAuthEngine:
+    """Test suite for batch execution, streaming output and resume"""
+
+    def _write_manifest(self, tmp_path) -> Path:
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(
+            MANIFEST_HEADER
+            + _cataract_row("ok-1", TEST_DATA_DIR / "case-2.pdf")
+            + _cataract_row("ok-2", TEST_DATA_DIR / "case-2.pdf")
+            + _cataract_row("missing", tmp_path / "does-not-exist.pdf")
+        )
+        return manifest
+
+    @patch('src.agents.medical_reviewer.call_llm_with_retry')
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_batch_streams_results_and_resumes(self, fwa_mock, medical_mock, tmp_path):
+        """Each record gets one JSONL line; a second run only retries failures"""
+        medical_mock.return_value = '{"assessment": "strong", "concerns": []}'
+        fwa_mock.return_value = '{"risk_level": "low", "flags": []}'
+
+        manifest = self._write_manifest(tmp_path)
+        output = tmp_path / "out" / "results.jsonl"
+        engine = BatchPreAuthEngine(concurrency=2, extract_workers=0)
+
+        summary = engine.run(str(manifest), str(output))
+
+        assert summary["total"] == 3
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        assert summary["records_per_minute"] > 0
+
+        records = {r["record_id"]: r for r in map(json.loads, output.read_text().splitlines())}
+        assert records["ok-1"]["status"] == "ok"
+        assert records["ok-1"]["result"]["overall_status"] in ("pass", "warning", "fail")
+        assert "extract_seconds" in records["ok-1"]["timings"]
+        assert records["missing"]["status"] == "error"
+        assert load_completed_ids(str(output)) == {"ok-1", "ok-2"}
+
+        resumed = engine.run(str(manifest), str(output))
+
+        assert resumed["skipped"] == 2
+        assert resumed["failed"] == 1
+        assert len(output.read_text().splitlines()) == 4
+
+    def test_bad_manifest_row_fails_alone(self, tmp_path):
+        """A row with unusable form data is written as failed without running the others"""
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text(MANIFEST_HEADER + _cataract_row("bad", "a.pdf").replace(",500000,", ",n/a,"))
+        output = tmp_path / "results.jsonl"
+        engine = BatchPreAuthEngine(concurrency=1, extract_workers=0)
+
+        with patch.object(engine, "_validate", side_effect=AssertionError("validated a bad row")):
+            summary = engine.run(str(manifest), str(output))
+
+        assert summary["failed"] == 1
+        record = json.loads(output.read_text())
+        assert record["status"] == "error"
+        assert "sum_insured" in record["error"]
+
+    def test_completed_ids_ignore_truncated_line(self, tmp_path):
+        """A partially written trailing line from an interrupted run is skipped"""
+        output = tmp_path / "results.jsonl"
+        output.write_text('{"record_id": "a", "status": "ok"}\n{"record_id": "b", "sta')
+
+        assert load_completed_ids(str(output)) == {"a"}
+
+    def test_percentile(self):
+        """Nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 95) == 95.0
+        assert _percentile([], 95) == 0.0
@@ -0,0 +1,87 @@
+"""
+Unit tests for the compiled catalog snapshot
+Tests round-trip, integrity checks and that seeded values are tied to their source files
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hashlib
+import json
+import pytest
+from src.utils import catalog_snapshot
+from src.utils.catalog_snapshot import SnapshotError, build_snapshot, read_snapshot, write_snapshot
+from src.utils.data_catalog import DataCatalog
+from src.utils.data_loader import PROJECT_ROOT, load_all_data
+
+
+def fail_parse(data):
+    raise AssertionError("value should have come from the snapshot")
+
+
+class TestCatalogSnapshot:
+    """Test suite for building and reading snapshots"""
+
+    def test_round_trip_covers_catalog(self, tmp_path):
+        """Every registry, medical data and policy file is in the snapshot, validated"""
+        path = tmp_path / "catalog.bin"
+        result = build_snapshot(path)
+
+        catalog = DataCatalog(check_interval=0)
+        expected = load_all_data(catalog)
+        snapshot = read_snapshot(path)
+
+        assert result["entries"] == expected == len(snapshot["entries"])
+        by_path = {entry["path"]: entry["value"] for entry in snapshot["entries"]}
+        policy_path = str(PROJECT_ROOT / "policy_data" / "star_comprehensive.json")
+        assert by_path[policy_path] == catalog.load(policy_path, fail_parse)
+
+    def test_corruption_detected(self, tmp_path):
+        """Flipped payload bytes, foreign files and truncation are rejected"""
+        path = tmp_path / "catalog.bin"
+        build_snapshot(path)
+        data = bytearray(path.read_bytes())
+        data[-10] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="integrity"):
+            read_snapshot(path)
+
+        path.write_bytes(b"not a snapshot at all, just some bytes here")
+        with pytest.raises(SnapshotError):
+            read_snapshot(path)
+
+        path.write_bytes(b"CRCAT")
+        with pytest.raises(SnapshotError, match="truncated"):
+            read_snapshot(path)
+
+        with pytest.raises(SnapshotError):
+            read_snapshot(tmp_path / "missing.bin")
+
+    def test_model_change_invalidates(self, tmp_path, monkeypatch):
+        """A snapshot built against other model definitions is not used"""
+        path = tmp_path / "catalog.bin"
+        write_snapshot(path, [])
+        monkeypatch.setattr(catalog_snapshot, "schema_fingerprint", lambda: "different")
+
+        with pytest.raises(SnapshotError, match="different data models"):
+            read_snapshot(path)
+
+    def test_seeded_values_follow_source_files(self, tmp_path):
+        """Seeded values are used while the file matches, re-parsed once it changes"""
+        source = tmp_path / "policy.json"
+        source.write_text(json.dumps({"v": 1}), encoding="utf-8")
+        sha256 = hashlib.sha256(source.read_bytes()).hexdigest()
+
+        catalog = DataCatalog(check_interval=0)
+        # Unknown mtime forces a hash comparison, as after a fresh checkout
+        catalog.seed(source, {"v": "from snapshot"}, sha256)
+        assert catalog.load(source, fail_parse) == {"v": "from snapshot"}
+
+        other = tmp_path / "other.json"
+        other.write_text(json.dumps({"v": 2}), encoding="utf-8")
+        catalog.seed(other, {"v": "stale"}, sha256)
+        assert catalog.load(other, dict) == {"v": 2}
@@ -0,0 +1,155 @@
+"""
+Unit tests for claim storage
+Tests both backends behave the same, SQLite pagination/filters and the JSON migration
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import pytest
+from src.services.claim_storage import (
+    ClaimStorageService,
+    JSONFileClaimBackend,
+    SQLiteClaimBackend,
+    create_claim_backend,
+    migrate_json_claims,
+)
+
+
+def make_record(claim_id, timestamp, policy_number="POL-1", procedure_id="cataract_surgery", insurer="Star Health"):
+    return {
+        "claim_id": claim_id,
+        "timestamp": timestamp,
+        "validation_score": 90,
+        "readiness_status": "green",
+        "policy_info": {"insurer": insurer, "policy_number": policy_number},
+        "procedure_info": {"procedure_id": procedure_id},
+    }
+
+
+RECORDS = [
+    make_record("CR-20251001-10001", "2025-10-01T09:00:00", policy_number="POL-1"),
+    make_record("CR-20251002-10002", "2025-10-02T09:00:00", policy_number="POL-2", procedure_id="appendectomy"),
+    make_record("CR-20251003-10003", "2025-10-03T09:00:00", policy_number="POL-1", insurer="HDFC ERGO"),
+    make_record("CR-20251004-10004", "2025-10-04T09:00:00", policy_number="POL-3"),
+]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_path):
+    """Each backend, pre-loaded with RECORDS"""
+    if request.param == "json":
+        store = JSONFileClaimBackend(str(tmp_path / "claims"))
+    else:
+        store = SQLiteClaimBackend(str(tmp_path / "claims.db"))
+    for record in RECORDS:
+        assert store.add(record)
+    yield store
+    store.close()
+
+
+class TestClaimBackends:
+    """Test suite run against both JSON and SQLite backends"""
+
+    def test_get_and_exists(self, backend):
+        """Stored records round-trip; unknown IDs return None"""
+        assert backend.get("CR-20251002-10002") == RECORDS[1]
+        assert backend.exists("CR-20251002-10002")
+        assert backend.get("CR-20990101-00000") is None
+        assert not backend.exists("CR-20990101-00000")
+
+    def test_add_existing_id_is_rejected(self, backend):
+        """A claim ID is never overwritten"""
+        assert not backend.add(make_record("CR-20251001-10001", "2025-11-01T09:00:00", policy_number="OTHER"))
+        assert backend.get("CR-20251001-10001")["policy_info"]["policy_number"] == "POL-1"
+
+    def test_pagination_most_recent_first(self, backend):
+        """Pages follow timestamp order, newest first"""
+        first = [r["claim_id"] for r in backend.list_claims(limit=2)]
+        second = [r["claim_id"] for r in backend.list_claims(limit=2, offset=2)]
+
+        assert first == ["CR-20251004-10004", "CR-20251003-10003"]
+        assert second == ["CR-20251002-10002", "CR-20251001-10001"]
+        assert backend.list_claim_ids() == first + second
+
+    def test_filters(self, backend):
+        """Filters combine; date range is [date_from, date_to)"""
+        assert [r["claim_id"] for r in backend.list_claims(policy_number="POL-1")] == [
+            "CR-20251003-10003", "CR-20251001-10001"
+        ]
+        assert backend.count_claims(procedure_id="cataract_surgery") == 3
+        assert backend.count_claims(procedure_id="cataract_surgery", insurer="HDFC ERGO") == 1
+        assert backend.count_claims(date_from="2025-10-02", date_to="2025-10-04") == 2
+
+    def test_unknown_filter_rejected(self, backend):
+        """Typos in filter names fail loudly instead of matching everything"""
+        with pytest.raises(ValueError):
+            backend.list_claims(policy="POL-1")
+
+
+class TestClaimStorageService:
+    """Test suite for the service on top of a backend"""
+
+    def test_save_and_load_with_sqlite(self, tmp_path):
+        """save_claim generates an ID and the claim is found by its indexed fields"""
+        storage = ClaimStorageService(backend=SQLiteClaimBackend(str(tmp_path / "claims.db")))
+        form_data = {"insurer": "Star Health", "policy_number": "POL-9", "procedure_id": "cataract_surgery"}
+        medical_note = {"patient_info": {"name": "Test Patient"}}
+
+        claim_id = storage.save_claim({"overall_score": 80, "readiness_status": "amber"}, form_data, medical_note)
+
+        assert claim_id.startswith("CR-")
+        assert storage.load_claim(claim_id)["patient_info"]["name"] == "Test Patient"
+        assert storage.list_all_claims() == [claim_id]
+        assert [c["claim_id"] for c in storage.list_claims(policy_number="POL-9")] == [claim_id]
+
+    def test_storage_dir_uses_json_files(self, tmp_path):
+        """The existing storage_dir argument keeps writing one JSON file per claim"""
+        storage = ClaimStorageService(storage_dir=str(tmp_path))
+        claim_id = storage.save_claim({"overall_score": 80}, {}, {})
+
+        assert (tmp_path / f"{claim_id}.json").exists()
+
+    def test_backend_from_environment(self, tmp_path, monkeypatch):
+        """CLAIM_STORAGE_BACKEND selects the backend"""
+        monkeypatch.setenv("CLAIM_STORAGE_BACKEND", "sqlite")
+        monkeypatch.setenv("CLAIM_STORAGE_DB", str(tmp_path / "env.db"))
+        backend = create_claim_backend()
+        try:
+            assert isinstance(backend, SQLiteClaimBackend)
+            assert (tmp_path / "env.db").exists()
+        finally:
+            backend.close()
+
+        with pytest.raises(ValueError):
+            create_claim_backend("postgres")
+
+
+class TestMigration:
+    """Test suite for importing JSON claim files into SQLite"""
+
+    def test_migrate_is_idempotent(self, tmp_path):
+        """Re-running skips claims already imported and reports unreadable files"""
+        source = JSONFileClaimBackend(str(tmp_path / "claims"))
+        for record in RECORDS:
+            source.add(record)
+        (tmp_path / "claims" / "CR-broken.json").write_text("{not json", encoding="utf-8")
+
+        target = SQLiteClaimBackend(str(tmp_path / "claims.db"))
+        try:
+            summary = migrate_json_claims(str(tmp_path / "claims"), target, batch_size=3)
+            assert summary == {"imported": 4, "skipped": 0, "failed": ["CR-broken.json"]}
+
+            summary = migrate_json_claims(str(tmp_path / "claims"), target)
+            assert summary["imported"] == 0
+            assert summary["skipped"] == 4
+
+            assert target.get("CR-20251003-10003") == json.loads(
+                (tmp_path / "claims" / "CR-20251003-10003.json").read_text(encoding="utf-8")
+            )
+        finally:
+            target.close()
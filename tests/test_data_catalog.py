@@ -0,0 +1,103 @@
+"""
+Unit tests for the data catalog
+Tests change detection, content-hash reuse, capacity and explicit reload
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import os
+import pytest
+from src.utils.data_catalog import DataCatalog
+from src.utils.data_loader import load_policy_data, reload_data
+
+
+def write_json(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestDataCatalog:
+    """Test suite for DataCatalog"""
+
+    def test_cached_until_file_changes(self, tmp_path):
+        """Unchanged files are parsed once; edits are picked up on the next lookup"""
+        path = tmp_path / "policy.json"
+        write_json(path, {"version": 1}, mtime_ns=1_000_000_000)
+        catalog = DataCatalog(check_interval=0)
+        parsed = []
+
+        def parse(data):
+            parsed.append(data)
+            return dict(data)
+
+        first = catalog.load(path, parse)
+        assert catalog.load(path, parse) is first
+
+        write_json(path, {"version": 2}, mtime_ns=2_000_000_000)
+        assert catalog.load(path, parse) == {"version": 2}
+        assert len(parsed) == 2
+        assert catalog.stats()["reloads"] == 1
+
+    def test_identical_content_keeps_value(self, tmp_path):
+        """A touched file with the same content is not re-parsed"""
+        path = tmp_path / "policy.json"
+        write_json(path, {"version": 1}, mtime_ns=1_000_000_000)
+        catalog = DataCatalog(check_interval=0)
+
+        first = catalog.load(path, dict)
+        os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+
+        assert catalog.load(path, dict) is first
+        assert catalog.stats()["reloads"] == 0
+
+    def test_check_interval_skips_stat(self, tmp_path):
+        """Within check_interval the cached value is returned without looking at the file"""
+        path = tmp_path / "policy.json"
+        write_json(path, {"version": 1})
+        catalog = DataCatalog(check_interval=3600)
+
+        first = catalog.load(path, dict)
+        path.unlink()
+
+        assert catalog.load(path, dict) is first
+
+    def test_capacity_and_reload(self, tmp_path):
+        """Least recently used files are dropped beyond max_entries; reload() drops all"""
+        catalog = DataCatalog(max_entries=2, check_interval=0)
+        paths = []
+        for i in range(3):
+            paths.append(tmp_path / f"p{i}.json")
+            write_json(paths[-1], {"i": i})
+            catalog.load(paths[-1], dict)
+
+        assert catalog.stats()["entries"] == 2
+        assert catalog.reload(paths[2]) == 1
+        assert catalog.reload() == 1
+        assert catalog.stats()["entries"] == 0
+
+    def test_missing_file(self, tmp_path):
+        """Deleted files raise and are dropped from the catalog"""
+        path = tmp_path / "policy.json"
+        write_json(path, {"version": 1})
+        catalog = DataCatalog(check_interval=0)
+        catalog.load(path, dict)
+        path.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            catalog.load(path, dict)
+        assert catalog.stats()["entries"] == 0
+
+    def test_data_loader_reload(self):
+        """reload_data() makes the loaders read the files again"""
+        before = load_policy_data("Star Health", "Comprehensive")
+        assert reload_data() >= 1
+
+        after = load_policy_data("Star Health", "Comprehensive")
+        assert after is not before
+        assert after == before
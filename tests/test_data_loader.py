@@ -0,0 +1,162 @@
+"""
+Unit tests for the procedure registry index, fuzzy matcher and exclusion matcher
+Tests id, name/synonym and ICD-10 prefix lookups against the registry scan semantics,
+ranked fuzzy matching of free-text procedure names, and exclusion keyword matching
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.schemas import ProcedureRegistryEntry
+from src.utils.data_loader import (
+    ProcedureIndex,
+    check_procedure_excluded,
+    find_procedure_candidates,
+    find_procedure_exclusions,
+    get_procedure_by_icd_code,
+    get_procedure_by_id,
+    get_procedure_by_synonym,
+    load_policy_data,
+    load_procedure_registry,
+)
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.procedure_matcher import ProcedureMatcher
+
+
+def make_entry(procedure_id, display_name, synonyms=(), codes=()):
+    return ProcedureRegistryEntry(
+        procedure_id=procedure_id,
+        user_display_name=display_name,
+        common_synonyms=list(synonyms),
+        icd_10_codes=list(codes),
+        medical_data_file=f"{procedure_id}.json"
+    )
+
+
+class TestProcedureIndex:
+    """Test suite for ProcedureIndex"""
+
+    def test_every_registry_entry_indexed(self):
+        """Each procedure is found by its id, display name and every synonym"""
+        for entry in load_procedure_registry():
+            assert get_procedure_by_id(entry.procedure_id) is entry
+            assert get_procedure_by_synonym(entry.user_display_name.upper()) is entry
+            for synonym in entry.common_synonyms:
+                assert get_procedure_by_synonym(synonym.lower()).procedure_id == entry.procedure_id
+
+    def test_name_lookup_ignores_case_and_spacing(self):
+        """Lookups are case-insensitive and tolerate extra whitespace"""
+        assert get_procedure_by_synonym("  lap   CHOLE ").procedure_id == "gallbladder_removal"
+        assert get_procedure_by_synonym("not a procedure") is None
+
+    def test_icd_code_prefix(self):
+        """More specific codes fall back to the registry's category code"""
+        assert get_procedure_by_icd_code("H25.9").procedure_id == "cataract_surgery"
+        assert get_procedure_by_icd_code("h25.91").procedure_id == "cataract_surgery"
+        assert get_procedure_by_icd_code("K35.80").procedure_id == "appendectomy"
+        assert get_procedure_by_icd_code("M17.11").procedure_id == "total_knee_replacement"
+        assert get_procedure_by_icd_code("Z00.0") is None
+        assert get_procedure_by_icd_code("") is None
+
+    def test_first_entry_wins_on_shared_keys(self):
+        """Shared names and codes resolve to the earlier entry, as the linear scan did"""
+        first = make_entry("first", "Knee Surgery", synonyms=["Scope"], codes=["M23"])
+        second = make_entry("second", "Scope", synonyms=["Knee Surgery"], codes=["M23", "M23.2"])
+        index = ProcedureIndex([first, second])
+
+        assert len(index) == 2
+        assert index.match_name("scope") is first
+        assert index.match_name("knee surgery") is first
+        assert index.match_icd_code("M23.9") is first
+        assert index.match_icd_code("M23.2") is second
+        assert index.get("second") is second
+
+
+class TestProcedureMatcher:
+    """Test suite for trigram fuzzy matching"""
+
+    def test_note_phrasings_match(self):
+        """Free-text phrasings from medical notes rank the right procedure first"""
+        cases = [
+            ("phaco emulsification", "cataract_surgery"),
+            ("Phacoemulsification with IOL", "cataract_surgery"),
+            ("lap chole", "gallbladder_removal"),
+            ("Lap-Chole", "gallbladder_removal"),
+            ("laparoscopic cholecystectomy", "gallbladder_removal"),
+            ("knee replacment", "total_knee_replacement"),
+            ("angioplasty and stent", "coronary_angioplasty"),
+        ]
+        for text, expected_id in cases:
+            candidates = find_procedure_candidates(text)
+            assert candidates, text
+            assert candidates[0].procedure_id == expected_id, text
+
+    def test_ranked_with_scores(self):
+        """Exact matches score 1.0; candidates are sorted and one per procedure"""
+        candidates = find_procedure_candidates("lap chole", limit=5, min_score=0.0)
+
+        assert candidates[0].score == 1.0
+        assert candidates[0].matched_name == "Lap chole"
+        scores = [c.score for c in candidates]
+        assert scores == sorted(scores, reverse=True)
+        assert len({c.procedure_id for c in candidates}) == len(candidates)
+
+    def test_no_match(self):
+        """Unrelated text and empty input return no candidates"""
+        assert find_procedure_candidates("xyz") == []
+        assert find_procedure_candidates("  ") == []
+
+    def test_fuzzy_synonym_fallback(self):
+        """get_procedure_by_synonym stays exact unless a fuzzy threshold is given"""
+        assert get_procedure_by_synonym("phaco emulsification") is None
+        assert get_procedure_by_synonym("phaco emulsification", fuzzy_min_score=0.6).procedure_id == "cataract_surgery"
+
+    def test_common_trigrams_still_scored(self):
+        """Names reached through a rare trigram are scored on all shared trigrams"""
+        entries = [make_entry(f"filler_{i}", f"surgery variant {i}") for i in range(100)]
+        entries.append(make_entry("target", "zygoma surgery"))
+        matcher = ProcedureMatcher(entries)
+
+        best = matcher.match("zygoma surgery", limit=1)[0]
+        assert best.procedure_id == "target"
+        assert best.score == 1.0
+
+
+class TestExclusionMatching:
+    """Test suite for Aho-Corasick exclusion keyword matching"""
+
+    def test_keyword_matcher_overlapping(self):
+        """All overlapping occurrences are reported with positions, case-insensitively"""
+        matcher = KeywordMatcher(["he", "she", "hers", "HE"])
+
+        assert len(matcher) == 3
+        assert matcher.find_all("uSHErs") == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+        assert KeywordMatcher([]).find_all("anything") == []
+
+    def test_clause_positions(self):
+        """Matches name the clause and the keyword offsets within it"""
+        policy = load_policy_data("HDFC ERGO", "Optima Secure")
+        exclusions = ["Dental treatment", "Correction of Refractive Error < 7.5 dioptres"]
+        policy = policy.model_copy(update={"exclusions": exclusions})
+
+        check = find_procedure_exclusions(policy, "cataract_surgery", diagnosis="Refractive error, both eyes")
+
+        assert check.excluded
+        match = check.triggering_matches[0]
+        assert match.clause_index == 1
+        assert exclusions[1][match.start:match.end].lower() == "refractive error"
+        assert check.diagnosis_matches == [("refractive error", 0, 16)]
+
+    def test_decision_rules(self):
+        """Excluded only if the clause keyword is in the diagnosis or is generic"""
+        policy = load_policy_data("HDFC ERGO", "Optima Secure")
+        refractive = policy.model_copy(update={"exclusions": ["Refractive error < 7.5 dioptres"]})
+        cosmetic = policy.model_copy(update={"exclusions": ["Cosmetic surgery"]})
+
+        assert not check_procedure_excluded(refractive, "cataract_surgery", "Senile cataract")
+        assert check_procedure_excluded(cosmetic, "cataract_surgery")
+        assert not check_procedure_excluded(cosmetic, "appendectomy")
+        assert not check_procedure_excluded(cosmetic, "unknown_procedure")
@@ -0,0 +1,93 @@
+"""
+Unit tests for the final bill parser
+Tests page-incremental matching, stopping once the totals are found and the
+pages reported as used
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from unittest.mock import patch
+from src.utils import pdf_text_cache
+from src.utils.discharge_pdf_extractor import FINAL_BILL_PARSER, BillParseState, extract_final_bill
+from src.utils.pdf_document import PDFDocument, ingest
+from src.utils.pdf_text_cache import PDFTextCache
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+class TestBillParseState:
+    """Test suite for matching bill fields page by page"""
+
+    def test_fields_split_across_pages(self):
+        """Lines continued on the next page are matched once complete"""
+        state = BillParseState()
+        state.feed("Bill No: APL/1\nTOTAL BILL AMOUNT    69,5")
+        assert state.result["total_bill_amount"] == 0
+        state.feed("00.00\nNET PAYABLE AMOUNT\n72,975.00")
+        bill = state.finish()
+
+        assert bill["bill_number"] == "APL/1"
+        assert bill["total_bill_amount"] == 69500.0
+        assert bill["net_payable_amount"] == 72975.0
+        assert state.field_pages["total_bill_amount"] == 1
+        assert state.pages_used == [1, 2]
+
+    def test_first_match_wins(self):
+        """A field found on an early page is not overwritten by later pages"""
+        state = BillParseState()
+        state.feed("Room Rent (2 days) 7,000.00\n")
+        state.feed("Room Rent extra day 3,500.00\n")
+
+        assert state.finish()["itemized_costs"]["room_charges"] == 7000.0
+        assert state.pages_used == [1]
+
+    def test_whole_text_matches_pages(self):
+        """Parsing the joined text and streaming every page give the same bill"""
+        document = PDFDocument.open(TEST_DATA_DIR / "case-5_finalbill.pdf")
+        pages = document.pages("pypdf2")
+        state = BillParseState(required=())
+        for page_text in pages:
+            state.feed(page_text)
+
+        assert state.finish() == FINAL_BILL_PARSER.parse("".join(pages))
+
+
+class TestStreamingBillExtraction:
+    """Test suite for stopping bill extraction once the totals are found"""
+
+    def setup_method(self):
+        """Use a private, memory-only text cache"""
+        self.cache = PDFTextCache("unused", persist=False)
+        self.patcher = patch.object(pdf_text_cache, "_pdf_text_cache", self.cache)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_stops_after_totals(self):
+        """The pages after the payment details are never extracted"""
+        result = ingest(TEST_DATA_DIR / "case-5_finalbill.pdf", FINAL_BILL_PARSER)
+
+        assert result.data["total_bill_amount"] == 343000.0
+        assert result.data["net_payable_amount"] == 340000.0
+        assert result.data["insurance_claimed"] == 275000.0
+        assert result.data["total_days"] > 0
+        # 8 pages: the notes on page 8 are not read
+        assert result.pages == [1, 2, 3, 6, 7]
+        assert "Thank you for choosing" not in result.text
+        # A partly read document is not cached
+        assert self.cache.stats()["misses"] == 0
+
+    def test_extract_final_bill_streams(self):
+        """extract_final_bill uses the streaming parser without calling the LLM"""
+        with patch("src.utils.discharge_pdf_extractor.call_llm_with_retry") as llm_mock:
+            bill = extract_final_bill(TEST_DATA_DIR / "case-1_finalbill.pdf")
+
+        assert bill["total_bill_amount"] > 0
+        assert bill["bill_number"]
+        llm_mock.assert_not_called()
@@ -0,0 +1,106 @@
+"""
+Unit tests for DischargeService orchestration
+Tests that independent extraction and agent steps overlap without calling the real API
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from unittest.mock import patch
+from src.services.discharge_service import DischargeService
+
+
+STEP_DELAY = 0.3
+
+EXPECTED_COSTS = {
+    "room_charges": 3500,
+    "surgeon_fees": 14000,
+    "anesthetist_fees": 6000,
+    "ot_charges": 15000,
+    "medicines": 7000,
+    "investigations": 4500,
+    "other_charges": 2000,
+    "total_estimated_cost": 52000
+}
+
+FINAL_BILL = {
+    "total_days": 1,
+    "itemized_costs": {
+        "room_charges": 3500.0,
+        "surgeon_fees": 14000.0,
+        "anesthetist_fees": 6000.0,
+        "ot_charges": 15000.0,
+        "medicines": 9500.0,
+        "investigations": 4500.0,
+        "other_charges": 2000.0
+    },
+    "total_bill_amount": 54500.0
+}
+
+DISCHARGE_SUMMARY = {
+    "diagnosis": "Senile cataract, right eye",
+    "procedure_performed": "Phacoemulsification with IOL",
+    "days_stayed": 1,
+    "complications": "None",
+    "medications": [],
+    "follow_up_schedule": [],
+    "warning_signs": []
+}
+
+
+def _slow_bill(pdf_path, use_llm_fallback=True):
+    time.sleep(STEP_DELAY)
+    return dict(FINAL_BILL)
+
+
+def _slow_summary(pdf_path, use_llm=True):
+    time.sleep(STEP_DELAY)
+    return dict(DISCHARGE_SUMMARY)
+
+
+def _slow_llm(**kwargs):
+    time.sleep(STEP_DELAY)
+    return '{}'
+
+
+@patch.dict('os.environ', {"ANTHROPIC_API_KEY": "test-key"})
+@patch('src.agents.medical_guidance_generator.call_llm_with_retry', side_effect=_slow_llm)
+@patch('src.agents.cost_escalation_analyzer.call_llm_with_retry', side_effect=_slow_llm)
+@patch('src.services.discharge_service.extract_discharge_summary', side_effect=_slow_summary)
+@patch('src.services.discharge_service.extract_final_bill', side_effect=_slow_bill)
+class TestDischargeServiceConcurrency:
+    """Test suite for concurrent discharge validation"""
+
+    def _validate(self, concurrent: bool):
+        service = DischargeService(concurrent=concurrent)
+        try:
+            started = time.monotonic()
+            result = service.validate_discharge_manual(
+                expected_costs=EXPECTED_COSTS,
+                expected_stay_days=1,
+                final_bill_pdf_path="bill.pdf",
+                discharge_summary_pdf_path="summary.pdf"
+            )
+            return result, time.monotonic() - started
+        finally:
+            service.shutdown()
+
+    def test_concurrent_and_sequential_modes_agree(self, *mocks):
+        """Concurrency does not change the validation result"""
+        concurrent_result, _ = self._validate(concurrent=True)
+        sequential_result, _ = self._validate(concurrent=False)
+
+        assert concurrent_result == sequential_result
+        assert concurrent_result["final_bill"]["total_bill_amount"] == 54500.0
+
+    def test_independent_steps_overlap(self, bill_mock, summary_mock, cost_llm_mock, guide_llm_mock):
+        """Extractions overlap, then Agents 6 and 8 overlap: two rounds instead of four"""
+        _, elapsed = self._validate(concurrent=True)
+
+        assert bill_mock.call_count == 1
+        assert summary_mock.call_count == 1
+        assert elapsed < 3 * STEP_DELAY
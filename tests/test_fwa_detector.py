@@ -11,13 +11,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
 from unittest.mock import patch
-from src.agents.fwa_detector import FWADetector
+from src.agents.fwa_detector import FWADetector, parse_llm_band
 from src.models.schemas import (
     MedicalNote, PatientInfo, DiagnosisInfo, ClinicalHistory,
     ProposedTreatment, MedicalJustification, HospitalizationDetails,
     CostBreakdown, DoctorDetails, HospitalDetails
 )
 from src.utils.data_loader import load_procedure_data
+from src.utils.fwa_rules import CostRuleTable
 
 
 class TestFWADetector:
@@ -464,6 +465,113 @@ class TestFWADetector:
         assert "review required" in summary.lower()
 
 
+class TestTieredFWADetection:
+    """Test suite for the rule pre-screen in tiered mode"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.cataract_procedure = load_procedure_data("cataract_surgery").model_dump()
+        # Day-care cataract: no room charges, which the reference data doesn't price
+        self.base_costs = {
+            'surgeon_fees': 18000,
+            'anesthetist_fees': 5000,
+            'ot_charges': 12000,
+            'investigations': 2500,
+            'medicines_consumables': 10000,
+            'total_estimated_cost': 47500
+        }
+        base = TestFWADetector()
+        base.setup_method()
+        self.medical_note = base.base_medical_note
+
+    def detect(self, detector, costs, treatment="Cataract Surgery", stay_duration=1):
+        return detector.detect(
+            diagnosis="Senile Cataract",
+            treatment=treatment,
+            costs=costs,
+            procedure_data=self.cataract_procedure,
+            stay_duration=stay_duration,
+            medical_note=self.medical_note
+        )
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_clean_claim_skips_llm(self, mock_llm):
+        """Every component within its range → rules decide, no LLM call"""
+        result = self.detect(FWADetector(tiered=True), self.base_costs)
+
+        mock_llm.assert_not_called()
+        assert result.status == "pass"
+        assert result.risk_level == "low"
+        assert result.flags == []
+        assert result.score_impact == 0
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_unpriced_components_are_not_clean(self, mock_llm):
+        """ICU and room charges on a day-care cataract have no range, so the LLM judges them"""
+        mock_llm.return_value = '{"risk_level": "low", "flags": []}'
+        costs = {**self.base_costs, 'icu_charges': 15000, 'room_charges': 20000, 'total_estimated_cost': 82500}
+
+        screen = CostRuleTable(self.cataract_procedure).screen(costs, 1)
+        assert screen.tier((1.0, 3.0)) == "ambiguous"
+        assert "icu_charges ₹15,000" in screen.reasons[0]
+        assert "room_charges ₹20,000" in screen.reasons[0]
+
+        self.detect(FWADetector(tiered=True), costs)
+        mock_llm.assert_called_once()
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_ambiguous_claim_calls_llm(self, mock_llm):
+        """Components above range, upgrades or long stays go to the LLM"""
+        mock_llm.return_value = '{"risk_level": "low", "flags": []}'
+        detector = FWADetector(tiered=True)
+
+        self.detect(detector, {**self.base_costs, 'surgeon_fees': 36000, 'total_estimated_cost': 65500})
+        self.detect(detector, self.base_costs, treatment="Cataract Surgery with Premium Toric IOL")
+        self.detect(detector, self.base_costs, stay_duration=2)
+
+        assert mock_llm.call_count == 3
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_clear_outlier_flagged_by_rules(self, mock_llm):
+        """Far above the band → rules flag each exceeded item without the LLM"""
+        costs = {**self.base_costs, 'surgeon_fees': 100000, 'total_estimated_cost': 129500}
+
+        result = self.detect(FWADetector(tiered=True), costs)
+
+        mock_llm.assert_not_called()
+        assert result.risk_level == "medium"
+        assert [f.category for f in result.flags] == ["cost_inflation", "cost_inflation"]
+        assert "Surgeon fees ₹100,000" in result.flags[0].detail
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_tiered_mode_off(self, mock_llm):
+        """With tiered mode off every claim goes to the LLM"""
+        mock_llm.return_value = '{"risk_level": "low", "flags": []}'
+
+        self.detect(FWADetector(tiered=False), self.base_costs)
+
+        mock_llm.assert_called_once()
+
+    def test_rule_table(self):
+        """Ranges, per-day prices and stay units compile from the medical data"""
+        cataract = CostRuleTable(self.cataract_procedure)
+        assert cataract.stay_maximum_days == 1
+        assert cataract.total_maximum == 120000
+        screen = cataract.screen(self.base_costs, 1)
+        assert screen.ratios["surgeon_fees"] == pytest.approx(0.6)
+        assert screen.findings == [] and screen.reasons == []
+
+        bypass = CostRuleTable(load_procedure_data("coronary_artery_bypass").model_dump())
+        assert bypass.stay_maximum_days == 7
+        icu = bypass.screen({'icu_charges': 30000, 'total_estimated_cost': 30000}, stay_duration=2)
+        assert icu.ratios["icu_charges"] == pytest.approx(1.0)
+
+        assert parse_llm_band("") == (1.0, 3.0)
+        assert parse_llm_band("0.9, 2") == (0.9, 2.0)
+        with pytest.raises(ValueError):
+            parse_llm_band("2,1")
+
+
 def run_fwa_detector_tests():
     """Run all FWA detector tests"""
     print("=" * 60)
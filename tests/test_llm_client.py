@@ -0,0 +1,566 @@
+"""
+Unit tests for LLM client utilities
+Tests response caching, request coalescing and retry behaviour without
+calling the real API
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import pytest
+from anthropic import APIConnectionError, APIStatusError, BadRequestError, RateLimitError
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.utils import llm_client
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.single_flight import SingleFlight
+
+
+def _fake_message(text: str) -> MagicMock:
+    """Build an object shaped like an Anthropic messages.create() response"""
+    message = MagicMock()
+    message.content = [MagicMock(text=text)]
+    return message
+
+
+def _api_error(cls, status_code: int, headers: dict = None):
+    """Build an Anthropic API status error with the given status and headers"""
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return cls(f"HTTP {status_code}", response=response, body=None)
+
+
+class TestLLMResponseCache:
+    """Test suite for the on-disk LLM response cache"""
+
+    def test_key_depends_on_all_request_parameters(self):
+        """Any change in model, max_tokens, temperature or prompt changes the key"""
+        base = LLMResponseCache.make_key("prompt", "model-a", 2000, 0.3)
+
+        assert base == LLMResponseCache.make_key("prompt", "model-a", 2000, 0.3)
+        assert base != LLMResponseCache.make_key("prompt!", "model-a", 2000, 0.3)
+        assert base != LLMResponseCache.make_key("prompt", "model-b", 2000, 0.3)
+        assert base != LLMResponseCache.make_key("prompt", "model-a", 1000, 0.3)
+        assert base != LLMResponseCache.make_key("prompt", "model-a", 2000, 0.2)
+
+    def test_hit_and_miss_counters(self, tmp_path):
+        """get() counts misses until set() stores the response"""
+        cache = LLMResponseCache(str(tmp_path))
+        key = LLMResponseCache.make_key("prompt", "model", 100, 0.0)
+
+        assert cache.get(key) is None
+        cache.set(key, '{"ok": true}', model="model")
+        assert cache.get(key) == '{"ok": true}'
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["writes"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries older than the TTL are not returned"""
+        cache = LLMResponseCache(str(tmp_path), ttl_seconds=60)
+        key = LLMResponseCache.make_key("prompt", "model", 100, 0.0)
+        cache.set(key, "response")
+
+        with patch("src.utils.llm_cache.time.time", return_value=time.time() + 120):
+            assert cache.get(key) is None
+
+        assert not any(tmp_path.glob("*/*.json"))
+
+    def test_size_eviction_removes_oldest(self, tmp_path):
+        """Exceeding max_entries evicts the oldest responses first"""
+        cache = LLMResponseCache(str(tmp_path), max_entries=10)
+        keys = []
+        for i in range(11):
+            key = LLMResponseCache.make_key(f"prompt {i}", "model", 100, 0.0)
+            cache.set(key, f"response {i}")
+            # Distinct mtimes so eviction order is deterministic
+            path = tmp_path / key[:2] / f"{key}.json"
+            stamp = time.time() - 100 + i
+            os.utime(path, (stamp, stamp))
+            keys.append(key)
+
+        assert cache.stats()["evictions"] >= 2
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[-1]) == "response 10"
+
+    def test_disabled_cache_never_stores(self, tmp_path):
+        """A disabled cache is a no-op"""
+        cache = LLMResponseCache(str(tmp_path), enabled=False)
+        key = LLMResponseCache.make_key("prompt", "model", 100, 0.0)
+        cache.set(key, "response")
+
+        assert cache.get(key) is None
+        assert not any(tmp_path.glob("*/*.json"))
+
+
+class TestCallLLMWithRetryCaching:
+    """Test that call_llm_with_retry serves identical requests from the cache"""
+
+    def setup_method(self):
+        """Setup mock Anthropic client"""
+        self.client = MagicMock()
+        self.client.messages.create.return_value = _fake_message("cached answer")
+
+    def test_identical_prompt_calls_api_once(self, tmp_path):
+        """Second identical request is served from the cache"""
+        cache = LLMResponseCache(str(tmp_path))
+
+        with patch.object(llm_client, "_llm_cache", cache), \
+             patch.object(llm_client, "get_llm_client", return_value=self.client):
+            first = llm_client.call_llm_with_retry("same prompt", model="m", max_tokens=10)
+            second = llm_client.call_llm_with_retry("same prompt", model="m", max_tokens=10)
+
+        assert first == second == "cached answer"
+        assert self.client.messages.create.call_count == 1
+
+    def test_use_cache_false_bypasses_cache(self, tmp_path):
+        """use_cache=False always calls the API"""
+        cache = LLMResponseCache(str(tmp_path))
+
+        with patch.object(llm_client, "_llm_cache", cache), \
+             patch.object(llm_client, "get_llm_client", return_value=self.client):
+            llm_client.call_llm_with_retry("same prompt", model="m", use_cache=False)
+            llm_client.call_llm_with_retry("same prompt", model="m", use_cache=False)
+
+        assert self.client.messages.create.call_count == 2
+        assert cache.stats()["writes"] == 0
+
+
+class TestRateLimiter:
+    """Test suite for the token-bucket rate limiter"""
+
+    def test_bucket_allows_burst_up_to_capacity(self):
+        """A full bucket serves up to its capacity without waiting"""
+        bucket = llm_client.TokenBucket(per_minute=60)
+
+        waits = [bucket.reserve(1) for _ in range(60)]
+
+        assert all(w == 0.0 for w in waits)
+
+    def test_bucket_wait_grows_with_queued_reservations(self):
+        """Reservations beyond capacity wait proportionally to the refill rate"""
+        bucket = llm_client.TokenBucket(per_minute=60)  # 1 token per second
+        bucket.reserve(60)
+
+        first = bucket.reserve(1)
+        second = bucket.reserve(1)
+
+        assert first == pytest.approx(1.0, abs=0.05)
+        assert second == pytest.approx(2.0, abs=0.05)
+
+    def test_limiter_waits_for_slowest_bucket(self):
+        """The token budget can be the binding constraint"""
+        limiter = llm_client.LLMRateLimiter(requests_per_minute=600, tokens_per_minute=6000)
+
+        assert limiter.reserve(6000) == 0.0
+        # 100 tokens/second refill -> 600 more tokens need ~6 seconds
+        assert limiter.reserve(600) == pytest.approx(6.0, abs=0.1)
+
+    def test_unlimited_limiter_never_waits(self):
+        """Zero limits disable rate limiting"""
+        limiter = llm_client.LLMRateLimiter()
+
+        assert limiter.reserve(10 ** 9) == 0.0
+
+
+class TestConcurrencyLimiter:
+    """Test suite for the process-wide concurrency gate"""
+
+    def test_threads_and_event_loops_share_one_limit(self):
+        """Sync callers and tasks on two event loops never exceed the limit together"""
+        limiter = llm_client.ConcurrencyLimiter(2)
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def enter():
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+
+        def leave():
+            nonlocal in_flight
+            with lock:
+                in_flight -= 1
+
+        def sync_worker():
+            with limiter:
+                enter()
+                time.sleep(0.02)
+                leave()
+
+        async def async_worker():
+            async with limiter:
+                enter()
+                await asyncio.sleep(0.02)
+                leave()
+
+        def loop_worker():
+            async def run():
+                await asyncio.gather(*[async_worker() for _ in range(4)])
+            asyncio.run(run())
+
+        threads = [threading.Thread(target=sync_worker) for _ in range(4)]
+        threads += [threading.Thread(target=loop_worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert peak == 2
+        assert limiter.in_flight() == 0
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        """A task cancelled while waiting doesn't keep a slot"""
+        limiter = llm_client.ConcurrencyLimiter(1)
+
+        async def run():
+            await limiter.acquire_async()
+            waiter = asyncio.create_task(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            limiter.release()
+
+        asyncio.run(run())
+
+        assert limiter.in_flight() == 0
+
+    def test_rate_limit_wait_does_not_hold_a_slot(self, tmp_path):
+        """Callers waiting on the rate limiter leave the concurrency slot free"""
+        limiter = llm_client.ConcurrencyLimiter(1)
+        client = MagicMock()
+        client.messages.create.return_value = _fake_message("ok")
+
+        class SlowRateLimiter:
+            def acquire(self, estimated_tokens):
+                assert limiter.in_flight() == 0
+                time.sleep(0.01)
+
+        with patch.object(llm_client, "_concurrency_limiter", limiter), \
+             patch.object(llm_client, "_rate_limiter", SlowRateLimiter()), \
+             patch.object(llm_client, "get_llm_client", return_value=client):
+            assert llm_client.call_llm_with_retry("prompt", use_cache=False) == "ok"
+
+
+class TestGetLLMClient:
+    """Test suite for the shared sync client"""
+
+    def test_one_client_per_api_key(self):
+        """A different API key gets its own client instead of the first one"""
+        with patch.dict(llm_client._llm_clients, clear=True):
+            first = llm_client.get_llm_client("key-a")
+            again = llm_client.get_llm_client("key-a")
+            other = llm_client.get_llm_client("key-b")
+
+        assert first is again
+        assert other is not first
+        assert other.api_key == "key-b"
+
+    def test_explicit_key_reaches_the_request(self, monkeypatch):
+        """A key passed to call_llm_with_retry is used even without ANTHROPIC_API_KEY"""
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        client = MagicMock()
+        client.messages.create.return_value = _fake_message("ok")
+
+        with patch.object(llm_client, "get_llm_client", return_value=client) as get_client:
+            assert llm_client.call_llm_with_retry("prompt", use_cache=False, api_key="key-a") == "ok"
+
+        get_client.assert_called_once_with("key-a")
+
+    def test_async_pools_are_keyed_by_api_key(self, monkeypatch):
+        """Each API key gets its own async client on a loop"""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+
+        async def run():
+            try:
+                return (
+                    llm_client.get_async_llm_client(),
+                    llm_client.get_async_llm_client("key-b"),
+                    llm_client.get_async_llm_client("env-key")
+                )
+            finally:
+                await llm_client.close_async_llm_client()
+
+        default, other, same = asyncio.run(run())
+
+        assert default is same
+        assert other.api_key == "key-b"
+        assert default.api_key == "env-key"
+
+
+class TestCallLLMAsync:
+    """Test suite for the async LLM helper"""
+
+    def _mock_pool(self, text: str):
+        pool = MagicMock()
+        pool.client.messages.create = AsyncMock(return_value=_fake_message(text))
+        return pool
+
+    def test_async_call_uses_cache_and_shared_pool(self, tmp_path):
+        """call_llm_async returns the response and caches it like the sync path"""
+        cache = LLMResponseCache(str(tmp_path))
+
+        async def run():
+            pool = self._mock_pool("async answer")
+            with patch.object(llm_client, "_get_async_pool", return_value=pool):
+                first = await llm_client.call_llm_async("prompt", model="m")
+                second = await llm_client.call_llm_async("prompt", model="m")
+            return pool, first, second
+
+        with patch.object(llm_client, "_llm_cache", cache):
+            pool, first, second = asyncio.run(run())
+
+        assert first == second == "async answer"
+        assert pool.client.messages.create.await_count == 1
+
+    def test_async_call_bounded_by_concurrency_limit(self, tmp_path):
+        """No more than the concurrency limit of requests are in flight at once"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return _fake_message("ok")
+
+        async def run():
+            pool = self._mock_pool("ok")
+            pool.client.messages.create.side_effect = slow_create
+            with patch.object(llm_client, "_get_async_pool", return_value=pool):
+                await asyncio.gather(*[
+                    llm_client.call_llm_async(f"prompt {i}", use_cache=False)
+                    for i in range(8)
+                ])
+
+        with patch.object(llm_client, "_concurrency_limiter", llm_client.ConcurrencyLimiter(2)):
+            asyncio.run(run())
+
+        assert peak == 2
+
+
+class TestRetryPolicy:
+    """Test suite for retry classification, backoff and deadline handling"""
+
+    def setup_method(self):
+        """Setup mock Anthropic client and a fast retry policy"""
+        self.client = MagicMock()
+        self.policy = llm_client.RetryPolicy(base_delay=0.01, max_delay=0.05, deadline=5.0)
+
+    def _call(self, max_retries: int = 3, policy=None):
+        with patch.object(llm_client, "get_llm_client", return_value=self.client):
+            return llm_client.call_llm_with_retry(
+                "prompt", max_retries=max_retries, use_cache=False, retry_policy=policy or self.policy
+            )
+
+    def test_classifies_transient_errors(self):
+        """429/529/5xx and connection errors are retryable, request errors are not"""
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+        assert self.policy.is_retryable(_api_error(RateLimitError, 429))
+        assert self.policy.is_retryable(_api_error(APIStatusError, 529))
+        assert self.policy.is_retryable(_api_error(APIStatusError, 503))
+        assert self.policy.is_retryable(APIConnectionError(request=request))
+        assert self.policy.is_retryable(TimeoutError("timed out"))
+        assert not self.policy.is_retryable(_api_error(BadRequestError, 400))
+        assert not self.policy.is_retryable(ValueError("bad prompt"))
+
+    def test_retries_transient_error_then_succeeds(self):
+        """A 529 followed by success returns the response"""
+        self.client.messages.create.side_effect = [
+            _api_error(APIStatusError, 529),
+            _fake_message("recovered")
+        ]
+
+        assert self._call() == "recovered"
+        assert self.client.messages.create.call_count == 2
+
+    def test_non_retryable_error_fails_without_retry(self):
+        """A 400 is not retried"""
+        self.client.messages.create.side_effect = _api_error(BadRequestError, 400)
+
+        with pytest.raises(Exception, match="after 1 attempts"):
+            self._call()
+        assert self.client.messages.create.call_count == 1
+
+    def test_zero_max_retries_still_makes_one_attempt(self):
+        """max_retries <= 0 is clamped to a single attempt instead of returning None"""
+        self.client.messages.create.return_value = _fake_message("once")
+
+        assert self._call(max_retries=0) == "once"
+
+        self.client.messages.create.side_effect = _api_error(APIStatusError, 529)
+        with pytest.raises(Exception, match="after 1 attempts"):
+            self._call(max_retries=-1)
+
+    def test_honours_retry_after_header(self):
+        """The server's retry-after hint overrides a shorter backoff"""
+        error = _api_error(RateLimitError, 429, {"retry-after": "0.2"})
+        self.client.messages.create.side_effect = [error, _fake_message("ok")]
+
+        with patch.object(llm_client.time, "sleep") as sleep:
+            self._call()
+
+        sleep.assert_called_once()
+        assert sleep.call_args[0][0] == pytest.approx(0.2)
+
+    def test_gives_up_when_retry_after_exceeds_deadline(self):
+        """No retry is attempted if waiting would overrun the deadline budget"""
+        policy = llm_client.RetryPolicy(base_delay=0.01, max_delay=0.05, deadline=1.0)
+        self.client.messages.create.side_effect = _api_error(RateLimitError, 429, {"retry-after": "30"})
+
+        with pytest.raises(Exception, match="after 1 attempts"):
+            self._call(policy=policy)
+        assert self.client.messages.create.call_count == 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Backoff grows exponentially but never exceeds max_delay"""
+        policy = llm_client.RetryPolicy(base_delay=1.0, max_delay=4.0)
+
+        delays = [policy.backoff(attempt) for attempt in range(10) for _ in range(20)]
+
+        assert all(0.0 <= d <= 4.0 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestRequestCoalescing:
+    """Test that identical in-flight requests share one API call"""
+
+    def setup_method(self):
+        """Setup a slow mock client and a fresh coalescing group"""
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.client = MagicMock()
+
+        def slow_create(**kwargs):
+            self.started.set()
+            self.release.wait(5)
+            return _fake_message("shared answer")
+
+        self.client.messages.create.side_effect = slow_create
+        self.group = SingleFlight()
+
+    def _patches(self, tmp_path):
+        return (
+            patch.object(llm_client, "_llm_cache", LLMResponseCache(str(tmp_path), enabled=False)),
+            patch.object(llm_client, "_single_flight", self.group),
+            patch.object(llm_client, "get_llm_client", return_value=self.client)
+        )
+
+    def _wait_for_followers(self, count: int):
+        deadline = time.monotonic() + 5
+        while self.group.stats()["coalesced"] < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_concurrent_threads_share_one_call(self, tmp_path):
+        """Threads sending the same prompt at once get one API call's response"""
+        cache_patch, group_patch, client_patch = self._patches(tmp_path)
+
+        with cache_patch, group_patch, client_patch, ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(llm_client.call_llm_with_retry, "same prompt") for _ in range(5)]
+            self._wait_for_followers(4)
+            self.release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["shared answer"] * 5
+        assert self.client.messages.create.call_count == 1
+        assert self.group.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+    def test_failure_is_shared(self, tmp_path):
+        """Followers receive the leader's error instead of retrying it themselves"""
+        def failing_create(**kwargs):
+            self.started.set()
+            self.release.wait(5)
+            raise _api_error(BadRequestError, 400)
+
+        self.client.messages.create.side_effect = failing_create
+        cache_patch, group_patch, client_patch = self._patches(tmp_path)
+
+        with cache_patch, group_patch, client_patch, ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(llm_client.call_llm_with_retry, "bad prompt") for _ in range(3)]
+            self._wait_for_followers(2)
+            self.release.set()
+            for future in futures:
+                with pytest.raises(Exception, match="after 1 attempts"):
+                    future.result()
+
+        assert self.client.messages.create.call_count == 1
+
+    def test_async_task_joins_thread_call(self, tmp_path):
+        """An asyncio task awaits the identical request a thread has in flight"""
+        pool = MagicMock()
+        pool.client.messages.create = AsyncMock(return_value=_fake_message("async answer"))
+        cache_patch, group_patch, client_patch = self._patches(tmp_path)
+
+        async def run():
+            with patch.object(llm_client, "_get_async_pool", return_value=pool):
+                tasks = [asyncio.create_task(llm_client.call_llm_async("same prompt")) for _ in range(3)]
+                while self.group.stats()["coalesced"] < 3:
+                    await asyncio.sleep(0.01)
+                self.release.set()
+                return await asyncio.gather(*tasks)
+
+        with cache_patch, group_patch, client_patch, ThreadPoolExecutor(max_workers=1) as executor:
+            thread_result = executor.submit(llm_client.call_llm_with_retry, "same prompt")
+            self.started.wait(5)
+            task_results = asyncio.run(run())
+
+        assert thread_result.result() == "shared answer"
+        assert task_results == ["shared answer"] * 3
+        assert pool.client.messages.create.await_count == 0
+        assert self.client.messages.create.call_count == 1
+
+    def test_cancelled_leader_hands_over(self, tmp_path):
+        """If the leading task is cancelled, a waiting task makes the call itself"""
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.1)
+            return _fake_message("answer")
+
+        pool = MagicMock()
+        pool.client.messages.create = create
+        cache_patch, group_patch, _ = self._patches(tmp_path)
+
+        async def run():
+            with patch.object(llm_client, "_get_async_pool", return_value=pool):
+                leader = asyncio.create_task(llm_client.call_llm_async("prompt"))
+                await asyncio.sleep(0.02)
+                follower = asyncio.create_task(llm_client.call_llm_async("prompt"))
+                await asyncio.sleep(0.02)
+                leader.cancel()
+                return await follower
+
+        with cache_patch, group_patch:
+            assert asyncio.run(run()) == "answer"
+        assert calls == 2
+
+    def test_coalescing_can_be_disabled(self, tmp_path, monkeypatch):
+        """LLM_COALESCE_ENABLED=false sends every request"""
+        monkeypatch.setenv("LLM_COALESCE_ENABLED", "false")
+        self.release.set()
+        cache_patch, group_patch, client_patch = self._patches(tmp_path)
+
+        with cache_patch, group_patch, client_patch, ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda _: llm_client.call_llm_with_retry("same prompt"), range(2)))
+
+        assert self.client.messages.create.call_count == 2
+        assert self.group.stats()["leaders"] == 0
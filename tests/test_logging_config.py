@@ -0,0 +1,110 @@
+"""
+Unit tests for logging configuration
+Tests per-module levels, JSON formatting, lazy rendering and that prompts and
+extracted notes stay out of stdout and non-debug logs
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from src.agents.fwa_detector import FWADetector
+from src.services.pdf_extractor import PDFExtractor
+from src.utils.data_loader import load_procedure_data
+from src.utils.logging_config import JSONFormatter, Lazy, configure_logging, lazy_json, parse_module_levels
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+@pytest.fixture
+def restore_levels():
+    names = ["src", "iris", "src.agents.fwa_detector"]
+    saved = {name: logging.getLogger(name).level for name in names}
+    yield
+    for name, level in saved.items():
+        logging.getLogger(name).setLevel(level)
+
+
+class TestLoggingConfig:
+    """Test suite for logging configuration helpers"""
+
+    def test_module_levels(self, restore_levels):
+        """LOG_LEVELS overrides apply per logger on top of LOG_LEVEL"""
+        assert parse_module_levels("src.agents=debug, httpx=WARNING,") == {
+            "src.agents": logging.DEBUG,
+            "httpx": logging.WARNING
+        }
+        with pytest.raises(ValueError):
+            parse_module_levels("src.agents")
+        with pytest.raises(ValueError):
+            parse_module_levels("src.agents=LOUD")
+
+        configure_logging(level="WARNING", module_levels="src.agents.fwa_detector=DEBUG")
+
+        assert not logging.getLogger("src.services.preauth_service").isEnabledFor(logging.INFO)
+        assert logging.getLogger("src.agents.fwa_detector").isEnabledFor(logging.DEBUG)
+
+    def test_lazy_rendered_only_when_emitted(self, restore_levels):
+        """Lazy arguments are not built for disabled levels"""
+        calls = []
+        logger = logging.getLogger("src.test_lazy")
+        logging.getLogger("src").setLevel(logging.INFO)
+
+        logger.debug("value: %s", Lazy(lambda: calls.append(1) or "expensive"))
+        assert calls == []
+
+        assert str(lazy_json({"b": 1}, indent=None)) == '{"b": 1}'
+
+    def test_json_formatter(self):
+        """Records become one JSON object with extra fields and exceptions"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.getLogger("src.test").makeRecord(
+                "src.test", logging.WARNING, __file__, 1, "failed %s", ("job-1",),
+                sys.exc_info(), extra={"job_id": "job-1"}
+            )
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["level"] == "WARNING"
+        assert entry["logger"] == "src.test"
+        assert entry["message"] == "failed job-1"
+        assert entry["job_id"] == "job-1"
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestPromptLogging:
+    """Test suite for prompt logging in the agents"""
+
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_prompt_only_logged_at_debug(self, mock_llm, capsys, caplog, restore_levels):
+        """The FWA prompt is never printed and only logged when debug is enabled"""
+        mock_llm.return_value = '{"risk_level": "low", "flags": []}'
+        detector = FWADetector()
+        note = PDFExtractor().extract_from_pdf(str(TEST_DATA_DIR / "case-2.pdf"))
+        kwargs = dict(
+            diagnosis=note.diagnosis.primary_diagnosis,
+            treatment=note.proposed_treatment.procedure_name,
+            costs=note.cost_breakdown.model_dump(),
+            procedure_data=load_procedure_data("cataract_surgery").model_dump(),
+            stay_duration=note.hospitalization_details.expected_length_of_stay,
+            medical_note=note
+        )
+
+        with caplog.at_level(logging.INFO, logger="src"):
+            detector.detect(**kwargs)
+        assert "Prompt sent" not in caplog.text
+        assert capsys.readouterr().out == ""
+
+        with caplog.at_level(logging.DEBUG, logger="src.agents.fwa_detector"):
+            detector.detect(**kwargs)
+        assert "Prompt sent to Agent 4" in caplog.text
@@ -0,0 +1,135 @@
+"""
+Unit tests for the mock LLM server and the offline pipeline benchmark
+Tests replay by prompt hash, rule fallbacks, error and latency injection,
+record-through-upstream, and the benchmark report on the test_data corpus
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import time
+
+import httpx
+from src.services.benchmark import discover_cases, run_benchmark, summarize
+from src.utils.mock_llm_server import MockLLMServer, Recordings, prompt_key
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+def post_prompt(server: MockLLMServer, prompt: str) -> httpx.Response:
+    return httpx.post(
+        f"{server.url}/v1/messages",
+        json={
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 100,
+            "messages": [{"role": "user", "content": prompt}]
+        },
+        timeout=10
+    )
+
+
+class TestMockLLMServer:
+    """Test suite for MockLLMServer"""
+
+    def test_replay_sources(self):
+        """Recorded prompts replay by hash, others fall back to rules, then default"""
+        recordings = Recordings(
+            responses={prompt_key("exact prompt"): "recorded answer"},
+            rules=[{"contains": ["medical claim", "reviewer"], "response": '{"assessment": "strong"}'}]
+        )
+
+        with MockLLMServer(recordings=recordings) as server:
+            recorded = post_prompt(server, "exact prompt")
+            ruled = post_prompt(server, "You are a medical claim reviewer ...")
+            unmatched = post_prompt(server, "something else")
+            recordings.default = "{}"
+            defaulted = post_prompt(server, "something else")
+            stats = server.stats()
+
+        body = recorded.json()
+        assert body["content"][0]["text"] == "recorded answer"
+        assert body["usage"]["input_tokens"] >= 1
+        assert ruled.json()["content"][0]["text"] == '{"assessment": "strong"}'
+        assert unmatched.status_code == 404
+        assert defaulted.json()["content"][0]["text"] == "{}"
+        assert stats == {"requests": 4, "recorded": 1, "rule": 1, "default": 1, "upstream": 0,
+                         "unmatched": 1, "errors_injected": 0}
+
+    def test_error_and_latency_injection(self):
+        """Injected errors are Anthropic-style 529s with retry-after; latency delays replies"""
+        with MockLLMServer(recordings=Recordings(default="ok"), error_rate=1.0, retry_after=2) as server:
+            failed = post_prompt(server, "prompt")
+
+        assert failed.status_code == 529
+        assert failed.headers["retry-after"] == "2"
+        assert failed.json()["error"]["type"] == "overloaded_error"
+
+        with MockLLMServer(recordings=Recordings(default="ok"), latency=0.2) as server:
+            started = time.perf_counter()
+            assert post_prompt(server, "prompt").status_code == 200
+            assert time.perf_counter() - started >= 0.2
+
+    def test_record_through_upstream(self, tmp_path):
+        """With an upstream, unrecorded prompts are forwarded and saved for replay"""
+        with MockLLMServer(recordings=Recordings(default="live answer")) as upstream:
+            recording = MockLLMServer(upstream=upstream.url, upstream_api_key="key")
+            with recording:
+                assert post_prompt(recording, "new prompt").json()["content"][0]["text"] == "live answer"
+                assert recording.stats()["upstream"] == 1
+
+        path = tmp_path / "recordings.json"
+        recording.recordings.save(path)
+        replay = Recordings.load(path)
+        assert replay.lookup("new prompt") == ("live answer", "recorded")
+
+    def test_shipped_recordings_cover_agents(self):
+        """The benchmark recordings answer every agent's prompt by rule"""
+        recordings = Recordings.load(TEST_DATA_DIR / "llm_recordings.json")
+        prompts = [
+            "You are a medical claim reviewer for health insurance in India.",
+            "You are a quality assurance specialist for health insurance claims in India.",
+            "You are analyzing cost variances between pre-authorization estimate and actual discharge bill.",
+            "generate a brief patient-friendly recovery timeline (2-3 sentences).",
+            "Extract information from this final hospital bill and return as JSON.",
+            "Extract information from this discharge summary and return as JSON.",
+        ]
+        for prompt in prompts:
+            assert recordings.lookup(prompt)[1] == "rule", prompt
+
+
+class TestPipelineBenchmark:
+    """Test suite for the offline benchmark harness"""
+
+    def test_discover_cases(self):
+        """Every case note is found; discharge documents are paired by case number"""
+        cases = discover_cases(TEST_DATA_DIR)
+
+        assert [c.case_id for c in cases] == ["case-1", "case-2", "case-3", "case-4", "case-5", "case-6"]
+        with_discharge = [c.case_id for c in cases if c.final_bill_pdf and c.discharge_summary_pdf]
+        assert with_discharge == ["case-1", "case-2", "case-3", "case-5"]
+
+    def test_summarize(self):
+        """Nearest-rank percentiles over stage durations"""
+        stats = summarize([float(i) for i in range(1, 21)])
+        assert (stats["count"], stats["p50"], stats["p95"], stats["max"]) == (20, 10.0, 19.0, 20.0)
+        assert summarize([])["count"] == 0
+
+    def test_preauth_report(self):
+        """The benchmark runs the corpus offline and reports per-stage latency and memory"""
+        report = run_benchmark(data_dir=TEST_DATA_DIR, pipelines=("preauth",), iterations=1)
+
+        result = report["pipelines"]["preauth"]
+        assert result["runs"] == 6
+        assert result["errors"] == 0
+        assert result["throughput_per_minute"] > 0
+        stages = result["latency_seconds"]["stages"]
+        for stage in ["pdf_extraction", "agent.completeness", "agent.policy_validation",
+                      "agent.medical_review", "agent.fwa_detection", "aggregation"]:
+            assert stages[stage]["count"] == 6, stage
+        assert result["latency_seconds"]["end_to_end"]["p95"] >= stages["pdf_extraction"]["p50"]
+        assert result["memory_peak_bytes"]["pdf_extraction"] > 0
+        assert report["mock_llm"]["unmatched"] == 0
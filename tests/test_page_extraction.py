@@ -0,0 +1,113 @@
+"""
+Unit tests for page-parallel PDF text extraction
+Tests page order across worker processes, the page-count threshold, early
+close and the serial fallback when the pool breaks
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from unittest.mock import patch
+from src.utils import page_extraction, pdf_text_cache
+from src.utils.page_extraction import PageExtractor, count_pages
+from src.utils.pdf_document import PDFDocument
+from src.utils.pdf_text_cache import PDFTextCache
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+class TestPageExtractor:
+    """Test suite for PageExtractor"""
+
+    def setup_method(self):
+        """Load an 8-page final bill"""
+        self.pdf_bytes = (TEST_DATA_DIR / "case-5_finalbill.pdf").read_bytes()
+        self.serial = list(page_extraction.PAGE_ITERATORS["pypdf2"](self.pdf_bytes))
+
+    def test_parallel_pages_stay_in_order(self):
+        """Pages extracted by worker processes come back in page order"""
+        extractor = PageExtractor(workers=2, min_pages=2)
+        try:
+            pages = list(extractor.iter_pages(self.pdf_bytes, "pypdf2"))
+        finally:
+            extractor.shutdown()
+
+        assert count_pages(self.pdf_bytes) == 8
+        assert pages == self.serial
+        assert extractor.stats()["parallel_documents"] == 1
+        assert extractor.stats()["pages"] == 8
+
+    def test_short_documents_are_extracted_serially(self):
+        """Below min_pages no pool is started"""
+        extractor = PageExtractor(workers=2, min_pages=24)
+        pages = list(extractor.iter_pages(self.pdf_bytes, "pypdf2"))
+
+        assert pages == self.serial
+        assert extractor.stats()["parallel_documents"] == 0
+        assert extractor._pool is None
+
+    def test_broken_pool_falls_back_to_serial(self):
+        """A pool that fails mid-document finishes the remaining pages in process"""
+        extractor = PageExtractor(workers=2, min_pages=2)
+        with patch.object(PageExtractor, "_get_pool", side_effect=OSError("no processes")):
+            pages = list(extractor.iter_pages(self.pdf_bytes, "pypdf2"))
+
+        assert pages == self.serial
+
+    def test_pdfplumber_backend_reads_every_page(self):
+        """The pdfplumber backend extracts every page of a real bill, serially and in parallel"""
+        serial = list(PageExtractor().iter_pages(self.pdf_bytes, "pdfplumber"))
+
+        extractor = PageExtractor(workers=2, min_pages=2)
+        try:
+            parallel = list(extractor.iter_pages(self.pdf_bytes, "pdfplumber"))
+        finally:
+            extractor.shutdown()
+
+        assert len(serial) == 8
+        assert any(text.strip() for text in serial)
+        assert parallel == serial
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            next(PageExtractor().iter_pages(self.pdf_bytes, "ocr"))
+
+
+class TestDocumentPageStreaming:
+    """Test suite for PDFDocument.iter_pages()"""
+
+    def setup_method(self):
+        """Use a private, memory-only text cache"""
+        self.cache = PDFTextCache("unused", persist=False)
+        self.patcher = patch.object(pdf_text_cache, "_pdf_text_cache", self.cache)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_pages_are_cached_only_when_fully_read(self):
+        """Stopping early caches nothing; a full pass is cached for the next reader"""
+        calls = []
+
+        def pages(pdf_bytes):
+            calls.append(pdf_bytes)
+            yield from ["one", "two", "three"]
+
+        document = PDFDocument(b"%PDF fake")
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": pages}):
+            stream = document.iter_pages("pypdf2")
+            assert next(stream) == "one"
+            stream.close()
+            assert self.cache.stats()["misses"] == 0
+
+            assert list(document.iter_pages("pypdf2")) == ["one", "two", "three"]
+            assert list(PDFDocument(b"%PDF fake").iter_pages("pypdf2")) == ["one", "two", "three"]
+
+        assert len(calls) == 2
+        assert self.cache.stats()["misses"] == 1
+        assert self.cache.stats()["memory_hits"] == 1
@@ -0,0 +1,124 @@
+"""
+Unit tests for the PDF ingestion layer
+Tests that documents are read once, backend selection per document, the
+template parsers run through ingest() and in-memory uploads
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from unittest.mock import patch
+from src.services.pdf_extractor import PDFExtractor
+from src.utils import page_extraction, pdf_text_cache
+from src.utils.discharge_pdf_extractor import FINAL_BILL_PARSER
+from src.utils.pdf_document import DocumentParser, PDFDocument, ingest
+from src.utils.pdf_text_cache import PDFTextCache
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+class EchoParser(DocumentParser):
+    """Returns the text it was given"""
+
+    def parse(self, text: str) -> str:
+        return text
+
+
+class TestPDFDocument:
+    """Test suite for PDFDocument and ingest()"""
+
+    def setup_method(self):
+        """Use a private, memory-only text cache"""
+        self.cache = PDFTextCache("unused", persist=False)
+        self.patcher = patch.object(pdf_text_cache, "_pdf_text_cache", self.cache)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_pages_are_extracted_once_per_document(self):
+        """Repeat reads of an opened document don't touch the extractor or the cache"""
+        calls = []
+        document = PDFDocument(b"%PDF fake")
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": lambda b: calls.append(b) or ["a", "", "b"]}):
+            assert document.read(("pypdf2",)) == ("pypdf2", "a\nb")
+            assert document.read(("pypdf2",), separator="") == ("pypdf2", "ab")
+
+        assert len(calls) == 1
+        assert self.cache.stats()["misses"] == 1
+        assert PDFDocument.open(document) is document
+
+    def test_falls_back_to_next_backend(self):
+        """A backend that fails or finds no text gives way to the next one"""
+        def broken(pdf_bytes):
+            raise RuntimeError("bad xref")
+
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": broken, "pdfplumber": lambda b: ["text"]}):
+            result = ingest(b"one", EchoParser())
+        assert (result.backend, result.data) == ("pdfplumber", "text")
+
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": lambda b: [""], "pdfplumber": lambda b: ["text"]}):
+            assert ingest(b"two", EchoParser()).backend == "pdfplumber"
+
+    def test_unreadable_documents_raise(self, tmp_path):
+        """Missing files, failing backends and text-less PDFs raise clear errors"""
+        with pytest.raises(FileNotFoundError):
+            PDFDocument.open(tmp_path / "missing.pdf")
+
+        def broken(pdf_bytes):
+            raise RuntimeError("bad xref")
+
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": broken, "pdfplumber": broken}):
+            with pytest.raises(ValueError, match="Failed to extract text"):
+                ingest(b"one", EchoParser())
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pypdf2": lambda b: [" "], "pdfplumber": lambda b: []}):
+            with pytest.raises(ValueError, match="empty"):
+                ingest(b"two", EchoParser())
+
+    def test_template_parsers(self):
+        """Bills and pre-auth notes parse through the same pipeline with the fast backend"""
+        bill = ingest(TEST_DATA_DIR / "case-1_finalbill.pdf", FINAL_BILL_PARSER)
+        assert bill.backend == "pypdf2"
+        assert bill.data["total_bill_amount"] > 0
+
+        note = ingest(TEST_DATA_DIR / "case-1.pdf", PDFExtractor())
+        assert note.backend == "pypdf2"
+        assert note.data["cost_breakdown"]["total_estimated_cost"] > 0
+
+
+class TestInMemorySources:
+    """Test suite for opening uploads without writing them to disk"""
+
+    def setup_method(self):
+        """Load a real pre-auth note"""
+        self.pdf_bytes = (TEST_DATA_DIR / "case-2.pdf").read_bytes()
+
+    def test_open_in_memory_content(self):
+        """bytes, bytearray, memoryview and file objects give the same document"""
+        stream = io.BytesIO(self.pdf_bytes)
+        stream.name = "note.pdf"
+        stream.seek(10)
+        sources = [self.pdf_bytes, bytearray(self.pdf_bytes), memoryview(self.pdf_bytes), stream,
+                   open(TEST_DATA_DIR / "case-2.pdf", "rb")]
+
+        for source in sources:
+            document = PDFDocument.open(source)
+            assert document.pdf_bytes == self.pdf_bytes
+        assert PDFDocument.open(self.pdf_bytes).pdf_bytes is self.pdf_bytes
+        assert PDFDocument.open(stream).name == "note.pdf"
+        # The caller's stream is left where it was
+        assert stream.tell() == 10
+        sources[-1].close()
+
+    def test_extract_from_upload_without_temp_files(self):
+        """The pre-auth extractor reads an upload without creating a temp file"""
+        with patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file created")):
+            note = PDFExtractor().extract_from_pdf(io.BytesIO(self.pdf_bytes))
+
+        assert note.diagnosis.icd_10_code == "H25.9"
@@ -9,8 +9,11 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import json
+from unittest.mock import patch
+
 import pytest
-from src.services.pdf_extractor import PDFExtractor
+from src.services.pdf_extractor import FIELD_SPECS, LLM_FALLBACK_MODEL, PDFExtractor
 from src.models.schemas import MedicalNote
 
 
@@ -164,6 +167,163 @@ class TestPDFExtractor:
             self.extractor.extract_from_text("")
 
 
+class TestSectionTokenizer:
+    """Test suite for the numbered-section tokenizer used by rule-based parsing"""
+
+    TEMPLATE_TEXT = """PRE-AUTHORIZATION REQUEST
+1. PATIENT DETAILS
+Patient Name: Meera Shah
+Gender: Female
+Age: 54 Years
+Contact Number: 9800011111
+2. TREATING DOCTOR INFORMATION
+Doctor Name: Dr. Ravi Rao
+Contact Number: 9822233333
+Qualification: MBBS, MS
+3. ILLNESS/DISEASE DETAILS
+Provisional Diagnosis: Acute appendicitis
+ICD-10 Code: K35.80
+6. INVESTIGATIONS AND TREATMENT DETAILS
+Investigations/Diagnostic Tests Done:
+1. Ultrasound Abdomen (01/10/2025): Inflamed appendix 9mm
+2. Complete Blood Count (01/10/2025): WBC 14,500
+8. CRP LEVEL PENDING
+Medical Management (If Any): None
+7. SURGICAL DETAILS (If Applicable)
+Name of Surgery/Procedure: Laparoscopic Appendectomy
+10. HOSPITALIZA TION DETAILS
+Date of Admission: 05/10/2025
+Expected Number of Days/Stay in Hospital: 2 Days
+11. ESTIMATED COST BREAKDOWN (in ₹)
+OT Charges 25000
+SUM-TOTAL EXPECTED COST OF HOSPITALIZATION 85000
+12. DECLARATION BY TREATING DOCTOR
+Doctor's Name: Dr. Ravi Rao
+"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.extractor = PDFExtractor()
+
+    def test_splits_numbered_sections(self):
+        """Headings are recognised even with split words; list items are not headings"""
+        sections = self.extractor._split_sections(self.TEMPLATE_TEXT)
+
+        assert set(sections) == {
+            'patient', 'doctor', 'illness', 'investigations', 'surgical',
+            'hospitalization', 'cost', 'doctor_declaration'
+        }
+        # An upper-case list item is not a heading and does not hide section 7
+        assert "8. CRP LEVEL PENDING" in sections['investigations']
+        assert "Laparoscopic Appendectomy" in sections['surgical']
+        assert sections['cost'].strip().startswith("OT Charges")
+
+    def test_fields_are_read_from_their_own_section(self):
+        """The doctor's contact number is not mistaken for the patient's"""
+        data, _ = self.extractor._parse_with_rules(self.TEMPLATE_TEXT)
+
+        assert data['patient_info']['contact_number'] == "9800011111"
+        assert data['diagnosis']['icd_10_code'] == "K35.80"
+        assert data['proposed_treatment']['procedure_name'] == "Laparoscopic Appendectomy"
+        assert data['hospitalization_details']['expected_length_of_stay'] == 2
+        assert data['cost_breakdown']['ot_charges'] == 25000
+        assert data['cost_breakdown']['total_estimated_cost'] == 85000
+        assert [t['test_name'] for t in data['diagnostic_tests']] == ["Ultrasound Abdomen", "Complete Blood Count"]
+
+    def test_text_without_sections_is_searched_whole(self):
+        """Free-form notes without numbered headings still parse"""
+        assert self.extractor._split_sections("Patient Name: A B\nAge: 40") == {}
+
+        data, _ = self.extractor._parse_with_rules("Patient Name: Asha Rao\nGender: Female\nAge: 40 Years\n")
+
+        assert data['patient_info']['name'] == "Asha Rao"
+        assert data['patient_info']['age'] == 40
+
+
+class TestFieldLevelFallback:
+    """Test suite for the LLM fallback of low-confidence fields"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.extractor = PDFExtractor(enable_llm_fallback=True)
+        self.text = TestSectionTokenizer.TEMPLATE_TEXT
+
+    def test_field_confidence(self):
+        """Found fields are confident, placeholders and computed totals are not"""
+        data, confidence, sections, _ = self.extractor._parse_fields(self.text)
+
+        assert confidence['patient_info.name'] == 1.0
+        assert confidence['cost_breakdown.total_estimated_cost'] == 1.0
+        assert 'proposed_treatment.anesthesia_type' not in confidence
+        assert 'hospital_details.name' not in confidence
+        assert 'cost' in sections
+
+        _, confidence, _, _ = self.extractor._parse_fields(self.text.replace(
+            "SUM-TOTAL EXPECTED COST OF HOSPITALIZATION 85000\n", ""))
+        assert confidence['cost_breakdown.total_estimated_cost'] == 0.5
+
+    def test_asks_only_for_missing_fields(self):
+        """The prompt names the low-confidence fields and carries only their sections"""
+        answer = {
+            "hospital_details.name": "City Care Hospital",
+            "hospitalization_details.hospitalization_type": "planned",
+            "proposed_treatment.anesthesia_type": "General",
+            "diagnosis.diagnosis_date": None
+        }
+        with patch('src.services.pdf_extractor.call_llm_with_retry', return_value=json.dumps(answer)) as mock_llm:
+            note = self.extractor.extract_from_text(self.text)
+
+        prompt = mock_llm.call_args.kwargs['prompt']
+        assert "- hospital_details.name:" in prompt
+        assert "- patient_info.name:" not in prompt
+        assert "Laparoscopic Appendectomy" in prompt
+        # Sections with only confident fields are left out
+        assert "Ultrasound Abdomen" not in prompt
+        assert "OT Charges" not in prompt
+        # The note has no clinical findings section to read this from
+        assert "why_hospitalization_required" not in prompt
+
+        # LLM values are merged; rule-based values and unanswered fields are kept
+        assert note.hospital_details.name == "City Care Hospital"
+        assert note.hospitalization_details.hospitalization_type == "Planned"
+        assert note.proposed_treatment.anesthesia_type == "General"
+        assert note.patient_info.name == "Meera Shah"
+        assert note.cost_breakdown.total_estimated_cost == 85000
+        assert note.diagnosis.diagnosis_date is None
+
+    def test_header_excerpt_is_cleaned_text(self):
+        """The letterhead sent to the LLM is cut from the same cleaned text as the sections"""
+        raw = "City  Care\r Hospital   ﬁrst floor\n" + self.text
+        data, _, sections, text = self.extractor._parse_fields(raw)
+        with patch('src.services.pdf_extractor.call_llm_with_retry', return_value="{}") as mock_llm:
+            self.extractor._fill_with_llm(data, ['hospital_details.name'], sections, text)
+
+        prompt = mock_llm.call_args.kwargs['prompt']
+        assert "City Care Hospital first floor" in prompt
+        assert "\r" not in prompt
+        assert mock_llm.call_args.kwargs['model'] == LLM_FALLBACK_MODEL
+
+    def test_no_call_when_fields_are_confident(self):
+        """Nothing is sent when every required field was found and the average is high"""
+        data, confidence, sections, text = self.extractor._parse_fields(self.text)
+        confident = {field: 1.0 for field in FIELD_SPECS}
+
+        with patch.object(self.extractor, '_parse_fields', return_value=(data, confident, sections, text)), \
+                patch('src.services.pdf_extractor.call_llm_with_retry') as mock_llm:
+            self.extractor.extract_from_text(self.text)
+
+        mock_llm.assert_not_called()
+
+    def test_llm_failure_keeps_rule_data(self):
+        """A failing or unparseable LLM answer falls back to the rule-based values"""
+        for side_effect in [Exception("API down"), ["not json"]]:
+            with patch('src.services.pdf_extractor.call_llm_with_retry', side_effect=side_effect):
+                note = self.extractor.extract_from_text(self.text)
+
+            assert note.patient_info.name == "Meera Shah"
+            assert note.hospital_details.name == "Hospital name not specified in document"
+
+
 def run_pdf_extractor_tests():
     """Run all PDF extractor tests"""
     print("=" * 60)
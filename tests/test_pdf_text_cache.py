@@ -0,0 +1,123 @@
+"""
+Unit tests for the PDF text cache
+Tests memory/disk hits and that every extractor shares one extraction per document
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pdfplumber
+import pytest
+from unittest.mock import patch
+from src.utils import page_extraction, pdf_text_cache
+from src.utils.pdf_document import PDFDocument
+from src.utils.pdf_text_cache import PDFTextCache
+from src.utils.discharge_pdf_extractor import extract_final_bill
+
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+class TestPDFTextCache:
+    """Test suite for the two-level PDF text cache, read through PDFDocument"""
+
+    def setup_method(self):
+        """Load a small real PDF"""
+        self.pdf_bytes = (TEST_DATA_DIR / "case-2_dischargesummary.pdf").read_bytes()
+
+    def _pages(self, cache, pdf_bytes, backend="pdfplumber"):
+        """Pages of a freshly opened document, extracted through cache"""
+        with patch.object(pdf_text_cache, "_pdf_text_cache", cache):
+            return PDFDocument(pdf_bytes).pages(backend)
+
+    def test_pages_match_direct_extraction(self, tmp_path):
+        """Cached pages are exactly what pdfplumber returns"""
+        cache = PDFTextCache(str(tmp_path))
+
+        with pdfplumber.open(str(TEST_DATA_DIR / "case-2_dischargesummary.pdf")) as pdf:
+            expected = [page.extract_text() or "" for page in pdf.pages]
+
+        assert self._pages(cache, self.pdf_bytes) == expected
+        assert self._pages(cache, self.pdf_bytes) == expected
+
+    def test_memory_then_disk_hits(self, tmp_path):
+        """Repeat lookups hit memory; a new process-level cache hits disk"""
+        cache = PDFTextCache(str(tmp_path))
+        first = self._pages(cache, self.pdf_bytes)
+        second = self._pages(cache, self.pdf_bytes)
+
+        assert first == second
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["memory_hits"] == 1
+
+        fresh = PDFTextCache(str(tmp_path))
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pdfplumber": lambda b: pytest.fail("re-extracted")}):
+            assert self._pages(fresh, self.pdf_bytes) == first
+        assert fresh.stats()["disk_hits"] == 1
+
+    def test_backends_are_cached_separately(self, tmp_path):
+        """PyPDF2 and pdfplumber output differ, so each has its own entry"""
+        cache = PDFTextCache(str(tmp_path))
+        fakes = {"pdfplumber": lambda b: iter(["plumber"]), "pypdf2": lambda b: iter(["pypdf2"])}
+        with patch.dict(page_extraction.PAGE_ITERATORS, fakes):
+            assert self._pages(cache, b"doc", backend="pdfplumber") == ["plumber"]
+            assert self._pages(cache, b"doc", backend="pypdf2") == ["pypdf2"]
+
+        assert cache.stats()["misses"] == 2
+
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            self._pages(cache, self.pdf_bytes, backend="ocr")
+
+    def test_memory_lru_is_bounded(self, tmp_path):
+        """Least recently used documents leave memory first"""
+        calls = []
+
+        def fake_extract(pdf_bytes):
+            calls.append(pdf_bytes)
+            return iter([pdf_bytes.decode()])
+
+        cache = PDFTextCache(str(tmp_path), memory_entries=2, persist=False)
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pdfplumber": fake_extract}):
+            for doc in (b"a", b"b", b"a", b"c", b"a", b"b"):
+                self._pages(cache, doc)
+
+        # "b" was evicted by "c", so it is extracted twice
+        assert calls == [b"a", b"b", b"c", b"b"]
+
+    def test_disabled_cache_always_extracts(self, tmp_path):
+        """A disabled cache neither stores nor serves"""
+        calls = []
+        cache = PDFTextCache(str(tmp_path), enabled=False)
+        with patch.dict(page_extraction.PAGE_ITERATORS, {"pdfplumber": lambda b: calls.append(b) or iter(["text"])}):
+            self._pages(cache, b"doc")
+            self._pages(cache, b"doc")
+
+        assert len(calls) == 2
+        assert not any(tmp_path.rglob("*.json"))
+
+
+class TestDischargeExtractorSharesCache:
+    """The regex pass and the LLM fallback extract the bill text only once"""
+
+    @patch('src.utils.discharge_pdf_extractor.call_llm_with_retry')
+    @patch('src.utils.discharge_pdf_extractor.FinalBillParser.parse_pages')
+    def test_llm_fallback_reuses_extracted_text(self, regex_mock, llm_mock, tmp_path):
+        def no_total(pages):
+            # Reads every page without finding a total
+            list(pages)
+            return {"total_bill_amount": 0}, []
+
+        regex_mock.side_effect = no_total
+        llm_mock.return_value = '{"total_bill_amount": 100}'
+        cache = PDFTextCache(str(tmp_path))
+
+        with patch.object(pdf_text_cache, "_pdf_text_cache", cache):
+            result = extract_final_bill(str(TEST_DATA_DIR / "case-2_dischargesummary.pdf"))
+
+        assert result == {"total_bill_amount": 100}
+        assert cache.stats()["misses"] == 1
+        # The LLM fallback reads the text kept on the opened document
+        assert cache.stats()["memory_hits"] == 0
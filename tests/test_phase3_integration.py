@@ -365,6 +365,10 @@ class TestPhase3Integration:
             )
         )
 
+        # Every cost is within its reference range, so the rule pre-screen would
+        # skip the FWA LLM call; this test combines the LLM-reported issues
+        self.service.fwa_detector.tiered = False
+
         # Run validation
         result = self.service.validate_preauth(
             medical_note=medical_note,
@@ -450,6 +454,84 @@ class TestPhase3Integration:
         assert result.approval_likelihood in ["high", "medium", "low"]
         # Should have used rule-based detection for FWA and graceful degradation for medical
 
+    def _build_simple_note(self) -> MedicalNote:
+        """Minimal valid cataract medical note for orchestration tests"""
+        return MedicalNote(
+            patient_info=PatientInfo(name="Test Patient", age=65, gender="Male", contact_number="9876543210"),
+            diagnosis=DiagnosisInfo(primary_diagnosis="Senile Cataract", icd_10_code="H25.9", diagnosis_date="2025-01-15"),
+            clinical_history=ClinicalHistory(chief_complaints="Vision loss"),
+            proposed_treatment=ProposedTreatment(procedure_name="Cataract Surgery", anesthesia_type="Local"),
+            medical_justification=MedicalJustification(
+                why_hospitalization_required="Surgical intervention required",
+                why_treatment_necessary="Vision impairment"
+            ),
+            hospitalization_details=HospitalizationDetails(planned_admission_date="2025-05-10", expected_length_of_stay=1),
+            cost_breakdown=CostBreakdown(
+                room_charges=3500, surgeon_fees=18000, anesthetist_fees=5000, ot_charges=12000,
+                investigations=2500, medicines_consumables=10000, total_estimated_cost=51000
+            ),
+            doctor_details=DoctorDetails(name="Dr. Kumar", qualification="MS", registration_number="MCI123456"),
+            hospital_details=HospitalDetails(name="Apollo Hospital")
+        )
+
+    @patch('src.agents.medical_reviewer.call_llm_with_retry')
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_concurrent_and_sequential_modes_agree(self, fwa_mock, medical_mock):
+        """Test 6: Concurrent agent execution gives the same result as sequential"""
+        medical_mock.return_value = '{"assessment": "acceptable", "concerns": []}'
+        fwa_mock.return_value = '{"risk_level": "low", "flags": []}'
+
+        medical_note = self._build_simple_note()
+        sequential = PreAuthService(concurrent_agents=False)
+
+        results = [
+            service.validate_preauth(
+                medical_note=medical_note,
+                policy_data=self.star_comprehensive,
+                procedure_data=self.cataract_procedure,
+                form_data=self.base_form_data
+            )
+            for service in (self.service, sequential)
+        ]
+
+        assert results[0].final_score == results[1].final_score
+        assert results[0].overall_status == results[1].overall_status
+        assert results[0].all_issues == results[1].all_issues
+
+    @patch('src.agents.medical_reviewer.call_llm_with_retry')
+    @patch('src.agents.fwa_detector.call_llm_with_retry')
+    def test_concurrent_agents_overlap_and_time_out(self, fwa_mock, medical_mock):
+        """Test 7: LLM agents overlap, and a slow agent falls back after agent_timeout"""
+        import time
+
+        def slow_medical(**kwargs):
+            time.sleep(2.0)
+            return '{"assessment": "strong", "concerns": []}'
+
+        def fast_fwa(**kwargs):
+            time.sleep(0.2)
+            return '{"risk_level": "low", "flags": []}'
+
+        medical_mock.side_effect = slow_medical
+        fwa_mock.side_effect = fast_fwa
+
+        service = PreAuthService(agent_timeout=0.5)
+        started = time.monotonic()
+        result = service.validate_preauth(
+            medical_note=self._build_simple_note(),
+            policy_data=self.star_comprehensive,
+            procedure_data=self.cataract_procedure,
+            form_data=self.base_form_data
+        )
+        elapsed = time.monotonic() - started
+        service.shutdown()
+
+        assert elapsed < 1.5
+        medical = result.agent_results.medical
+        assert medical.status == "warning"
+        assert "timed out" in medical.concerns[0].description
+        assert result.agent_results.fwa.risk_level == "low"
+
 
 def run_integration_tests():
     """Run all integration tests"""
@@ -0,0 +1,169 @@
+"""
+Unit tests for pipeline telemetry
+Tests span timing, per-agent LLM token and cost attribution across threads,
+cache-hit recording, the Prometheus text export and job-level trace summaries
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.app import create_app
+from src.api.jobs import JobManager
+from src.utils import telemetry
+from src.utils.llm_client import call_llm_with_retry
+
+
+def _fake_message(text: str, input_tokens: int, output_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    telemetry.get_metrics().reset()
+    yield
+    telemetry.get_metrics().reset()
+
+
+class TestTraceAttribution:
+    """Test suite for spans and LLM usage attribution"""
+
+    def test_llm_usage_attributed_to_agent_span_in_worker_thread(self):
+        """Tokens and cost from the API response land on the span that made the call"""
+        client = MagicMock()
+        client.messages.create.return_value = _fake_message("ok", 1000, 200)
+
+        def agent():
+            with telemetry.span("agent.medical_review"):
+                return call_llm_with_retry("prompt", model="claude-sonnet-4-20250514", use_cache=False)
+
+        with patch("src.utils.llm_client.get_llm_client", return_value=client):
+            with telemetry.trace("preauth", job_id="job-1") as trace:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    assert executor.submit(telemetry.wrap(agent)).result() == "ok"
+
+        summary = trace.summary()
+        usage = summary["llm"]["agent.medical_review"]
+        assert usage["requests"] == 1
+        assert (usage["input_tokens"], usage["output_tokens"]) == (1000, 200)
+        assert usage["cost_usd"] == pytest.approx((1000 * 3.0 + 200 * 15.0) / 1_000_000)
+        assert summary["cost_usd"] == pytest.approx(usage["cost_usd"])
+        assert [s["name"] for s in summary["spans"]] == ["agent.medical_review"]
+        assert summary["attributes"] == {"job_id": "job-1"}
+
+        metrics = telemetry.get_metrics()
+        assert metrics.counter_value(
+            "iris_llm_tokens_total", model="claude-sonnet-4-20250514",
+            agent="agent.medical_review", direction="input"
+        ) == 1000
+        assert metrics.histogram_count("iris_trace_duration_seconds", trace="preauth", status="ok") == 1
+
+    def test_cache_hit_recorded_without_cost(self):
+        """Responses served from the cache count as hits with no tokens or spend"""
+        cache = MagicMock(enabled=True)
+        cache.get.return_value = "cached"
+
+        with patch("src.utils.llm_client.get_llm_cache", return_value=cache):
+            with telemetry.trace("discharge") as trace:
+                with telemetry.span("agent.cost_escalation"):
+                    assert call_llm_with_retry("prompt") == "cached"
+
+        usage = trace.summary()["llm"]["agent.cost_escalation"]
+        assert usage["cache_hits"] == 1
+        assert usage["cost_usd"] == 0.0
+        assert telemetry.get_metrics().counter_value(
+            "iris_llm_requests_total", model="claude-sonnet-4-20250514",
+            agent="agent.cost_escalation", cache="hit"
+        ) == 1
+
+    def test_failed_span_and_trace(self):
+        """Exceptions mark the span and trace as errors and still record timings"""
+        with pytest.raises(ValueError):
+            with telemetry.trace("preauth") as trace:
+                with telemetry.span("pdf_extraction"):
+                    raise ValueError("bad pdf")
+
+        assert trace.status == "error"
+        assert trace.summary()["spans"][0]["status"] == "error"
+        assert telemetry.get_metrics().histogram_count("iris_span_duration_seconds", span="pdf_extraction") == 1
+
+    def test_cost_estimate(self, monkeypatch):
+        """Prices follow the model family unless overridden by the environment"""
+        assert telemetry.estimate_cost("claude-opus-4-1", 1_000_000, 0) == pytest.approx(15.0)
+        assert telemetry.estimate_cost("claude-3-5-haiku-latest", 0, 1_000_000) == pytest.approx(4.0)
+        assert telemetry.estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+        monkeypatch.setenv("LLM_PRICE_INPUT_PER_MTOK", "1")
+        assert telemetry.estimate_cost("claude-sonnet-4", 1_000_000, 0) == pytest.approx(1.0)
+
+    def test_trace_logged_as_json(self, caplog):
+        """A finished trace is logged as one JSON line"""
+        with caplog.at_level(logging.INFO, logger="iris.telemetry"):
+            with telemetry.trace("preauth", job_id="job-2"):
+                with telemetry.span("aggregation"):
+                    pass
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["event"] == "trace"
+        assert record["attributes"]["job_id"] == "job-2"
+        assert record["spans"][0]["name"] == "aggregation"
+
+
+class TestPrometheusExport:
+    """Test suite for the metrics registry and /metrics endpoint"""
+
+    def test_render_text_format(self):
+        """Histograms are cumulative with +Inf, sum and count; label values are escaped"""
+        metrics = telemetry.MetricsRegistry()
+        metrics.observe("iris_span_duration_seconds", 0.02, span="agent.fwa_detection")
+        metrics.observe("iris_span_duration_seconds", 3.0, span="agent.fwa_detection")
+        metrics.inc("iris_llm_requests_total", model='we"ird', agent="none", cache="miss")
+
+        text = metrics.render()
+
+        assert "# TYPE iris_span_duration_seconds histogram" in text
+        assert 'iris_span_duration_seconds_bucket{span="agent.fwa_detection",le="0.01"} 0' in text
+        assert 'iris_span_duration_seconds_bucket{span="agent.fwa_detection",le="0.025"} 1' in text
+        assert 'iris_span_duration_seconds_bucket{span="agent.fwa_detection",le="+Inf"} 2' in text
+        assert 'iris_span_duration_seconds_count{span="agent.fwa_detection"} 2' in text
+        assert 'iris_llm_requests_total{agent="none",cache="miss",model="we\\"ird"} 1' in text
+        assert text.endswith("\n")
+
+    def test_metrics_endpoint_and_job_summary(self):
+        """Jobs run inside a trace; /metrics exposes the recorded spans"""
+        manager = JobManager(max_workers=1)
+        client = TestClient(create_app(job_manager=manager))
+
+        def run():
+            with telemetry.span("agent.completeness"):
+                return {"ok": True}
+
+        try:
+            job = manager.submit("preauth", run)
+            job.future.result(timeout=5)
+        finally:
+            manager.shutdown()
+
+        summary = job.to_dict()["telemetry"]
+        assert summary["name"] == "preauth"
+        assert summary["attributes"]["job_id"] == job.job_id
+        assert summary["spans"][0]["name"] == "agent.completeness"
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'iris_span_duration_seconds_count{span="agent.completeness"} 1' in response.text
+        assert 'iris_trace_duration_seconds_count{status="ok",trace="preauth"} 1' in response.text